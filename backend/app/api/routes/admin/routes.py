@@ -5,7 +5,8 @@ Superadmin-only endpoints for cost tracking, metrics, system monitoring, and use
 
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from sqlmodel import select, func, col, desc, or_, text
 from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import BaseModel, Field
@@ -184,6 +185,39 @@ async def get_circuit_breaker_status(
     return {"circuit_breakers": status}
 
 
+@router.get("/metrics/llm-cache")
+async def get_llm_cache_stats(
+    current_user: dict = Depends(get_current_superadmin),
+    session: AsyncSession = Depends(get_session),
+):
+    """Get LLM response cache hit rates by call site"""
+    metrics_service = MetricsService(session)
+    return await metrics_service.get_llm_cache_stats()
+
+
+@router.get("/metrics/health-probes")
+async def get_health_probes(
+    format: str = Query("json", description="json or prometheus"),
+    current_user: dict = Depends(get_current_superadmin),
+    session: AsyncSession = Depends(get_session),
+):
+    """Get cached dependency health and probe latency histograms"""
+    if format == "prometheus":
+        return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+    metrics_service = MetricsService(session)
+    return await metrics_service.get_dependency_health()
+
+
+@router.get("/metrics/db-pool")
+async def get_db_pool_metrics(
+    current_user: dict = Depends(get_current_superadmin),
+    session: AsyncSession = Depends(get_session),
+):
+    """Get database connection pool usage and acquisition latency"""
+    metrics_service = MetricsService(session)
+    return await metrics_service.get_db_pool_stats()
+
+
 @router.get("/metrics/model-usage-distribution")
 async def get_model_usage_distribution(
     start_date: Optional[str] = Query(None),
@@ -220,6 +254,20 @@ async def get_generation_times(
     return times
 
 
+@router.get("/metrics/generations/{generation_id}/waterfall")
+async def get_generation_waterfall(
+    generation_id: uuid.UUID,
+    current_user: dict = Depends(get_current_superadmin),
+    session: AsyncSession = Depends(get_session),
+):
+    """Get the traced span waterfall (stages, scenes, provider/ffmpeg/storage/DB calls) of one generation"""
+    metrics_service = MetricsService(session)
+    waterfall = await metrics_service.get_generation_waterfall(str(generation_id))
+    if waterfall is None:
+        raise HTTPException(status_code=404, detail="No trace recorded for this generation")
+    return waterfall
+
+
 @router.get("/health-check")
 async def get_health_check(
     current_user: dict = Depends(get_current_superadmin),
@@ -62,8 +62,10 @@ from app.core.services.ai import AIService
 # from app.core.services.voice import VoiceService
 from app.api.services.video import VideoService
 from app.core.services.rag import RAGService
+from app.core.services.script_ast import attach_script_ast
 from app.core.services.elevenlabs import ElevenLabsService
 from app.core.services.embeddings import EmbeddingsService
+from app.chapter_changes.service import ChapterChangeTracker
 from app.core.database import get_session, get_session
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
@@ -788,6 +790,7 @@ async def expand_script(
             content=user_message,
             user_tier=tier,
             analysis_type="script_expansion",
+            hedge=True,
         )
 
         if response.get("status") != "success":
@@ -852,6 +855,7 @@ async def expand_script(
 
                 if script_record:
                     script_record.script = expanded_content
+                    attach_script_ast(script_record)
                     session.add(script_record)
                     await session.commit()
                     saved = True
@@ -1025,6 +1029,7 @@ async def generate_entertainment_video(
             retry_count=0,
             script_data={
                 "script": script_data.script,
+                "script_ast": script_data.script_ast,
                 "scene_descriptions": script_data.scene_descriptions,
                 "characters": script_data.characters,
                 "script_style": script_data.script_style,
@@ -2919,6 +2924,7 @@ async def generate_audio_for_script(
             script_id=uuid.UUID(script_id),
             script_data={
                 "script": script_data.script,
+                "script_ast": script_data.script_ast,
                 "characters": script_data.characters,
                 "scene_descriptions": script_data.scene_descriptions,
                 "style": script_data.script_style,
@@ -2943,7 +2949,12 @@ async def generate_audio_for_script(
         async with credit_service.credit_transaction(reservation_id, AUDIO_NARRATION):
             from app.tasks.audio_tasks import generate_all_audio_for_video
 
-            task = generate_all_audio_for_video.delay(video_gen_id)
+            priority = await SubscriptionManager(session).get_task_priority(
+                current_user.id
+            )
+            task = generate_all_audio_for_video.apply_async(
+                args=[video_gen_id], priority=priority
+            )
 
             # KAN-267: Persist Celery task id durably for execution tracking
             task_meta = dict(video_gen.task_meta or {})
@@ -3815,6 +3826,7 @@ async def generate_script_and_scenes(
                 plot_context=(
                     plot_info if plot_info and plot_info.get("enhanced_content") else None
                 ),
+                hedge=True,
             )
 
         if script_result.get("status") != "success":
@@ -4155,11 +4167,21 @@ Script to analyze:
 
         # Always insert new script (allow multiple scripts per chapter)
         new_script = Script(**script_record)
+        attach_script_ast(new_script)
         session.add(new_script)
         await session.commit()
         await session.refresh(new_script)
         script_id = str(new_script.id)
 
+        # A new script supersedes the chapter's scene media (artifacts aren't tracked)
+        if chapter_data:
+            await ChapterChangeTracker(session).mark_built(
+                [chapter_data],
+                "script",
+                source={"title": chapter_title, "content": chapter_content},
+            )
+            await session.commit()
+
         # ✅ Record usage for billing/limits
         await subscription_manager.record_usage(
             user_id=current_user.id,
@@ -4379,6 +4401,7 @@ async def generate_script_and_scenes_with_gpt(
             # Update existing
             for key, value in script_record.items():
                 setattr(existing_script, key, value)
+            attach_script_ast(existing_script)
             session.add(existing_script)
             await session.commit()
             await session.refresh(existing_script)
@@ -4386,11 +4409,16 @@ async def generate_script_and_scenes_with_gpt(
         else:
             # Insert new
             new_script = Script(**script_record)
+            attach_script_ast(new_script)
             session.add(new_script)
             await session.commit()
             await session.refresh(new_script)
             script_id = str(new_script.id)
 
+        # A new script supersedes the chapter's scene media
+        await ChapterChangeTracker(session).mark_built([chapter_data], "script")
+        await session.commit()
+
         # ✅ Record usage for billing/limits
         await subscription_manager.record_usage(
             user_id=current_user.id,
@@ -4584,6 +4612,7 @@ async def save_script_and_scenes(
         }
 
         new_script = Script(**script_record)
+        attach_script_ast(new_script)
         session.add(new_script)
         await session.commit()
         await session.refresh(new_script)
@@ -4976,8 +5005,13 @@ async def retry_video_generation(
         new_status = get_status_for_step(step_to_retry)
 
         video_response.generation_status = new_status
-        video_response.task_meta["failed_at_step"] = None
-        video_response.task_meta["error_message"] = None
+        task_meta = dict(video_response.task_meta or {})
+        task_meta["failed_at_step"] = None
+        task_meta["error_message"] = None
+        # A user-requested regeneration bypasses the media cache in the
+        # audio and video stages instead of returning the previous result
+        task_meta["regenerate"] = bool(request.get("regenerate")) if request else False
+        video_response.task_meta = task_meta
         video_response.retry_count = retry_count
         video_response.can_resume = False
         video_response.updated_at = datetime.now()
@@ -4986,7 +5020,12 @@ async def retry_video_generation(
         await session.commit()
 
         # Trigger the appropriate task
-        task_id = await trigger_task_for_step(step_to_retry, video_gen_id, session)
+        priority = await SubscriptionManager(session).get_task_priority(
+            current_user.id
+        )
+        task_id = await trigger_task_for_step(
+            step_to_retry, video_gen_id, session, priority=priority
+        )
 
         return {
             "message": f"Retrying from step: {step_to_retry.value}",
@@ -5287,7 +5326,10 @@ def get_status_for_step(step: PipelineStep) -> str:
 
 
 async def trigger_task_for_step(
-    step: PipelineStep, video_gen_id: str, session: AsyncSession
+    step: PipelineStep,
+    video_gen_id: str,
+    session: AsyncSession,
+    priority: Optional[int] = None,
 ) -> str:
     """Trigger the appropriate task for a pipeline step"""
     try:
@@ -5296,7 +5338,9 @@ async def trigger_task_for_step(
         if step == PipelineStep.AUDIO_GENERATION:
             from app.tasks.audio_tasks import generate_all_audio_for_video
 
-            task = generate_all_audio_for_video.delay(video_gen_id)
+            task = generate_all_audio_for_video.apply_async(
+                args=[video_gen_id], priority=priority
+            )
             task_id = task.id
             print(f"🎵 Started audio generation task: {task_id}")
 
@@ -5317,21 +5361,27 @@ async def trigger_task_for_step(
         elif step == PipelineStep.IMAGE_GENERATION:
             from app.tasks.image_tasks import generate_all_images_for_video
 
-            task = generate_all_images_for_video.delay(video_gen_id)
+            task = generate_all_images_for_video.apply_async(
+                args=[video_gen_id], priority=priority
+            )
             task_id = task.id
             print(f"🖼️  Started image generation task: {task_id}")
 
         elif step == PipelineStep.VIDEO_GENERATION:
             from app.tasks.video_tasks import generate_all_videos_for_generation
 
-            task = generate_all_videos_for_generation.delay(video_gen_id)
+            task = generate_all_videos_for_generation.apply_async(
+                args=[video_gen_id], priority=priority
+            )
             task_id = task.id
             print(f"🎬 Started video generation task: {task_id}")
 
         elif step == PipelineStep.AUDIO_VIDEO_MERGE:
             from app.tasks.merge_tasks import merge_audio_video_for_generation
 
-            task = merge_audio_video_for_generation.delay(video_gen_id)
+            task = merge_audio_video_for_generation.apply_async(
+                args=[video_gen_id], priority=priority
+            )
             task_id = task.id
             print(f"🔗 Started merge task: {task_id}")
 
@@ -5602,9 +5652,12 @@ async def retry_video_retrieval(
         print(f"🔄 Attempting video retrieval from URL: {video_url}")
 
         # Import and use the video service for retry
+        from app.core.config import settings
         from app.core.services.modelslab_v7_video import ModelsLabV7VideoService
 
-        video_service = ModelsLabV7VideoService()
+        video_service = ModelsLabV7VideoService(
+            acquire_timeout=settings.PROVIDER_LIMIT_REQUEST_ACQUIRE_TIMEOUT_SECONDS
+        )
 
         # Attempt video retrieval
         retry_result = await video_service.retry_video_retrieval(video_url)
@@ -5779,6 +5832,7 @@ Provide ONLY the enhanced description, no explanations or formatting."""
             content=combined_prompt,
             user_tier=user_model_tier,
             analysis_type="enhancement",  # Custom type for scene enhancement
+            hedge=True,
         )
 
         # Extract enhanced text from result - OpenRouter returns 'result' key
@@ -1,14 +1,16 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 from datetime import datetime, timezone
 from fastapi import (
     APIRouter,
     Depends,
     HTTPException,
+    Query,
     status,
     UploadFile,
     File,
     Form,
     BackgroundTasks,
+    Header,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.services.embeddings import EmbeddingsService
@@ -20,7 +22,7 @@ import fitz
 import os
 import aiofiles
 from pydantic import BaseModel
-from fastapi.responses import Response, StreamingResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 import json
 import io
 
@@ -32,6 +34,15 @@ from sqlmodel import select, update, delete, col, or_, text
 from sqlalchemy import func
 from sqlalchemy.orm import selectinload
 from app.books.models import Book as BookModel, Chapter, Section, LearningContent
+from app.books.search import BookSearchService
+from app.chapter_changes.service import ChapterChangeTracker
+from app.books.manifest import (
+    ChapterManifestService,
+    DEFAULT_CONTENT_PAGE_CHARS,
+    MAX_CONTENT_PAGE_CHARS,
+    chapter_content_etag,
+    etag_matches,
+)
 from app.auth.models import User, User as UserModel
 from app.books.schemas import (
     BookCreate,
@@ -48,6 +59,8 @@ from app.books.schemas import (
     ChapterCreate,
     BookWithDraftChapters,
     BookWithChapters,
+    BookWithChapterManifest,
+    ChapterContentPage,
 )
 from app.core.services.ai import AIService
 from app.core.services.file import FileService
@@ -105,127 +118,85 @@ async def get_structure_types():
     return {"structure_types": structure_types, "default": "flat"}
 
 
-@router.get("/search", response_model=Dict[str, List[Any]])
+@router.get("/search", response_model=Dict[str, Any])
 async def search_content(
     query: str,
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0),
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_active_user),
 ):
     """
     Search books and chapters using full-text search.
-    Returns a dictionary with 'books' and 'chapters' lists.
+
+    Results are ranked (title matches outrank body matches) and carry a
+    highlighted ``snippet`` instead of the full chapter content. ``limit`` and
+    ``offset`` page both lists; ``has_more`` tells whether either list has
+    another page.
     """
     if not query or len(query.strip()) < 3:
-        return {"books": [], "chapters": []}
+        return {"books": [], "chapters": [], "limit": limit, "offset": offset, "has_more": False}
 
     search_query = query.strip()
 
     try:
-        # Prepare TS Query
-        ts_query = func.plainto_tsquery("english", search_query)
-
-        # Search Books
-        # We search title, description, author_name
-        # Using coalesce to handle NULLs
-        book_stmt = (
-            select(BookModel)
-            .where(
-                BookModel.user_id == current_user.id,
-                or_(
-                    func.to_tsvector("english", func.coalesce(BookModel.title, "")).op(
-                        "@@"
-                    )(ts_query),
-                    func.to_tsvector(
-                        "english", func.coalesce(BookModel.description, "")
-                    ).op("@@")(ts_query),
-                    func.to_tsvector(
-                        "english", func.coalesce(BookModel.author_name, "")
-                    ).op("@@")(ts_query),
-                ),
-            )
-            .limit(20)
+        search_service = BookSearchService(session)
+        # Fetch one extra row per list to know whether another page exists
+        books = await search_service.search_books(
+            current_user.id, search_query, limit=limit + 1, offset=offset
         )
-
-        book_result = await session.exec(book_stmt)
-        books = book_result.all()
-
-        # Search Chapters
-        # We search title, content
-        # We need to join with BookModel to ensure user ownership/access
-        chapter_stmt = (
-            select(Chapter)
-            .join(BookModel)
-            .where(
-                BookModel.user_id == current_user.id,
-                or_(
-                    func.to_tsvector("english", func.coalesce(Chapter.title, "")).op(
-                        "@@"
-                    )(ts_query),
-                    func.to_tsvector("english", func.coalesce(Chapter.content, "")).op(
-                        "@@"
-                    )(ts_query),
-                ),
-            )
-            .limit(20)
+        chapters = await search_service.search_chapters(
+            current_user.id, search_query, limit=limit + 1, offset=offset
         )
 
-        chapter_result = await session.exec(chapter_stmt)
-        chapters = chapter_result.all()
-
         return {
-            "books": [book.model_dump(mode="json") for book in books],
-            "chapters": [chapter.model_dump(mode="json") for chapter in chapters],
+            "books": books[:limit],
+            "chapters": chapters[:limit],
+            "limit": limit,
+            "offset": offset,
+            "has_more": len(books) > limit or len(chapters) > limit,
         }
 
     except Exception as e:
         print(f"Search error: {e}")
-        # Fallback to simple ILIKE if TSVector fails (e.g. if not on Postgres or other issues)
-        # or just return empty/error
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 
+async def _get_superadmin_books_with_manifests(
+    session: AsyncSession, book_type: str
+) -> List[BookWithChapterManifest]:
+    """Published superadmin books of one type with chapter manifests (two queries total)."""
+    stmt = (
+        select(BookModel)
+        .join(UserModel, UserModel.id == BookModel.user_id)
+        .where(
+            UserModel.email == settings.SUPERADMIN_EMAIL,
+            BookModel.status == "PUBLISHED",
+            BookModel.book_type == book_type,
+        )
+        .order_by(BookModel.created_at.desc())
+    )
+    result = await session.exec(stmt)
+    books = result.all()
+
+    manifests = await ChapterManifestService(session).manifests_for_books(
+        [book.id for book in books]
+    )
+
+    books_with_chapters = []
+    for book in books:
+        book_dict = book.model_dump(mode="json")
+        book_dict["chapters"] = manifests[str(book.id)]
+        books_with_chapters.append(BookWithChapterManifest(**book_dict))
+    return books_with_chapters
+
+
 async def get_superadmin_learning_books(
     session: AsyncSession = Depends(get_session),
 ):
     """Get all published learning books authored by the superadmin (for Explore Learning Materials)"""
     try:
-        # Get superadmin user ID
-        stmt = select(UserModel.id).where(UserModel.email == settings.SUPERADMIN_EMAIL)
-        result = await session.exec(stmt)
-        superadmin_id = result.first()
-
-        if not superadmin_id:
-            return []
-
-        # Get published learning books by superadmin
-        stmt = (
-            select(BookModel)
-            .where(
-                BookModel.user_id == superadmin_id,
-                BookModel.status == "PUBLISHED",
-                BookModel.book_type == "non-fiction",
-            )
-            .order_by(BookModel.created_at.desc())
-        )
-        result = await session.exec(stmt)
-        books = result.all()
-
-        # For each book, get its chapters
-        books_with_chapters = []
-        for book in books:
-            stmt = (
-                select(Chapter)
-                .where(Chapter.book_id == book.id)
-                .order_by(Chapter.chapter_number)
-            )
-            result = await session.exec(stmt)
-            chapters = result.all()
-
-            book_dict = book.model_dump(mode="json")
-            book_dict["chapters"] = [c.model_dump(mode="json") for c in chapters]
-            books_with_chapters.append(BookWithChapters(**book_dict))
-
-        return books_with_chapters
+        return await _get_superadmin_books_with_manifests(session, "non-fiction")
 
     except Exception as e:
         raise HTTPException(
@@ -234,49 +205,20 @@ async def get_superadmin_learning_books(
         )
 
 
-@router.get("/superadmin-entertainment-books", response_model=List[BookWithChapters])
+@router.get(
+    "/superadmin-entertainment-books", response_model=List[BookWithChapterManifest]
+)
 async def get_superadmin_entertainment_books(
     session: AsyncSession = Depends(get_session),
 ):
-    """Get all published entertainment books authored by the superadmin (for Interactive Stories)"""
-    try:
-        # Get superadmin user ID
-        stmt = select(UserModel.id).where(UserModel.email == settings.SUPERADMIN_EMAIL)
-        result = await session.exec(stmt)
-        superadmin_id = result.first()
-
-        if not superadmin_id:
-            return []
-
-        # Get published entertainment books by superadmin
-        stmt = (
-            select(BookModel)
-            .where(
-                BookModel.user_id == superadmin_id,
-                BookModel.status == "PUBLISHED",
-                BookModel.book_type == "entertainment",
-            )
-            .order_by(BookModel.created_at.desc())
-        )
-        result = await session.exec(stmt)
-        books = result.all()
-
-        # For each book, get its chapters
-        books_with_chapters = []
-        for book in books:
-            stmt = (
-                select(Chapter)
-                .where(Chapter.book_id == book.id)
-                .order_by(Chapter.chapter_number)
-            )
-            result = await session.exec(stmt)
-            chapters = result.all()
-
-            book_dict = book.model_dump(mode="json")
-            book_dict["chapters"] = [c.model_dump(mode="json") for c in chapters]
-            books_with_chapters.append(BookWithChapters(**book_dict))
+    """
+    Get all published entertainment books authored by the superadmin (for Interactive Stories).
 
-        return books_with_chapters
+    Chapters are manifests (no content); read content through
+    GET /{book_id}/chapters/{chapter_id}/content.
+    """
+    try:
+        return await _get_superadmin_books_with_manifests(session, "entertainment")
 
     except Exception as e:
         print(f"Error in /superadmin-entertainment-books: {e}")
@@ -296,51 +238,42 @@ async def get_learning_books_with_progress(
         result = await session.exec(stmt)
         books = result.all()
 
-        result_list = []
-        for book in books:
-            # Get chapters for book
-            stmt = select(Chapter).where(Chapter.book_id == book.id)
+        book_ids = [book.id for book in books]
+
+        # Chapter ids of every book in one query (ids only, no content)
+        chapter_ids_by_book: Dict[str, List[uuid.UUID]] = {str(b): [] for b in book_ids}
+        if book_ids:
+            stmt = select(Chapter.id, Chapter.book_id).where(
+                col(Chapter.book_id).in_(book_ids)
+            )
             chapters_result = await session.exec(stmt)
-            chapters = chapters_result.all()
-
-            if not chapters:
-                result_list.append(
-                    {
-                        "id": str(book.id),
-                        "title": book.title,
-                        "author_name": book.author_name or "",
-                        "cover_image_url": book.cover_image_url or "",
-                        "description": book.description or "",
-                        "progress": 0,
-                        "total_chapters": 0,
-                        "book_type": book.book_type,
-                        "status": book.status,
-                    }
-                )
-                continue
+            for chapter_id, chapter_book_id in chapters_result.all():
+                chapter_ids_by_book[str(chapter_book_id)].append(chapter_id)
+
+        # Learning content progress for all those chapters in one query
+        chapters_with_content = set()
+        all_chapter_ids = [c for ids in chapter_ids_by_book.values() for c in ids]
+        if all_chapter_ids:
+            stmt = select(LearningContent.chapter_id).where(
+                col(LearningContent.chapter_id).in_(all_chapter_ids),
+                LearningContent.user_id == current_user.id,
+                LearningContent.status == "ready",
+                col(LearningContent.content_type).in_(
+                    ["audio_narration", "realistic_video"]
+                ),
+            )
+            content_result = await session.exec(stmt)
+            chapters_with_content = set(content_result.all())
 
-            chapter_ids = [c.id for c in chapters]
+        result_list = []
+        for book in books:
+            chapter_ids = chapter_ids_by_book[str(book.id)]
             total_chapters = len(chapter_ids)
             progress = 0
 
             if total_chapters > 0:
-                # Get learning content progress
-                stmt = select(LearningContent).where(
-                    col(LearningContent.chapter_id).in_(chapter_ids),
-                    LearningContent.user_id == current_user.id,
-                    LearningContent.status == "ready",
-                )
-                content_result = await session.exec(stmt)
-                content = content_result.all()
-
-                chapters_with_content = set(
-                    [
-                        c.chapter_id
-                        for c in content
-                        if c.content_type in ["audio_narration", "realistic_video"]
-                    ]
-                )
-                progress = round((len(chapters_with_content) / total_chapters) * 100)
+                completed = sum(1 for c in chapter_ids if c in chapters_with_content)
+                progress = round((completed / total_chapters) * 100)
 
             result_list.append(
                 {
@@ -384,13 +317,20 @@ async def get_my_books(
     raise HTTPException(status_code=404, detail="Explorer mode is no longer available")
 
 
-@router.get("/{book_id}", response_model=BookWithChapters)
+@router.get("/{book_id}", response_model=Union[BookWithChapters, BookWithChapterManifest])
 async def get_book(
     book_id: str,
+    manifest: bool = Query(False),
     session: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
-    """Get book by ID with its chapters"""
+    """
+    Get book by ID with its chapters.
+
+    With ``manifest=true`` chapters carry id, number, title, word count and
+    summary only; content is read through
+    GET /{book_id}/chapters/{chapter_id}/content.
+    """
     try:
         stmt = select(BookModel).where(BookModel.id == book_id)
         result = await session.exec(stmt)
@@ -407,6 +347,13 @@ async def get_book(
                 status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
             )
 
+        book_dict = book.model_dump(mode="json")
+
+        if manifest:
+            manifests = await ChapterManifestService(session).manifests_for_books([book.id])
+            book_dict["chapters"] = manifests[str(book.id)]
+            return BookWithChapterManifest(**book_dict)
+
         # Get chapters
         stmt = (
             select(Chapter)
@@ -416,7 +363,6 @@ async def get_book(
         result = await session.exec(stmt)
         chapters = result.all()
 
-        book_dict = book.model_dump(mode="json")
         book_dict["chapters"] = [c.model_dump(mode="json") for c in chapters]
         return BookWithChapters(**book_dict)
 
@@ -660,6 +606,73 @@ async def get_chapters(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.get(
+    "/{book_id}/chapters/{chapter_id}/content", response_model=ChapterContentPage
+)
+async def get_chapter_content(
+    book_id: uuid.UUID,
+    chapter_id: uuid.UUID,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_CONTENT_PAGE_CHARS, ge=1, le=MAX_CONTENT_PAGE_CHARS),
+    if_none_match: Optional[str] = Header(None),
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Read one character range of a chapter's content.
+
+    ``offset``/``limit`` are in characters; ``has_more`` tells whether another
+    range follows. Responses carry an ETag, and a matching If-None-Match is
+    answered with 304 before the content is read.
+    """
+    manifest_service = ChapterManifestService(session)
+    version = await manifest_service.get_content_version(book_id, chapter_id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Chapter not found")
+
+    if version["book_status"] != BookStatus.PUBLISHED and str(
+        version["book_user_id"]
+    ) != str(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+        )
+
+    etag = chapter_content_etag(
+        str(chapter_id), version["updated_at"], version["content_bytes"], offset, limit
+    )
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    page = await manifest_service.get_content_page(chapter_id, offset, limit)
+    return JSONResponse(content=ChapterContentPage(**page).model_dump(), headers=headers)
+
+
+@router.get("/{book_id}/changes", response_model=Dict[str, Any])
+async def get_book_changes(
+    book_id: uuid.UUID,
+    session: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    What an incremental regeneration has to redo after chapter edits.
+
+    Lists, per chapter, the derived artifacts ("embeddings", "plot",
+    "script", "scene_media") that are "stale" (built from an older version
+    of the chapter) or "missing" (never built). Chapters with everything
+    current are omitted; ``plot_stale`` says whether the overview needs
+    regenerating at all.
+    """
+    book = await session.get(BookModel, book_id)
+    if not book:
+        raise HTTPException(status_code=404, detail="BookModel not found")
+    if str(book.user_id) != str(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+        )
+    return await ChapterChangeTracker(session).book_changes(book_id)
+
+
 # @router.post("/upload", response_model=BookPreview, status_code=status.HTTP_202_ACCEPTED)
 # async def upload_book(
 #     file: Optional[UploadFile] = File(None),
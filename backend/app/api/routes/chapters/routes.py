@@ -6,10 +6,12 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select, col, SQLModel
 
 from app.core.auth import get_current_active_user
+from app.core.config import settings
 from app.core.database import get_session
 from app.core.services.standalone_image import StandaloneImageService
 from app.core.services.elevenlabs import ElevenLabsService
 from app.core.services.modelslab_v7_audio import ModelsLabV7AudioService
+from app.tasks.celery_app import priority_for_tier
 from app.tasks.image_tasks import (
     generate_character_image_task,
     generate_scene_image_task,
@@ -657,14 +659,15 @@ async def generate_scene_image(
                 detail=f"Failed to create image generation record: {str(db_error)}",
             )
 
-        # Queue the scene image generation task
-        credit_service = CreditService(session)
+        # Queue the scene image generation task. The task confirms the
+        # reservation once the image is generated and releases it on a cache
+        # hit or failure, so a cached image is not charged.
         try:
-            async with credit_service.credit_transaction(reservation_id, SCENE_IMAGE_GEN):
-                print(
-                    f"[DEBUG] [generate_scene_image] About to queue task for record_id={record_id}, scene={scene_number}"
-                )
-                task = generate_scene_image_task.delay(
+            print(
+                f"[DEBUG] [generate_scene_image] About to queue task for record_id={record_id}, scene={scene_number}"
+            )
+            task = generate_scene_image_task.apply_async(
+                kwargs=dict(
                     record_id=record_id,
                     scene_description=scene_description,
                     scene_number=scene_number,
@@ -679,20 +682,24 @@ async def generate_scene_image(
                     character_ids=request.character_ids,
                     character_image_urls=request.character_image_urls,
                     is_suggested_shot=request.is_suggested_shot,
-                )
+                    regenerate=request.regenerate,
+                    credit_reservation_id=str(reservation_id),
+                ),
+                priority=priority_for_tier(user_tier),
+            )
 
-                print(
-                    f"[DEBUG] [generate_scene_image] Task queued successfully with task_id={task.id}"
-                )
-                return ImageGenerationQueuedResponse(
-                    task_id=task.id,
-                    status="queued",
-                    message="Scene image generation has been queued and will be processed in the background",
-                    estimated_time_seconds=60,
-                    record_id=record_id,
-                    scene_number=scene_number,
-                    retry_count=0,
-                )
+            print(
+                f"[DEBUG] [generate_scene_image] Task queued successfully with task_id={task.id}"
+            )
+            return ImageGenerationQueuedResponse(
+                task_id=task.id,
+                status="queued",
+                message="Scene image generation has been queued and will be processed in the background",
+                estimated_time_seconds=60,
+                record_id=record_id,
+                scene_number=scene_number,
+                retry_count=0,
+            )
 
         except Exception as task_error:
             # If task queueing fails, mark the DB record as failed
@@ -700,6 +707,13 @@ async def generate_scene_image(
                 f"[ERROR] [generate_scene_image] Failed to queue task: {str(task_error)}"
             )
 
+            try:
+                await CreditService(session).release_reservation(reservation_id)
+            except Exception as release_error:
+                print(
+                    f"[ERROR] [generate_scene_image] Failed to release credit reservation: {str(release_error)}"
+                )
+
             try:
                 record.status = "failed"
                 record.error_message = f"Failed to queue task: {str(task_error)}"
@@ -781,15 +795,20 @@ async def generate_character_image(
         # Queue the character image generation task
         credit_service = CreditService(session)
         async with credit_service.credit_transaction(reservation_id, CHARACTER_IMAGE_GEN):
-            task = generate_character_image_task.delay(
-                character_name=character_info["name"],
-                character_description=character_info["description"],
-                user_id=str(current_user.id),
-                chapter_id=chapter_id,
-                style=request.style,
-                aspect_ratio=request.aspect_ratio,
-                custom_prompt=request.custom_prompt,
-                record_id=record_id,  # Pass the record_id to the task
+            task = generate_character_image_task.apply_async(
+                kwargs=dict(
+                    character_name=character_info["name"],
+                    character_description=character_info["description"],
+                    user_id=str(current_user.id),
+                    chapter_id=chapter_id,
+                    style=request.style,
+                    aspect_ratio=request.aspect_ratio,
+                    custom_prompt=request.custom_prompt,
+                    record_id=record_id,  # Pass the record_id to the task
+                ),
+                priority=await SubscriptionManager(session).get_task_priority(
+                    current_user.id
+                ),
             )
 
             return ImageGenerationQueuedResponse(
@@ -1566,17 +1585,22 @@ async def generate_chapter_audio(
         # Queue the audio generation task
         from app.tasks.audio_tasks import generate_chapter_audio_task
 
-        task = generate_chapter_audio_task.delay(
-            audio_type=audio_type,
-            text_content=text_content,
-            user_id=current_user.id,
-            chapter_id=chapter_id,
-            scene_number=scene_number,
-            voice_id=request.voice_id,
-            emotion=request.emotion,
-            speed=request.speed,
-            duration=request.duration,
-            record_id=record_id,
+        task = generate_chapter_audio_task.apply_async(
+            kwargs=dict(
+                audio_type=audio_type,
+                text_content=text_content,
+                user_id=current_user.id,
+                chapter_id=chapter_id,
+                scene_number=scene_number,
+                voice_id=request.voice_id,
+                emotion=request.emotion,
+                speed=request.speed,
+                duration=request.duration,
+                record_id=record_id,
+            ),
+            priority=await SubscriptionManager(session).get_task_priority(
+                current_user.id
+            ),
         )
 
         return AudioGenerationQueuedResponse(
@@ -1743,13 +1767,18 @@ async def export_chapter_audio_mix(
         # Queue the audio export task
         from app.tasks.audio_tasks import export_chapter_audio_mix_task
 
-        task = export_chapter_audio_mix_task.delay(
-            export_id=export_id,
-            chapter_id=chapter_id,
-            user_id=current_user.id,
-            audio_files=audio_files_data,
-            export_format=request.format,
-            mix_settings=request.mix_settings,
+        task = export_chapter_audio_mix_task.apply_async(
+            kwargs=dict(
+                export_id=export_id,
+                chapter_id=chapter_id,
+                user_id=current_user.id,
+                audio_files=audio_files_data,
+                export_format=request.format,
+                mix_settings=request.mix_settings,
+            ),
+            priority=await SubscriptionManager(session).get_task_priority(
+                current_user.id
+            ),
         )
 
         return AudioExportResponse(
@@ -1879,7 +1908,9 @@ async def upscale_image(
         # Import and use upscale service
         from app.core.services.modelslab_upscale import ModelsLabUpscaleService
 
-        upscale_service = ModelsLabUpscaleService()
+        upscale_service = ModelsLabUpscaleService(
+            acquire_timeout=settings.PROVIDER_LIMIT_REQUEST_ACQUIRE_TIMEOUT_SECONDS
+        )
 
         # Check if user wants to override with a specific model (e.g., anime)
         override_model = request.get("model_id")
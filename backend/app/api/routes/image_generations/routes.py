@@ -5,6 +5,7 @@ from sqlmodel import select, col
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.auth import get_current_active_user
+from app.core.config import settings
 from app.core.database import get_session
 from app.core.services.standalone_image import StandaloneImageService
 from app.core.services.modelslab_v7_image import ModelsLabV7ImageService
@@ -189,7 +190,9 @@ async def expand_image(
         )
 
         # Initialize the image service
-        image_service = ModelsLabV7ImageService()
+        image_service = ModelsLabV7ImageService(
+            acquire_timeout=settings.PROVIDER_LIMIT_REQUEST_ACQUIRE_TIMEOUT_SECONDS
+        )
 
         # Perform expansion
         result = await image_service.expand_image(
@@ -4,6 +4,7 @@ from pydantic import BaseModel
 from typing import Optional
 
 from app.core.auth import get_current_active_user
+from app.core.config import settings
 from app.core.database import get_session
 from app.core.services.modelslab_upscale import ModelsLabUpscaleService
 from app.credits.dependencies import require_credits
@@ -31,7 +32,9 @@ async def upscale_image(
     Upscale an image using ModelsLab V6 service based on user tier.
     """
     try:
-        upscale_service = ModelsLabUpscaleService()
+        upscale_service = ModelsLabUpscaleService(
+            acquire_timeout=settings.PROVIDER_LIMIT_REQUEST_ACQUIRE_TIMEOUT_SECONDS
+        )
         result = await upscale_service.upscale_with_tier(
             image_url=request.image_url,
             user_tier=request.user_tier,
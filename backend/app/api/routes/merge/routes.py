@@ -185,8 +185,11 @@ async def start_manual_merge(
         await session.refresh(merge_op)
 
         # Start background merge task
+        priority = await SubscriptionManager(session).get_task_priority(
+            uuid.UUID(user_id)
+        )
         background_tasks.add_task(
-            process_manual_merge, str(merge_id), request, user_id
+            process_manual_merge, str(merge_id), request, user_id, priority
         )
 
         # Estimate processing time based on input sources
@@ -226,8 +229,11 @@ async def generate_merge_preview(
         preview_id = str(uuid.uuid4())
 
         # Start background preview task
+        priority = await SubscriptionManager(session).get_task_priority(
+            uuid.UUID(user_id)
+        )
         background_tasks.add_task(
-            process_merge_preview, preview_id, request, user_id
+            process_merge_preview, preview_id, request, user_id, priority
         )
 
         return MergePreviewResponse(
@@ -555,7 +561,10 @@ async def upload_merge_file(
 
 # Background task functions
 async def process_manual_merge(
-    merge_id: str, request: MergeManualRequest, user_id: str
+    merge_id: str,
+    request: MergeManualRequest,
+    user_id: str,
+    priority: Optional[int] = None,
 ):
     """Process the manual merge operation in the background"""
     try:
@@ -566,7 +575,9 @@ async def process_manual_merge(
         print(f"Processing manual merge {merge_id} for user {user_id}")
 
         # Call the actual merge task
-        task_process_manual_merge.delay(merge_id, user_id)
+        task_process_manual_merge.apply_async(
+            args=[merge_id, user_id], priority=priority
+        )
 
     except Exception as e:
         print(f"Error processing manual merge {merge_id}: {str(e)}")
@@ -574,7 +585,10 @@ async def process_manual_merge(
 
 
 async def process_merge_preview(
-    preview_id: str, request: MergePreviewRequest, user_id: str
+    preview_id: str,
+    request: MergePreviewRequest,
+    user_id: str,
+    priority: Optional[int] = None,
 ):
     """Process the merge preview in the background"""
     try:
@@ -585,7 +599,9 @@ async def process_merge_preview(
         print(f"Processing merge preview {preview_id} for user {user_id}")
 
         # Call the actual preview task
-        task_process_merge_preview.delay(preview_id, user_id)
+        task_process_merge_preview.apply_async(
+            args=[preview_id, user_id], priority=priority
+        )
 
     except Exception as e:
         print(f"Error processing merge preview {preview_id}: {str(e)}")
@@ -4,6 +4,7 @@ import json
 import re
 from datetime import datetime, timezone
 
+from app.core.config import settings
 from app.core.database import get_session
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select, update, delete
@@ -68,7 +69,9 @@ class CharacterService:
         self.session = session
         self.openrouter = ScriptModelRouter()
         self.subscription_manager = SubscriptionManager(self.session)
-        self.image_service = ModelsLabV7ImageService()
+        self.image_service = ModelsLabV7ImageService(
+            acquire_timeout=settings.PROVIDER_LIMIT_REQUEST_ACQUIRE_TIMEOUT_SECONDS
+        )
         self.embeddings_service = EmbeddingsService(self.session)
 
         # Default archetypes for initial setup
@@ -386,7 +389,7 @@ class CharacterService:
 
             # Queue the async task
             from app.tasks.image_tasks import generate_character_image_task
-            from app.tasks.celery_app import celery_app
+            from app.tasks.celery_app import celery_app, priority_for_tier
 
             # Debug: Log Celery configuration
             logger.info(
@@ -397,17 +400,20 @@ class CharacterService:
             )
 
             try:
-                task = generate_character_image_task.delay(
-                    character_name=character.name,
-                    character_description=character_description,
-                    user_id=str(user_id),
-                    character_id=str(character_id),
-                    style=style,
-                    aspect_ratio=aspect_ratio,
-                    custom_prompt=custom_prompt,
-                    record_id=record_id,
-                    user_tier=user_tier,
-                    entity_type=character.entity_type or "character",
+                task = generate_character_image_task.apply_async(
+                    kwargs=dict(
+                        character_name=character.name,
+                        character_description=character_description,
+                        user_id=str(user_id),
+                        character_id=str(character_id),
+                        style=style,
+                        aspect_ratio=aspect_ratio,
+                        custom_prompt=custom_prompt,
+                        record_id=record_id,
+                        user_tier=user_tier,
+                        entity_type=character.entity_type or "character",
+                    ),
+                    priority=priority_for_tier(user_tier),
                 )
                 logger.info(
                     f"[CharacterService] Task dispatched successfully! Task ID: {task.id}"
@@ -599,6 +599,7 @@ Respond helpfully and guide them toward their creative goal.{nudge}"""
                 analysis_type="cinematic_universe_analysis",
                 max_tokens=max_tokens,
                 system_prompt_override=system_prompt,
+                hedge=True,
             )
 
             result_text = response.get("result") or ""
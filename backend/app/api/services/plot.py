@@ -132,6 +132,9 @@ class PlotService:
                 book_context,
             )
 
+            # 6. Record which chapter versions the overview reflects
+            await self._record_plot_built(book_id)
+
             return result
 
         except Exception as e:
@@ -935,6 +938,17 @@ Return ONLY a valid JSON array of NEW character objects:
             logger.error(f"[PlotService] Error adding characters to project: {str(e)}")
             raise PlotGenerationError(f"Failed to add characters: {str(e)}")
 
+    async def _record_plot_built(self, book_id: uuid.UUID) -> None:
+        """
+        Mark every chapter's plot inputs as covered by the stored overview, so
+        later edits that leave them alone don't flag the overview as stale.
+        """
+        from app.chapter_changes.service import ChapterChangeTracker
+
+        result = await self.session.exec(select(Chapter).where(Chapter.book_id == book_id))
+        await ChapterChangeTracker(self.session).mark_built(result.all(), "plot")
+        await self.session.commit()
+
     async def _get_book_context_for_plot(self, book_id: uuid.UUID) -> Dict[str, Any]:
         """
         Retrieve book and chapter summaries for context.
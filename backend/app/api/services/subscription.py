@@ -18,6 +18,7 @@ from app.subscriptions.models import (
     SubscriptionHistory,
 )
 from app.credits.constants import TIER_CREDIT_GRANTS_BY_ENUM
+from app.credits.service import CreditService
 from app.promo.models import CreditGrant, GrantType
 import logging
 import uuid
@@ -287,6 +288,14 @@ class SubscriptionManager:
             logger.error(f"Error getting user tier for {user_id}: {e}")
             return SubscriptionTier.FREE
 
+    async def get_task_priority(self, user_id: uuid.UUID) -> int:
+        """
+        Get the Celery message priority for background jobs queued for a user
+        """
+        from app.tasks.celery_app import priority_for_tier
+
+        return priority_for_tier(await self.get_user_tier(user_id))
+
     async def get_subscription(self, user_id: uuid.UUID) -> Optional[UserSubscription]:
         """
         Get user's current subscription
@@ -695,7 +704,7 @@ class SubscriptionManager:
                     promo_code_id=None,
                     grant_type=grant_type,
                 )
-                self.session.add(tier_credit_grant)
+                await CreditService(self.session).add_grant(tier_credit_grant)
                 await self.session.commit()
                 logger.info(
                     f"KAN-314: granted {credit_amount} credits to user {user_id} "
@@ -26,6 +26,7 @@ from app.core.logging import get_logger
 from app.core.database import get_session
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
+from app.credits.service import CreditService
 from app.promo.models import CreditGrant, GrantType
 
 logger = get_logger()
@@ -241,7 +242,7 @@ class UserAuthService:
             promo_code_id=None,
             grant_type=GrantType.FREE_TIER,
         )
-        session.add(free_tier_grant)
+        await CreditService(session).add_grant(free_tier_grant)
         await session.commit()
 
         activation_token = await self.issue_activation_token(new_user, session)
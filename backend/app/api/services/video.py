@@ -3,11 +3,12 @@ from typing import List, Dict, Any, Optional
 import asyncio
 from app.core.config import settings
 from app.core.services.rag import RAGService
+from app.core.services.script_ast import compile_script
 from app.core.services.elevenlabs import ElevenLabsService
 from app.core.services.text_utils import TextSanitizer
+from app.tracing.tracer import traced_run
 import time
 import os
-import subprocess
 import tempfile
 import aiofiles
 import aiohttp
@@ -232,8 +233,11 @@ class VideoService:
 
             # Mix all audio tracks
             mixed_audio = await self.elevenlabs_service.mix_audio_tracks(
-                audio_tracks=[{"url": audio["audio_url"]} for audio in character_audios]
-                + [{"url": background_audio}],
+                audio_tracks=[
+                    {"url": audio["audio_url"], "type": "character"}
+                    for audio in character_audios
+                ]
+                + [{"url": background_audio, "type": "background_music"}],
                 user_id=user_id,
             )
 
@@ -791,7 +795,7 @@ class VideoService:
         """Merge video and audio using FFmpeg"""
         try:
             # Check if FFmpeg is available
-            result = subprocess.run(
+            result = traced_run(
                 ["ffmpeg", "-version"], capture_output=True, text=True
             )
             if result.returncode != 0:
@@ -814,7 +818,7 @@ class VideoService:
                 output_path,
             ]
 
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = traced_run(cmd, capture_output=True, text=True)
 
             if result.returncode == 0:
                 print(f"Successfully merged video and audio to {output_path}")
@@ -835,7 +839,7 @@ class VideoService:
             print(f"[FRAME EXTRACTION] Extracting last frame from video: {video_url}")
 
             # Check if FFmpeg is available
-            result = subprocess.run(
+            result = traced_run(
                 ["ffmpeg", "-version"], capture_output=True, text=True
             )
             if result.returncode != 0:
@@ -883,7 +887,7 @@ class VideoService:
                 print(
                     f"[FRAME EXTRACTION] Running FFmpeg command: {' '.join(ffmpeg_cmd)}"
                 )
-                result = subprocess.run(
+                result = traced_run(
                     ffmpeg_cmd, capture_output=True, text=True, timeout=60
                 )
 
@@ -927,7 +931,7 @@ class VideoService:
         """Create a mock video using FFmpeg for development"""
         try:
             # Check if FFmpeg is available
-            result = subprocess.run(
+            result = traced_run(
                 ["ffmpeg", "-version"], capture_output=True, text=True
             )
             if result.returncode != 0:
@@ -961,7 +965,7 @@ class VideoService:
                 str(output_path),
             ]
 
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = traced_run(cmd, capture_output=True, text=True)
 
             if result.returncode == 0:
                 print(f"Created mock video: {output_path}")
@@ -1233,7 +1237,6 @@ Return as JSON with: script, character_details, scene_prompt
         """Download and merge audio/video files"""
         try:
             import tempfile
-            import subprocess
             import httpx
 
             # Download video and audio files
@@ -1297,7 +1300,7 @@ Return as JSON with: script, character_details, scene_prompt
                 merged_path,
             ]
 
-            proc = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
+            proc = traced_run(ffmpeg_cmd, capture_output=True, text=True)
 
             if not os.path.exists(merged_path):
                 return {"error": "Merged video not found"}
@@ -2340,16 +2343,13 @@ Return as JSON with: script, character_details, scene_prompt
         scene_descriptions = []
         character_dialogues = []
 
-        # Split script into lines
-        lines = script.split("\n")
+        # Stripped, non-blank lines from the shared compiled script
         current_character = None
 
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
+        for script_line in compile_script(script).lines:
+            line = script_line.text
 
-            print(f"[SCREENPLAY PARSER] Line {i}: '{line}'")
+            print(f"[SCREENPLAY PARSER] Line {script_line.number - 1}: '{line}'")
 
             # Scene headings (INT./EXT. locations)
             if re.match(r"^(INT\.|EXT\.)", line, re.IGNORECASE):
@@ -2442,12 +2442,8 @@ Return as JSON with: script, character_details, scene_prompt
         scene_descriptions = []
         narration_text = []
 
-        lines = script.split("\n")
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+        for script_line in compile_script(script).lines:
+            line = script_line.text
 
             # Camera directions and visual descriptions
             if any(
@@ -3030,7 +3026,6 @@ Return as JSON with: script, character_details, scene_prompt
             print(f"🎬 Combining {len(video_urls)} videos using FFmpeg")
 
             import tempfile
-            import subprocess
             import httpx
 
             # Download all videos to temporary files
@@ -3079,7 +3074,7 @@ Return as JSON with: script, character_details, scene_prompt
 
             print(f"🔄 Running FFmpeg command: {' '.join(ffmpeg_cmd)}")
 
-            result = subprocess.run(
+            result = traced_run(
                 ffmpeg_cmd,
                 capture_output=True,
                 text=True,
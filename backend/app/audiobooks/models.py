@@ -96,6 +96,10 @@ class AudiobookChapter(SQLModel, table=True):
     duration_seconds: Optional[float] = Field(default=0.0)
     credits_used: int = Field(default=0)
     error_message: Optional[str] = Field(default=None)
+    # Rendered TTS chunks: [{index, fingerprint, audio_url, duration_seconds}]
+    chunk_manifest: Optional[List[dict]] = Field(
+        default=None, sa_column=Column(pg.JSONB, nullable=True)
+    )
 
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
@@ -0,0 +1,180 @@
+"""
+Audiobook chapter rendering: concurrent chunk synthesis and gapless stitching.
+
+A chapter is split into TTS-sized chunks, the chunks are synthesized in
+parallel (bounded by the TTS provider's concurrency limit) and the results are
+joined with the ffmpeg concat demuxer and loudness-normalized into a single
+chapter file.
+
+Every rendered chunk is recorded in AudiobookChapter.chunk_manifest with a
+fingerprint of (voice, model, text). A retry only synthesizes chunks whose
+fingerprint is not already in the manifest, so a chapter that failed on one
+chunk re-renders that chunk, and an edited chapter re-renders only the
+chunks whose text changed.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.tracing.tracer import traced_run
+from app.core.services.ffmpeg_utils import _get_audio_duration
+
+logger = logging.getLogger(__name__)
+
+SynthesizeFn = Callable[[str], Awaitable[Dict[str, Any]]]
+
+
+@dataclass
+class RenderedChunk:
+    index: int
+    fingerprint: str
+    audio_url: Optional[str] = None
+    duration_seconds: float = 0.0
+    error: Optional[str] = None
+
+    def to_manifest(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "fingerprint": self.fingerprint,
+            "audio_url": self.audio_url,
+            "duration_seconds": self.duration_seconds,
+        }
+
+
+def chunk_fingerprint(text: str, voice_id: Optional[str], model: Optional[str]) -> str:
+    """Stable identity of one synthesized chunk."""
+    material = f"{model or ''}\x1f{voice_id or ''}\x1f{text.strip()}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def manifest_by_fingerprint(manifest: Optional[Sequence[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Index a stored chunk manifest by fingerprint, keeping only rendered chunks."""
+    return {
+        entry["fingerprint"]: entry
+        for entry in manifest or []
+        if entry.get("fingerprint") and entry.get("audio_url")
+    }
+
+
+async def render_chunks(
+    chunks: Sequence[str],
+    synthesize: SynthesizeFn,
+    *,
+    voice_id: Optional[str],
+    model: Optional[str],
+    concurrency: int,
+    previous_manifest: Optional[Sequence[Dict[str, Any]]] = None,
+) -> List[RenderedChunk]:
+    """
+    Synthesize chunks concurrently, reusing chunks already in previous_manifest.
+
+    Never raises for a single chunk: failed chunks come back with error set so
+    the caller can persist the successful ones before failing the chapter.
+    """
+    reusable = manifest_by_fingerprint(previous_manifest)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _render(index: int, text: str) -> RenderedChunk:
+        fingerprint = chunk_fingerprint(text, voice_id, model)
+        cached = reusable.get(fingerprint)
+        if cached:
+            return RenderedChunk(
+                index=index,
+                fingerprint=fingerprint,
+                audio_url=cached["audio_url"],
+                duration_seconds=float(cached.get("duration_seconds") or 0.0),
+            )
+
+        async with semaphore:
+            try:
+                result = await synthesize(text)
+            except Exception as e:
+                return RenderedChunk(index=index, fingerprint=fingerprint, error=str(e))
+
+        audio_url = result.get("audio_url") or result.get("url")
+        if not audio_url:
+            return RenderedChunk(
+                index=index,
+                fingerprint=fingerprint,
+                error=result.get("error") or "No audio URL returned from TTS",
+            )
+        duration = result.get("duration_seconds") or result.get("duration") or 0.0
+        return RenderedChunk(
+            index=index,
+            fingerprint=fingerprint,
+            audio_url=audio_url,
+            duration_seconds=float(duration),
+        )
+
+    rendered = await asyncio.gather(*(_render(i, text) for i, text in enumerate(chunks)))
+    reused = sum(1 for chunk in rendered if chunk.fingerprint in reusable)
+    if reused:
+        logger.info("[AUDIOBOOK] Reused %d/%d previously rendered chunks", reused, len(chunks))
+    return list(rendered)
+
+
+def stitch_audio_files(input_paths: Sequence[str], output_path: str) -> Optional[float]:
+    """
+    Concatenate audio files and normalize loudness in a single ffmpeg pass.
+
+    Decoding through the concat demuxer and re-encoding once avoids the
+    encoder-delay gaps a stream-copy join leaves between mp3 chunks.
+    Returns the output duration, or None if ffmpeg failed.
+    """
+    list_path = f"{output_path}.txt"
+    with open(list_path, "w") as f:
+        for path in input_paths:
+            escaped = path.replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+    cmd = [
+        "ffmpeg", "-y",
+        "-f", "concat", "-safe", "0", "-i", list_path,
+        "-af", f"loudnorm=I={settings.AUDIOBOOK_LOUDNESS_LUFS}:TP=-1.5:LRA=11",
+        "-ar", "44100",
+        "-c:a", "libmp3lame", "-b:a", "128k",
+        output_path,
+    ]
+    result = traced_run(cmd, capture_output=True, text=True, timeout=1800)
+    if result.returncode != 0 or not os.path.exists(output_path):
+        logger.error(f"[AUDIOBOOK] ffmpeg stitch failed: {result.stderr[-500:]}")
+        return None
+    return _get_audio_duration(output_path)
+
+
+async def stitch_chapter_audio(
+    chunk_urls: Sequence[str],
+    storage,
+    dest_path: str,
+) -> Tuple[str, float]:
+    """Download chunk audio, stitch it into one chapter file and upload it."""
+    tmp_dir = tempfile.mkdtemp(prefix="audiobook_chapter_")
+    try:
+        async def _fetch(index: int, url: str) -> str:
+            data = await storage.download(url)
+            if data is None:
+                raise Exception(f"Chunk audio missing from storage: {url}")
+            path = os.path.join(tmp_dir, f"chunk_{index:04d}.mp3")
+            with open(path, "wb") as f:
+                f.write(data)
+            return path
+
+        paths = await asyncio.gather(*(_fetch(i, url) for i, url in enumerate(chunk_urls)))
+
+        output_path = os.path.join(tmp_dir, "chapter.mp3")
+        duration = await asyncio.to_thread(stitch_audio_files, paths, output_path)
+        if duration is None:
+            raise Exception("Failed to stitch chapter audio")
+
+        with open(output_path, "rb") as f:
+            url = await storage.upload_stream(f, dest_path, content_type="audio/mpeg")
+        return url, duration
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -18,6 +18,7 @@ from app.audiobooks.service import AudiobookService
 from app.credits.service import CreditService, credits_for_audio_duration
 from app.core.services.tts import tts_router
 from app.subscriptions.models import UserSubscription
+from app.tasks.celery_app import priority_for_tier
 from sqlmodel import select
 
 router = APIRouter()
@@ -86,7 +87,10 @@ async def generate_audiobook(
         # confirm_deduction (not deduct_for_operation) — KAN-176 fix.
         from app.audiobooks.tasks import generate_audiobook_task
 
-        generate_audiobook_task.delay(str(audiobook.id), str(reservation))
+        generate_audiobook_task.apply_async(
+            args=[str(audiobook.id), str(reservation)],
+            priority=priority_for_tier(user_tier),
+        )
 
         return audiobook
 
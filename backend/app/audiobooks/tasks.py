@@ -1,15 +1,25 @@
-import asyncio
 import uuid
 from typing import Optional
 from datetime import datetime, timezone
 from contextlib import asynccontextmanager
 
 from app.tasks.celery_app import celery_app
+from app.core.async_runtime import run_async
 from app.audiobooks.models import Audiobook, AudiobookChapter
 from app.books.models import Chapter
 from app.subscriptions.models import UserSubscription
 from app.credits.service import CreditService, credits_for_audio_duration
 from app.core.services.tts import tts_router
+from app.core.services.tts.segmentation import split_for_tts
+from app.core.services.tts.synthesis_cache import (
+    build_tts_cache_key,
+    lookup_synthesis,
+    store_synthesis,
+    synthesized_model,
+)
+from app.core.services.storage import get_storage_service, S3StorageService
+from app.core.config import settings
+from app.audiobooks.renderer import render_chunks, stitch_chapter_audio
 from app.core.database import get_session
 from sqlmodel import select
 from celery.utils.log import get_task_logger
@@ -75,10 +85,70 @@ def generate_audiobook_task(
             ch_result = await session.exec(ch_stmt)
             ab_chapters = list(ch_result.all())
 
+            # Retry-safe progress: chapters finished by an earlier attempt are
+            # kept and the counters are rebuilt from them instead of added to.
+            finished = [
+                c for c in ab_chapters if c.status == "completed" and c.audio_url
+            ]
+            audiobook.completed_chapters = len(finished)
+            audiobook.total_duration_seconds = sum(
+                c.duration_seconds or 0.0 for c in finished
+            )
+            audiobook.credits_used = sum(c.credits_used or 0 for c in finished)
+            session.add(audiobook)
+            await session.commit()
+
             credit_service = CreditService(session)
             max_chars = tts_router.max_chars_per_request(user_tier)
+            tts_model = tts_router.resolve_model(user_tier)
+            concurrency = min(
+                settings.AUDIOBOOK_TTS_CONCURRENCY,
+                tts_router.max_concurrent_requests(user_tier),
+            )
+            storage = get_storage_service()
+            # Seconds of the current chapter served from the synthesis cache,
+            # which cost no generation and are not charged
+            cached_seconds = {"chapter": 0.0}
+
+            async def _synthesize(chunk_text: str) -> dict:
+                # Phrases already voiced for this user (other audiobooks of the
+                # same book, re-runs) come from the synthesis cache.
+                cache_key = build_tts_cache_key(
+                    model=tts_model, voice_id=voice_id, text=chunk_text, scope=str(user_id)
+                )
+                cached = await lookup_synthesis(cache_key)
+                if cached is not None:
+                    cached_seconds["chapter"] += cached.duration_seconds or 0.0
+                    return {
+                        "audio_url": cached.media_url,
+                        "duration_seconds": cached.duration_seconds,
+                    }
+
+                result = await tts_router.synthesize(
+                    text=chunk_text,
+                    user_tier=user_tier,
+                    voice_id=voice_id,
+                )
+                # A fallback model's audio is cached under its own key
+                produced_model = synthesized_model(result)
+                if result.get("audio_url") and produced_model:
+                    await store_synthesis(
+                        build_tts_cache_key(
+                            model=produced_model,
+                            voice_id=voice_id,
+                            text=chunk_text,
+                            scope=str(user_id),
+                        ),
+                        audio_url=result["audio_url"],
+                        model=produced_model,
+                        user_id=str(user_id),
+                        duration_seconds=result.get("duration_seconds"),
+                    )
+                return result
 
             for ab_chapter in ab_chapters:
+                if ab_chapter.status == "completed" and ab_chapter.audio_url:
+                    continue
                 try:
                     logger.info(
                         f"[AUDIOBOOK] Processing chapter {ab_chapter.chapter_number}/{audiobook.total_chapters}"
@@ -97,47 +167,58 @@ def generate_audiobook_task(
                         )
                         raise Exception("No content available")
 
-                    content = source_chapter.content
-                    audio_urls = []
-                    total_duration = 0.0
-                    chapter_credits = 0
-
-                    # Split content into chunks if needed
-                    chunks = _split_text(content, max_chars)
+                    # Split content into chunks and synthesize them in parallel;
+                    # chunks rendered by a previous attempt are reused.
+                    chunks = split_for_tts(source_chapter.content, max_chars)
+                    cached_seconds["chapter"] = 0.0
+                    logger.info(
+                        f"[AUDIOBOOK] Synthesizing {len(chunks)} chunks for chapter "
+                        f"{ab_chapter.chapter_number} (concurrency {concurrency})"
+                    )
+                    rendered = await render_chunks(
+                        chunks,
+                        _synthesize,
+                        voice_id=voice_id,
+                        model=tts_model,
+                        concurrency=concurrency,
+                        previous_manifest=ab_chapter.chunk_manifest,
+                    )
 
-                    for i, chunk in enumerate(chunks):
-                        logger.info(
-                            f"[AUDIOBOOK] Synthesizing chunk {i+1}/{len(chunks)} for chapter {ab_chapter.chapter_number}"
-                        )
+                    # Persist what rendered so a retry only redoes the rest
+                    ab_chapter.chunk_manifest = [
+                        chunk.to_manifest() for chunk in rendered if chunk.audio_url
+                    ]
+                    session.add(ab_chapter)
+                    await session.commit()
 
-                        # Synthesize via TTS router
-                        result = await tts_router.synthesize(
-                            text=chunk,
-                            user_tier=user_tier,
-                            voice_id=voice_id,
+                    failed_chunks = [chunk for chunk in rendered if chunk.error]
+                    if failed_chunks:
+                        raise Exception(
+                            f"{len(failed_chunks)}/{len(chunks)} chunks failed: "
+                            f"{failed_chunks[0].error}"
                         )
 
-                        audio_url = result.get("audio_url") or result.get("url")
-                        duration = result.get("duration", 0.0)
-
-                        if audio_url:
-                            audio_urls.append(audio_url)
-                            total_duration += duration
+                    # Stitch the chunks into one gapless, loudness-normalized file
+                    dest_path = S3StorageService.build_media_path(
+                        user_id=str(user_id),
+                        media_type="audiobooks",
+                        record_id=str(ab_chapter.id),
+                        extension="mp3",
+                        scope_id=str(audiobook.id),
+                    )
+                    primary_url, total_duration = await stitch_chapter_audio(
+                        [chunk.audio_url for chunk in rendered], storage, dest_path
+                    )
 
                     # Calculate credits. Do not deduct per chapter here.
                     # KAN-176: settle the route-created reservation once at
                     # finalization with the actual total credits used.
-                    chapter_credits = credits_for_audio_duration(total_duration)
-
-                    # Update chapter with primary audio URL (first chunk or concatenated)
-                    primary_url = audio_urls[0] if audio_urls else None
-                    if len(audio_urls) > 1:
-                        # Store all URLs as JSON string for future concatenation
-                        import json
-
-                        primary_url = audio_urls[
-                            0
-                        ]  # Frontend can request merge separately
+                    billable_seconds = total_duration - cached_seconds["chapter"]
+                    chapter_credits = (
+                        credits_for_audio_duration(billable_seconds)
+                        if billable_seconds > 0
+                        else 0
+                    )
 
                     if primary_url:
                         # Re-fetch to avoid stale session issues
@@ -151,6 +232,7 @@ def generate_audiobook_task(
                         fresh_chapter.audio_url = primary_url
                         fresh_chapter.duration_seconds = total_duration
                         fresh_chapter.credits_used = chapter_credits
+                        fresh_chapter.error_message = None
                         session.add(fresh_chapter)
 
                         # Update audiobook progress
@@ -256,46 +338,4 @@ def generate_audiobook_task(
 
             return {"status": "success", "audiobook_id": audiobook_id}
 
-    return asyncio.run(_generate())
-
-
-def _split_text(text: str, max_chars: int) -> list:
-    """Split text into chunks that fit within TTS character limits.
-    Tries to split on sentence boundaries."""
-    if not text:
-        return []
-
-    if len(text) <= max_chars:
-        return [text]
-
-    chunks = []
-    # Split on sentence boundaries
-    sentences = []
-    current = ""
-    for char in text:
-        current += char
-        if char in ".!?\n" and len(current) > 0:
-            sentences.append(current.strip())
-            current = ""
-
-    if current.strip():
-        sentences.append(current.strip())
-
-    # Group sentences into chunks
-    chunk = ""
-    for sentence in sentences:
-        if len(chunk) + len(sentence) > max_chars and chunk:
-            chunks.append(chunk.strip())
-            chunk = sentence
-        else:
-            chunk += " " + sentence if chunk else sentence
-
-    if chunk.strip():
-        # If single chunk is still too long, hard split
-        while len(chunk) > max_chars:
-            chunks.append(chunk[:max_chars].strip())
-            chunk = chunk[max_chars:]
-        if chunk.strip():
-            chunks.append(chunk.strip())
-
-    return chunks
+    return run_async(_generate())
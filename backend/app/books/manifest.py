@@ -0,0 +1,127 @@
+"""
+ChapterManifestService — chapter listings without chapter content.
+
+Book reads used to ship every chapter's full ``content``, so payload size and
+DB time grew with the length of the book. A manifest carries only
+id, number, title, summary and ``word_count`` (a stored generated column,
+migration chapterwordcount01), projected in one query for any number of
+books, so Postgres never detoasts the content.
+
+Content is read separately, one character range at a time. Each range has an
+ETag derived from the chapter's ``updated_at`` and stored size, so the ETag
+check runs before the content itself is read.
+"""
+
+import hashlib
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+DEFAULT_CONTENT_PAGE_CHARS = 20_000
+MAX_CONTENT_PAGE_CHARS = 200_000
+
+_MANIFEST_SQL = text(
+    """
+    SELECT c.id, c.book_id, c.chapter_number, c.title, c.summary,
+           c.content_type, c.order_index, c.word_count
+    FROM chapters c
+    WHERE c.book_id = ANY(:book_ids)
+    ORDER BY c.book_id, c.chapter_number
+    """
+)
+
+# Only reads the TOAST header (octet_length), never the content itself
+_CONTENT_VERSION_SQL = text(
+    """
+    SELECT c.updated_at, octet_length(c.content) AS content_bytes,
+           b.status AS book_status, b.user_id AS book_user_id
+    FROM chapters c
+    JOIN books b ON b.id = c.book_id
+    WHERE c.id = :chapter_id AND c.book_id = :book_id
+    """
+)
+
+_CONTENT_PAGE_SQL = text(
+    """
+    SELECT substr(c.content, :offset + 1, :limit) AS content,
+           char_length(c.content) AS total_chars
+    FROM chapters c
+    WHERE c.id = :chapter_id
+    """
+)
+
+
+def chapter_content_etag(
+    chapter_id: str,
+    updated_at: Optional[datetime],
+    content_bytes: Optional[int],
+    offset: int,
+    limit: int,
+) -> str:
+    """ETag of one content range; changes whenever the chapter is rewritten."""
+    version = updated_at.isoformat() if updated_at else ""
+    material = f"{chapter_id}:{version}:{content_bytes or 0}:{offset}:{limit}"
+    return f'"{hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header value covers etag (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class ChapterManifestService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def manifests_for_books(
+        self, book_ids: Sequence[uuid.UUID]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Chapter manifests for every book in one query, keyed by book id."""
+        manifests: Dict[str, List[Dict[str, Any]]] = {str(book_id): [] for book_id in book_ids}
+        if not book_ids:
+            return manifests
+
+        result = await self.session.execute(
+            _MANIFEST_SQL, {"book_ids": [uuid.UUID(str(book_id)) for book_id in book_ids]}
+        )
+        for row in result.mappings().all():
+            item = dict(row)
+            item["id"] = str(item["id"])
+            item["book_id"] = str(item["book_id"])
+            item["word_count"] = item["word_count"] or 0
+            manifests[item["book_id"]].append(item)
+        return manifests
+
+    async def get_content_version(
+        self, book_id: uuid.UUID, chapter_id: uuid.UUID
+    ) -> Optional[Dict[str, Any]]:
+        """updated_at, stored size and owning book's status/user, or None."""
+        result = await self.session.execute(
+            _CONTENT_VERSION_SQL, {"book_id": book_id, "chapter_id": chapter_id}
+        )
+        row = result.mappings().first()
+        return dict(row) if row else None
+
+    async def get_content_page(
+        self, chapter_id: uuid.UUID, offset: int, limit: int
+    ) -> Dict[str, Any]:
+        result = await self.session.execute(
+            _CONTENT_PAGE_SQL, {"chapter_id": chapter_id, "offset": offset, "limit": limit}
+        )
+        row = result.mappings().first()
+        content = row["content"] if row else ""
+        total_chars = row["total_chars"] if row else 0
+        return {
+            "chapter_id": str(chapter_id),
+            "offset": offset,
+            "limit": limit,
+            "content": content or "",
+            "total_chars": total_chars or 0,
+            "has_more": offset + len(content or "") < (total_chars or 0),
+        }
@@ -228,6 +228,32 @@ class BookWithChapters(Book):
     chapters: List[Chapter] = []
 
 
+class ChapterManifest(BaseModel):
+    """Chapter listing entry without content; see app/books/manifest.py."""
+
+    id: str
+    book_id: str
+    chapter_number: Optional[int] = None
+    title: str
+    word_count: int = 0
+    summary: Optional[str] = None
+    content_type: Optional[str] = "chapter"
+    order_index: Optional[int] = None
+
+
+class BookWithChapterManifest(Book):
+    chapters: List[ChapterManifest] = []
+
+
+class ChapterContentPage(BaseModel):
+    chapter_id: str
+    offset: int
+    limit: int
+    content: str
+    total_chars: int
+    has_more: bool
+
+
 class BookWithDraftChapters(Book):
     id: str
     user_id: Optional[str] = None
@@ -0,0 +1,109 @@
+"""
+BookSearchService — ranked full-text search over a user's books and chapters.
+
+Both tables carry a stored, weighted ``search_vector`` column (generated by
+Postgres, migration booksearch01) with a GIN index:
+
+    books.search_vector    = title (A) || author_name (B) || description (C)
+    chapters.search_vector = title (A) || content (D)
+
+The columns are deliberately not mapped on the SQLModel classes so ordinary
+Book/Chapter loads never ship the vectors. Matching and ranking
+(``ts_rank_cd``) run against the index; ``ts_headline`` — which re-parses the
+document — only runs for the rows of the requested page.
+"""
+
+import uuid
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+SEARCH_CONFIG = "english"
+
+# ts_rank_cd normalization 32: rank / (rank + 1), keeps scores in [0, 1)
+RANK_NORMALIZATION = 32
+
+HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, "
+    "ShortWord=3, MaxFragments=2, FragmentDelimiter=\" … \""
+)
+
+_BOOK_SEARCH_SQL = text(
+    f"""
+    WITH q AS (SELECT websearch_to_tsquery('{SEARCH_CONFIG}', :query) AS tsq),
+    hits AS (
+        SELECT b.id, b.title, b.author_name, b.description, b.cover_image_url,
+               ts_rank_cd(b.search_vector, q.tsq, {RANK_NORMALIZATION}) AS rank
+        FROM books b, q
+        WHERE b.user_id = :user_id AND b.search_vector @@ q.tsq
+        ORDER BY rank DESC, b.id
+        LIMIT :limit OFFSET :offset
+    )
+    SELECT hits.id, hits.title, hits.author_name, hits.cover_image_url, hits.rank,
+           ts_headline('{SEARCH_CONFIG}', coalesce(hits.description, ''), q.tsq,
+                       :headline_options) AS snippet
+    FROM hits, q
+    ORDER BY hits.rank DESC, hits.id
+    """
+)
+
+_CHAPTER_SEARCH_SQL = text(
+    f"""
+    WITH q AS (SELECT websearch_to_tsquery('{SEARCH_CONFIG}', :query) AS tsq),
+    hits AS (
+        SELECT c.id, c.book_id, c.chapter_number, c.title,
+               ts_rank_cd(c.search_vector, q.tsq, {RANK_NORMALIZATION}) AS rank
+        FROM chapters c
+        JOIN books b ON b.id = c.book_id, q
+        WHERE b.user_id = :user_id AND c.search_vector @@ q.tsq
+        ORDER BY rank DESC, c.id
+        LIMIT :limit OFFSET :offset
+    )
+    SELECT hits.id, hits.book_id, b.title AS book_title, hits.chapter_number,
+           hits.title, hits.rank,
+           ts_headline('{SEARCH_CONFIG}', c.content, q.tsq, :headline_options) AS snippet
+    FROM hits
+    JOIN chapters c ON c.id = hits.id
+    JOIN books b ON b.id = hits.book_id, q
+    ORDER BY hits.rank DESC, hits.id
+    """
+)
+
+
+class BookSearchService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def search_books(
+        self, user_id: uuid.UUID, query: str, limit: int = 20, offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        return await self._run(_BOOK_SEARCH_SQL, user_id, query, limit, offset)
+
+    async def search_chapters(
+        self, user_id: uuid.UUID, query: str, limit: int = 20, offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        return await self._run(_CHAPTER_SEARCH_SQL, user_id, query, limit, offset)
+
+    async def _run(
+        self, statement, user_id: uuid.UUID, query: str, limit: int, offset: int
+    ) -> List[Dict[str, Any]]:
+        result = await self.session.execute(
+            statement,
+            {
+                "query": query,
+                "user_id": user_id,
+                "limit": limit,
+                "offset": offset,
+                "headline_options": HEADLINE_OPTIONS,
+            },
+        )
+        rows = []
+        for row in result.mappings().all():
+            item = dict(row)
+            item["id"] = str(item["id"])
+            if "book_id" in item:
+                item["book_id"] = str(item["book_id"])
+            item["rank"] = float(item["rank"])
+            rows.append(item)
+        return rows
@@ -0,0 +1 @@
+# Per-chapter change tracking (content fingerprints, dirty derived artifacts)
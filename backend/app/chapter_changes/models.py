@@ -0,0 +1,57 @@
+import uuid
+from datetime import datetime, timezone
+from sqlmodel import Field, SQLModel, Column
+from sqlalchemy.dialects import postgresql as pg
+from sqlalchemy import Boolean, ForeignKey, String, UniqueConstraint, text
+
+
+class ChapterArtifactState(SQLModel, table=True):
+    """
+    What a derived artifact of a chapter was last built from.
+
+    One row per (chapter, artifact): "embeddings", "plot", "script" or
+    "scene_media". source_hash is the fingerprint of the inputs the artifact
+    was built from (see app.chapter_changes.service.artifact_fingerprint);
+    dirty is set when an edit or an upstream rebuild invalidates it. A
+    missing row means the artifact was never built since tracking started.
+    """
+
+    __tablename__ = "chapter_artifact_states"
+    __table_args__ = (
+        UniqueConstraint("chapter_id", "artifact", name="uq_chapter_artifact_states_chapter_artifact"),
+    )
+
+    id: uuid.UUID = Field(
+        sa_column=Column(
+            pg.UUID(as_uuid=True),
+            primary_key=True,
+            server_default=text("gen_random_uuid()"),
+        ),
+        default_factory=uuid.uuid4,
+    )
+    chapter_id: uuid.UUID = Field(
+        sa_column=Column(
+            pg.UUID(as_uuid=True),
+            ForeignKey("chapters.id", ondelete="CASCADE"),
+            nullable=False,
+            index=True,
+        )
+    )
+    book_id: uuid.UUID = Field(
+        sa_column=Column(pg.UUID(as_uuid=True), nullable=False, index=True)
+    )
+    artifact: str = Field(sa_column=Column(String, nullable=False))
+    # sha256 hex of the inputs the artifact was built from
+    source_hash: str = Field(sa_column=Column(String(64), nullable=False))
+    dirty: bool = Field(
+        default=False,
+        sa_column=Column(Boolean, nullable=False, server_default=text("false")),
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(
+            pg.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=text("CURRENT_TIMESTAMP"),
+        ),
+    )
@@ -0,0 +1,303 @@
+"""
+Per-chapter change tracking, so editing one chapter recomputes only what
+that edit invalidated instead of the whole book.
+
+Every derived artifact of a chapter is built from a known subset of the
+chapter's fields (the dependency edges):
+
+    embeddings   <- content
+    plot         <- title, chapter_number, summary (or the content excerpt
+                    PlotService feeds the model when there is no summary)
+    script       <- title, content
+    scene_media  <- script
+
+    tracker = ChapterChangeTracker(session)
+    for chapter in await tracker.stale(chapters, "embeddings"):
+        ...  # re-embed this chapter only
+    await tracker.mark_built(rebuilt_chapters, "embeddings")
+    await session.commit()
+
+When an artifact is built, the sha256 of its inputs is stored per (chapter,
+artifact) in chapter_artifact_states. It is stale when the chapter's inputs
+no longer hash to that value or the row was flagged dirty. Rebuilding an
+artifact flags its DEPENDENTS dirty, so a new script marks that chapter's
+scene media without touching other chapters. A missing row means the
+artifact was never built (or was built before tracking existed).
+
+Tracking never breaks the pipeline: writes run in a savepoint and are
+skipped on error, and reads report "stale" when the state is unavailable,
+which falls back to the old rebuild-everything behaviour.
+"""
+
+import hashlib
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.books.models import Chapter
+from app.chapter_changes.models import ChapterArtifactState
+
+logger = logging.getLogger(__name__)
+
+ARTIFACTS = ("embeddings", "plot", "script", "scene_media")
+
+# Content PlotService._get_book_context_for_plot uses when a chapter has no summary
+PLOT_EXCERPT_CHARS = 500
+
+# Artifacts rebuilt from another artifact; rebuilding the key marks these dirty
+DEPENDENTS: Dict[str, Tuple[str, ...]] = {
+    "script": ("scene_media",),
+}
+
+CURRENT, STALE, MISSING = "current", "stale", "missing"
+
+
+def content_hash(*parts: Any) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(("" if part is None else str(part)).encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def _field(chapter: Any, name: str) -> Any:
+    if isinstance(chapter, dict):
+        return chapter.get(name)
+    return getattr(chapter, name, None)
+
+
+def artifact_fingerprint(chapter: Any, artifact: str) -> str:
+    """Hash of exactly the chapter fields `artifact` is built from."""
+    title = _field(chapter, "title")
+    content = _field(chapter, "content") or ""
+    if artifact == "embeddings":
+        return content_hash(content)
+    if artifact == "plot":
+        excerpt = _field(chapter, "summary") or content[:PLOT_EXCERPT_CHARS]
+        return content_hash(_field(chapter, "chapter_number"), title, excerpt)
+    if artifact in ("script", "scene_media"):
+        return content_hash(title, content)
+    raise ValueError(f"Unknown chapter artifact: {artifact}")
+
+
+def with_dependents(artifacts: Iterable[str]) -> Set[str]:
+    closure: Set[str] = set()
+    pending = list(artifacts)
+    while pending:
+        artifact = pending.pop()
+        if artifact not in closure:
+            closure.add(artifact)
+            pending.extend(DEPENDENTS.get(artifact, ()))
+    return closure
+
+
+def invalidated_artifacts(before: Any, after: Any) -> Set[str]:
+    """Artifacts (and their dependents) whose inputs differ between two versions of a chapter."""
+    changed = {
+        artifact
+        for artifact in ARTIFACTS
+        if artifact_fingerprint(before, artifact) != artifact_fingerprint(after, artifact)
+    }
+    return with_dependents(changed)
+
+
+def match_chapters(
+    existing: Sequence[Any], incoming: Sequence[Dict[str, Any]]
+) -> Tuple[List[Optional[Any]], List[Any]]:
+    """
+    Pair each incoming chapter dict with the existing chapter row it replaces.
+
+    Matching keeps chapter ids (and everything keyed by them) stable across a
+    structure save: first by explicit "id", then by identical content, then
+    by title, then by position. Returns the pairing aligned with `incoming`
+    (None for new chapters) and the existing rows nobody claimed.
+    """
+    pairs: List[Optional[Any]] = [None] * len(incoming)
+    unclaimed = list(existing)
+
+    def claim(index: int, row: Any) -> None:
+        pairs[index] = row
+        unclaimed.remove(row)
+
+    by_id = {str(row.id): row for row in existing}
+    for index, data in enumerate(incoming):
+        row = by_id.get(str(data.get("id") or ""))
+        if row is not None and row in unclaimed:
+            claim(index, row)
+
+    rules = (
+        lambda row, data: content_hash(row.content or "") == content_hash(data.get("content") or ""),
+        lambda row, data: (row.title or "").strip() == (data.get("title") or "").strip(),
+    )
+    for same in rules:
+        for index, data in enumerate(incoming):
+            if pairs[index] is None:
+                row = next((r for r in unclaimed if same(r, data)), None)
+                if row is not None:
+                    claim(index, row)
+
+    for index in range(len(incoming)):
+        if pairs[index] is None and index < len(existing) and existing[index] in unclaimed:
+            claim(index, existing[index])
+    return pairs, unclaimed
+
+
+class ChapterChangeTracker:
+    """Reads and records what each chapter's artifacts were built from."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _states(
+        self, chapter_ids: Sequence[uuid.UUID], artifacts: Optional[Sequence[str]] = None
+    ) -> Dict[Tuple[uuid.UUID, str], ChapterArtifactState]:
+        if not chapter_ids:
+            return {}
+        stmt = select(ChapterArtifactState).where(
+            ChapterArtifactState.chapter_id.in_(list(chapter_ids))
+        )
+        if artifacts:
+            stmt = stmt.where(ChapterArtifactState.artifact.in_(list(artifacts)))
+        result = await self.session.exec(stmt)
+        return {(row.chapter_id, row.artifact): row for row in result.all()}
+
+    @staticmethod
+    def _status(state: Optional[ChapterArtifactState], chapter: Any, artifact: str) -> str:
+        if state is None:
+            return MISSING
+        if state.dirty or state.source_hash != artifact_fingerprint(chapter, artifact):
+            return STALE
+        return CURRENT
+
+    async def _load(self, chapters: Sequence[Any], artifact: str) -> Optional[Dict]:
+        try:
+            async with self.session.begin_nested():
+                return await self._states([c.id for c in chapters], [artifact])
+        except Exception as e:
+            logger.warning("[ChapterChanges] state lookup failed, treating as stale: %s", e)
+            return None
+
+    async def stale(self, chapters: Sequence[Any], artifact: str) -> List[Any]:
+        """The chapters whose `artifact` is missing or out of date."""
+        states = await self._load(chapters, artifact)
+        if states is None:
+            return list(chapters)
+        return [
+            chapter
+            for chapter in chapters
+            if self._status(states.get((chapter.id, artifact)), chapter, artifact) != CURRENT
+        ]
+
+    async def needs_rebuild(
+        self, chapter: Any, artifact: str, source: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Whether `artifact` must be rebuilt; `source` overrides the chapter
+        fields it is about to be built from (e.g. the text being embedded).
+        """
+        states = await self._load([chapter], artifact)
+        if states is None:
+            return True
+        current = source if source is not None else chapter
+        return self._status(states.get((chapter.id, artifact)), current, artifact) != CURRENT
+
+    async def mark_built(
+        self, chapters: Sequence[Any], artifact: str, source: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Record `artifact` as rebuilt from the chapters' current fields (or
+        from `source`, a dict of the fields actually used, for a single
+        chapter) and flag its dependents dirty. Does not commit.
+        """
+        if not chapters:
+            return
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "chapter_id": chapter.id,
+                "book_id": chapter.book_id,
+                "artifact": artifact,
+                "source_hash": artifact_fingerprint(source if source is not None else chapter, artifact),
+                "dirty": False,
+                "updated_at": now,
+            }
+            for chapter in chapters
+        ]
+        stmt = pg_insert(ChapterArtifactState).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ChapterArtifactState.chapter_id, ChapterArtifactState.artifact],
+            set_={key: stmt.excluded[key] for key in ("source_hash", "dirty", "updated_at")},
+        )
+        try:
+            async with self.session.begin_nested():
+                await self.session.execute(stmt)
+                await self._flag_dirty(
+                    [chapter.id for chapter in chapters],
+                    with_dependents([artifact]) - {artifact},
+                )
+        except Exception as e:
+            logger.warning("[ChapterChanges] could not record %s build: %s", artifact, e)
+
+    async def mark_dirty(self, chapter_ids: Sequence[uuid.UUID], artifacts: Iterable[str]) -> None:
+        """Flag already-built artifacts as invalidated. Does not commit."""
+        try:
+            async with self.session.begin_nested():
+                await self._flag_dirty(chapter_ids, with_dependents(artifacts))
+        except Exception as e:
+            logger.warning("[ChapterChanges] could not mark chapters dirty: %s", e)
+
+    async def _flag_dirty(self, chapter_ids: Sequence[uuid.UUID], artifacts: Set[str]) -> None:
+        if not chapter_ids or not artifacts:
+            return
+        await self.session.execute(
+            update(ChapterArtifactState)
+            .where(
+                ChapterArtifactState.chapter_id.in_(list(chapter_ids)),
+                ChapterArtifactState.artifact.in_(sorted(artifacts)),
+            )
+            .values(dirty=True, updated_at=datetime.now(timezone.utc))
+        )
+
+    async def book_changes(self, book_id: uuid.UUID) -> Dict[str, Any]:
+        """
+        Which artifacts of which chapters an incremental regeneration has to
+        redo. Chapters whose artifacts are all current are left out.
+        """
+        result = await self.session.exec(
+            select(Chapter).where(Chapter.book_id == book_id).order_by(Chapter.order_index)
+        )
+        chapters = result.all()
+        states = await self._states([c.id for c in chapters])
+
+        changed: List[Dict[str, Any]] = []
+        counts = {artifact: 0 for artifact in ARTIFACTS}
+        for chapter in chapters:
+            statuses = {
+                artifact: self._status(states.get((chapter.id, artifact)), chapter, artifact)
+                for artifact in ARTIFACTS
+            }
+            # Media rendered from a script that is itself out of date is too
+            if statuses["script"] == STALE and statuses["scene_media"] == CURRENT:
+                statuses["scene_media"] = STALE
+            pending = {a: s for a, s in statuses.items() if s != CURRENT}
+            for artifact, status in pending.items():
+                if status == STALE:
+                    counts[artifact] += 1
+            if pending:
+                changed.append(
+                    {"chapter_id": str(chapter.id), "title": chapter.title, "artifacts": pending}
+                )
+        return {
+            "book_id": str(book_id),
+            "total_chapters": len(chapters),
+            # The overview covers the whole book: any chapter's plot inputs changing dates it
+            "plot_stale": counts["plot"] > 0,
+            "stale_counts": counts,
+            "chapters": changed,
+        }
@@ -0,0 +1,239 @@
+"""
+Long-lived asyncio runtime for Celery worker processes.
+
+Celery task bodies are synchronous, so every task used to wrap its coroutine
+in ``asyncio.run``. That creates and tears down an event loop per task, which
+also throws away pooled DB connections (asyncpg connections are bound to the
+loop that opened them) and any HTTP keep-alive connections.
+
+``WorkerAsyncRuntime`` keeps one event loop per process running on a daemon
+thread. Tasks submit coroutines with ``run_async`` and block until they
+finish, so the shared ``async_session`` engine and the pooled HTTP client are
+reused across tasks. The loop is started from Celery's worker signals (see
+``app.tasks.celery_app``) and lazily on first use anywhere else.
+
+Under the thread pool (the io worker profile) every pool thread submits to the
+same loop, so one blocking call inside a coroutine stalls every task of the
+worker, along with the time limits and provider-limiter lease renewals below.
+The loop stays per process because the ``async_session`` engine pool is shared
+and asyncpg connections cannot move between loops; blocking work (boto3,
+``requests``, ffmpeg/ffprobe subprocesses) is run through
+``asyncio.to_thread`` instead.
+
+Celery's thread pool does not enforce time_limit or
+soft_time_limit, so ``run_async`` enforces the calling task's soft limit (or
+its hard limit if it has no soft one) itself: the coroutine is cancelled on
+the loop and SoftTimeLimitExceeded is raised in the task, as under prefork.
+"""
+
+import asyncio
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Coroutine, Optional, TypeVar
+
+import httpx
+from celery import current_task
+from celery.exceptions import SoftTimeLimitExceeded
+
+from app.core.logging import get_logger
+
+logger = get_logger()
+
+T = TypeVar("T")
+
+# Shared HTTP client pool limits (per worker process)
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+HTTP_KEEPALIVE_EXPIRY = 30.0
+HTTP_DEFAULT_TIMEOUT = 60.0
+
+SHUTDOWN_TIMEOUT_SECONDS = 10.0
+
+
+class WorkerAsyncRuntime:
+    """One event loop per process, running on a background thread."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        return self._loop if self.is_running else None
+
+    @property
+    def is_running(self) -> bool:
+        return (
+            self._loop is not None
+            and self._pid == os.getpid()
+            and self._thread is not None
+            and self._thread.is_alive()
+        )
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Start the loop thread if this process does not have one yet."""
+        with self._lock:
+            if self.is_running:
+                return self._loop
+
+            # A loop inherited through fork() has no thread behind it; drop it.
+            self._http_client = None
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            thread = threading.Thread(
+                target=self._run_loop,
+                args=(loop, ready),
+                name="worker-async-runtime",
+                daemon=True,
+            )
+            thread.start()
+            ready.wait()
+
+            self._loop = loop
+            self._thread = thread
+            self._pid = os.getpid()
+            logger.info(f"[AsyncRuntime] Event loop started (pid={self._pid})")
+            return loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def run(
+        self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None
+    ) -> T:
+        """Run a coroutine on the runtime loop and block until it completes."""
+        loop = self.start()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            coro.close()
+            raise RuntimeError(
+                "run_async() cannot be called from the runtime loop itself; await the coroutine instead"
+            )
+
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # Soft time limits / worker shutdown interrupt the waiting thread;
+            # make sure the coroutine does not keep running in the background.
+            future.cancel()
+            raise
+
+    def get_http_client(self) -> Optional[httpx.AsyncClient]:
+        """Return the pooled client when called from the runtime loop."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        if not self.is_running or running is not self._loop:
+            return None
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                timeout=HTTP_DEFAULT_TIMEOUT,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                ),
+            )
+        return self._http_client
+
+    async def _aclose(self) -> None:
+        from app.core.database import engine
+
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+        self._http_client = None
+        await engine.dispose()
+
+    def shutdown(self) -> None:
+        """Close pooled resources and stop the loop thread."""
+        with self._lock:
+            if not self.is_running:
+                return
+            loop, thread = self._loop, self._thread
+            try:
+                asyncio.run_coroutine_threadsafe(self._aclose(), loop).result(
+                    SHUTDOWN_TIMEOUT_SECONDS
+                )
+            except Exception as e:
+                logger.warning(f"[AsyncRuntime] Error closing pooled resources: {e}")
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(SHUTDOWN_TIMEOUT_SECONDS)
+            self._loop = None
+            self._thread = None
+            self._pid = None
+            logger.info("[AsyncRuntime] Event loop stopped")
+
+
+runtime = WorkerAsyncRuntime()
+
+
+def task_time_limit() -> Optional[float]:
+    """Soft (else hard) time limit of the Celery task running on this thread."""
+    task = current_task._get_current_object()
+    if task is None or not task.request.id or task.request.is_eager:
+        return None
+    hard, soft = task.request.timelimit or (None, None)
+    conf = task.app.conf
+    limit = (
+        soft
+        or task.soft_time_limit
+        or conf.task_soft_time_limit
+        or hard
+        or task.time_limit
+        or conf.task_time_limit
+    )
+    return float(limit) if limit else None
+
+
+async def _within_time_limit(coro: Coroutine[Any, Any, T], seconds: float) -> T:
+    try:
+        async with asyncio.timeout(seconds) as deadline:
+            return await coro
+    except TimeoutError:
+        # A timeout raised by the task's own code is not the time limit
+        if not deadline.expired():
+            raise
+        raise SoftTimeLimitExceeded(f"Task exceeded its {seconds:g}s time limit") from None
+
+
+def run_async(coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    """Drop-in replacement for ``asyncio.run`` inside Celery task bodies."""
+    limit = task_time_limit()
+    if limit is not None:
+        coro = _within_time_limit(coro, limit)
+    return runtime.run(coro, timeout=timeout)
+
+
+@asynccontextmanager
+async def shared_http_client(
+    timeout: float = HTTP_DEFAULT_TIMEOUT,
+) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Yield the worker's pooled HTTP client, or a one-off client outside a worker.
+
+    Pass per-request options (timeout, follow_redirects) on each request call;
+    the pooled client is shared and must not be closed by the caller.
+    """
+    client = runtime.get_http_client()
+    if client is not None:
+        yield client
+        return
+    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
+        yield client
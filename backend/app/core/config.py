@@ -115,6 +115,23 @@ class Settings(BaseSettings):
     # Postgres Configuration
     DATABASE_URL: str = ""
 
+    # Connection pool (app/core/db_pool.py). Mode defaults to "null" (a
+    # connection per session) in production and "queue" elsewhere.
+    # "transaction" is a small pool in front of a transaction-mode pooler and
+    # needs DATABASE_URL on the pooler's transaction-mode port (Supabase:
+    # 6543, not the session-mode 5432). Process type is detected (Celery
+    # worker vs API) unless set. Worker sizes are per task and multiplied by
+    # --concurrency under a threads/gevent pool. Keep the fleet's total
+    # size + overflow under the pooler's client limit.
+    DB_POOL_MODE: Optional[Literal["queue", "transaction", "null"]] = None
+    DB_PROCESS_TYPE: Optional[Literal["api", "worker"]] = None
+    DB_POOL_SIZE_API: int = 5
+    DB_POOL_MAX_OVERFLOW_API: int = 5
+    DB_POOL_SIZE_WORKER: int = 2
+    DB_POOL_MAX_OVERFLOW_WORKER: int = 2
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0
+    DB_POOL_RECYCLE_SECONDS: int = 300
+
     # Redis
 
     REDIS_HOST: str = "redis"
@@ -132,6 +149,7 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: Optional[str] = None
     ANTHROPIC_API_KEY: Optional[str] = None
     ELEVENLABS_API_KEY: Optional[str] = None
+    ELEVENLABS_BASE_URL: str = "https://api.elevenlabs.io/v1"
     GOOGLE_TTS_API_KEY: Optional[str] = None
     FISH_SPEECH_API_KEY: Optional[str] = None
     KOKORO_API_KEY: Optional[str] = None
@@ -265,6 +283,96 @@ class Settings(BaseSettings):
     S3_BUCKET_NAME: str = "litink-books-prod"
     S3_REGION: str = "us-east-1"
 
+    # Generated media cache (app/media_cache). TTL should match the bucket
+    # lifecycle expiration for generated media so entries never outlive objects.
+    MEDIA_CACHE_ENABLED: bool = True
+    MEDIA_CACHE_TTL_DAYS: int = 30
+
+    # Audiobook rendering (app/audiobooks/renderer.py). Chunk synthesis runs
+    # concurrently up to min(this, provider limit); chapters are stitched and
+    # loudness-normalized to AUDIOBOOK_LOUDNESS_LUFS (ACX-style -16..-20).
+    AUDIOBOOK_TTS_CONCURRENCY: int = 4
+    AUDIOBOOK_LOUDNESS_LUFS: float = -18.0
+
+    # Multi-track audio mixer (app/core/services/audio_mixer.py). Music is
+    # ducked under dialogue by AUDIO_MIX_DUCK_RATIO and every mix is
+    # loudness-normalized to AUDIO_MIX_LOUDNESS_LUFS.
+    AUDIO_MIX_LOUDNESS_LUFS: float = -16.0
+    AUDIO_MIX_DUCK_RATIO: float = 8.0
+    AUDIO_MIX_DOWNLOAD_CONCURRENCY: int = 8
+
+    # Lip-sync stage (app/tasks/lipsync_tasks.py): scenes run concurrently, with
+    # at most this many provider jobs in flight per provider per worker process
+    LIPSYNC_CONCURRENCY_PER_PROVIDER: int = 3
+
+    # Trailer analysis (app/trailers/service.py): chapters scored concurrently
+    TRAILER_SCORING_CONCURRENCY: int = 6
+
+    # LLM response cache (app/core/services/llm_cache.py). Call sites opt in
+    # with chat_completion(cache_site=...); TTLs are per call site.
+    LLM_RESPONSE_CACHE_ENABLED: bool = True
+    LLM_RESPONSE_CACHE_MAX_TEMPERATURE: float = 0.3
+    LLM_RESPONSE_CACHE_DEFAULT_TTL_SECONDS: int = 86400
+    LLM_RESPONSE_CACHE_TTLS: Dict[str, int] = {
+        "keywords": 604800,
+        "difficulty": 604800,
+        "key_concepts": 604800,
+        "toc_extraction": 86400,
+    }
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = 20000
+    LLM_RESPONSE_CACHE_MAX_ENTRY_BYTES: int = 262144
+    # Lock held while one process computes an entry; others wait up to this long
+    LLM_RESPONSE_CACHE_LOCK_SECONDS: int = 60
+
+    # RAG context assembly (app/core/services/context_builder.py). Token budget
+    # split by source; unused budget passes to the next source in this order.
+    RAG_CONTEXT_TOKEN_BUDGET: int = 12000
+    RAG_CONTEXT_SHARES: Dict[str, float] = {
+        "current": 0.65,
+        "retrieved": 0.2,
+        "neighbors": 0.15,
+    }
+    # Retrieved chunks this much covered by text already in context are skipped
+    RAG_CONTEXT_DEDUP_OVERLAP: float = 0.6
+
+    # Hedged text generation (ModelFallbackManager, hedge=True). The next ladder
+    # model starts once the current one runs past its p90 latency; models with
+    # fewer than HEDGE_MIN_SAMPLES successes use the default budget.
+    HEDGE_ENABLED: bool = True
+    HEDGE_MIN_SAMPLES: int = 10
+    HEDGE_DEFAULT_BUDGET_SECONDS: float = 20.0
+    HEDGE_MIN_BUDGET_SECONDS: float = 2.0
+    HEDGE_MAX_BUDGET_SECONDS: float = 60.0
+
+    # Fleet-wide provider limits (app/core/provider_limits.py). A call waits at
+    # most this long for a concurrency slot and rate token.
+    PROVIDER_LIMITS_ENABLED: bool = True
+    PROVIDER_LIMIT_ACQUIRE_TIMEOUT_SECONDS: float = 120.0
+    # API handlers that call a provider directly wait at most this long, so a
+    # limit held by background jobs fails the request fast
+    PROVIDER_LIMIT_REQUEST_ACQUIRE_TIMEOUT_SECONDS: float = 10.0
+
+    # Background dependency prober (app/core/health.py); health endpoints serve
+    # its cached snapshot
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 15.0
+    HEALTH_PROVIDER_PROBE_INTERVAL_SECONDS: float = 60.0
+
+    # Per-generation pipeline tracing (app/tracing). Spans go to the
+    # pipeline_spans table ("table"), a JSONL file ("jsonl") or nowhere ("none").
+    # Per-statement DB spans are one row per query, so they are opt-in.
+    # Table rows older than TRACING_RETENTION_DAYS are purged hourly.
+    TRACING_ENABLED: bool = True
+    TRACING_EXPORTER: str = "table"
+    TRACING_JSONL_PATH: str = "logs/pipeline_spans.jsonl"
+    TRACING_DB_QUERIES: bool = False
+    TRACING_RETENTION_DAYS: int = 14
+
+    # Batched media-row writes (app/core/services/media_repository.py). Pending
+    # rows are written once this many accumulate and at every stage boundary;
+    # progress rows are written at most once per interval unless final.
+    MEDIA_WRITE_BATCH_SIZE: int = 50
+    PROGRESS_WRITE_MIN_INTERVAL_SECONDS: float = 2.0
+
     # Celery
     CELERY_BROKER_URL: str = "redis://redis:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://redis:6379/0"
@@ -7,29 +7,19 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from app.core.db_model_registry import load_models
 from sqlalchemy import text
+from app.tracing.tracer import instrument_engine
 
-from sqlalchemy.pool import NullPool, AsyncAdaptedQueuePool
+from app.core.db_pool import engine_options, instrument_pool
 
 
 logger = get_logger()
 
-# Use NullPool in production (Supabase session mode pooler handles pooling)
-# Use AsyncAdaptedQueuePool in development (direct PostgreSQL connection)
-if settings.ENVIRONMENT == "production":
-    engine = create_async_engine(
-        settings.DATABASE_URL,
-        poolclass=NullPool,
-    )
-else:
-    engine = create_async_engine(
-        settings.DATABASE_URL,
-        poolclass=AsyncAdaptedQueuePool,
-        pool_pre_ping=True,
-        pool_size=5,
-        max_overflow=10,
-        pool_timeout=30,
-        pool_recycle=1800,
-    )
+# Pool mode and size depend on ENVIRONMENT / DB_POOL_MODE and on whether this
+# is an API or a Celery worker process (see app/core/db_pool.py)
+engine = create_async_engine(settings.DATABASE_URL, **engine_options())
+
+instrument_pool(engine)
+instrument_engine(engine)
 
 async_session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
@@ -0,0 +1,225 @@
+"""
+Database connection pool modes and pool metrics.
+
+Production uses NullPool, so every session opens a new TCP and TLS
+connection to the Supabase pooler. DB_POOL_MODE picks the engine's pool:
+
+    queue        AsyncAdaptedQueuePool with a direct PostgreSQL connection
+                 (the development setup, default outside production)
+    transaction  a small pool in front of a transaction-mode pooler
+                 (Supavisor / PgBouncer)
+    null         a new connection per session (default in production)
+
+Production's DATABASE_URL points at the Supabase session-mode pooler (port
+5432). Before setting DB_POOL_MODE=transaction, switch DATABASE_URL to the
+transaction-mode pooler (port 6543): a client pool in front of the session
+pooler would pin one server connection per pooled client connection.
+
+Behind a transaction-mode pooler, consecutive transactions of one client
+connection can run on different server connections, so a statement prepared
+in one transaction may not exist in the next. Both asyncpg's statement cache
+and SQLAlchemy's prepared statement cache are therefore off, and each
+prepared statement gets a unique name, so no two clients' names collide on a
+shared server connection. pool_pre_ping drops connections the pooler closed,
+and a short recycle keeps idle ones from outliving its client timeout.
+
+Pool size depends on the process type. API processes serve many concurrent
+requests. A prefork Celery worker child runs one task at a time and needs
+only a few connections; under a threads, gevent or eventlet pool every task
+of the worker shares one engine, so the worker sizes are multiplied by the
+worker's --concurrency (see tasks_per_process()).
+
+    engine = create_async_engine(settings.DATABASE_URL, **engine_options())
+    instrument_pool(engine)
+
+Acquisition latency and counts are exported as Prometheus metrics
+(db_pool_acquire_seconds, db_pool_connections_total) and summarised by
+pool_stats() for GET /admin/metrics/db-pool.
+"""
+
+import os
+import sys
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from app.core.config import settings
+
+POOL_ACQUIRE_LATENCY = Histogram(
+    "db_pool_acquire_seconds",
+    "Time to acquire a database connection from the pool",
+    ["process_type", "mode"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+POOL_CONNECTIONS = Counter(
+    "db_pool_connections_total",
+    "Database connection pool events (opened, invalidated, timeout)",
+    ["process_type", "mode", "event"],
+)
+
+
+def process_type() -> str:
+    """"worker" inside a Celery worker process, "api" otherwise."""
+    if settings.DB_PROCESS_TYPE:
+        return settings.DB_PROCESS_TYPE
+    return "worker" if "celery" in os.path.basename(sys.argv[0] if sys.argv else "") else "api"
+
+
+def pool_mode() -> str:
+    if settings.DB_POOL_MODE:
+        return settings.DB_POOL_MODE
+    return "null" if settings.ENVIRONMENT == "production" else "queue"
+
+
+def _option(argv: List[str], long: str, short: str) -> Optional[str]:
+    """Value of a command-line option given as --long=v, --long v, -s v or -sv."""
+    for index, arg in enumerate(argv):
+        if arg.startswith(f"{long}="):
+            return arg.split("=", 1)[1]
+        if arg in (long, short):
+            return argv[index + 1] if index + 1 < len(argv) else None
+        if arg.startswith(short) and not arg.startswith("--") and len(arg) > len(short):
+            return arg[len(short):]
+    return None
+
+
+def tasks_per_process(argv: Optional[List[str]] = None) -> int:
+    """Celery tasks that can run at once in this process and share its engine."""
+    argv = sys.argv if argv is None else argv
+    if _option(argv, "--pool", "-P") not in ("threads", "gevent", "eventlet"):
+        return 1
+    concurrency = _option(argv, "--concurrency", "-c")
+    try:
+        return max(1, int(concurrency))
+    except (TypeError, ValueError):
+        # Celery's default concurrency is the number of CPUs
+        return os.cpu_count() or 1
+
+
+PROCESS_TYPE = process_type()
+POOL_MODE = pool_mode()
+
+
+class _MeteredPoolMixin:
+    """Times every checkout; subclasses survive Pool.recreate() on dispose."""
+
+    def connect(self):
+        labels = {"process_type": PROCESS_TYPE, "mode": POOL_MODE}
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            POOL_CONNECTIONS.labels(event="timeout", **labels).inc()
+            raise
+        finally:
+            POOL_ACQUIRE_LATENCY.labels(**labels).observe(time.perf_counter() - start)
+
+
+class MeteredQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class MeteredNullPool(_MeteredPoolMixin, NullPool):
+    pass
+
+
+def _prepared_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def engine_options(mode: str = None, process: str = None) -> Dict[str, Any]:
+    """create_async_engine keyword arguments for a pool mode and process type."""
+    mode = mode or POOL_MODE
+    process = process or PROCESS_TYPE
+    if mode == "null":
+        return {"poolclass": MeteredNullPool}
+    if mode == "queue":
+        return {
+            "poolclass": MeteredQueuePool,
+            "pool_pre_ping": True,
+            "pool_size": 5,
+            "max_overflow": 10,
+            "pool_timeout": 30,
+            "pool_recycle": 1800,
+        }
+    if mode != "transaction":
+        raise ValueError(f"Unknown DB_POOL_MODE: {mode}")
+
+    if process == "worker":
+        tasks = tasks_per_process()
+        pool_size = settings.DB_POOL_SIZE_WORKER * tasks
+        max_overflow = settings.DB_POOL_MAX_OVERFLOW_WORKER * tasks
+    else:
+        pool_size = settings.DB_POOL_SIZE_API
+        max_overflow = settings.DB_POOL_MAX_OVERFLOW_API
+    return {
+        "poolclass": MeteredQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": True,
+        # Most recently used first, so surplus connections idle out and recycle
+        "pool_use_lifo": True,
+        "connect_args": {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _prepared_statement_name,
+        },
+    }
+
+
+def instrument_pool(engine: AsyncEngine) -> None:
+    """Count physical connections opened and invalidated by the engine's pool."""
+    labels = {"process_type": PROCESS_TYPE, "mode": POOL_MODE}
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        POOL_CONNECTIONS.labels(event="opened", **labels).inc()
+
+    @event.listens_for(engine.sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        POOL_CONNECTIONS.labels(event="invalidated", **labels).inc()
+
+
+def pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    """Pool configuration, current usage and acquisition counters for this process."""
+    pool = engine.sync_engine.pool
+    stats: Dict[str, Any] = {
+        "mode": POOL_MODE,
+        "process_type": PROCESS_TYPE,
+        "pool_class": type(pool).__name__,
+    }
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update(
+            size=pool.size(),
+            overflow=pool.overflow(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+        )
+
+    acquire: Dict[str, Any] = {}
+    for metric in POOL_ACQUIRE_LATENCY.collect():
+        for sample in metric.samples:
+            if sample.labels.get("process_type") != PROCESS_TYPE:
+                continue
+            if sample.name.endswith("_count"):
+                acquire["count"] = acquire.get("count", 0) + int(sample.value)
+            elif sample.name.endswith("_sum"):
+                acquire["sum_seconds"] = round(acquire.get("sum_seconds", 0) + sample.value, 6)
+    if acquire.get("count"):
+        acquire["mean_ms"] = round(acquire["sum_seconds"] * 1000 / acquire["count"], 3)
+    stats["acquire"] = acquire
+
+    events: Dict[str, int] = {}
+    for metric in POOL_CONNECTIONS.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_total") and sample.labels.get("process_type") == PROCESS_TYPE:
+                events[sample.labels["event"]] = events.get(sample.labels["event"], 0) + int(sample.value)
+    stats["connections"] = events
+    return stats
@@ -1,6 +1,6 @@
-import asyncio
 from fastapi_mail import MessageSchema, MessageType, MultipartSubtypeEnum
 from app.tasks.celery_app import celery_app
+from app.core.async_runtime import run_async
 from app.core.logging import get_logger
 from app.core.emails.config import fastamail
 from app.core.config import settings
@@ -47,7 +47,7 @@ def send_email_task(
             multipart_subtype=MultipartSubtypeEnum.alternative,
             headers=headers,
         )
-        asyncio.run(fastamail.send_message(message))
+        run_async(fastamail.send_message(message))
         logger.info(f"Email successfully sent to {recipients} with subject {subject}")
         return True
     except Exception as e:
@@ -1,14 +1,64 @@
+"""
+Dependency health, refreshed by a background prober.
+
+Health endpoints used to run every check inline, with retry sleeps, and
+several checks called synchronous clients (Celery inspect, the Celery result
+backend's Redis client) from async code. A health request could therefore
+block the event loop for seconds.
+
+Now a prober task started in the app lifespan refreshes every registered
+dependency on its own interval (HEALTH_PROBE_INTERVAL_SECONDS;
+HEALTH_PROVIDER_PROBE_INTERVAL_SECONDS for external providers):
+
+- each probe makes one attempt with a timeout, and a failed probe is simply
+  retried on the next tick;
+- Redis checks use redis.asyncio;
+- blocking clients (Celery, kombu, boto3) run in a worker thread.
+
+check_all_services() serves the latest snapshot without touching any
+dependency. Every probe's latency is observed in the
+``dependency_probe_latency_seconds`` Prometheus histogram, labelled by
+dependency.
+"""
+
 import asyncio
-from typing import Dict, Any, Callable, Awaitable, Optional
-from datetime import datetime, timedelta, timezone
+import time
+from datetime import datetime, timezone
 from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+import redis.asyncio as aioredis
+from prometheus_client import Histogram
 from sqlalchemy import text
-from app.tasks.celery_app import celery_app
-from app.core.logging import get_logger
+
+from app.core.config import settings
 from app.core.database import async_session
+from app.core.logging import get_logger
+from app.tasks.celery_app import celery_app
 
 logger = get_logger()
 
+PROBE_LATENCY = Histogram(
+    "dependency_probe_latency_seconds",
+    "Latency of background dependency health probes",
+    ["dependency"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+# Reachability probes for external providers: any response below 500 means
+# the provider's edge is up. Only providers with a configured key are probed.
+PROVIDER_PROBE_URLS: Dict[str, tuple[str, str]] = {
+    "openai": ("OPENAI_API_KEY", "https://api.openai.com/v1/models"),
+    "anthropic": ("ANTHROPIC_API_KEY", "https://api.anthropic.com/v1/models"),
+    "google": ("GOOGLE_AI_STUDIO_API_KEY", settings.GOOGLE_AI_STUDIO_BASE_URL),
+    "groq": ("GROQ_API_KEY", settings.GROQ_BASE_URL),
+    "zai": ("Z_AI_API_KEY", settings.Z_AI_BASE_URL),
+    "piapi": ("PIAPI_API_KEY_LITINKAI", settings.PIAPI_BASE_URL),
+    "modelslab": ("MODELSLAB_API_KEY", settings.MODELSLAB_BASE_URL),
+    "elevenlabs": ("ELEVENLABS_API_KEY", "https://api.elevenlabs.io/v1/models"),
+}
+
 
 class ServiceStatus(str, Enum):
     HEALTHY = "healthy"
@@ -24,14 +74,19 @@ class HealthCheck:
         self._check_functions: Dict[str, Callable[[], Awaitable[bool]]] = {}
         self._last_check: Dict[str, datetime] = {}
         self._timeouts: Dict[str, float] = {}
-        self._retry_delays: Dict[str, float] = {}
-        self._max_retries: Dict[str, int] = {}
+        self._intervals: Dict[str, float] = {}
+        self._critical: Dict[str, bool] = {}
+        self._latencies: Dict[str, float] = {}
+        self._errors: Dict[str, Optional[str]] = {}
+        self._next_probe: Dict[str, float] = {}
         self._lock = asyncio.Lock()
         self._dependencies: Dict[str, set[str]] = {}
 
-        self._cache_duration: timedelta = timedelta(seconds=25)
         self._cache_status: Optional[Dict[str, Any]] = None
-        self._last_check_time: Optional[datetime] = None
+        self._prober: Optional[asyncio.Task] = None
+        self._redis: Optional[aioredis.Redis] = None
+        self._broker_redis: Optional[aioredis.Redis] = None
+        self._http: Optional[httpx.AsyncClient] = None
 
     async def validate_dependencies(
         self, service_name: str, depends_on: list[str]
@@ -50,15 +105,20 @@ class HealthCheck:
         service_name: str,
         check_function: Callable[[], Awaitable[bool]],
         timeout: float = 5.0,
-        retry_delay: float = 1.0,
-        max_retries: int = 3,
         depends_on: list[str] | None = None,
+        interval: float | None = None,
+        critical: bool = True,
     ) -> None:
+        """
+        Register a dependency. Non-critical services (storage, providers) are
+        reported but do not change the overall status.
+        """
         self._services[service_name] = ServiceStatus.STARTING
         self._check_functions[service_name] = check_function
         self._timeouts[service_name] = timeout
-        self._retry_delays[service_name] = retry_delay
-        self._max_retries[service_name] = max_retries
+        self._intervals[service_name] = interval or settings.HEALTH_PROBE_INTERVAL_SECONDS
+        self._critical[service_name] = critical
+        self._next_probe[service_name] = 0.0
         self._last_check[service_name] = datetime.now(timezone.utc)
 
         if depends_on:
@@ -68,11 +128,31 @@ class HealthCheck:
                 f"Service '{service_name}' registered with dependencies: {depends_on}"
             )
 
+    async def add_provider_services(self) -> None:
+        """Register reachability probes for every configured provider."""
+        for provider, (key_setting, url) in PROVIDER_PROBE_URLS.items():
+            if not getattr(settings, key_setting, None) or not url:
+                continue
+            await self.add_service(
+                f"provider:{provider}",
+                self._provider_check(url),
+                timeout=10.0,
+                interval=settings.HEALTH_PROVIDER_PROBE_INTERVAL_SECONDS,
+                critical=False,
+            )
+
+    # ------------------------------------------------------------------
+    # Checks (all non-blocking)
+    # ------------------------------------------------------------------
+
     async def check_redis(self) -> bool:
+        if self._redis is None:
+            url = settings.CELERY_RESULT_BACKEND
+            if not url.startswith(("redis://", "rediss://")):
+                url = settings.REDIS_URL
+            self._redis = aioredis.from_url(url)
         try:
-            redis_client = celery_app.backend.client
-            redis_client.ping()
-            self._last_check["redis"] = datetime.now(timezone.utc)
+            await self._redis.ping()
             return True
         except Exception as e:
             logger.error(f"Redis health check failed: {e}")
@@ -87,141 +167,201 @@ class HealthCheck:
                 await session.execute(text("SELECT 1"))
                 await session.commit()
 
-            self._last_check["database"] = datetime.now(timezone.utc)
             return True
 
         except Exception as e:
             logger.error(f"Postgres Database health check failed: {e}")
             return False
 
-    async def check_celery(self) -> bool:
+    async def check_broker(self) -> bool:
+        broker_url = settings.CELERY_BROKER_URL
         try:
-            inspect = celery_app.control.inspect()
-            workers = inspect.ping()
+            if broker_url.startswith(("redis://", "rediss://")):
+                if self._broker_redis is None:
+                    self._broker_redis = aioredis.from_url(broker_url)
+                await self._broker_redis.ping()
+            else:
+                await asyncio.to_thread(self._ensure_broker_connection)
+            return True
+        except Exception as e:
+            logger.error(f"Broker health check failed: {e}")
+            return False
 
-            if not workers:
-                conn = celery_app.connection()
-                try:
-                    conn.ensure_connection(max_retries=3)
-                    logger.warning("No celery workers found, but Rabbitmq is reachable")
-                    self._last_check["celery"] = datetime.now(timezone.utc)
-                    return True
-                finally:
-                    conn.close()
+    @staticmethod
+    def _ensure_broker_connection() -> None:
+        conn = celery_app.connection()
+        try:
+            conn.ensure_connection(max_retries=1)
+        finally:
+            conn.close()
 
-            self._last_check["celery"] = datetime.now(timezone.utc)
+    async def check_celery(self) -> bool:
+        try:
+            workers = await asyncio.to_thread(
+                celery_app.control.inspect(timeout=1.0).ping
+            )
+            if not workers:
+                logger.warning("No celery workers answered ping; checking the broker")
+                return await self.check_broker()
             return True
         except Exception as e:
             logger.error(f"Celery health check failed: {e}")
             return False
 
-    async def check_service_health(
-        self, service_name: str, max_retries: int = 3
-    ) -> ServiceStatus:
-        if service_name in self._dependencies:
-            for dep in self._dependencies[service_name]:
-                dep_status = await self.check_service_health(dep)
+    async def check_storage(self) -> bool:
+        from app.core.services.storage import get_storage_service
 
-                if dep_status != ServiceStatus.HEALTHY:
-                    logger.error(
-                        f"Dependency {dep} not healthy for service {service_name}"
-                    )
-                    return ServiceStatus.DEGRADED
+        try:
+            storage = get_storage_service()
+            await asyncio.to_thread(storage.client.head_bucket, Bucket=storage.bucket_name)
+            return True
+        except Exception as e:
+            logger.error(f"Storage health check failed: {e}")
+            return False
+
+    def _provider_check(self, url: str) -> Callable[[], Awaitable[bool]]:
+        async def check() -> bool:
+            if self._http is None:
+                self._http = httpx.AsyncClient(timeout=10.0)
+            response = await self._http.get(url)
+            return response.status_code < 500
+
+        return check
 
+    # ------------------------------------------------------------------
+    # Probing
+    # ------------------------------------------------------------------
+
+    async def probe(self, service_name: str) -> ServiceStatus:
+        """Run one attempt of a service's check and record its status and latency."""
         if service_name not in self._check_functions:
             raise ValueError(f"Unknown service: {service_name}")
         check_func = self._check_functions[service_name]
         timeout = self._timeouts.get(service_name, 5.0)
-        max_retries = self._max_retries[service_name]
-        retry_delay = self._retry_delays[service_name]
-
-        metrics = {"attempts": 0, "total_delay": 0.0, "last_error": None}
-
-        for attempt in range(max_retries):
-            metrics["attempts"] += 1
-            try:
-                async with asyncio.timeout(timeout):
-                    is_healthy = await check_func()
-
-                    if is_healthy:
-                        async with self._lock:
-                            self._services[service_name] = ServiceStatus.HEALTHY
-                            self._last_check[service_name] = datetime.now()
-
-                            if attempt > 0:
-                                logger.info(
-                                    f"Service {service_name} recovered after {metrics['attempts']} attempts"
-                                )
-                        return ServiceStatus.HEALTHY
-                    async with self._lock:
-                        self._services[service_name] = ServiceStatus.DEGRADED
-            except asyncio.TimeoutError:
-                metrics["last_error"] = f"Timeout after {timeout}"
-                if attempt == max_retries - 1:
-                    logger.warning(
-                        f"Health check timeout for {service_name} after all retries"
-                    )
-
-            except Exception as e:
-                metrics["last_error"] = str(e)
-                if attempt == max_retries - 1:
-                    logger.error(f"Health check failed for {service_name}: {e}")
-            metrics["total_delay"] += retry_delay
-            await asyncio.sleep(retry_delay)
 
-        async with self._lock:
-            self._services[service_name] = ServiceStatus.UNHEALTHY
-            logger.error(
-                f"Service {service_name} unhealthy after {max_retries} attempts: {metrics['last_error']}"
-            )
-        return ServiceStatus.UNHEALTHY
-
-    async def check_all_services(self) -> Dict[str, Any]:
-        current_time = datetime.now(timezone.utc)
-        if (
-            self._cache_status is not None
-            and self._last_check_time is not None
-            and (current_time - self._last_check_time) < self._cache_duration
-        ):
-            return self._cache_status
+        error = None
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(timeout):
+                is_healthy = await check_func()
+            status = ServiceStatus.HEALTHY if is_healthy else ServiceStatus.UNHEALTHY
+        except asyncio.TimeoutError:
+            status, error = ServiceStatus.UNHEALTHY, f"Timeout after {timeout}"
+        except Exception as e:
+            status, error = ServiceStatus.UNHEALTHY, str(e)
+        latency = time.perf_counter() - started
+        PROBE_LATENCY.labels(dependency=service_name).observe(latency)
 
         async with self._lock:
-            services = list(self._services.keys())
-        tasks = [self.check_service_health(service) for service in services]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
+            previous = self._services.get(service_name)
+            self._services[service_name] = status
+            self._latencies[service_name] = latency
+            self._errors[service_name] = error
+            self._last_check[service_name] = datetime.now(timezone.utc)
+            self._next_probe[service_name] = time.monotonic() + self._intervals[service_name]
+        if status != previous and previous != ServiceStatus.STARTING:
+            logger.warning(f"Service {service_name} is now {status.value}: {error or ''}")
+        return status
+
+    async def refresh(self, force: bool = True) -> Dict[str, Any]:
+        """Probe services concurrently (only those due unless force) and rebuild the snapshot."""
+        now = time.monotonic()
+        services = [
+            name
+            for name in list(self._check_functions)
+            if force or self._next_probe.get(name, 0.0) <= now
+        ]
+        await asyncio.gather(*(self.probe(name) for name in services))
+        self._cache_status = self._build_snapshot()
+        return self._cache_status
+
+    def _build_snapshot(self) -> Dict[str, Any]:
         health_status = {
             "status": ServiceStatus.HEALTHY,
-            "timestamp": current_time.isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "services": {},
         }
-
-        for service, result in zip(services, results):
-            if isinstance(result, Exception):
-                health_status["services"][service] = {
-                    "status": ServiceStatus.UNHEALTHY,
-                    "error": str(result),
-                    "last_check": self._last_check[service].isoformat(),
-                }
+        for service, status in self._services.items():
+            unhealthy_deps = [
+                dep
+                for dep in self._dependencies.get(service, ())
+                if self._services.get(dep) != ServiceStatus.HEALTHY
+            ]
+            if status == ServiceStatus.HEALTHY and unhealthy_deps:
+                status = ServiceStatus.DEGRADED
+            entry = {
+                "status": status,
+                "last_check": self._last_check[service].isoformat(),
+                "latency_ms": (
+                    round(self._latencies[service] * 1000, 2)
+                    if service in self._latencies
+                    else None
+                ),
+                "critical": self._critical.get(service, True),
+            }
+            if self._errors.get(service):
+                entry["error"] = self._errors[service]
+            health_status["services"][service] = entry
+            if status != ServiceStatus.HEALTHY and entry["critical"]:
                 health_status["status"] = ServiceStatus.DEGRADED
-            else:
-                health_status["services"][service] = {
-                    "status": result,
-                    "last_check": self._last_check[service].isoformat(),
-                }
-                if result != ServiceStatus.HEALTHY:
-                    health_status["status"] = ServiceStatus.DEGRADED
+        return health_status
+
+    async def _probe_loop(self) -> None:
+        tick = min(self._intervals.values(), default=settings.HEALTH_PROBE_INTERVAL_SECONDS)
+        while True:
+            try:
+                await self.refresh(force=False)
+            except Exception as e:
+                logger.error(f"Health prober refresh failed: {e}")
+            await asyncio.sleep(tick)
 
-        self._cache_status = health_status
-        self._last_check_time = current_time
+    def start_prober(self) -> None:
+        if self._prober is None or self._prober.done():
+            self._prober = asyncio.create_task(self._probe_loop())
 
-        return health_status
+    async def stop_prober(self) -> None:
+        if self._prober is not None:
+            self._prober.cancel()
+            try:
+                await self._prober
+            except asyncio.CancelledError:
+                pass
+            self._prober = None
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def check_all_services(self) -> Dict[str, Any]:
+        """The latest snapshot; probes once only if the prober has not run yet."""
+        if self._cache_status is None:
+            return await self.refresh()
+        return self._cache_status
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        return self._cache_status
+
+    @staticmethod
+    def latency_histograms() -> Dict[str, Any]:
+        """Probe latency histograms by dependency, with cumulative bucket counts."""
+        histograms: Dict[str, Any] = {}
+        for metric in PROBE_LATENCY.collect():
+            for sample in metric.samples:
+                dependency = sample.labels.get("dependency")
+                entry = histograms.setdefault(dependency, {"buckets": {}})
+                if sample.name.endswith("_bucket"):
+                    entry["buckets"][sample.labels["le"]] = int(sample.value)
+                elif sample.name.endswith("_count"):
+                    entry["count"] = int(sample.value)
+                elif sample.name.endswith("_sum"):
+                    entry["sum_seconds"] = round(sample.value, 6)
+        return histograms
 
     async def wait_for_services(self, timeout: float = 30.0) -> bool:
         try:
-            start_time = datetime.now()
-            while (datetime.now() - start_time) < timedelta(seconds=timeout):
-                status = await self.check_all_services()
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                status = await self.refresh()
                 if status["status"] == ServiceStatus.HEALTHY:
                     return True
                 await asyncio.sleep(1)
@@ -231,13 +371,24 @@ class HealthCheck:
             return False
 
     async def cleanup(self) -> None:
+        await self.stop_prober()
+        for client in (self._redis, self._broker_redis):
+            if client is not None:
+                await client.aclose()
+        if self._http is not None:
+            await self._http.aclose()
+        self._redis = self._broker_redis = self._http = None
         async with self._lock:
             self._services.clear()
             self._check_functions.clear()
             self._last_check.clear()
             self._timeouts.clear()
-            self._retry_delays.clear()
-            self._max_retries.clear()
+            self._intervals.clear()
+            self._critical.clear()
+            self._latencies.clear()
+            self._errors.clear()
+            self._next_probe.clear()
+        self._cache_status = None
 
 
 health_checker = HealthCheck()
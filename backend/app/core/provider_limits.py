@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class ProviderLimit:
+    """
+    Fleet-wide limits for one provider API key, shared by every API and Celery
+    process through Redis (app/core/services/provider_limiter.py).
+    """
+
+    # Calls in flight at once; None for no concurrency limit
+    max_concurrent: Optional[int] = None
+    # Sustained request rate; None for no rate limit
+    requests_per_minute: Optional[float] = None
+    # Requests that may go out back to back after an idle period
+    burst: int = 1
+    # A held slot expires this long after its last renewal, so a crashed
+    # worker cannot keep it forever
+    lease_seconds: int = 120
+    # Longest wait for a slot and token before ProviderCapacityError; None
+    # uses PROVIDER_LIMIT_ACQUIRE_TIMEOUT_SECONDS
+    acquire_timeout_seconds: Optional[float] = None
+
+
+# Keys are provider names: model prefixes for script models (see
+# provider_router.provider_name_for_model) plus the media and embedding
+# services. Values sit just under each account's plan limits.
+PROVIDER_LIMITS: Dict[str, ProviderLimit] = {
+    # Script models
+    "zai": ProviderLimit(max_concurrent=20, requests_per_minute=300, burst=20),
+    "google": ProviderLimit(max_concurrent=20, requests_per_minute=900, burst=30),
+    "groq": ProviderLimit(max_concurrent=10, requests_per_minute=25, burst=5),
+    "openai": ProviderLimit(max_concurrent=30, requests_per_minute=450, burst=30),
+    "anthropic": ProviderLimit(max_concurrent=10, requests_per_minute=45, burst=5),
+    "piapi": ProviderLimit(max_concurrent=10, requests_per_minute=120, burst=10),
+    "featherless": ProviderLimit(max_concurrent=4),
+    "ollama": ProviderLimit(max_concurrent=2),
+    # Embeddings (gemini-embedding-001 free tier allows 100 requests/minute)
+    "google_embeddings": ProviderLimit(requests_per_minute=90, burst=10),
+    # Media. ModelsLab counts queued jobs against the plan, so a slot is held
+    # from submission until the result is fetched (up to 20 minutes for
+    # images). The holder renews the short lease while it polls, so a killed
+    # worker frees its slot within two minutes. A background job queues for a
+    # slot about as long as one generation can take (the Celery time limit
+    # bounds the total); API handlers pass
+    # PROVIDER_LIMIT_REQUEST_ACQUIRE_TIMEOUT_SECONDS instead.
+    "modelslab": ProviderLimit(
+        max_concurrent=8,
+        requests_per_minute=120,
+        burst=8,
+        lease_seconds=120,
+        acquire_timeout_seconds=20 * 60,
+    ),
+    "elevenlabs": ProviderLimit(max_concurrent=5, lease_seconds=300),
+}
+
+
+def get_provider_limit(provider: str) -> Optional[ProviderLimit]:
+    return PROVIDER_LIMITS.get(provider)
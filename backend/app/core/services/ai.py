@@ -381,6 +381,7 @@ Ensure the entire output is a single valid JSON object.
                 provider=provider,
                 temperature=0.3,
                 max_tokens=100,
+                cache_site="keywords",
             )
 
             keywords = response.choices[0].message.content.split(", ")
@@ -407,6 +408,7 @@ Ensure the entire output is a single valid JSON object.
                 provider=provider,
                 temperature=0.1,
                 max_tokens=10,
+                cache_site="difficulty",
             )
 
             difficulty = response.choices[0].message.content.strip().lower()
@@ -474,6 +476,7 @@ Ensure the entire output is a single valid JSON object.
                 provider=provider,
                 temperature=0.3,
                 max_tokens=100,
+                cache_site="key_concepts",
             )
 
             concepts = response.choices[0].message.content.split(", ")
@@ -0,0 +1,374 @@
+"""
+Multi-track audio mixer: one ffmpeg filter graph per mix.
+
+    tracks = tracks_from_audio_files(chapter_audio, mix_settings)
+    await AudioMixer().mix(tracks, "/tmp/chapter.mp3")
+
+A track is a narrator, character, sfx or music clip with an optional start
+time. Inputs are downloaded concurrently, clips without a start time are
+placed on the scene timeline (place_by_scene), and a single ffmpeg run
+renders the whole mix:
+
+    each clip   aformat (stereo, float, 44.1k) -> volume -> adelay to its start
+    voice bus   narrator + character clips, amix
+    sfx bus     sound effects, amix
+    music bus   amix, then sidechaincompress keyed by the voice bus (ducking)
+    master      amix of the buses -> loudnorm (EBU R128) -> aresample
+
+The buses are summed without amix's 1/n input scaling (normalize=0); the
+float pipeline does not clip and loudnorm sets the final level. ffmpeg
+encodes straight into the output file as it renders, so neither the inputs
+nor the mix are ever held in memory.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from app.core.async_runtime import shared_http_client
+from app.core.config import settings
+from app.core.services.ffmpeg_utils import _get_audio_duration
+from app.tracing.tracer import traced_run
+
+logger = logging.getLogger(__name__)
+
+VOICE_ROLES = ("narrator", "character")
+ROLES = VOICE_ROLES + ("sfx", "music")
+
+# audio_type / track "type" values seen across the pipeline -> mixer role
+ROLE_ALIASES: Dict[str, str] = {
+    "narrator": "narrator",
+    "narration": "narrator",
+    "character": "character",
+    "dialogue": "character",
+    "sound_effects": "sfx",
+    "sound_effect": "sfx",
+    "sfx": "sfx",
+    "background_music": "music",
+    "music": "music",
+}
+
+SAMPLE_RATE = 44100
+
+# Output container -> encoder arguments
+OUTPUT_CODECS: Dict[str, List[str]] = {
+    "mp3": ["-c:a", "libmp3lame", "-b:a", "192k"],
+    "wav": ["-c:a", "pcm_s16le"],
+    "m4a": ["-c:a", "aac", "-b:a", "192k"],
+    "aac": ["-c:a", "aac", "-b:a", "192k"],
+    "ogg": ["-c:a", "libvorbis", "-q:a", "5"],
+    "flac": ["-c:a", "flac"],
+}
+
+CONTENT_TYPES: Dict[str, str] = {
+    "mp3": "audio/mpeg",
+    "wav": "audio/wav",
+    "m4a": "audio/mp4",
+    "aac": "audio/aac",
+    "ogg": "audio/ogg",
+    "flac": "audio/flac",
+}
+
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+
+class AudioMixError(RuntimeError):
+    """No usable input, or ffmpeg rejected the mix."""
+
+
+@dataclass
+class MixTrack:
+    source: str
+    role: str = "sfx"
+    # None: placed by place_by_scene()
+    start_seconds: Optional[float] = None
+    duration_seconds: Optional[float] = None
+    volume: float = 1.0
+    scene: Optional[str] = None
+    order: int = 0
+    # Filled in by AudioMixer once the source is on local disk
+    local_path: Optional[str] = None
+
+
+@dataclass
+class MixSettings:
+    ducking: bool = True
+    duck_threshold: float = 0.05
+    duck_ratio: float = field(default_factory=lambda: settings.AUDIO_MIX_DUCK_RATIO)
+    duck_attack_ms: float = 20.0
+    duck_release_ms: float = 400.0
+    loudness_lufs: Optional[float] = field(
+        default_factory=lambda: settings.AUDIO_MIX_LOUDNESS_LUFS
+    )
+    true_peak_db: float = -1.5
+    loudness_range: float = 11.0
+    output_format: str = "mp3"
+
+    @classmethod
+    def from_request(cls, mix_settings: Optional[Dict[str, Any]], output_format: str = "mp3") -> "MixSettings":
+        """Read the optional mixer keys of a chapter export's mix_settings."""
+        mix = cls(output_format=output_format)
+        for key in ("ducking", "duck_threshold", "duck_ratio", "loudness_lufs"):
+            if mix_settings and mix_settings.get(key) is not None:
+                setattr(mix, key, mix_settings[key])
+        return mix
+
+
+def role_for(audio_type: Optional[str]) -> str:
+    return ROLE_ALIASES.get(str(audio_type or "").lower(), "sfx")
+
+
+def _scene_of(audio: Dict[str, Any]) -> Optional[str]:
+    metadata = audio.get("metadata") or audio.get("audio_metadata") or {}
+    for value in (
+        audio.get("scene_number"),
+        audio.get("scene"),
+        audio.get("scene_id"),
+        metadata.get("scene_number"),
+        metadata.get("scene"),
+    ):
+        if value not in (None, ""):
+            return str(value)
+    return None
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _first(audio: Dict[str, Any], *keys: str) -> Any:
+    for key in keys:
+        if audio.get(key) is not None:
+            return audio[key]
+    return None
+
+
+def tracks_from_audio_files(
+    audio_files: Iterable[Dict[str, Any]],
+    mix_settings: Optional[Dict[str, Any]] = None,
+) -> List[MixTrack]:
+    """
+    Build mixer tracks from AudioGeneration rows (model_dump) or pipeline audio
+    result dicts. ``mix_settings["<audio_type>_volume"]`` sets the gain of a
+    type unless the item carries its own ``volume``.
+    """
+    tracks: List[MixTrack] = []
+    for index, audio in enumerate(audio_files):
+        source = _first(audio, "audio_url", "url")
+        if not source:
+            continue
+        audio_type = _first(audio, "audio_type", "type")
+        audio_type = getattr(audio_type, "value", audio_type)
+        volume = _float(audio.get("volume"))
+        if volume is None and mix_settings:
+            volume = _float(mix_settings.get(f"{audio_type}_volume"))
+        sequence = audio.get("sequence_order")
+        tracks.append(
+            MixTrack(
+                source=source,
+                role=role_for(audio_type) if audio_type else "narrator",
+                start_seconds=_float(_first(audio, "start_seconds", "start_time")),
+                duration_seconds=_float(_first(audio, "duration_seconds", "duration")),
+                volume=1.0 if volume is None else volume,
+                scene=_scene_of(audio),
+                order=sequence if isinstance(sequence, int) else index,
+            )
+        )
+    return tracks
+
+
+def _scene_sort_key(scene: Optional[str]) -> Tuple[int, Any]:
+    if scene is None:
+        return (0, 0)
+    numbers = re.findall(r"\d+(?:\.\d+)?", scene)
+    return (1, float(numbers[-1])) if numbers else (2, scene)
+
+
+def place_by_scene(tracks: Sequence[MixTrack]) -> None:
+    """
+    Give every track without a start time one, scene by scene.
+
+    Scenes play back to back in scene order (clips without a scene first).
+    Inside a scene the voice clips play one after another in ``order``;
+    sound effects and music start with the scene. The next scene starts when
+    the last voice clip or the longest effect ends (a music-only scene lasts
+    as long as its music).
+    Explicit start times are kept and do not move the timeline.
+    """
+    scenes: Dict[Optional[str], List[MixTrack]] = {}
+    for track in tracks:
+        if track.start_seconds is None:
+            scenes.setdefault(track.scene, []).append(track)
+
+    cursor = 0.0
+    for scene in sorted(scenes, key=_scene_sort_key):
+        members = sorted(scenes[scene], key=lambda t: t.order)
+        voice_end = cursor
+        for track in members:
+            if track.role in VOICE_ROLES:
+                track.start_seconds = voice_end
+                voice_end += track.duration_seconds or 0.0
+        effect_end = cursor
+        for track in members:
+            if track.role not in VOICE_ROLES:
+                track.start_seconds = cursor
+                if track.role == "sfx":
+                    effect_end = max(effect_end, cursor + (track.duration_seconds or 0.0))
+        if voice_end == cursor and effect_end == cursor:
+            music = [t.duration_seconds or 0.0 for t in members if t.role == "music"]
+            effect_end = cursor + max(music, default=0.0)
+        cursor = max(voice_end, effect_end)
+
+
+def build_filter_graph(tracks: Sequence[MixTrack], mix: MixSettings) -> str:
+    """filter_complex for tracks fed to ffmpeg as inputs 0..n-1 in order; output is [out]."""
+    chains: List[str] = []
+    buses: Dict[str, List[str]] = {"voice": [], "sfx": [], "music": []}
+    for index, track in enumerate(tracks):
+        delay_ms = int(round(max(track.start_seconds or 0.0, 0.0) * 1000))
+        chains.append(
+            f"[{index}:a]aformat=sample_fmts=fltp:sample_rates={SAMPLE_RATE}"
+            f":channel_layouts=stereo,volume={track.volume:.3f},"
+            f"adelay={delay_ms}|{delay_ms}[a{index}]"
+        )
+        bus = "voice" if track.role in VOICE_ROLES else track.role
+        buses[bus].append(f"[a{index}]")
+
+    def sum_bus(labels: List[str], name: str) -> str:
+        if len(labels) == 1:
+            chains.append(f"{labels[0]}anull[{name}]")
+        else:
+            chains.append(
+                f"{''.join(labels)}amix=inputs={len(labels)}:duration=longest"
+                f":dropout_transition=0:normalize=0[{name}]"
+            )
+        return f"[{name}]"
+
+    voice = sum_bus(buses["voice"], "voice") if buses["voice"] else None
+    music = sum_bus(buses["music"], "music") if buses["music"] else None
+    if voice and music and mix.ducking:
+        # apad keeps the key running after the last line so the music bed
+        # is not cut short when dialogue ends first
+        chains.append("[voice]asplit=2[voicemix][voicekey]")
+        chains.append("[voicekey]apad[voicekeypad]")
+        chains.append(
+            f"[music][voicekeypad]sidechaincompress=threshold={mix.duck_threshold}"
+            f":ratio={mix.duck_ratio}:attack={mix.duck_attack_ms}"
+            f":release={mix.duck_release_ms}[musicducked]"
+        )
+        voice, music = "[voicemix]", "[musicducked]"
+    sfx = sum_bus(buses["sfx"], "sfx") if buses["sfx"] else None
+
+    mixed = sum_bus([bus for bus in (voice, sfx, music) if bus], "mix")
+    if mix.loudness_lufs is not None:
+        chains.append(
+            f"{mixed}loudnorm=I={mix.loudness_lufs}:TP={mix.true_peak_db}"
+            f":LRA={mix.loudness_range},aresample={SAMPLE_RATE}[out]"
+        )
+    else:
+        chains.append(f"{mixed}anull[out]")
+    return ";".join(chains)
+
+
+def build_mix_command(
+    tracks: Sequence[MixTrack], output_path: str, mix: MixSettings
+) -> List[str]:
+    if not tracks:
+        raise AudioMixError("No audio tracks to mix")
+    codec = OUTPUT_CODECS.get(mix.output_format.lower())
+    if codec is None:
+        raise AudioMixError(f"Unsupported mix format: {mix.output_format}")
+    cmd = ["ffmpeg", "-y", "-hide_banner", "-nostdin"]
+    for track in tracks:
+        cmd.extend(["-i", track.local_path or track.source])
+    cmd.extend(["-filter_complex", build_filter_graph(tracks, mix), "-map", "[out]"])
+    cmd.extend(["-ar", str(SAMPLE_RATE), *codec, output_path])
+    return cmd
+
+
+class AudioMixer:
+    def __init__(self, download_concurrency: Optional[int] = None):
+        self.download_concurrency = max(
+            1, download_concurrency or settings.AUDIO_MIX_DOWNLOAD_CONCURRENCY
+        )
+
+    async def _fetch(self, track: MixTrack, index: int, work_dir: str, slots: asyncio.Semaphore) -> bool:
+        parsed = urlparse(track.source)
+        if parsed.scheme not in ("http", "https"):
+            for candidate in (track.source, track.source.lstrip("/")):
+                if os.path.exists(candidate):
+                    track.local_path = candidate
+                    return True
+            logger.warning("[AUDIO MIX] Input not found: %s", track.source)
+            return False
+
+        extension = os.path.splitext(parsed.path)[1] or ".audio"
+        local_path = os.path.join(work_dir, f"input_{index}{extension}")
+        async with slots:
+            try:
+                async with shared_http_client() as client:
+                    async with client.stream(
+                        "GET", track.source, timeout=120.0, follow_redirects=True
+                    ) as response:
+                        response.raise_for_status()
+                        with open(local_path, "wb") as handle:
+                            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_BYTES):
+                                handle.write(chunk)
+            except Exception as exc:
+                logger.warning("[AUDIO MIX] Download failed for %s: %s", track.source, exc)
+                return False
+        track.local_path = local_path
+        return True
+
+    async def prepare(self, tracks: Sequence[MixTrack], work_dir: str) -> List[MixTrack]:
+        """Download inputs concurrently, probe missing durations and place clips."""
+        slots = asyncio.Semaphore(self.download_concurrency)
+        fetched = await asyncio.gather(
+            *(self._fetch(track, i, work_dir, slots) for i, track in enumerate(tracks))
+        )
+        usable = [track for track, ok in zip(tracks, fetched) if ok]
+        if not usable:
+            raise AudioMixError("None of the audio tracks could be downloaded")
+
+        unplaced = [t for t in usable if t.start_seconds is None and t.duration_seconds is None]
+        durations = await asyncio.gather(
+            *(asyncio.to_thread(_get_audio_duration, t.local_path) for t in unplaced)
+        )
+        for track, duration in zip(unplaced, durations):
+            track.duration_seconds = duration
+        place_by_scene(usable)
+        return usable
+
+    async def mix(
+        self,
+        tracks: Sequence[MixTrack],
+        output_path: str,
+        mix: Optional[MixSettings] = None,
+    ) -> str:
+        """Render tracks into output_path with one ffmpeg run; returns output_path."""
+        mix = mix or MixSettings()
+        work_dir = tempfile.mkdtemp(prefix="audio_mix_")
+        try:
+            usable = await self.prepare(tracks, work_dir)
+            cmd = build_mix_command(usable, output_path, mix)
+            logger.info(
+                "[AUDIO MIX] Mixing %d tracks (%s) into %s",
+                len(usable),
+                ", ".join(f"{r}={sum(t.role == r for t in usable)}" for r in ROLES),
+                output_path,
+            )
+            result = await asyncio.to_thread(traced_run, cmd, capture_output=True, text=True)
+            if result.returncode != 0 or not os.path.exists(output_path):
+                raise AudioMixError(f"FFmpeg audio mix failed: {result.stderr[-1000:]}")
+            return output_path
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
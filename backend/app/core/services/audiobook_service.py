@@ -6,13 +6,14 @@ Location per spec: app/core/services/audiobook_service.py
 """
 
 import uuid
-from typing import Optional, List, Dict, Any
+from typing import Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.audiobooks.models import Audiobook, AudiobookChapter
 from app.books.models import Book, Chapter
 from app.core.services.tts import tts_router
+from app.core.services.tts.segmentation import split_for_tts
 from app.credits.service import credits_for_audio_duration
 
 
@@ -98,7 +99,7 @@ class AudiobookService:
         voice_id = tts_config.get("voice_id")
 
         max_chars = tts_router.max_chars_per_request(user_tier)
-        chunks = _split_text(chapter_text, max_chars)
+        chunks = split_for_tts(chapter_text, max_chars)
 
         audio_urls = []
         total_duration = 0.0
@@ -110,7 +111,7 @@ class AudiobookService:
                 voice_id=voice_id,
             )
             audio_url = result.get("audio_url") or result.get("url")
-            duration = result.get("duration", 0.0)
+            duration = result.get("duration_seconds") or result.get("duration") or 0.0
 
             if audio_url:
                 audio_urls.append(audio_url)
@@ -125,42 +126,3 @@ class AudiobookService:
             "credits_used": credits_used,
             "chunks_processed": len(audio_urls),
         }
-
-
-def _split_text(text: str, max_chars: int) -> List[str]:
-    """Split text into chunks respecting sentence boundaries."""
-    if not text:
-        return []
-
-    if len(text) <= max_chars:
-        return [text]
-
-    chunks = []
-    sentences = []
-    current = ""
-
-    for char in text:
-        current += char
-        if char in ".!?\n" and current.strip():
-            sentences.append(current.strip())
-            current = ""
-
-    if current.strip():
-        sentences.append(current.strip())
-
-    chunk = ""
-    for sentence in sentences:
-        if len(chunk) + len(sentence) > max_chars and chunk:
-            chunks.append(chunk.strip())
-            chunk = sentence
-        else:
-            chunk += " " + sentence if chunk else sentence
-
-    if chunk.strip():
-        while len(chunk) > max_chars:
-            chunks.append(chunk[:max_chars].strip())
-            chunk = chunk[max_chars:]
-        if chunk.strip():
-            chunks.append(chunk.strip())
-
-    return chunks
@@ -0,0 +1,175 @@
+"""
+Token-budgeted context assembly for RAG prompts.
+
+RAGService.get_chapter_with_context used to concatenate adjacent chapters,
+the whole current chapter and every retrieved chunk with no token
+accounting, so long chapters overflowed model limits and short ones still
+paid for near-duplicate chunks.
+
+ContextBuilder splits a token budget between three sources, in priority
+order:
+
+- the current chapter;
+- retrieved chunks, ranked by similarity and deduplicated against each
+  other and against the chapter text already included;
+- adjacent chapters, nearest first.
+
+Budget a source leaves unused passes to the next one. Every piece is cut at
+a sentence boundary, and tokens are counted with the process-wide tiktoken
+encoding (text_utils.get_encoding).
+
+The assembled text keeps the layout prompts already expect: adjacent
+chapters, then the current chapter, then "Related content:".
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from app.core.config import settings
+from app.core.services.text_utils import TokenCounter
+
+# Word n-grams used to detect overlapping chunks
+_SHINGLE_WORDS = 8
+_WORD = re.compile(r"\w+")
+
+SOURCES = ("current", "retrieved", "neighbors")
+
+
+def _shingles(text: str) -> Set[int]:
+    words = _WORD.findall(text.lower())
+    if len(words) < _SHINGLE_WORDS:
+        return {hash(" ".join(words))} if words else set()
+    return {
+        hash(" ".join(words[i : i + _SHINGLE_WORDS]))
+        for i in range(len(words) - _SHINGLE_WORDS + 1)
+    }
+
+
+class ContextBuilder:
+    """Assemble chapter, neighbor and retrieved text into a token budget."""
+
+    def __init__(
+        self,
+        token_budget: Optional[int] = None,
+        shares: Optional[Dict[str, float]] = None,
+        token_counter: Optional[TokenCounter] = None,
+    ):
+        self.token_budget = token_budget or settings.RAG_CONTEXT_TOKEN_BUDGET
+        self.shares = shares or settings.RAG_CONTEXT_SHARES
+        self.token_counter = token_counter or TokenCounter()
+
+    def build(
+        self,
+        chapter: Dict[str, Any],
+        adjacent_chapters: Iterable[Dict[str, Any]] = (),
+        similar_chunks: Iterable[Dict[str, Any]] = (),
+    ) -> Dict[str, Any]:
+        """
+        Returns {"text", "tokens", "budget", "sources"}. ``sources`` has per-source
+        token use and how many pieces were included, truncated or dropped.
+        """
+        stats = {
+            source: {"budget": 0, "tokens": 0, "included": 0, "truncated": 0, "dropped": 0}
+            for source in SOURCES
+        }
+        carry = 0
+
+        def allocate(source: str) -> int:
+            budget = int(self.token_budget * self.shares.get(source, 0)) + carry
+            stats[source]["budget"] = budget
+            return budget
+
+        # 1. Current chapter
+        budget = allocate("current")
+        current_text, used = self._fit(chapter.get("content") or "", budget, stats["current"])
+        carry = budget - used
+        seen = _shingles(current_text)
+
+        # 2. Retrieved chunks: most similar first, skipping the current chapter
+        # and anything mostly covered by text already included
+        budget = allocate("retrieved")
+        current_id = str(chapter.get("id"))
+        ranked = sorted(
+            (
+                chunk
+                for chunk in similar_chunks
+                if str(chunk.get("chapter", {}).get("id")) != current_id
+            ),
+            key=lambda chunk: chunk.get("similarity") or 0.0,
+            reverse=True,
+        )
+        related: List[str] = []
+        remaining = budget
+        for chunk in ranked:
+            text = chunk.get("content_chunk") or ""
+            shingles = _shingles(text)
+            if not shingles or self._overlap(shingles, seen) >= settings.RAG_CONTEXT_DEDUP_OVERLAP:
+                stats["retrieved"]["dropped"] += 1
+                continue
+            prefix = f"Related content from Chapter {chunk['chapter'].get('chapter_number')}: "
+            piece, used = self._fit(prefix + text, remaining, stats["retrieved"])
+            if not piece:
+                continue
+            related.append(piece)
+            seen |= shingles
+            remaining -= used
+        carry = remaining
+
+        # 3. Adjacent chapters, nearest to the current chapter first
+        budget = allocate("neighbors")
+        number = chapter.get("chapter_number") or 0
+        neighbors = sorted(
+            adjacent_chapters,
+            key=lambda c: (abs((c.get("chapter_number") or 0) - number), c.get("chapter_number") or 0),
+        )
+        neighbor_text: Dict[Any, str] = {}
+        remaining = budget
+        for index, neighbor in enumerate(neighbors):
+            # Even split of what is left among the neighbors not yet placed
+            share = remaining // (len(neighbors) - index)
+            heading = f"Chapter {neighbor.get('chapter_number')}: {neighbor.get('title')}\n"
+            piece, used = self._fit(heading + (neighbor.get("content") or ""), share, stats["neighbors"])
+            if piece:
+                neighbor_text[neighbor.get("id")] = piece
+                remaining -= used
+
+        # Same layout as before: neighbors in book order, chapter, related content
+        ordered_neighbors = [
+            neighbor_text[c.get("id")]
+            for c in sorted(neighbors, key=lambda c: c.get("chapter_number") or 0)
+            if c.get("id") in neighbor_text
+        ]
+        parts = []
+        if ordered_neighbors:
+            parts.append("\n\n".join(ordered_neighbors))
+        parts.append(current_text)
+        text = "\n\n".join(parts)
+        if related:
+            text += "\n\nRelated content:\n" + "\n".join(related)
+
+        return {
+            "text": text,
+            "tokens": sum(stats[source]["tokens"] for source in SOURCES),
+            "budget": self.token_budget,
+            "sources": stats,
+        }
+
+    def _fit(self, text: str, budget: int, stats: Dict[str, int]):
+        if not text or budget <= 0:
+            if text:
+                stats["dropped"] += 1
+            return "", 0
+        piece, used = self.token_counter.truncate_to_tokens(text, budget)
+        if not piece:
+            stats["dropped"] += 1
+            return "", 0
+        stats["included"] += 1
+        if len(piece) < len(text):
+            stats["truncated"] += 1
+        stats["tokens"] += used
+        return piece, used
+
+    @staticmethod
+    def _overlap(shingles: Set[int], seen: Set[int]) -> float:
+        """Fraction of a chunk's shingles already present in the context."""
+        return len(shingles & seen) / len(shingles)
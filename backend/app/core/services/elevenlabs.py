@@ -4,6 +4,13 @@ import os
 import logging
 from typing import List, Dict, Any, Optional
 from app.core.config import settings
+from app.core.services.audio_mixer import (
+    CONTENT_TYPES,
+    AudioMixer,
+    MixSettings,
+    tracks_from_audio_files,
+)
+from app.core.services.provider_limiter import provider_limiter
 import traceback
 import time
 
@@ -15,7 +22,7 @@ class ElevenLabsService:
 
     def __init__(self):
         self.api_key = settings.ELEVENLABS_API_KEY
-        self.base_url = "https://api.elevenlabs.io/v1"
+        self.base_url = settings.ELEVENLABS_BASE_URL.rstrip("/")
         self.audio_dir = "uploads/audio"
 
         # Ensure audio directory exists
@@ -193,7 +200,11 @@ class ElevenLabsService:
             return None
 
     async def mix_audio_tracks(
-        self, audio_tracks: List[Dict[str, Any]], user_id: str = None
+        self,
+        audio_tracks: List[Dict[str, Any]],
+        user_id: str = None,
+        mix_settings: Optional[Dict[str, Any]] = None,
+        output_format: str = "mp3",
     ) -> Dict[str, Any]:
         """Mix multiple audio tracks together"""
         try:
@@ -201,14 +212,16 @@ class ElevenLabsService:
                 return {"audio_url": None, "error": "No audio tracks provided"}
 
             # Download and mix audio files
-            mixed_audio_path = await self._download_and_mix_audio(audio_tracks)
+            mixed_audio_path = await self._download_and_mix_audio(
+                audio_tracks, mix_settings=mix_settings, output_format=output_format
+            )
 
             if not mixed_audio_path or not os.path.exists(mixed_audio_path):
                 return {"audio_url": None, "error": "Failed to create mixed audio"}
 
             # Upload to Local Storage
             timestamp = int(time.time())
-            mixed_filename = f"mixed_audio_{timestamp}.mp3"
+            mixed_filename = f"mixed_audio_{timestamp}.{output_format}"
 
             if user_id:
                 storage_path = f"users/{user_id}/audio/{mixed_filename}"
@@ -217,14 +230,11 @@ class ElevenLabsService:
 
             from app.core.services.storage import storage_service
 
-            # Read file content
+            # Stream the file to storage instead of reading it into memory
             with open(mixed_audio_path, "rb") as f:
-                file_content = f.read()
-
-            # Upload using storage service
-            public_url = await storage_service.upload(
-                file_content, storage_path, "audio/mpeg"
-            )
+                public_url = await storage_service.upload_stream(
+                    f, storage_path, CONTENT_TYPES.get(output_format, "audio/mpeg")
+                )
 
             # Clean up local file
             os.remove(mixed_audio_path)
@@ -258,8 +268,8 @@ class ElevenLabsService:
             if background_music:
                 mixed_audio = await self.mix_audio_tracks(
                     audio_tracks=[
-                        {"url": narration_result["audio_url"]},
-                        {"url": background_music},
+                        {"url": narration_result["audio_url"], "type": "narrator"},
+                        {"url": background_music, "type": "background_music"},
                     ],
                     user_id=user_id,
                 )
@@ -430,7 +440,10 @@ class ElevenLabsService:
                 },
             }
 
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with (
+                provider_limiter.acquire("elevenlabs", self.api_key),
+                httpx.AsyncClient(timeout=60.0) as client,
+            ):
                 response = await client.post(
                     f"{self.base_url}/text-to-speech/{voice_id}",
                     headers={
@@ -486,7 +499,10 @@ class ElevenLabsService:
                 f"ElevenLabs request - voice_id: {voice_id}, text_length: {len(text)}"
             )
 
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            async with (
+                provider_limiter.acquire("elevenlabs", self.api_key),
+                httpx.AsyncClient(timeout=60.0) as client,
+            ):
                 response = await client.post(
                     f"{self.base_url}/text-to-speech/{voice_id}",
                     headers={
@@ -509,38 +525,25 @@ class ElevenLabsService:
             return None
 
     async def _download_and_mix_audio(
-        self, audio_tracks: List[Dict[str, Any]]
+        self,
+        audio_tracks: List[Dict[str, Any]],
+        mix_settings: Optional[Dict[str, Any]] = None,
+        output_format: str = "mp3",
     ) -> Optional[str]:
-        """Download and mix audio tracks"""
+        """Download and mix audio tracks with one ffmpeg filter graph"""
         try:
-            # For now, return the first audio track as a simple implementation
-            # In a real implementation, you would use audio processing libraries
-            # like pydub or ffmpeg to mix the audio tracks
-
-            if not audio_tracks:
-                return None
-
-            first_track = audio_tracks[0]
-            audio_url = first_track.get("audio_url")
-
-            if not audio_url:
+            tracks = tracks_from_audio_files(audio_tracks, mix_settings)
+            if not tracks:
                 return None
 
-            # Download the audio file
-            async with httpx.AsyncClient() as client:
-                response = await client.get(audio_url)
-                if response.status_code == 200:
-                    # Save to temporary file
-                    timestamp = int(time.time())
-                    mixed_filename = f"mixed_audio_{timestamp}.mp3"
-                    mixed_path = os.path.join(self.audio_dir, mixed_filename)
-
-                    with open(mixed_path, "wb") as f:
-                        f.write(response.content)
-
-                    return mixed_path
-
-            return None
+            timestamp = int(time.time())
+            mixed_filename = f"mixed_audio_{timestamp}.{output_format}"
+            mixed_path = os.path.join(self.audio_dir, mixed_filename)
+            return await AudioMixer().mix(
+                tracks,
+                mixed_path,
+                MixSettings.from_request(mix_settings, output_format),
+            )
 
         except Exception as e:
             print(f"Error in _download_and_mix_audio: {e}")
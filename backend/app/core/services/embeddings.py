@@ -1,4 +1,3 @@
-import asyncio
 import openai
 from google import genai
 from google.genai import types as genai_types
@@ -9,6 +8,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.orm import selectinload
 from app.core.config import settings
 import logging
+from app.core.services.provider_limiter import provider_limiter
 from app.core.services.text_utils import TextSanitizer
 from app.books.models import Chapter, Book, ChapterEmbedding, BookEmbedding
 import uuid
@@ -33,22 +33,29 @@ class EmbeddingsService:
         """Generate embedding using Google text-embedding-004 (primary) with OpenAI fallback"""
         sanitized_text = TextSanitizer.sanitize_for_openai(text)
 
-        # Try Google first (free tier: 100 req/min for gemini-embedding-001)
+        # Try Google first (free tier: 100 req/min for gemini-embedding-001).
+        # The fleet-wide limiter paces requests; on a 429 it backs every
+        # worker off together and the retry waits for the next token.
         if self.google_client:
             for attempt in range(3):
                 try:
-                    result = self.google_client.models.embed_content(
-                        model="gemini-embedding-001",
-                        contents=sanitized_text,
-                        config=genai_types.EmbedContentConfig(output_dimensionality=1536),
-                    )
+                    async with provider_limiter.acquire(
+                        "google_embeddings", self.google_api_key
+                    ):
+                        result = self.google_client.models.embed_content(
+                            model="gemini-embedding-001",
+                            contents=sanitized_text,
+                            config=genai_types.EmbedContentConfig(output_dimensionality=1536),
+                        )
                     logger.debug("Embedding generated via Google gemini-embedding-001")
                     return result.embeddings[0].values
                 except Exception as e:
                     if "429" in str(e) or "RESOURCE_EXHAUSTED" in str(e):
-                        wait_time = (attempt + 1) * 30  # 30s, 60s, 90s
-                        logger.warning(f"Google embedding rate limited, waiting {wait_time}s (attempt {attempt + 1}/3)")
-                        await asyncio.sleep(wait_time)
+                        wait_time = (attempt + 1) * 10  # 10s, 20s, 30s
+                        logger.warning(f"Google embedding rate limited, backing off {wait_time}s (attempt {attempt + 1}/3)")
+                        await provider_limiter.backoff(
+                            "google_embeddings", self.google_api_key, wait_time
+                        )
                         continue
                     logger.warning(f"Google embedding failed, falling back to OpenAI: {e}")
                     break
@@ -110,9 +117,18 @@ class EmbeddingsService:
         return chunks
 
     async def create_chapter_embeddings(
-        self, chapter_id: uuid.UUID, content: str
+        self, chapter_id: uuid.UUID, content: str, force: bool = False
     ) -> bool:
-        """Create embeddings for a chapter's content"""
+        """
+        Create embeddings for a chapter's content.
+
+        A no-op when the chapter's embeddings were already built from this
+        exact content (see app.chapter_changes). Otherwise chunks whose text
+        is unchanged reuse their stored vectors, so only edited chunks cost a
+        provider call.
+        """
+        from app.chapter_changes.service import ChapterChangeTracker
+
         try:
             # Get chapter info
             statement = select(Chapter).where(Chapter.id == chapter_id)
@@ -123,6 +139,19 @@ class EmbeddingsService:
                 raise ValueError(f"Chapter {chapter_id} not found")
 
             book_id = chapter.book_id
+            tracker = ChapterChangeTracker(self.session)
+            source = {"content": content}
+            if not force and not await tracker.needs_rebuild(chapter, "embeddings", source=source):
+                logger.info(f"Embeddings for chapter {chapter_id} are up to date")
+                return True
+
+            # Vectors of the current chunks, reused for chunks the edit left alone
+            existing = await self.session.exec(
+                select(ChapterEmbedding.content_chunk, ChapterEmbedding.embedding).where(
+                    ChapterEmbedding.chapter_id == chapter_id
+                )
+            )
+            reusable = {chunk: vector for chunk, vector in existing.all()}
 
             # Delete existing embeddings for this chapter
             delete_stmt = delete(ChapterEmbedding).where(
@@ -133,9 +162,14 @@ class EmbeddingsService:
             # Chunk the content
             chunks = await self.chunk_text(content)
 
-            # Generate embeddings for each chunk
+            # Generate embeddings for each new or edited chunk
+            reused = 0
             for i, chunk in enumerate(chunks):
-                embedding = await self.generate_embedding(chunk["text"])
+                embedding = reusable.get(chunk["text"])
+                if embedding is None:
+                    embedding = await self.generate_embedding(chunk["text"])
+                else:
+                    reused += 1
 
                 # Store embedding
                 embedding_record = ChapterEmbedding(
@@ -149,8 +183,12 @@ class EmbeddingsService:
                 )
                 self.session.add(embedding_record)
 
+            await tracker.mark_built([chapter], "embeddings", source=source)
             await self.session.commit()
-            logger.info(f"Created {len(chunks)} embeddings for chapter {chapter_id}")
+            logger.info(
+                f"Created {len(chunks)} embeddings for chapter {chapter_id} "
+                f"({reused} reused from unchanged chunks)"
+            )
             return True
 
         except Exception as e:
@@ -250,35 +288,26 @@ class EmbeddingsService:
             # Lower distance = higher similarity
             # We can also use cosine_distance if preferred
 
-            statement = select(ChapterEmbedding, Chapter).join(Chapter)
+            # For normalized vectors, cosine similarity = 1 - (l2_distance^2) / 2
+            distance = ChapterEmbedding.embedding.l2_distance(query_embedding)
+            statement = select(ChapterEmbedding, Chapter, distance.label("distance")).join(Chapter)
 
             if book_id:
                 statement = statement.where(ChapterEmbedding.book_id == book_id)
 
             # Order by distance
-            statement = statement.order_by(
-                ChapterEmbedding.embedding.l2_distance(query_embedding)
-            )
+            statement = statement.order_by(distance)
             statement = statement.limit(limit)
 
             results = await self.session.exec(statement)
 
             formatted_results = []
-            for embedding_record, chapter in results:
-                # Calculate similarity score (approximate from distance)
-                # For normalized vectors, cosine similarity = 1 - (l2_distance^2) / 2
-                # Or just return distance. The original code returned similarity.
-                # Let's assume similarity roughly correlates inversely with distance.
-                # We can compute exact distance if needed, but for now let's just return the record.
-
-                # To filter by threshold, we might need to fetch distance.
-                # SQLModel doesn't easily return the computed distance in the select unless we add it to select.
-
+            for embedding_record, chapter, chunk_distance in results:
                 formatted_results.append(
                     {
                         "chapter": chapter.model_dump(),  # Convert to dict
                         "content_chunk": embedding_record.content_chunk,
-                        "similarity": 0.9,  # Placeholder, or calculate if possible
+                        "similarity": 1.0 - (float(chunk_distance) ** 2) / 2,
                         "chunk_index": embedding_record.chunk_index,
                     }
                 )
@@ -18,7 +18,6 @@ Usage:
 
 import asyncio
 import os
-import subprocess
 import tempfile
 import uuid as uuid_lib
 from typing import Dict, Any, Optional, List, Tuple
@@ -26,6 +25,7 @@ from urllib.parse import urlparse, urlunparse
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.tracing.tracer import traced_run
 
 logger = get_logger()
 
@@ -111,7 +111,7 @@ async def extract_last_frame(
             "default=noprint_wrappers=1:nokey=1",
             video_path,
         ]
-        result = subprocess.run(probe_cmd, capture_output=True, text=True)
+        result = traced_run(probe_cmd, capture_output=True, text=True)
         duration = float(result.stdout.strip()) if result.stdout.strip() else 0.0
         seek_time = max(0, duration - seek_offset_seconds)
 
@@ -128,7 +128,7 @@ async def extract_last_frame(
             "2",
             frame_path,
         ]
-        subprocess.run(extract_cmd, capture_output=True, check=True)
+        traced_run(extract_cmd, capture_output=True, check=True)
 
         if not os.path.exists(frame_path):
             logger.warning("[LAST FRAME] ffmpeg completed without frame output")
@@ -229,7 +229,7 @@ def apply_letterbox(
         ]
 
         logger.info(f"[LETTERBOX] Running FFmpeg: {' '.join(cmd)}")
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = traced_run(cmd, capture_output=True, text=True)
 
         if result.returncode != 0:
             raise Exception(f"FFmpeg letterboxing failed: {result.stderr}")
@@ -317,7 +317,7 @@ def apply_letterbox_to_dimensions(
             output_path,
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = traced_run(cmd, capture_output=True, text=True)
 
         if result.returncode != 0:
             raise Exception(f"FFmpeg letterboxing failed: {result.stderr}")
@@ -408,7 +408,7 @@ def apply_crossfade_transition(
         ]
 
         logger.info(f"[CROSSFADE] Running FFmpeg with xfade filter")
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = traced_run(cmd, capture_output=True, text=True)
 
         if result.returncode != 0:
             raise Exception(f"FFmpeg crossfade failed: {result.stderr}")
@@ -463,7 +463,7 @@ def concatenate_with_transitions(
         if len(video_paths) < 2:
             # Single video, just copy it
             if len(video_paths) == 1:
-                subprocess.run(["cp", video_paths[0], output_path], check=True)
+                traced_run(["cp", video_paths[0], output_path], check=True)
                 return {
                     "status": "success",
                     "output_path": output_path,
@@ -551,7 +551,7 @@ def concatenate_with_transitions(
         )
 
         logger.info(f"[CONCAT TRANSITIONS] Running FFmpeg with chained xfade")
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = traced_run(cmd, capture_output=True, text=True)
 
         if result.returncode != 0:
             raise Exception(f"FFmpeg concatenation failed: {result.stderr}")
@@ -637,7 +637,7 @@ def apply_fade_in_out(
             output_path,
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = traced_run(cmd, capture_output=True, text=True)
 
         if result.returncode != 0:
             raise Exception(f"FFmpeg fade failed: {result.stderr}")
@@ -684,7 +684,7 @@ def _get_video_dimensions(video_path: str) -> Tuple[Optional[int], Optional[int]
             "csv=p=0",
             video_path,
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = traced_run(cmd, capture_output=True, text=True)
         if result.returncode == 0:
             parts = result.stdout.strip().split(",")
             if len(parts) >= 2:
@@ -707,7 +707,7 @@ def _get_video_duration(video_path: str) -> Optional[float]:
             "default=noprint_wrappers=1:nokey=1",
             video_path,
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = traced_run(cmd, capture_output=True, text=True)
         if result.returncode == 0:
             return float(result.stdout.strip())
     except Exception as e:
@@ -731,7 +731,7 @@ def _get_audio_duration(audio_path: str) -> Optional[float]:
             "default=noprint_wrappers=1:nokey=1",
             audio_path,
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
+        result = traced_run(cmd, capture_output=True, text=True, timeout=15)
         if result.returncode == 0 and result.stdout.strip():
             val = float(result.stdout.strip())
             if val > 0:
@@ -741,6 +741,21 @@ def _get_audio_duration(audio_path: str) -> Optional[float]:
     return None
 
 
+def download_to_file(url: str, local_path: str, timeout: Optional[float] = None) -> None:
+    """Stream ``url`` to ``local_path`` with requests (blocking).
+
+    Async callers run this through ``asyncio.to_thread`` so the download does
+    not stall the worker's shared event loop.
+    """
+    import requests as _requests
+
+    resp = _requests.get(url, timeout=timeout, stream=True)
+    resp.raise_for_status()
+    with open(local_path, "wb") as f:
+        for chunk in resp.iter_content(chunk_size=8192):
+            f.write(chunk)
+
+
 async def probe_audio_duration_from_url(audio_url: str) -> Optional[float]:
     """Probe audio file duration from a URL using ffprobe (KAN-166).
 
@@ -748,13 +763,12 @@ async def probe_audio_duration_from_url(audio_url: str) -> Optional[float]:
     may not support all URL schemes directly. Returns None on failure.
     """
     import tempfile
-    import requests as _requests
 
     if not audio_url:
         return None
 
     # Try direct probing first (ffprobe supports many URLs natively)
-    duration = _get_audio_duration(audio_url)
+    duration = await asyncio.to_thread(_get_audio_duration, audio_url)
     if duration is not None:
         return duration
 
@@ -762,12 +776,8 @@ async def probe_audio_duration_from_url(audio_url: str) -> Optional[float]:
     try:
         with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
             tmp_path = tmp.name
-        resp = _requests.get(audio_url, timeout=15, stream=True)
-        resp.raise_for_status()
-        with open(tmp_path, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                f.write(chunk)
-        duration = _get_audio_duration(tmp_path)
+        await asyncio.to_thread(download_to_file, audio_url, tmp_path, 15)
+        duration = await asyncio.to_thread(_get_audio_duration, tmp_path)
         return duration
     except Exception as e:
         logger.error(f"[FFPROBE] Error probing audio duration from URL: {e}")
@@ -893,7 +903,7 @@ def trim_audio_file_sync(input_path: str, output_path: str, max_duration: float)
         "-c", "copy",
         output_path,
     ]
-    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+    result = traced_run(cmd, capture_output=True, text=True, timeout=30)
     if result.returncode != 0:
         logger.error(f"[TRIM AUDIO] ffmpeg failed: {result.stderr[:200]}")
         return False
@@ -914,7 +924,6 @@ async def download_trim_and_upload(
     if trimming fails.
     """
     import tempfile
-    import requests as _requests
     import shutil
 
     if not source_url or max_duration <= 0:
@@ -926,11 +935,7 @@ async def download_trim_and_upload(
 
     try:
         # Download original
-        resp = _requests.get(source_url, timeout=60, stream=True)
-        resp.raise_for_status()
-        with open(tmp_input, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                f.write(chunk)
+        await asyncio.to_thread(download_to_file, source_url, tmp_input, 60)
 
         # Trim with ffmpeg
         cmd = [
@@ -939,7 +944,9 @@ async def download_trim_and_upload(
             "-c", "copy",
             tmp_output,
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        result = await asyncio.to_thread(
+            traced_run, cmd, capture_output=True, text=True, timeout=30
+        )
         if result.returncode != 0 or not os.path.exists(tmp_output) or os.path.getsize(tmp_output) == 0:
             logger.error(f"[TRIM] ffmpeg failed: {result.stderr[:200]}")
             # Fallback: upload original
@@ -956,7 +963,7 @@ async def download_trim_and_upload(
         # if input was already shorter; always return the probed value capped at max_duration.
         actual_dur = max_duration
         try:
-            probed = _get_audio_duration(tmp_output)
+            probed = await asyncio.to_thread(_get_audio_duration, tmp_output)
             if probed and probed > 0:
                 actual_dur = min(probed, max_duration)
         except Exception as probe_err:
@@ -21,6 +21,18 @@ import hashlib
 import json
 import time
 from app.core.services.text_utils import TextSanitizer, LogSanitizer
+from app.core.services.line_classifier import (
+    BLANK,
+    CHAPTER,
+    PAGE_NUMBER,
+    SECTION,
+    SPECIAL,
+    TOC_ENTRY,
+    TOC_HEADING,
+    LineIndex,
+    compile_patterns,
+)
+from app.core.services.title_locator import TitleLocator
 import itertools
 import traceback
 import ebooklib
@@ -210,6 +222,23 @@ class BookStructureDetector:
             r"(?i)^glossary[\s\-:]*(.*)$",
         ]
 
+        self.TOC_SECTION_PATTERNS = [
+            r"(?i)^contents?$",
+            r"(?i)^table\s+of\s+contents?$",
+            r"(?i)^contents\s+page$",
+        ]
+
+        # Common running header/footer patterns (searched in lowercased text)
+        self.RUNNING_HEADER_PATTERNS = [
+            r"^page \d+",  # "Page 123"
+            r"^\d+ - ",  # "123 - Book Title"
+            r" - \d+$",  # "Book Title - 123"
+            r"^chapter \d+ - ",  # "Chapter 1 - Title"
+        ]
+
+        # Line index of the book currently being detected (see _get_line_index)
+        self._line_index: Optional[LineIndex] = None
+
     @staticmethod
     def _with_generation_flag(item: Dict[str, Any]) -> Dict[str, Any]:
         """Mark read-only matter so downstream generation can exclude it."""
@@ -383,13 +412,15 @@ class BookStructureDetector:
             )
             chapter_group = []
 
-        for line_num, line in enumerate(lines):
-            line = line.strip()
-            if not line:
+        index = self._get_line_index(lines)
+
+        for line_num, line in enumerate(index.stripped):
+            flags = index.flags[line_num]
+            if flags & BLANK:
                 continue
 
             # Skip if we're in a TOC section
-            if self._is_toc_section(line):
+            if flags & TOC_HEADING:
                 in_toc_section = True
                 continue
 
@@ -403,21 +434,16 @@ class BookStructureDetector:
                 continue
 
             # Skip obvious TOC entries
-            if (
-                self._is_toc_entry(line)
-                and not self._match_section_patterns(line)
-                and not self._match_special_sections(line)
-                and not self._match_chapter_patterns(line)
-            ):
+            if flags & TOC_ENTRY and not flags & (SECTION | SPECIAL | CHAPTER):
                 continue
 
             # Check if line matches any section pattern
-            section_match = self._match_section_patterns(line)
+            section_match = index.section_matches.get(line_num)
             if section_match:
                 # Verify this isn't a TOC entry by checking following content
-                if self._has_substantial_following_content(
-                    lines, line_num
-                ) or self._has_following_chapter_before_next_section(lines, line_num):
+                if index.has_substantial_following_content(
+                    line_num
+                ) or index.has_following_chapter_before_next_section(line_num):
                     _flush_chapter_group()
                     # Save previous section if exists
                     if current_section:
@@ -436,10 +462,8 @@ class BookStructureDetector:
                 continue
 
             # Check for special sections (preface, introduction, etc.)
-            special_match = self._match_special_sections(line)
-            if special_match and self._has_substantial_following_content(
-                lines, line_num
-            ):
+            special_match = index.special_matches.get(line_num)
+            if special_match and index.has_substantial_following_content(line_num):
                 _flush_chapter_group()
                 # Save previous section if exists
                 if current_section:
@@ -459,10 +483,8 @@ class BookStructureDetector:
                 continue
 
             # Check if line matches chapter pattern
-            chapter_match = self._match_chapter_patterns(line)
-            if chapter_match and self._has_substantial_following_content(
-                lines, line_num
-            ):
+            chapter_match = index.chapter_matches.get(line_num)
+            if chapter_match and index.has_substantial_following_content(line_num):
                 # Build a proper title
                 chapter_number = chapter_match["number"]
                 chapter_subtitle = chapter_match.get("title", "").strip()
@@ -474,11 +496,11 @@ class BookStructureDetector:
                     # No subtitle, look for title in next few lines
                     title_found = None
                     for i in range(line_num + 1, min(line_num + 5, len(lines))):
-                        next_line = lines[i].strip()
+                        next_line = index.stripped[i]
                         if not next_line:
                             continue
                         if self._is_semantic_heading_candidate(next_line):
-                            if not self._match_chapter_patterns(next_line):
+                            if not index.flags[i] & CHAPTER:
                                 title_found = next_line
                                 break
 
@@ -572,53 +594,48 @@ class BookStructureDetector:
             ),
         }
 
+    def _get_line_index(self, lines: List[str]) -> LineIndex:
+        """
+        Classify every line once and reuse the result for the same list.
+
+        The index is cached by list identity, so helpers called with the
+        ``lines`` list of the book being detected share one pass over it.
+        """
+        if self._line_index is None or self._line_index.lines is not lines:
+            self._line_index = LineIndex(
+                lines,
+                match_chapter=self._match_chapter_patterns,
+                match_section=self._match_section_patterns,
+                match_special=self._match_special_sections,
+                toc_heading=compile_patterns(tuple(self.TOC_SECTION_PATTERNS)),
+                toc_entry=compile_patterns(tuple(self.TOC_PATTERNS)),
+                is_running_header=self._is_running_header_or_footer,
+            )
+        return self._line_index
+
     def _is_toc_section(self, line: str) -> bool:
         """Check if we're entering a TOC section"""
-        toc_indicators = [
-            r"(?i)^contents?$",
-            r"(?i)^table\s+of\s+contents?$",
-            r"(?i)^contents\s+page$",
-        ]
-        return any(re.match(pattern, line) for pattern in toc_indicators)
+        return compile_patterns(tuple(self.TOC_SECTION_PATTERNS)).match(line) is not None
 
     def _is_toc_entry(self, line: str) -> bool:
         """Check if a line is a TOC entry"""
-        for pattern in self.TOC_PATTERNS:
-            if re.match(pattern, line):
-                return True
-        return False
+        return compile_patterns(tuple(self.TOC_PATTERNS)).match(line) is not None
 
     def _has_substantial_following_content(
         self, lines: List[str], start_line: int, min_lines: int = 10
     ) -> bool:
-        """Check if there's substantial content following this line"""
-        content_lines = 0
-        total_content = ""
-
-        for i in range(
-            start_line + 1, min(len(lines), start_line + 20)
-        ):  # Check next 20 lines
-            line = lines[i].strip()
-            if line and not re.match(r"^\d+$", line):  # Skip page numbers
-                content_lines += 1
-                total_content += line + " "
-
-        # Must have multiple lines and substantial text
-        return content_lines >= min_lines and len(total_content.strip()) > 200
+        """Check if there's substantial content following this line (next 20 lines)"""
+        return self._get_line_index(lines).has_substantial_following_content(
+            start_line, min_lines
+        )
 
     def _has_following_chapter_before_next_section(
         self, lines: List[str], start_line: int
     ) -> bool:
         """Accept bare PART headings when real chapters follow immediately."""
-        for i in range(start_line + 1, min(len(lines), start_line + 40)):
-            line = lines[i].strip()
-            if not line:
-                continue
-            if self._match_section_patterns(line):
-                return False
-            if self._match_chapter_patterns(line):
-                return True
-        return False
+        return self._get_line_index(lines).has_following_chapter_before_next_section(
+            start_line
+        )
 
     def _normalize_chapter_number(self, number: str) -> str:
         """Normalize chapter numbers (convert Roman to Arabic)"""
@@ -723,8 +740,11 @@ class BookStructureDetector:
         )
         print(f"[CONTENT EXTRACTION] Starting from line {start_line}")
 
+        index = self._get_line_index(lines)
+
         for i in range(start_line, len(lines)):
-            line = lines[i].strip()
+            line = index.stripped[i]
+            flags = index.flags[i]
 
             # Skip empty lines at the beginning
             if not content_lines and not line:
@@ -736,18 +756,18 @@ class BookStructureDetector:
             # Fast path optimization: check if line might be a chapter header
             if len(line) < 150:
                 # If it's just a number, do the relaxed check
-                if re.match(r"^(\d+)$", line) and i < len(lines) - 5:
+                if flags & PAGE_NUMBER and i < len(lines) - 5:
                     for j in range(i + 1, min(i + 5, len(lines))):
-                        next_line = lines[j].strip()
+                        next_line = index.stripped[j]
                         if not next_line:
                             continue
                         # If next line looks like a title or matches pattern
                         if (
                             10 < len(next_line) < 100 and next_line[0].isupper()
-                        ) or self._match_chapter_patterns(next_line):
+                        ) or index.flags[j] & CHAPTER:
                             is_chapter_break = True
                             break
-                elif self._match_chapter_patterns(line):
+                elif flags & CHAPTER:
                     # Also stop if we explicitly match a chapter pattern
                     is_chapter_break = True
 
@@ -759,7 +779,7 @@ class BookStructureDetector:
                 break
 
             # Skip page numbers, headers, footers
-            if re.match(r"^\d+$", line) or len(line) < 3:
+            if flags & PAGE_NUMBER or len(line) < 3:
                 continue
 
             # Stop at bibliography/back-matter sections that should not bleed into the
@@ -777,7 +797,7 @@ class BookStructureDetector:
                 break
 
             # KAN-367 v3: Also stop when any special section heading is encountered
-            if self._match_special_sections(line):
+            if flags & SPECIAL:
                 print(
                     f"[CONTENT EXTRACTION] Stopped at special section: "
                     f"{LogSanitizer.redact(line, label='line')}"
@@ -795,16 +815,14 @@ class BookStructureDetector:
     def _find_chapter_number_and_title(self, lines: List[str]) -> List[Dict[str, Any]]:
         """Find chapters by looking for number + title pattern - MORE RESTRICTIVE"""
         chapter_headers = []
+        index = self._get_line_index(lines)
 
-        for line_num, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
-
+        for line_num, line in enumerate(index.stripped):
             # Look for just a number on its own line
-            number_match = re.match(r"^(\d+)$", line)
-            if number_match and line_num < len(lines) - 5:  # Must have content after
-                chapter_number = int(number_match.group(1))
+            if not index.flags[line_num] & PAGE_NUMBER:
+                continue
+            if line_num < len(lines) - 5:  # Must have content after
+                chapter_number = int(line)
 
                 # FIX: Be more restrictive about chapter numbers
                 if chapter_number > 200:  # Skip obviously wrong numbers (was 100, raised for large books like Moby-Dick)
@@ -817,14 +835,14 @@ class BookStructureDetector:
                 for next_line_num in range(
                     line_num + 1, min(line_num + 10, len(lines))
                 ):
-                    next_line = lines[next_line_num].strip()
+                    next_line = index.stripped[next_line_num]
 
                     # Skip empty lines and very short lines
                     if not next_line or len(next_line) < 5:
                         continue
 
                     # Skip page numbers or single words
-                    if re.match(r"^\d+$", next_line) or len(next_line.split()) < 2:
+                    if index.flags[next_line_num] & PAGE_NUMBER or len(next_line.split()) < 2:
                         continue
 
                     # FIX: More restrictive title validation
@@ -837,8 +855,8 @@ class BookStructureDetector:
                 if (
                     chapter_title
                     and title_line_num
-                    and self._has_substantial_following_content(
-                        lines, title_line_num, min_lines=8
+                    and index.has_substantial_following_content(
+                        title_line_num, min_lines=8
                     )
                     and chapter_number <= 150
                 ):  # Reasonable chapter count limit (was 50, raised for large books)
@@ -862,53 +880,36 @@ class BookStructureDetector:
 
     def _is_running_header_or_footer(self, text: str) -> bool:
         """Check if text is a running header or footer"""
-        text_lower = text.lower()
-
-        # Common running header/footer patterns
-        running_patterns = [
-            r"^page \d+",  # "Page 123"
-            r"^\d+ - ",  # "123 - Book Title"
-            r" - \d+$",  # "Book Title - 123"
-            r"^chapter \d+ - ",  # "Chapter 1 - Title"
-        ]
-
         # Check if it's too short (likely page number or header)
         if len(text.split()) <= 2:
             return True
 
-        # Check patterns
-        for pattern in running_patterns:
-            if re.search(pattern, text_lower):
-                return True
-
-        return False
+        running_patterns = compile_patterns(tuple(self.RUNNING_HEADER_PATTERNS))
+        return running_patterns.regex.search(text.lower()) is not None
 
     def _find_all_chapter_headers(self, lines: List[str]) -> List[Dict[str, Any]]:
         """Find all potential chapter headers in the content"""
         chapter_headers = []
+        index = self._get_line_index(lines)
+        chapter_patterns = compile_patterns(tuple(self.CHAPTER_PATTERNS), re.IGNORECASE)
 
-        for line_num, line in enumerate(lines):
-            line = line.strip()
-            if not line:
+        for line_num, line in enumerate(index.stripped):
+            if index.flags[line_num] & BLANK:
                 continue
 
             # Look for chapter patterns
-            for pattern in self.CHAPTER_PATTERNS:
-                match = re.match(pattern, line, re.IGNORECASE)
-                if match:
-                    # Verify this has substantial following content
-                    if self._has_substantial_following_content(
-                        lines, line_num, min_lines=5
-                    ):
-                        chapter_headers.append(
-                            {
-                                "line_num": line_num,
-                                "title": line,
-                                "number": match.group(1),
-                                "pattern": pattern,
-                            }
-                        )
-                        break
+            match = chapter_patterns.match(line)
+            # Verify this has substantial following content
+            if match and index.has_substantial_following_content(line_num, min_lines=5):
+                pattern_index, groups = match
+                chapter_headers.append(
+                    {
+                        "line_num": line_num,
+                        "title": line,
+                        "number": groups[0],
+                        "pattern": chapter_patterns.patterns[pattern_index],
+                    }
+                )
 
         print(f"[CHAPTER DETECTION] Found {len(chapter_headers)} potential chapters")
         for header in chapter_headers:
@@ -918,31 +919,29 @@ class BookStructureDetector:
 
     def _match_section_patterns(self, line: str) -> Optional[Dict]:
         """Match line against section patterns"""
-        for pattern in self.SECTION_PATTERNS:
-            match = re.match(pattern, line)
-            if match:
-                return {
-                    "number": match.group(1),
-                    "title": match.group(2).strip() if len(match.groups()) > 1 else "",
-                    "type": self._get_section_type(pattern),
-                }
-        return None
+        section_patterns = compile_patterns(tuple(self.SECTION_PATTERNS))
+        match = section_patterns.match(line)
+        if not match:
+            return None
+        pattern_index, groups = match
+        return {
+            "number": groups[0],
+            "title": groups[1].strip() if len(groups) > 1 else "",
+            "type": self._get_section_type(section_patterns.patterns[pattern_index]),
+        }
 
     def _match_special_sections(self, line: str) -> Optional[Dict]:
         """Match line against special section patterns"""
-        for pattern in self.SPECIAL_SECTIONS:
-            match = re.match(pattern, line)
-            if match:
-                return {
-                    "number": "0",  # Special sections don't have numbers
-                    "title": (
-                        match.group(1).strip()
-                        if len(match.groups()) > 0
-                        else match.group(0).strip()
-                    ),
-                    "type": "special",
-                }
-        return None
+        special_patterns = compile_patterns(tuple(self.SPECIAL_SECTIONS))
+        match = special_patterns.match(line)
+        if not match:
+            return None
+        _, groups = match
+        return {
+            "number": "0",  # Special sections don't have numbers
+            "title": groups[0].strip() if groups else line.strip(),
+            "type": "special",
+        }
 
     def _roman_to_int(self, roman: str) -> int:
         """Convert Roman numeral to integer"""
@@ -998,17 +997,17 @@ class BookStructureDetector:
 
     def _match_chapter_patterns(self, line: str) -> Optional[Dict]:
         """Match line against chapter patterns"""
-        for pattern in self.CHAPTER_PATTERNS:
-            match = re.match(pattern, line)
-            if match:
-                raw_number = match.group(1)
-                normalized_number = self._normalize_chapter_number(raw_number)
-                return {
-                    "number": normalized_number,
-                    "raw_number": raw_number,
-                    "title": match.group(2).strip() if len(match.groups()) > 1 else "",
-                }
-        return None
+        match = compile_patterns(tuple(self.CHAPTER_PATTERNS)).match(line)
+        if not match:
+            return None
+        _, groups = match
+        raw_number = groups[0]
+        normalized_number = self._normalize_chapter_number(raw_number)
+        return {
+            "number": normalized_number,
+            "raw_number": raw_number,
+            "title": groups[1].strip() if len(groups) > 1 else "",
+        }
 
     def _get_section_type(self, pattern: str) -> str:
         """Determine section type from pattern"""
@@ -1039,25 +1038,14 @@ class BookStructureDetector:
         self, full_content: str, section_title: str, lines: List[str], start_line: int
     ) -> str:
         """Extract content for a specific section"""
-        content_lines = []
+        index = self._get_line_index(lines)
 
-        # Start from the line after the section title
-        for i in range(start_line + 1, len(lines)):
-            line = lines[i].strip()
-
-            # Stop if we hit another section or a real chapter heading
-            # KAN-367 v3: chapter headings must close the previous special section
-            # so ETYMOLOGY/EPILOGUE content does not bleed into real chapters.
-            if (
-                self._match_section_patterns(line)
-                or self._match_special_sections(line)
-                or self._match_chapter_patterns(line)
-            ):
-                break
-
-            content_lines.append(line)
-
-        return "\n".join(content_lines).strip()
+        # From the line after the section title, stop at another section or a
+        # real chapter heading.
+        # KAN-367 v3: chapter headings must close the previous special section
+        # so ETYMOLOGY/EPILOGUE content does not bleed into real chapters.
+        end = index.next_boundary(start_line + 1)
+        return "\n".join(index.stripped[start_line + 1 : end]).strip()
 
     def _extract_flat_chapters(self, content: str) -> List[Dict]:
         """Extract chapters when no hierarchical structure is detected.
@@ -1081,13 +1069,15 @@ class BookStructureDetector:
             "about the author", "suggested reading", "references", "notes",
         }
 
-        for line_num, line in enumerate(lines):
-            line = line.strip()
-            if not line:
+        index = self._get_line_index(lines)
+
+        for line_num, line in enumerate(index.stripped):
+            flags = index.flags[line_num]
+            if flags & BLANK:
                 continue
 
             # Skip TOC sections
-            if self._is_toc_section(line):
+            if flags & TOC_HEADING:
                 in_toc_section = True
                 continue
             if in_toc_section and len(line) > 100:
@@ -1096,16 +1086,12 @@ class BookStructureDetector:
                 continue
 
             # Skip TOC entries (e.g. "1. Title  23")
-            if (
-                self._is_toc_entry(line)
-                and not self._match_special_sections(line)
-                and not self._match_chapter_patterns(line)
-            ):
+            if flags & TOC_ENTRY and not flags & (SPECIAL | CHAPTER):
                 continue
 
             # KAN-367 v3: Check for special sections — PRESERVE, don't skip
-            special_match = self._match_special_sections(line)
-            if special_match and self._has_substantial_following_content(lines, line_num):
+            special_match = index.special_matches.get(line_num)
+            if special_match and index.has_substantial_following_content(line_num):
                 special_title = line
                 # Classify as front_matter or back_matter based on title
                 title_lower = special_title.lower().strip()
@@ -1143,10 +1129,10 @@ class BookStructureDetector:
                     )
                 continue
 
-            chapter_match = self._match_chapter_patterns(line)
+            chapter_match = index.chapter_matches.get(line_num)
             if chapter_match:
                 # Guard: require substantial following content to avoid matching page numbers
-                if not self._has_substantial_following_content(lines, line_num):
+                if not index.has_substantial_following_content(line_num):
                     print(
                         f"[FLAT CHAPTERS] Skipped "
                         f"'{LogSanitizer.redact(line, label='line')}' — "
@@ -1164,11 +1150,11 @@ class BookStructureDetector:
                 else:
                     title_found = None
                     for i in range(line_num + 1, min(line_num + 5, len(lines))):
-                        next_line = lines[i].strip()
+                        next_line = index.stripped[i]
                         if not next_line:
                             continue
                         if self._is_semantic_heading_candidate(next_line):
-                            if not self._match_chapter_patterns(next_line):
+                            if not index.flags[i] & CHAPTER:
                                 title_found = next_line
                                 break
 
@@ -1989,6 +1975,8 @@ class FileService:
     """File processing service for book uploads"""
 
     MAX_CHAPTERS = 50
+    # How far before a title occurrence to look for its "Chapter N:" prefix
+    TITLE_PREFIX_WINDOW = 64
     ROMAN_RE = r"[IVXLCDM]+"
     ROMAN_RE_LOWER = r"[ivxlcdm]+"
 
@@ -2008,8 +1996,59 @@ class FileService:
         self.upload_dir = settings.UPLOAD_DIR
         self.ai_service = AIService()
         self.structure_detector = BookStructureDetector()
+        # Shared title position index for the book text being extracted
+        self._title_locator: Optional[TitleLocator] = None
         os.makedirs(self.upload_dir, exist_ok=True)
 
+    def _get_title_locator(self, full_text: str, titles: List[str]) -> TitleLocator:
+        """
+        Title occurrence index for full_text covering titles.
+
+        Reused while the text is the same and the titles are already indexed;
+        otherwise rebuilt (one pass) with the new titles added.
+        """
+        titles = [title for title in titles if title and title.strip()]
+        locator = self._title_locator
+        if locator is None or locator.text is not full_text:
+            locator = TitleLocator(full_text, titles)
+        elif any(title not in locator for title in titles):
+            locator = TitleLocator(full_text, locator.indexed_titles + titles)
+        self._title_locator = locator
+        return locator
+
+    @staticmethod
+    def _clean_chapter_title(chapter_title: str) -> str:
+        """Title without a "Chapter N:" prefix"""
+        title_parts = chapter_title.split(":", 1)
+        return title_parts[1].strip() if len(title_parts) > 1 else chapter_title
+
+    @staticmethod
+    def _content_search_titles(chapter_title: str) -> List[str]:
+        """Title forms _extract_content_for_chapters looks for, in order"""
+        return [
+            chapter_title,  # Exact match
+            chapter_title.replace("Chapter ", "").replace(":", ""),  # Without "Chapter" prefix
+            chapter_title.split(":")[-1].strip() if ":" in chapter_title else None,  # Just the title part
+        ]
+
+    def _index_chapter_titles(self, full_text: str, chapters: List[Dict]) -> TitleLocator:
+        """Index every title form of every chapter in one pass over full_text."""
+        titles: List[str] = []
+        for chapter in chapters:
+            clean_title = self._clean_chapter_title(chapter["title"])
+            titles.extend(
+                title for title in self._content_search_titles(chapter["title"]) if title
+            )
+            titles.extend(
+                [
+                    clean_title,
+                    clean_title.upper(),
+                    clean_title.lower(),
+                    clean_title.title(),
+                ]
+            )
+        return self._get_title_locator(full_text, titles)
+
     def _extract_chapter_content(
         self, full_content: str, chapter_title: str, lines: List[str], start_line: int
     ) -> str:
@@ -3715,6 +3754,8 @@ class FileService:
         print("[CONTENT EXTRACTION] Extracting content by searching chapter titles...")
 
         final_chapters = []
+        # One pass over the text for every chapter's titles
+        locator = self._index_chapter_titles(full_text, validated_chapters)
 
         for i, chapter in enumerate(validated_chapters):
             chapter_title = chapter["title"]
@@ -3724,24 +3765,12 @@ class FileService:
             )
 
             # Search for chapter title in text (flexible matching)
-            chapter_patterns = [
-                re.escape(chapter_title),  # Exact match
-                re.escape(
-                    chapter_title.replace("Chapter ", "").replace(":", "")
-                ),  # Without "Chapter" prefix
-                (
-                    re.escape(chapter_title.split(":")[-1].strip())
-                    if ":" in chapter_title
-                    else None
-                ),  # Just the title part
-            ]
-
             content_start = None
-            for pattern in chapter_patterns:
-                if pattern:
-                    match = re.search(pattern, full_text, re.IGNORECASE)
+            for title in self._content_search_titles(chapter_title):
+                if title and title.strip():
+                    match = locator.first(title)
                     if match:
-                        content_start = match.end()
+                        content_start = match[1]
                         print(
                             f"[CONTENT EXTRACTION] Found chapter start at position {content_start}"
                         )
@@ -3758,11 +3787,9 @@ class FileService:
             content_end = len(full_text)
             if i + 1 < len(validated_chapters):
                 next_chapter = validated_chapters[i + 1]["title"]
-                next_match = re.search(
-                    re.escape(next_chapter), full_text[content_start:], re.IGNORECASE
-                )
+                next_match = locator.first(next_chapter, content_start) if next_chapter.strip() else None
                 if next_match:
-                    content_end = content_start + next_match.start()
+                    content_end = next_match[0]
 
             # Extract content
             content = full_text[content_start:content_end].strip()
@@ -4625,11 +4652,8 @@ class FileService:
 
     def _find_title_occurrences(self, full_text: str, chapter_title: str) -> List[int]:
         """Find all occurrences of the exact chapter title in the text"""
-        occurrences = []
-
         # Clean the title - remove "Chapter N:" prefix if present
-        title_parts = chapter_title.split(":", 1)
-        clean_title = title_parts[1].strip() if len(title_parts) > 1 else chapter_title
+        clean_title = self._clean_chapter_title(chapter_title)
 
         # Try multiple variations of the title
         title_variations = [
@@ -4638,19 +4662,13 @@ class FileService:
             clean_title.lower(),  # All lowercase
             clean_title.title(),  # Title case
         ]
+        title_variations = [title for title in title_variations if title]
+        if not title_variations:
+            return []
 
-        for title_var in title_variations:
-            # Find exact matches
-            start = 0
-            while True:
-                pos = full_text.find(title_var, start)
-                if pos == -1:
-                    break
-                occurrences.append(pos)
-                start = pos + 1
-
-        # Remove duplicates and sort
-        occurrences = sorted(list(set(occurrences)))
+        # Exact-case matches of any variation, from the shared title index
+        locator = self._get_title_locator(full_text, title_variations)
+        occurrences = locator.exact_positions(title_variations)
         print(
             f"[CONTENT EXTRACTION] Found {len(occurrences)} title occurrences for: "
             f"{LogSanitizer.redact(clean_title, label='title')}"
@@ -4721,30 +4739,29 @@ class FileService:
 
         # Get the next chapter title
         next_chapter = validated_chapters[current_index + 1]
-        next_title_parts = next_chapter["title"].split(":", 1)
-        next_clean_title = (
-            next_title_parts[1].strip()
-            if len(next_title_parts) > 1
-            else next_chapter["title"]
-        )
+        next_clean_title = self._clean_chapter_title(next_chapter["title"])
 
-        # Search for the next chapter title after current content start
-        search_text = full_text[
-            content_start + 1000 :
-        ]  # Skip first 1000 chars to avoid false matches
+        # Search for the next chapter title after current content start,
+        # skipping the first 1000 chars to avoid false matches
+        search_start = content_start + 1000
 
         # Try different variations of the next title
         title_variations = [
-            next_clean_title,
-            next_clean_title.upper(),
-            next_clean_title.lower(),
+            title
+            for title in (
+                next_clean_title,
+                next_clean_title.upper(),
+                next_clean_title.lower(),
+            )
+            if title
         ]
+        locator = self._get_title_locator(full_text, title_variations)
 
         for title_var in title_variations:
-            pos = search_text.find(title_var)
-            if pos != -1:
+            positions = locator.exact_positions([title_var], start=search_start)
+            if positions:
                 # Validate this is actually a chapter start, not just a reference
-                potential_end = content_start + 1000 + pos
+                potential_end = positions[0]
                 preview = full_text[potential_end - 100 : potential_end + 100]
 
                 # Make sure it's not in a TOC (no dots leading to page numbers)
@@ -4816,21 +4833,27 @@ class FileService:
         occurrences = []
 
         # Extract clean title without "Chapter N:" prefix
-        title_parts = chapter_title.split(":", 1)
-        clean_title = title_parts[1].strip() if len(title_parts) > 1 else chapter_title
+        clean_title = self._clean_chapter_title(chapter_title)
+
+        # Titled formats, from the shared title index: find the title, then
+        # check what precedes it
+        # Full format: "Chapter N: Title"; number with title: "N. Title"
+        if clean_title.strip():
+            titled_prefixes = [
+                re.compile(rf"Chapter\s+{chapter_num}\s*[:.\-]?\s*$", re.IGNORECASE),
+                re.compile(rf"{chapter_num}\s*[:.\-]\s*$", re.IGNORECASE),
+            ]
+            locator = self._get_title_locator(full_text, [clean_title])
+            for title_start in locator.positions(clean_title):
+                window_start = max(0, title_start - self.TITLE_PREFIX_WINDOW)
+                for titled_prefix in titled_prefixes:
+                    prefix = titled_prefix.search(full_text, window_start, title_start)
+                    if prefix:
+                        occurrences.append(prefix.start())
 
         # Build dynamic patterns based on common formats
         patterns = []
 
-        # Add patterns for different chapter formats
-        # Full format: "Chapter N: Title"
-        patterns.append(
-            rf"Chapter\s+{chapter_num}\s*[:.\-]?\s*{re.escape(clean_title)}"
-        )
-
-        # Number with title
-        patterns.append(rf"{chapter_num}\s*[:.\-]\s*{re.escape(clean_title)}")
-
         # Number on separate line from title
         patterns.append(
             rf"^\s*{chapter_num}\s*\n+\s*{re.escape(clean_title.split()[0])}"
@@ -5420,67 +5443,46 @@ class FileService:
         yield f"Received {len(confirmed_chapters)} confirmed chapters"
 
         try:
-            from app.books.models import (
-                Book,
-                Chapter,
-                ChapterEmbedding,
-                BookEmbedding,
-                Section,
-            )
+            from app.books.models import Book, Chapter, Section
             from sqlmodel import select, delete
             import uuid
 
             book_uuid = uuid.UUID(book_id)
 
-            # ✅ FIX: Clean old data in the CORRECT order to avoid foreign key violations
-            yield "Cleaning existing data..."
-
-            # 1. Delete chapter embeddings first (they reference chapters)
-            try:
-                stmt = delete(ChapterEmbedding).where(
-                    ChapterEmbedding.book_id == book_uuid
-                )
-                await session.exec(stmt)
-                yield "Deleted chapter embeddings"
-            except Exception as e:
-                print(
-                    f"[STRUCTURE SAVE] Warning: Failed to delete chapter embeddings: {e}"
-                )
-
-            # 2. Delete book embeddings (they reference the book)
-            try:
-                stmt = delete(BookEmbedding).where(BookEmbedding.book_id == book_uuid)
-                await session.exec(stmt)
-                yield "Deleted book embeddings"
-            except Exception as e:
-                print(
-                    f"[STRUCTURE SAVE] Warning: Failed to delete book embeddings: {e}"
-                )
+            # Chapters are updated in place rather than dropped and recreated:
+            # ids stay stable for the scripts and media keyed by them, and an
+            # edit only invalidates (and re-embeds) the chapters it touched.
+            from app.chapter_changes.service import (
+                ChapterChangeTracker,
+                invalidated_artifacts,
+                match_chapters,
+            )
+            from app.core.services.embeddings import EmbeddingsService
 
-            # 3. Delete chapters (they reference sections and book)
-            try:
-                stmt = delete(Chapter).where(Chapter.book_id == book_uuid)
-                await session.exec(stmt)
-                yield "Deleted chapters"
-            except Exception as e:
-                print(f"[STRUCTURE SAVE] Warning: Failed to delete chapters: {e}")
+            yield "Comparing with the saved structure..."
+            result = await session.exec(
+                select(Chapter)
+                .where(Chapter.book_id == book_uuid)
+                .order_by(Chapter.order_index)
+            )
+            existing_chapters = result.all()
+            result = await session.exec(select(Section.id).where(Section.book_id == book_uuid))
+            old_section_ids = list(result.all())
 
-            # 4. Delete sections (they reference book)
-            try:
-                stmt = delete(Section).where(Section.book_id == book_uuid)
-                await session.exec(stmt)
-                yield "Deleted sections"
-            except Exception as e:
-                print(f"[STRUCTURE SAVE] Warning: Failed to delete sections: {e}")
+            incoming = [
+                dict(ch, content=self._clean_text_content(ch.get("content", "")))
+                for ch in confirmed_chapters
+            ]
+            matches, removed_chapters = match_chapters(existing_chapters, incoming)
+            tracker = ChapterChangeTracker(session)
 
             # Build sections (if present)
             section_id_map: Dict[str, uuid.UUID] = {}
             order = 0
+            saved_chapters = []
+            changed = unchanged = 0
 
-            # We need to commit deletions before insertions?
-            # SQLAlchemy handles transaction, so it should be fine within same transaction.
-
-            for ch in confirmed_chapters:
+            for ch, chapter in zip(incoming, matches):
                 order += 1
                 section_id = None
                 if ch.get("section_title"):
@@ -5514,32 +5516,77 @@ class FileService:
                     if chapter_number is None:
                         chapter_number = order
 
-                chapter = Chapter(
-                    book_id=book_uuid,
-                    section_id=section_id,
-                    chapter_number=chapter_number,
-                    title=ch.get("title", f"Chapter {order}"),
-                    content=self._clean_text_content(ch.get("content", "")),
-                    summary=self._clean_text_content(ch.get("summary", "")),
-                    content_type=content_type,
-                    order_index=order,
-                )
-                session.add(chapter)
-                await session.flush()
-                await session.refresh(chapter)
-                yield f"Created {content_type}: {chapter.title}"
+                fields = {
+                    "section_id": section_id,
+                    "chapter_number": chapter_number,
+                    "title": ch.get("title", f"Chapter {order}"),
+                    "content": ch["content"],
+                    "summary": self._clean_text_content(ch.get("summary", "")),
+                    "content_type": content_type,
+                    "order_index": order,
+                }
 
-                # Create embeddings (best-effort)
+                if chapter is None:
+                    chapter = Chapter(book_id=book_uuid, **fields)
+                    session.add(chapter)
+                    await session.flush()
+                    await session.refresh(chapter)
+                    yield f"Created {content_type}: {chapter.title}"
+                else:
+                    before = {
+                        key: getattr(chapter, key)
+                        for key in ("title", "content", "summary", "chapter_number")
+                    }
+                    for key, value in fields.items():
+                        setattr(chapter, key, value)
+                    session.add(chapter)
+                    invalidated = invalidated_artifacts(before, chapter)
+                    if invalidated:
+                        await tracker.mark_dirty([chapter.id], invalidated)
+                        changed += 1
+                        yield f"Updated {content_type}: {chapter.title}"
+                    else:
+                        unchanged += 1
+                saved_chapters.append(chapter)
+
+            # Drop chapters that are no longer part of the structure
+            # (their embeddings and change-tracking rows cascade)
+            if removed_chapters:
                 try:
-                    from app.core.services.embeddings import EmbeddingsService
+                    async with session.begin_nested():
+                        stmt = delete(Chapter).where(
+                            Chapter.id.in_([c.id for c in removed_chapters])
+                        )
+                        await session.exec(stmt)
+                    yield f"Deleted {len(removed_chapters)} chapters"
+                except Exception as e:
+                    print(f"[STRUCTURE SAVE] Warning: Failed to delete chapters: {e}")
 
-                    es = EmbeddingsService(session)
-                    await es.create_chapter_embeddings(
-                        chapter.id, ch.get("content", "")
-                    )
-                    yield f"Created embeddings for chapter {chapter.id}"
+            # Previous sections are no longer referenced by any chapter
+            if old_section_ids:
+                try:
+                    async with session.begin_nested():
+                        stmt = delete(Section).where(Section.id.in_(old_section_ids))
+                        await session.exec(stmt)
+                except Exception as e:
+                    print(f"[STRUCTURE SAVE] Warning: Failed to delete sections: {e}")
+
+            await session.commit()
+            if unchanged:
+                yield f"{unchanged} chapters unchanged, keeping their embeddings"
+
+            # Create embeddings (best-effort), only where the content changed
+            to_embed = [
+                (chapter.id, chapter.content)
+                for chapter in await tracker.stale(saved_chapters, "embeddings")
+            ]
+            es = EmbeddingsService(session)
+            for chapter_id, content in to_embed:
+                try:
+                    await es.create_chapter_embeddings(chapter_id, content)
+                    yield f"Created embeddings for chapter {chapter_id}"
                 except Exception as e:
-                    print(f"[EMBEDDINGS] Failed for chapter {chapter.id}: {e}")
+                    print(f"[EMBEDDINGS] Failed for chapter {chapter_id}: {e}")
 
             # Update book metadata
             yield "Updating book metadata..."
@@ -6950,6 +6997,7 @@ Chapters:
                 model=_FILE_DEFAULT_MODEL,
                 max_tokens=4000,
                 temperature=0.1,
+                cache_site="toc_extraction",
             )
 
             content = response.choices[0].message.content.strip()
@@ -7182,6 +7230,7 @@ Chapters:
                 model=_FILE_DEFAULT_MODEL,
                 max_tokens=4000,
                 temperature=0.1,
+                cache_site="toc_extraction",
             )
 
             # Clean the response
@@ -7381,6 +7430,7 @@ Chapters:
                 model=_FILE_DEFAULT_MODEL,
                 max_tokens=4000,
                 temperature=0.1,
+                cache_site="toc_extraction",
             )
 
             result = json.loads(response.choices[0].message.content)
@@ -0,0 +1,190 @@
+"""
+Single-pass line classifier for BookStructureDetector.
+
+Structure detection used to try every raw regex string with ``re.match`` in
+turn for each line, and re-scan the following 20-40 lines from every
+candidate heading. For a long book that is O(lines x patterns) regex calls,
+repeated for each helper that looks at the same line.
+
+``PatternSet`` compiles an ordered list of patterns into one alternation. The
+first alternative that matches wins, exactly like trying each pattern in
+order. ``LineIndex`` classifies every line of a book once into a compact
+bit-flag array and keeps the match details for heading lines. It also keeps
+prefix sums of content lines and characters and "next heading" arrays. With
+those, the "substantial following content" and "chapter before next section"
+checks become O(1) lookups.
+"""
+
+import re
+from array import array
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Line flags (one byte per line)
+BLANK = 1
+PAGE_NUMBER = 2
+CHAPTER = 4
+SECTION = 8
+SPECIAL = 16
+TOC_ENTRY = 32
+TOC_HEADING = 64
+RUNNING_HEADER = 128
+
+BOUNDARY = CHAPTER | SECTION | SPECIAL
+
+_PAGE_NUMBER_RE = re.compile(r"^\d+$")
+
+# Window _has_substantial_following_content has always looked at
+FOLLOWING_CONTENT_WINDOW = 20
+FOLLOWING_CHAPTER_WINDOW = 40
+
+
+def _scope_inline_flags(pattern: str) -> str:
+    """Turn a leading global "(?i)" into a scoped group so it can be alternated."""
+    match = re.match(r"^\(\?([aiLmsux]+)\)", pattern)
+    if not match:
+        return pattern
+    return f"(?{match.group(1)}:{pattern[match.end():]})"
+
+
+class PatternSet:
+    """Ordered patterns compiled into a single regex; first match wins."""
+
+    def __init__(self, patterns: Sequence[str], flags: int = 0):
+        self.patterns = tuple(patterns)
+        parts = []
+        self._groups: List[Tuple[int, int]] = []  # (first inner group, group count)
+        group = 0
+        for index, pattern in enumerate(self.patterns):
+            inner_groups = re.compile(pattern, flags).groups
+            parts.append(f"(?P<_p{index}>{_scope_inline_flags(pattern)})")
+            self._groups.append((group + 2, inner_groups))
+            group += 1 + inner_groups
+        self.regex = re.compile("|".join(parts), flags)
+
+    def match(self, line: str) -> Optional[Tuple[int, Tuple[Optional[str], ...]]]:
+        """(index of the matching pattern, its groups) or None."""
+        match = self.regex.match(line)
+        if not match:
+            return None
+        index = int(match.lastgroup[2:])
+        first, count = self._groups[index]
+        return index, tuple(match.group(g) for g in range(first, first + count))
+
+
+@lru_cache(maxsize=64)
+def compile_patterns(patterns: Tuple[str, ...], flags: int = 0) -> PatternSet:
+    return PatternSet(patterns, flags)
+
+
+class LineIndex:
+    """
+    Per-line tags and lookups for one book, built in a single pass.
+
+    ``lines`` is kept by identity so callers holding the same list can reuse
+    the index. Match dicts for chapter, section and special lines are the
+    ones BookStructureDetector's ``_match_*`` helpers return.
+    """
+
+    def __init__(
+        self,
+        lines: List[str],
+        *,
+        match_chapter: Callable[[str], Optional[Dict[str, Any]]],
+        match_section: Callable[[str], Optional[Dict[str, Any]]],
+        match_special: Callable[[str], Optional[Dict[str, Any]]],
+        toc_heading: PatternSet,
+        toc_entry: PatternSet,
+        is_running_header: Callable[[str], bool],
+    ):
+        self.lines = lines
+        n = len(lines)
+        self.stripped: List[str] = [line.strip() for line in lines]
+        self.flags = bytearray(n)
+        self.chapter_matches: Dict[int, Dict[str, Any]] = {}
+        self.section_matches: Dict[int, Dict[str, Any]] = {}
+        self.special_matches: Dict[int, Dict[str, Any]] = {}
+
+        # Prefix sums over content lines (non-blank, not a bare page number)
+        self._content_lines = array("q", [0]) * (n + 1)
+        self._content_chars = array("q", [0]) * (n + 1)
+
+        content_lines = content_chars = 0
+        for i, line in enumerate(self.stripped):
+            flag = 0
+            if not line:
+                flag = BLANK
+            else:
+                if _PAGE_NUMBER_RE.match(line):
+                    flag |= PAGE_NUMBER
+                else:
+                    content_lines += 1
+                    content_chars += len(line)
+                if toc_heading.match(line):
+                    flag |= TOC_HEADING
+                if toc_entry.match(line):
+                    flag |= TOC_ENTRY
+                section = match_section(line)
+                if section:
+                    flag |= SECTION
+                    self.section_matches[i] = section
+                special = match_special(line)
+                if special:
+                    flag |= SPECIAL
+                    self.special_matches[i] = special
+                chapter = match_chapter(line)
+                if chapter:
+                    flag |= CHAPTER
+                    self.chapter_matches[i] = chapter
+                if is_running_header(line):
+                    flag |= RUNNING_HEADER
+            self.flags[i] = flag
+            self._content_lines[i + 1] = content_lines
+            self._content_chars[i + 1] = content_chars
+
+        # next_*[i]: first line >= i carrying the flag, or n
+        self._next_chapter = self._next_with(CHAPTER)
+        self._next_section = self._next_with(SECTION)
+        self._next_boundary = self._next_with(BOUNDARY)
+
+    def _next_with(self, mask: int) -> array:
+        n = len(self.flags)
+        nxt = array("q", [0]) * (n + 1)
+        nxt[n] = n
+        for i in range(n - 1, -1, -1):
+            nxt[i] = i if self.flags[i] & mask else nxt[i + 1]
+        return nxt
+
+    def __len__(self) -> int:
+        return len(self.flags)
+
+    def has(self, line_num: int, mask: int) -> bool:
+        return bool(self.flags[line_num] & mask)
+
+    def has_substantial_following_content(
+        self, start_line: int, min_lines: int = 10
+    ) -> bool:
+        """At least min_lines content lines and > 200 chars in the next 19 lines."""
+        lo = min(start_line + 1, len(self))
+        hi = min(len(self), start_line + FOLLOWING_CONTENT_WINDOW)
+        if hi <= lo:
+            return False
+        count = self._content_lines[hi] - self._content_lines[lo]
+        # Joined with single spaces, as the line-by-line check did
+        chars = self._content_chars[hi] - self._content_chars[lo] + max(count - 1, 0)
+        return count >= min_lines and chars > 200
+
+    def has_following_chapter_before_next_section(self, start_line: int) -> bool:
+        """A chapter heading within the next 39 lines, before any section heading."""
+        lo = start_line + 1
+        if lo >= len(self):
+            return False
+        limit = min(len(self), start_line + FOLLOWING_CHAPTER_WINDOW)
+        next_chapter = self._next_chapter[lo]
+        return next_chapter < limit and next_chapter < self._next_section[lo]
+
+    def next_boundary(self, start_line: int) -> int:
+        """First section, special or chapter heading at or after start_line."""
+        if start_line >= len(self):
+            return len(self)
+        return self._next_boundary[max(start_line, 0)]
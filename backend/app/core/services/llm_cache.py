@@ -0,0 +1,358 @@
+"""
+Opt-in response cache for deterministic chat completions.
+
+ProviderRouter.chat_completion consults this cache when the caller names a
+call site (``cache_site="keywords"``) and the request is near-deterministic:
+temperature at or below LLM_RESPONSE_CACHE_MAX_TEMPERATURE, no streaming and
+a single choice. Entries are keyed by a canonical hash of (model, messages,
+params) and expire after the call site's TTL (LLM_RESPONSE_CACHE_TTLS).
+
+Storage is bounded: responses over LLM_RESPONSE_CACHE_MAX_ENTRY_BYTES are not
+stored, and a sorted-set index evicts the oldest entries past
+LLM_RESPONSE_CACHE_MAX_ENTRIES.
+
+Concurrent identical requests are collapsed (single-flight). Inside a process
+they await the first caller's result. Across processes, the first caller
+takes a short Redis lock and the others poll for its entry before giving up
+and calling the provider themselves.
+
+Cached responses have the OpenAI shape callers already read
+(``choices[0].message.content``). Their ``usage`` is zero because nothing
+was spent; the original usage is on ``cached_usage``. Hits, misses and
+coalesced requests are counted per call site in Redis for the admin metrics.
+Every Redis failure falls open to a normal provider call.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import Counter, defaultdict
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.services.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "llm_cache"
+INDEX_KEY = f"{KEY_PREFIX}:index"
+STATS_KEY = f"{KEY_PREFIX}:stats"
+LOCK_POLL_SECONDS = 0.25
+
+# Request params that change the output; anything else (timeouts, headers)
+# is left out of the key
+_KEY_PARAMS = (
+    "temperature",
+    "top_p",
+    "max_tokens",
+    "stop",
+    "seed",
+    "response_format",
+    "tools",
+    "tool_choice",
+    "presence_penalty",
+    "frequency_penalty",
+)
+
+STAT_FIELDS = ("hits", "misses", "coalesced", "uncacheable")
+
+
+class LLMResponseCache:
+    def __init__(self, redis_service=redis_client, sleep=asyncio.sleep):
+        self.redis = redis_service
+        self.sleep = sleep
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.local_stats: Dict[str, Counter] = defaultdict(Counter)
+
+    # ------------------------------------------------------------------
+    # Keys and policy
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def cacheable(params: Dict[str, Any]) -> bool:
+        temperature = params.get("temperature")
+        return (
+            settings.LLM_RESPONSE_CACHE_ENABLED
+            and temperature is not None
+            and temperature <= settings.LLM_RESPONSE_CACHE_MAX_TEMPERATURE
+            and not params.get("stream")
+            and params.get("n", 1) == 1
+        )
+
+    @staticmethod
+    def cache_key(model: str, messages: List[Dict[str, Any]], params: Dict[str, Any]) -> str:
+        canonical = json.dumps(
+            {
+                "model": model,
+                "messages": messages,
+                "params": {k: params[k] for k in _KEY_PARAMS if params.get(k) is not None},
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        )
+        return f"{KEY_PREFIX}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()}"
+
+    @staticmethod
+    def ttl_for(site: str) -> int:
+        return settings.LLM_RESPONSE_CACHE_TTLS.get(
+            site, settings.LLM_RESPONSE_CACHE_DEFAULT_TTL_SECONDS
+        )
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    async def get_or_call(
+        self,
+        site: str,
+        model: str,
+        messages: List[Dict[str, Any]],
+        params: Dict[str, Any],
+        call: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Cached response for the request, or call() once for all concurrent callers."""
+        if not self.cacheable(params):
+            await self._count(site, "uncacheable")
+            return await call()
+
+        key = self.cache_key(model, messages, params)
+        leader = self._inflight.get(key)
+        if leader is not None:
+            try:
+                payload = await asyncio.shield(leader)
+            except _Uncached:
+                return await call()
+            except asyncio.CancelledError:
+                if not leader.cancelled():
+                    raise
+                return await call()
+            await self._count(site, "coalesced")
+            return self.to_response(payload)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            payload = await self._read(key)
+            if payload is not None:
+                await self._count(site, "hits")
+                future.set_result(payload)
+                return self.to_response(payload)
+
+            locked = await self._lock(key)
+            if not locked:
+                payload = await self._wait_for_entry(key)
+                if payload is not None:
+                    await self._count(site, "coalesced")
+                    future.set_result(payload)
+                    return self.to_response(payload)
+
+            try:
+                response = await call()
+                payload = self.to_payload(response)
+                if payload is not None:
+                    await self._write(key, payload, self.ttl_for(site))
+                await self._count(site, "misses")
+            finally:
+                if locked:
+                    await self._unlock(key)
+
+            if payload is None:
+                # Nothing storable; followers make their own call
+                future.set_exception(_Uncached())
+            else:
+                future.set_result(payload)
+            return response
+        except BaseException as exc:
+            if not future.done():
+                if isinstance(exc, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(exc)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+            if future.done() and not future.cancelled():
+                # Marks a failure as retrieved so asyncio does not log it
+                future.exception()
+
+    # ------------------------------------------------------------------
+    # Response shape
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def to_payload(response: Any) -> Optional[Dict[str, Any]]:
+        try:
+            choice = response.choices[0]
+            content = choice.message.content
+        except (AttributeError, IndexError, TypeError):
+            return None
+        if not content:
+            return None
+        usage = getattr(response, "usage", None)
+        return {
+            "content": content,
+            "finish_reason": getattr(choice, "finish_reason", None),
+            "model": getattr(response, "model", None),
+            "usage": {
+                field: getattr(usage, field, 0) or 0
+                for field in ("prompt_tokens", "completion_tokens", "total_tokens")
+            },
+            "cached_at": time.time(),
+        }
+
+    @staticmethod
+    def to_response(payload: Dict[str, Any]) -> Any:
+        return SimpleNamespace(
+            choices=[
+                SimpleNamespace(
+                    message=SimpleNamespace(role="assistant", content=payload["content"]),
+                    finish_reason=payload.get("finish_reason"),
+                )
+            ],
+            usage=SimpleNamespace(prompt_tokens=0, completion_tokens=0, total_tokens=0),
+            cached_usage=SimpleNamespace(**payload["usage"]),
+            model=payload.get("model"),
+            cached=True,
+        )
+
+    # ------------------------------------------------------------------
+    # Redis
+    # ------------------------------------------------------------------
+
+    async def _client(self):
+        if not getattr(self.redis, "is_connected", False):
+            await self.redis.connect()
+        return self.redis.redis_client if self.redis.is_connected else None
+
+    async def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            if await self._client() is None:
+                return None
+            payload = await self.redis.get(key)
+        except Exception as exc:
+            logger.warning("[LLM CACHE] Read failed open: %s", exc)
+            return None
+        return payload if isinstance(payload, dict) and "content" in payload else None
+
+    async def _write(self, key: str, payload: Dict[str, Any], ttl: int) -> None:
+        serialized = json.dumps(payload)
+        if len(serialized.encode("utf-8")) > settings.LLM_RESPONSE_CACHE_MAX_ENTRY_BYTES:
+            return
+        try:
+            client = await self._client()
+            if client is None:
+                return
+            await client.set(key, serialized, ex=ttl)
+            await client.zadd(INDEX_KEY, {key: time.time()})
+            overflow = await client.zcard(INDEX_KEY) - settings.LLM_RESPONSE_CACHE_MAX_ENTRIES
+            if overflow > 0:
+                evicted = await client.zrange(INDEX_KEY, 0, overflow - 1)
+                if evicted:
+                    await client.delete(*evicted)
+                    await client.zrem(INDEX_KEY, *evicted)
+        except Exception as exc:
+            logger.warning("[LLM CACHE] Write failed open: %s", exc)
+
+    async def _lock(self, key: str) -> bool:
+        """True if this caller should compute the entry."""
+        try:
+            client = await self._client()
+            if client is None:
+                return True
+            acquired = await client.set(
+                f"{key}:lock", "1", nx=True, ex=settings.LLM_RESPONSE_CACHE_LOCK_SECONDS
+            )
+            return bool(acquired)
+        except Exception as exc:
+            logger.warning("[LLM CACHE] Lock failed open: %s", exc)
+            return True
+
+    async def _unlock(self, key: str) -> None:
+        try:
+            client = await self._client()
+            if client is not None:
+                await client.delete(f"{key}:lock")
+        except Exception as exc:
+            logger.warning("[LLM CACHE] Unlock failed: %s", exc)
+
+    async def _wait_for_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Poll for an entry another process is computing, until its lock goes away."""
+        deadline = time.monotonic() + settings.LLM_RESPONSE_CACHE_LOCK_SECONDS
+        while time.monotonic() < deadline:
+            await self.sleep(LOCK_POLL_SECONDS)
+            payload = await self._read(key)
+            if payload is not None:
+                return payload
+            try:
+                client = await self._client()
+                if client is None or not await client.exists(f"{key}:lock"):
+                    return None
+            except Exception:
+                return None
+        return None
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    async def _count(self, site: str, field: str) -> None:
+        self.local_stats[site][field] += 1
+        try:
+            client = await self._client()
+            if client is not None:
+                await client.hincrby(STATS_KEY, f"{site}:{field}", 1)
+        except Exception:
+            pass
+
+    async def stats(self) -> Dict[str, Any]:
+        """Hit rates per call site, across processes when Redis is available."""
+        counts: Dict[str, Counter] = defaultdict(Counter)
+        source = "redis"
+        try:
+            client = await self._client()
+            raw = await client.hgetall(STATS_KEY) if client is not None else None
+        except Exception:
+            raw = None
+        if raw is None:
+            source = "local"
+            for site, site_counts in self.local_stats.items():
+                counts[site].update(site_counts)
+        else:
+            for field, value in raw.items():
+                field = field.decode() if isinstance(field, bytes) else field
+                site, _, name = field.rpartition(":")
+                counts[site][name] += int(value)
+
+        sites = {}
+        totals: Counter = Counter()
+        for site, site_counts in sorted(counts.items()):
+            totals.update(site_counts)
+            sites[site] = _summarize(site_counts, self.ttl_for(site))
+        return {
+            "source": source,
+            "enabled": settings.LLM_RESPONSE_CACHE_ENABLED,
+            "overall": _summarize(totals),
+            "sites": sites,
+        }
+
+
+class _Uncached(Exception):
+    """The leader's response could not be cached; followers call the provider."""
+
+
+def _summarize(counts: Counter, ttl: Optional[int] = None) -> Dict[str, Any]:
+    served = counts["hits"] + counts["coalesced"]
+    lookups = served + counts["misses"]
+    summary = {field: counts[field] for field in STAT_FIELDS}
+    summary["hit_rate"] = round(100 * served / lookups, 2) if lookups else 0.0
+    if ttl is not None:
+        summary["ttl_seconds"] = ttl
+    return summary
+
+
+llm_response_cache = LLMResponseCache()
@@ -0,0 +1,241 @@
+"""
+Batched writes for generated media rows, and coalesced progress updates.
+
+Stage loops used to INSERT one image_generations / audio_generations /
+video_segments row per item and commit after each. MediaBatchWriter
+accumulates a stage's rows and writes each table's rows with a single
+executemany INSERT ... ON CONFLICT (id) DO NOTHING, committing once per batch:
+
+    async with MediaBatchWriter(session_factory=async_session) as media:
+        for scene in scenes:
+            ...
+            record_id = await media.add(AudioGeneration(...))
+    # remaining rows are written here, also when the loop raised
+
+Ids are assigned client-side, so callers have them before the row is written
+(credit ref_ids, task results), and ON CONFLICT makes a re-flush harmless.
+Rows become visible every MEDIA_WRITE_BATCH_SIZE rows and at the end of the
+stage. When a batch fails its rows are retried one at a time, so a bad row
+costs only itself; a row that still fails is logged and dropped rather than
+failing the stage, as the per-row inserts it replaces did.
+
+With session_factory a short-lived session is opened per flush, so a loop
+does not hold a connection across provider calls; with session the caller's
+session is used and committed.
+
+ProgressWriter coalesces progress UPDATEs of one row: unchanged values are
+dropped, and updates closer together than PROGRESS_WRITE_MIN_INTERVAL_SECONDS
+are merged and written once the interval has passed. Final updates are
+written immediately; cancel() drops what is still pending.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _raw_table(name: str, values: Dict[str, Any]) -> sa.TableClause:
+    """Lightweight table over the given columns; dict/list values bind as JSONB."""
+    return sa.table(
+        name,
+        *(
+            sa.column(key, JSONB() if isinstance(value, (dict, list)) else None)
+            for key, value in values.items()
+        ),
+    )
+
+
+def _instance_row(instance: Any) -> Tuple[sa.Table, Dict[str, Any]]:
+    table = type(instance).__table__
+    row = {}
+    for column in table.columns:
+        value = getattr(instance, column.name, None)
+        if value is None and column.server_default is not None:
+            continue  # let the database fill it
+        row[column.name] = value
+    return table, row
+
+
+class MediaBatchWriter:
+    """Accumulates a stage's media rows and writes them in batches."""
+
+    def __init__(
+        self,
+        session: Optional[AsyncSession] = None,
+        *,
+        session_factory: Optional[Callable[[], Any]] = None,
+        batch_size: Optional[int] = None,
+    ):
+        if (session is None) == (session_factory is None):
+            raise ValueError("Pass exactly one of session or session_factory")
+        self.session = session
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size or settings.MEDIA_WRITE_BATCH_SIZE)
+        self.written = 0
+        self._pending: List[Tuple[sa.Table, Dict[str, Any]]] = []
+
+    async def add(self, instance: Any) -> uuid.UUID:
+        """Queue an ORM table instance; returns its id."""
+        if getattr(instance, "id", None) is None:
+            instance.id = uuid.uuid4()
+        table, row = _instance_row(instance)
+        self._pending.append((table, row))
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+        return row["id"]
+
+    @staticmethod
+    def _statements(
+        pending: List[Tuple[sa.Table, Dict[str, Any]]],
+    ) -> List[Tuple[Any, List[Dict[str, Any]]]]:
+        # One executemany per table and column set, in first-seen order
+        groups: Dict[Tuple[sa.Table, Tuple[str, ...]], List[Dict[str, Any]]] = {}
+        for table, row in pending:
+            groups.setdefault((table, tuple(row)), []).append(row)
+        return [
+            (pg_insert(table).on_conflict_do_nothing(index_elements=["id"]), rows)
+            for (table, _), rows in groups.items()
+        ]
+
+    async def _execute(
+        self, session: AsyncSession, pending: List[Tuple[sa.Table, Dict[str, Any]]]
+    ) -> None:
+        for stmt, rows in self._statements(pending):
+            await session.execute(stmt, rows[0] if len(rows) == 1 else rows)
+        await session.commit()
+
+    async def _write(self, pending: List[Tuple[sa.Table, Dict[str, Any]]]) -> None:
+        if self.session_factory is not None:
+            async with self.session_factory() as session:
+                await self._execute(session, pending)
+            return
+        try:
+            await self._execute(self.session, pending)
+        except Exception:
+            try:
+                await self.session.rollback()
+            except Exception:
+                pass
+            raise
+
+    async def flush(self) -> int:
+        """Write and commit every queued row; returns how many were written."""
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, []
+        try:
+            await self._write(pending)
+            written = len(pending)
+        except Exception as e:
+            logger.warning(
+                "[MediaBatchWriter] Batch of %d media rows failed, writing them one at a time: %s",
+                len(pending),
+                e,
+            )
+            written = 0
+            for table, row in pending:
+                try:
+                    await self._write([(table, row)])
+                    written += 1
+                except Exception as row_error:
+                    logger.error(
+                        "[MediaBatchWriter] Failed to write %s row %s: %s",
+                        table.name,
+                        row.get("id"),
+                        row_error,
+                    )
+        self.written += written
+        return written
+
+    async def __aenter__(self) -> "MediaBatchWriter":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.flush()
+
+
+class ProgressWriter:
+    """Coalesces progress-style updates of one row (see module docstring)."""
+
+    def __init__(
+        self,
+        table: str,
+        row_id: Any,
+        session_factory: Callable[[], Any],
+        *,
+        touch: Optional[Dict[str, Any]] = None,
+        min_interval: Optional[float] = None,
+    ):
+        self.table = table
+        self.row_id = row_id
+        self.session_factory = session_factory
+        # Columns set on every write, e.g. {"updated_at": sa.func.now()}
+        self.touch = touch or {}
+        self.min_interval = (
+            settings.PROGRESS_WRITE_MIN_INTERVAL_SECONDS
+            if min_interval is None
+            else min_interval
+        )
+        self.writes = 0
+        self._written: Dict[str, Any] = {}
+        self._pending: Dict[str, Any] = {}
+        self._last_write = float("-inf")
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+
+    async def update(self, *, final: bool = False, **values: Any) -> None:
+        self._pending.update(
+            {k: v for k, v in values.items() if k not in self._written or self._written[k] != v}
+        )
+        if not self._pending:
+            return
+        wait = self._last_write + self.min_interval - time.monotonic()
+        if final or wait <= 0:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later(wait))
+
+    def cancel(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending.clear()
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning("[ProgressWriter] Deferred %s update failed: %s", self.table, e)
+
+    async def flush(self) -> None:
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+            self._timer = None
+        async with self._lock:
+            if not self._pending:
+                return
+            values, self._pending = self._pending, {}
+            table = _raw_table(self.table, {"id": self.row_id, **values, **self.touch})
+            stmt = (
+                sa.update(table)
+                .where(table.c.id == self.row_id)
+                .values(**values, **self.touch)
+            )
+            async with self.session_factory() as session:
+                await session.execute(stmt)
+                await session.commit()
+            self._written.update(values)
+            self._last_write = time.monotonic()
+            self.writes += 1
@@ -276,22 +276,41 @@ class MetricsService:
         return sorted(result, key=lambda x: x["total_attempts"], reverse=True)
 
     async def get_circuit_breaker_status(self) -> List[Dict[str, Any]]:
-        """Get current circuit breaker status for all models"""
-        # This would typically query Redis or a cache layer
-        # For now, return mock data structure
-        # In production, this would integrate with ModelFallbackManager's circuit breaker state
-
-        return [
-            {
-                "model": "Model information not available in current implementation",
-                "status": "active",
-                "failure_count": 0,
-                "last_failure": None,
-                "blocked_until": None,
-                "note": "Circuit breaker state is managed in-memory by ModelFallbackManager. "
-                "Implement Redis integration for persistent state tracking.",
-            }
-        ]
+        """Get current circuit breaker state and health stats for all ladder models"""
+        from app.core.model_config import ModelTier, get_model_config
+        from app.core.services.model_fallback import fallback_manager
+
+        models: List[str] = []
+        for service_type in ("script", "image", "video", "audio"):
+            for tier in ModelTier:
+                config = get_model_config(service_type, tier.value)
+                for model in config.models if config else []:
+                    if model not in models:
+                        models.append(model)
+
+        return await fallback_manager.circuit_breaker.snapshot(models)
+
+    async def get_llm_cache_stats(self) -> Dict[str, Any]:
+        """Hit rates of the LLM response cache per call site"""
+        from app.core.services.llm_cache import llm_response_cache
+
+        return await llm_response_cache.stats()
+
+    async def get_dependency_health(self) -> Dict[str, Any]:
+        """Cached dependency snapshot from the background prober and its latency histograms"""
+        from app.core.health import health_checker
+
+        return {
+            "snapshot": health_checker.snapshot(),
+            "probe_latency_histograms": health_checker.latency_histograms(),
+        }
+
+    async def get_db_pool_stats(self) -> Dict[str, Any]:
+        """Connection pool mode, usage and acquisition counters of this API process"""
+        from app.core.database import engine
+        from app.core.db_pool import pool_stats
+
+        return pool_stats(engine)
 
     async def get_model_usage_distribution(
         self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
@@ -425,8 +444,27 @@ class MetricsService:
             "video_generation": await self._get_video_generation_times(
                 start_date, end_date
             ),
+            "pipeline": await self._get_pipeline_span_times(start_date, end_date),
         }
 
+    async def get_generation_waterfall(self, generation_id: str) -> Optional[Dict[str, Any]]:
+        """Depth-ordered span waterfall of one generation's trace"""
+        from app.tracing.service import get_generation_waterfall
+
+        return await get_generation_waterfall(self.session, generation_id)
+
+    async def _get_pipeline_span_times(
+        self, start_date: datetime, end_date: datetime
+    ) -> Dict[str, Any]:
+        """Per-stage and per-operation wall times from pipeline tracing spans"""
+        from app.tracing.service import summarize_pipeline_spans
+
+        try:
+            return await summarize_pipeline_spans(self.session, start_date, end_date)
+        except Exception as e:
+            await self.session.rollback()
+            return {"error": str(e)}
+
     async def _get_image_generation_times(
         self, start_date: datetime, end_date: datetime
     ) -> Dict[str, Any]:
@@ -542,4 +580,5 @@ class MetricsService:
                 "audio_generation": fallback_rates["audio_generation"],
             },
             "top_performing_models": model_performance[:5] if model_performance else [],
+            "dependencies": (await self.get_dependency_health())["snapshot"],
         }
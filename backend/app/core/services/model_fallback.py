@@ -1,10 +1,13 @@
 import asyncio
+import json
 import logging
 import time
-from datetime import datetime, timedelta
-from typing import Any, Callable, Dict, List
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List
 
+from app.core.config import settings
 from app.core.model_config import get_model_config
+from app.core.services.provider_limiter import ProviderCapacityError, retry_after_seconds
 from app.core.services.provider_router import (
     ProviderNotConfiguredError,
     ProviderSkipError,
@@ -14,38 +17,434 @@ from app.core.services.redis import redis_client
 
 logger = logging.getLogger(__name__)
 
-PROVIDER_COOLDOWN_SECONDS = 60 * 60
+# Model health is shared by every process through Redis. Each process reads
+# it at most this often per model and otherwise uses its local copy.
+HEALTH_REFRESH_SECONDS = 2.0
+HEALTH_KEY_TTL_SECONDS = 24 * 60 * 60
+# After a failed connect, Redis is not retried for this long
+REDIS_RETRY_SECONDS = 5.0
+# How long the single half-open probe may run before another process may probe
+HALF_OPEN_PROBE_SECONDS = 120
+
+EWMA_LATENCY_ALPHA = 0.3
+EWMA_SUCCESS_ALPHA = 0.2
+# A model is degraded, and moved behind healthy models in its ladder, once it
+# has this many samples and a low success rate or a latency well above the
+# fastest model in the ladder
+DEGRADED_MIN_SAMPLES = 5
+DEGRADED_SUCCESS_RATE = 0.5
+DEGRADED_LATENCY_RATIO = 3.0
+# Successful latencies kept per model for the hedging p90 budget
+LATENCY_WINDOW = 50
+
+# KEYS[1] health JSON. ARGV: now, success (1/0), latency ('' if unknown),
+# failure threshold, breaker timeout, latency window, success alpha, latency
+# alpha, ttl. Applies one outcome in a single step, so concurrent workers
+# never overwrite each other's updates. Returns the new health JSON and the
+# breaker transition ('', 'opened', 'reopened' or 'closed'). cjson encodes
+# empty lists as {}, which ModelHealth.from_dict accepts.
+RECORD_OUTCOME_SCRIPT = """
+local h = {}
+local raw = redis.call('GET', KEYS[1])
+if raw then
+  h = cjson.decode(raw)
+end
+local now = tonumber(ARGV[1])
+local success = ARGV[2] == '1'
+local latency = tonumber(ARGV[3])
+local threshold = tonumber(ARGV[4])
+local timeout = tonumber(ARGV[5])
+local opened = tonumber(h.opened_until) or 0
+local transition = ''
+if success then
+  if opened > 0 then
+    transition = 'closed'
+  end
+  h.failures = {}
+  h.opened_until = 0
+else
+  local kept = {}
+  if type(h.failures) == 'table' then
+    for _, t in ipairs(h.failures) do
+      if t > now - timeout then
+        kept[#kept + 1] = t
+      end
+    end
+  end
+  local failures = {}
+  for i = math.max(1, #kept - threshold + 2), #kept do
+    failures[#failures + 1] = kept[i]
+  end
+  failures[#failures + 1] = now
+  h.failures = failures
+  local half_open = opened > 0 and now >= opened
+  if half_open or (opened == 0 and #failures >= threshold) then
+    h.opened_until = now + timeout
+    if half_open then
+      transition = 'reopened'
+    else
+      transition = 'opened'
+    end
+  end
+end
+local outcome = 0
+if success then
+  outcome = 1
+end
+h.samples = (tonumber(h.samples) or 0) + 1
+local rate = tonumber(h.success_rate) or 1
+h.success_rate = rate + tonumber(ARGV[7]) * (outcome - rate)
+if latency then
+  local ewma = tonumber(h.ewma_latency)
+  if ewma then
+    h.ewma_latency = ewma + tonumber(ARGV[8]) * (latency - ewma)
+  else
+    h.ewma_latency = latency
+  end
+  if success then
+    local recent = {}
+    if type(h.recent_latencies) == 'table' then
+      for _, l in ipairs(h.recent_latencies) do
+        recent[#recent + 1] = l
+      end
+    end
+    recent[#recent + 1] = math.floor(latency * 1000 + 0.5) / 1000
+    local window = {}
+    for i = math.max(1, #recent - tonumber(ARGV[6]) + 1), #recent do
+      window[#window + 1] = recent[i]
+    end
+    h.recent_latencies = window
+  end
+end
+h.updated_at = now
+local encoded = cjson.encode(h)
+redis.call('SET', KEYS[1], encoded, 'EX', ARGV[9])
+return {encoded, transition}
+"""
+
+
+@dataclass
+class ModelHealth:
+    failures: List[float] = field(default_factory=list)
+    # 0 while closed; while open, the time after which one probe is allowed
+    opened_until: float = 0.0
+    ewma_latency: float | None = None
+    success_rate: float = 1.0
+    samples: int = 0
+    updated_at: float = 0.0
+    recent_latencies: List[float] = field(default_factory=list)
+
+    def state(self, now: float) -> str:
+        if not self.opened_until:
+            return "closed"
+        return "open" if now < self.opened_until else "half_open"
+
+    def is_degraded(self, fastest_latency: float | None) -> bool:
+        if self.samples < DEGRADED_MIN_SAMPLES:
+            return False
+        if self.success_rate < DEGRADED_SUCCESS_RATE:
+            return True
+        return bool(
+            fastest_latency
+            and self.ewma_latency
+            and self.ewma_latency > DEGRADED_LATENCY_RATIO * fastest_latency
+        )
+
+    def latency_percentile(self, percentile: float) -> float | None:
+        if not self.recent_latencies:
+            return None
+        ordered = sorted(self.recent_latencies)
+        index = min(len(ordered) - 1, int(percentile * len(ordered)))
+        return ordered[index]
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "ModelHealth":
+        known = {name: raw[name] for name in cls.__dataclass_fields__ if name in raw}
+        for name in ("failures", "recent_latencies"):
+            # RECORD_OUTCOME_SCRIPT's cjson writes an empty list as {}
+            known[name] = list(known.get(name) or [])
+        return cls(**known)
+
+
+def apply_outcome(
+    health: ModelHealth,
+    now: float,
+    success: bool,
+    latency: float | None,
+    failure_threshold: int,
+    timeout_seconds: float,
+) -> str:
+    """
+    Python version of RECORD_OUTCOME_SCRIPT for the per-process fallback.
+    Updates health in place and returns the breaker transition.
+    """
+    transition = ""
+    if success:
+        if health.opened_until:
+            transition = "closed"
+        health.failures = []
+        health.opened_until = 0.0
+    else:
+        kept = [t for t in health.failures if t > now - timeout_seconds]
+        health.failures = kept[max(0, len(kept) - (failure_threshold - 1)) :] + [now]
+        half_open = bool(health.opened_until) and now >= health.opened_until
+        if half_open or (
+            not health.opened_until and len(health.failures) >= failure_threshold
+        ):
+            health.opened_until = now + timeout_seconds
+            transition = "reopened" if half_open else "opened"
+
+    health.samples += 1
+    health.success_rate += EWMA_SUCCESS_ALPHA * ((1.0 if success else 0.0) - health.success_rate)
+    if latency is not None:
+        health.ewma_latency = (
+            latency
+            if health.ewma_latency is None
+            else health.ewma_latency + EWMA_LATENCY_ALPHA * (latency - health.ewma_latency)
+        )
+        if success:
+            health.recent_latencies = (health.recent_latencies + [round(latency, 3)])[
+                -LATENCY_WINDOW:
+            ]
+    health.updated_at = now
+    return transition
 
 
 class CircuitBreaker:
-    def __init__(self, failure_threshold: int = 5, timeout_seconds: int = 60):
+    """
+    Per-model circuit breaker and health stats, shared across processes.
+
+    A model opens after failure_threshold failures within timeout_seconds and
+    stays open for timeout_seconds. It then turns half-open: one caller
+    (across all processes, via a Redis NX key) gets to probe it. A successful
+    probe closes the breaker; a failed one reopens it.
+
+    Every outcome also updates the model's EWMA latency and success rate,
+    which ModelFallbackManager uses to reorder ladders. Outcomes are applied
+    to the shared record by RECORD_OUTCOME_SCRIPT, so concurrent workers all
+    count toward the threshold. Without Redis the state is kept per process.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        timeout_seconds: int = 60,
+        redis_service=None,
+    ):
         self.failure_threshold = failure_threshold
         self.timeout_seconds = timeout_seconds
-        self.failures: Dict[str, List[datetime]] = {}
-
-    def record_failure(self, model_name: str) -> None:
-        now = datetime.now()
-        failures = self.failures.setdefault(model_name, [])
-        failures.append(now)
-        cutoff = now - timedelta(seconds=self.timeout_seconds)
-        self.failures[model_name] = [
-            failure for failure in failures if failure > cutoff
-        ]
+        self.redis = redis_service
+        self.local: Dict[str, ModelHealth] = {}
+        self.fetched_at: Dict[str, float] = {}
+        self.local_probes: Dict[str, float] = {}
+        self._redis_retry_at = 0.0
 
-    def is_open(self, model_name: str) -> bool:
-        cutoff = datetime.now() - timedelta(seconds=self.timeout_seconds)
-        recent = [
-            failure for failure in self.failures.get(model_name, []) if failure > cutoff
-        ]
-        return len(recent) >= self.failure_threshold
+    @staticmethod
+    def health_key(model_name: str) -> str:
+        return f"model:{model_name}:health"
 
-    def reset(self, model_name: str) -> None:
-        self.failures.pop(model_name, None)
+    @staticmethod
+    def probe_key(model_name: str) -> str:
+        return f"model:{model_name}:probe"
+
+    async def _redis_ready(self) -> bool:
+        if self.redis is None:
+            return False
+        if getattr(self.redis, "is_connected", False):
+            return True
+        if time.monotonic() < self._redis_retry_at:
+            return False
+        try:
+            await self.redis.connect()
+        except Exception as exc:
+            logger.warning("[CIRCUIT] Redis connect failed open: %s", exc)
+        if not getattr(self.redis, "is_connected", False):
+            self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+            return False
+        return True
+
+    async def health(self, model_name: str, fresh: bool = False) -> ModelHealth:
+        fetched_at = self.fetched_at.get(model_name, 0.0)
+        if not fresh and time.monotonic() - fetched_at < HEALTH_REFRESH_SECONDS:
+            return self.local[model_name]
+        health = self.local.get(model_name) or ModelHealth()
+        if await self._redis_ready():
+            try:
+                raw = await self.redis.get(self.health_key(model_name))
+                if isinstance(raw, str):
+                    raw = json.loads(raw)
+                health = ModelHealth.from_dict(raw) if raw else ModelHealth()
+            except Exception as exc:
+                logger.warning("[CIRCUIT] Health read failed open: %s", exc)
+        self.local[model_name] = health
+        self.fetched_at[model_name] = time.monotonic()
+        return health
+
+    async def _save(self, model_name: str, health: ModelHealth) -> None:
+        health.updated_at = time.time()
+        self.local[model_name] = health
+        self.fetched_at[model_name] = time.monotonic()
+        if await self._redis_ready():
+            try:
+                await self.redis.set(
+                    self.health_key(model_name),
+                    json.dumps(asdict(health)),
+                    expire=HEALTH_KEY_TTL_SECONDS,
+                )
+            except Exception as exc:
+                logger.warning("[CIRCUIT] Health write failed open: %s", exc)
+
+    async def allow_request(self, model_name: str) -> bool:
+        health = await self.health(model_name)
+        state = health.state(time.time())
+        if state == "closed":
+            return True
+        if state == "open":
+            return False
+        return await self._acquire_probe(model_name)
+
+    async def _acquire_probe(self, model_name: str) -> bool:
+        client = getattr(self.redis, "redis_client", None)
+        if client is not None and await self._redis_ready():
+            try:
+                acquired = await client.set(
+                    self.probe_key(model_name), "1", nx=True, ex=HALF_OPEN_PROBE_SECONDS
+                )
+                if acquired:
+                    logger.info("[CIRCUIT] Probing half-open model %s", model_name)
+                return bool(acquired)
+            except Exception as exc:
+                logger.warning("[CIRCUIT] Probe lock failed, probing locally: %s", exc)
+        now = time.time()
+        if self.local_probes.get(model_name, 0.0) > now:
+            return False
+        self.local_probes[model_name] = now + HALF_OPEN_PROBE_SECONDS
+        logger.info("[CIRCUIT] Probing half-open model %s", model_name)
+        return True
+
+    async def release_probe(self, model_name: str) -> None:
+        self.local_probes.pop(model_name, None)
+        client = getattr(self.redis, "redis_client", None)
+        if client is not None and getattr(self.redis, "is_connected", False):
+            try:
+                await client.delete(self.probe_key(model_name))
+            except Exception:
+                pass
+
+    async def record_success(self, model_name: str, latency: float | None = None) -> None:
+        await self._record(model_name, True, latency)
+
+    async def record_failure(self, model_name: str, latency: float | None = None) -> None:
+        await self._record(model_name, False, latency)
+
+    async def _record(self, model_name: str, success: bool, latency: float | None) -> None:
+        now = time.time()
+        health = None
+        client = getattr(self.redis, "redis_client", None)
+        if client is not None and await self._redis_ready():
+            try:
+                raw, transition = await client.eval(
+                    RECORD_OUTCOME_SCRIPT,
+                    1,
+                    self.health_key(model_name),
+                    now,
+                    1 if success else 0,
+                    "" if latency is None else latency,
+                    self.failure_threshold,
+                    self.timeout_seconds,
+                    LATENCY_WINDOW,
+                    EWMA_SUCCESS_ALPHA,
+                    EWMA_LATENCY_ALPHA,
+                    HEALTH_KEY_TTL_SECONDS,
+                )
+                health = ModelHealth.from_dict(json.loads(raw))
+                if isinstance(transition, bytes):
+                    transition = transition.decode()
+            except Exception as exc:
+                logger.warning("[CIRCUIT] Health update failed, recording locally: %s", exc)
+        if health is None:
+            health = self.local.get(model_name) or ModelHealth()
+            transition = apply_outcome(
+                health, now, success, latency, self.failure_threshold, self.timeout_seconds
+            )
+        self.local[model_name] = health
+        self.fetched_at[model_name] = time.monotonic()
+
+        if transition == "closed":
+            logger.info("[CIRCUIT] Closing breaker for %s", model_name)
+        elif transition:
+            logger.warning(
+                "[CIRCUIT] Opening breaker for %s for %ss (%s)",
+                model_name,
+                self.timeout_seconds,
+                "probe failed" if transition == "reopened" else "failure threshold",
+            )
+        if transition in ("closed", "reopened"):
+            await self.release_probe(model_name)
+
+    async def hedge_budget(self, model_name: str) -> float:
+        """Seconds to wait on a model before hedging: its p90 success latency."""
+        health = await self.health(model_name)
+        if len(health.recent_latencies) < settings.HEDGE_MIN_SAMPLES:
+            return settings.HEDGE_DEFAULT_BUDGET_SECONDS
+        return min(
+            max(health.latency_percentile(0.9), settings.HEDGE_MIN_BUDGET_SECONDS),
+            settings.HEDGE_MAX_BUDGET_SECONDS,
+        )
+
+    async def reset(self, model_name: str) -> None:
+        await self._save(model_name, ModelHealth())
+        await self.release_probe(model_name)
+
+    async def rank(self, models: List[str]) -> List[str]:
+        """Ladder order with degraded and open models moved behind the rest."""
+        now = time.time()
+        healths = {model: await self.health(model) for model in models}
+        latencies = [
+            h.ewma_latency
+            for h in healths.values()
+            if h.ewma_latency and h.samples >= DEGRADED_MIN_SAMPLES and h.state(now) == "closed"
+        ]
+        fastest = min(latencies) if latencies else None
+
+        def demotion(model: str) -> int:
+            health = healths[model]
+            if health.state(now) == "open":
+                return 2
+            return 1 if health.is_degraded(fastest) else 0
+
+        return sorted(models, key=demotion)
+
+    async def snapshot(self, models: List[str]) -> List[Dict[str, Any]]:
+        now = time.time()
+        result = []
+        for model in models:
+            health = await self.health(model, fresh=True)
+            result.append(
+                {
+                    "model": model,
+                    "status": health.state(now),
+                    "failure_count": len(
+                        [t for t in health.failures if t > now - self.timeout_seconds]
+                    ),
+                    "last_failure": max(health.failures) if health.failures else None,
+                    "blocked_until": health.opened_until or None,
+                    "ewma_latency_seconds": (
+                        round(health.ewma_latency, 3) if health.ewma_latency else None
+                    ),
+                    "success_rate": round(health.success_rate, 3),
+                    "samples": health.samples,
+                    "p90_latency_seconds": health.latency_percentile(0.9),
+                }
+            )
+        return result
 
 
 class ModelFallbackManager:
     def __init__(self, redis_service=redis_client, sleep=asyncio.sleep):
-        self.circuit_breaker = CircuitBreaker(failure_threshold=5, timeout_seconds=60)
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=5, timeout_seconds=60, redis_service=redis_service
+        )
         self.redis = redis_service
         self.sleep = sleep
         self.local_cooldowns: Dict[str, float] = {}
@@ -78,20 +477,26 @@ class ModelFallbackManager:
             logger.warning("[FALLBACK] Redis cooldown read failed open: %s", exc)
             return None
 
-    async def _set_cooldown(self, provider: str) -> None:
-        cooldown_until = time.time() + PROVIDER_COOLDOWN_SECONDS
+    async def _set_cooldown(self, provider: str, error: Exception) -> None:
+        """
+        Skip a provider that answered 429/503 for its Retry-After (capped at a
+        few minutes), not for an hour. The router has already backed the
+        provider's fleet-wide token bucket off for the same time.
+        """
+        seconds = retry_after_seconds(error)
+        cooldown_until = time.time() + seconds
         self.local_cooldowns[provider] = cooldown_until
         try:
             await self._ensure_redis()
             await self.redis.set(
                 self.cooldown_key(provider),
                 str(cooldown_until),
-                expire=PROVIDER_COOLDOWN_SECONDS,
+                expire=max(1, int(seconds)),
             )
             logger.warning(
-                "[FALLBACK] Provider %s cooling down for %s seconds",
+                "[FALLBACK] Provider %s cooling down for %.0f seconds",
                 provider,
-                PROVIDER_COOLDOWN_SECONDS,
+                seconds,
             )
         except Exception as exc:
             logger.warning("[FALLBACK] Redis cooldown write failed open: %s", exc)
@@ -122,7 +527,18 @@ class ModelFallbackManager:
         generation_function: Callable,
         request_params: Dict[str, Any],
         model_param_name: str = "model_id",
+        hedge: bool = False,
+        on_hedge_cancelled: Callable[[str, float], Awaitable[None]] | None = None,
     ) -> Dict[str, Any]:
+        """
+        Run generation_function down the tier ladder until a model succeeds.
+
+        With hedge=True (text generation only), a model still running past its
+        p90 latency budget gets the next ladder model started alongside it; the
+        first valid result wins and the other call is cancelled.
+        on_hedge_cancelled(model, elapsed_seconds) lets the caller account the
+        cancelled call's cost.
+        """
         tier_normalized = user_tier.lower() if user_tier else "free"
         config = get_model_config(service_type, tier_normalized)
         if not config:
@@ -142,7 +558,173 @@ class ModelFallbackManager:
             tier=tier_normalized,
             max_tokens=config.max_tokens,
             temperature=config.temperature,
+            hedge=hedge,
+            on_hedge_cancelled=on_hedge_cancelled,
+        )
+
+    @staticmethod
+    async def _generate(generation_function: Callable, params: Dict[str, Any]) -> Dict[str, Any]:
+        result = await generation_function(**params)
+        if not result or result.get("status") not in {"success", "processing"}:
+            error = result.get("error", "Unknown error") if result else "No result"
+            raise RuntimeError(f"Generation failed: {error}")
+        return result
+
+    async def _is_available(self, model: str) -> bool:
+        provider = provider_name_for_model(model)
+        if provider != "unknown" and await self._cooldown_until(provider):
+            return False
+        return await self.circuit_breaker.allow_request(model)
+
+    async def _hedged_generate(
+        self,
+        model: str,
+        params: Dict[str, Any],
+        backups: List[str],
+        params_for: Callable[[str], Dict[str, Any]],
+        generation_function: Callable,
+        attempted_models: List[Dict[str, Any]],
+        hedge_state: Dict[str, Any],
+        on_hedge_cancelled: Callable[[str, float], Awaitable[None]] | None,
+    ) -> tuple[str, Dict[str, Any], float]:
+        """
+        Run model, hedging with the first available backup once model is past
+        its latency budget. Returns (winner, result, winner_started).
+
+        The backup's failures are recorded here. If neither call returns a
+        valid result, model's error is raised for _try_models to handle.
+        """
+        started = time.monotonic()
+        primary = asyncio.create_task(self._generate(generation_function, params))
+        tasks = {primary: (model, started)}
+        pending = {primary}
+        try:
+            budget = await self.circuit_breaker.hedge_budget(model)
+            done, pending = await asyncio.wait(pending, timeout=budget)
+            if done:
+                return model, primary.result(), started
+
+            backup = None
+            for candidate in backups:
+                if await self._is_available(candidate):
+                    backup = candidate
+                    break
+            if backup is None:
+                return model, await primary, started
+
+            logger.info(
+                "[FALLBACK] %s still running after %.1fs, hedging with %s",
+                model,
+                budget,
+                backup,
+            )
+            hedge_state.update(model=backup, budget_seconds=round(budget, 3))
+            hedge_task = asyncio.create_task(
+                self._generate(generation_function, params_for(backup))
+            )
+            tasks[hedge_task] = (backup, time.monotonic())
+            pending.add(hedge_task)
+            primary_error: Exception | None = None
+            primary_elapsed = 0.0
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    name, task_started = tasks[task]
+                    error = task.exception()
+                    if error is None:
+                        for loser in pending:
+                            await self._cancel_hedge_loser(
+                                loser, *tasks[loser], attempted_models, on_hedge_cancelled
+                            )
+                        pending = set()
+                        if primary_error is not None:
+                            await self._record_hedge_failure(
+                                model, primary_error, primary_elapsed, attempted_models
+                            )
+                        hedge_state["winner"] = name
+                        return name, task.result(), task_started
+                    if task is primary:
+                        primary_error = error
+                        primary_elapsed = time.monotonic() - started
+                    else:
+                        await self._record_hedge_failure(
+                            backup,
+                            error,
+                            time.monotonic() - task_started,
+                            attempted_models,
+                            model_type="hedge",
+                        )
+            raise primary_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _cancel_hedge_loser(
+        self,
+        task: asyncio.Task,
+        model: str,
+        started: float,
+        attempted_models: List[Dict[str, Any]],
+        on_hedge_cancelled: Callable[[str, float], Awaitable[None]] | None,
+    ) -> None:
+        task.cancel()
+        elapsed = time.monotonic() - started
+        await self.circuit_breaker.release_probe(model)
+        attempted_models.append(
+            {
+                "model": model,
+                "status": "cancelled",
+                "reason": "hedge_lost",
+                "provider": provider_name_for_model(model),
+                "elapsed_seconds": round(elapsed, 3),
+            }
         )
+        if on_hedge_cancelled is not None:
+            try:
+                await on_hedge_cancelled(model, elapsed)
+            except Exception as exc:
+                logger.warning("[FALLBACK] Hedge cost accounting failed for %s: %s", model, exc)
+
+    async def _record_hedge_failure(
+        self,
+        model: str,
+        error: Exception,
+        elapsed: float,
+        attempted_models: List[Dict[str, Any]],
+        model_type: str = "primary",
+    ) -> None:
+        """Record a failed call of a hedged pair that _try_models will not see."""
+        provider = provider_name_for_model(model)
+        skip_reasons = {
+            ProviderSkipError: "provider_soft_skip",
+            ProviderNotConfiguredError: "provider_not_configured",
+            ProviderCapacityError: "provider_capacity",
+        }
+        reason = next(
+            (name for kind, name in skip_reasons.items() if isinstance(error, kind)), None
+        )
+        if reason:
+            await self.circuit_breaker.release_probe(model)
+            attempted_models.append(
+                {"model": model, "status": "skipped", "reason": reason, "error": str(error)}
+            )
+            return
+        await self.circuit_breaker.record_failure(model, elapsed)
+        status_code = self._status_code(error)
+        attempted_models.append(
+            {
+                "model": model,
+                "status": "failed",
+                "provider": provider,
+                "error": str(error) or repr(error),
+                "status_code": status_code,
+                "model_type": model_type,
+            }
+        )
+        if status_code in {429, 503} and provider != "unknown":
+            await self._set_cooldown(provider, error)
 
     async def _try_models(
         self,
@@ -154,14 +736,43 @@ class ModelFallbackManager:
         tier: str | None = None,
         max_tokens: int | None = None,
         temperature: float | None = None,
+        hedge: bool = False,
+        on_hedge_cancelled: Callable[[str, float], Awaitable[None]] | None = None,
     ) -> Dict[str, Any]:
         attempted_models: List[Dict[str, Any]] = []
         last_error: Exception | None = None
         actual_attempts = 0
+        # One hedge per request: the model it started is not tried again
+        hedge_state: Dict[str, Any] = {}
+        hedge = hedge and settings.HEDGE_ENABLED
+        # Providers whose fleet limit is full. Their other models would queue
+        # for the same slots, so only other providers are tried. Unprefixed
+        # media models share one adapter's limit and count as one provider.
+        at_capacity: set = set()
+
+        ladder = await self.circuit_breaker.rank(models)
+        if ladder != models:
+            logger.info(
+                "[FALLBACK] Reordered %s ladder by model health: %s",
+                service_type,
+                ladder,
+            )
 
-        for index, model in enumerate(models):
+        def params_for(model: str) -> Dict[str, Any]:
+            updated_params = dict(request_params)
+            updated_params[model_param_name] = model
+            if service_type == "script" and max_tokens:
+                updated_params["max_tokens"] = max_tokens
+            if service_type == "script" and temperature is not None:
+                updated_params["temperature"] = temperature
+            return updated_params
+
+        for index, model in enumerate(ladder):
+            if model == hedge_state.get("model"):
+                continue
             provider = provider_name_for_model(model)
-            model_type = "primary" if index == 0 else f"fallback{index}"
+            static_index = models.index(model)
+            model_type = "primary" if static_index == 0 else f"fallback{static_index}"
 
             cooldown_until = (
                 await self._cooldown_until(provider) if provider != "unknown" else None
@@ -177,19 +788,24 @@ class ModelFallbackManager:
                 )
                 continue
 
-            if self.circuit_breaker.is_open(model):
+            if provider in at_capacity:
                 attempted_models.append(
-                    {"model": model, "status": "skipped", "reason": "circuit_breaker"}
+                    {
+                        "model": model,
+                        "status": "skipped",
+                        "reason": "provider_capacity",
+                        "provider": provider,
+                    }
                 )
                 continue
 
-            updated_params = dict(request_params)
-            updated_params[model_param_name] = model
-            if service_type == "script" and max_tokens:
-                updated_params["max_tokens"] = max_tokens
-            if service_type == "script" and temperature is not None:
-                updated_params["temperature"] = temperature
+            if not await self.circuit_breaker.allow_request(model):
+                attempted_models.append(
+                    {"model": model, "status": "skipped", "reason": "circuit_breaker"}
+                )
+                continue
 
+            started = time.monotonic()
             try:
                 logger.info(
                     "[FALLBACK] Attempting %s model %s for %s/%s",
@@ -199,14 +815,33 @@ class ModelFallbackManager:
                     tier or "n/a",
                 )
                 actual_attempts += 1
-                result = await generation_function(**updated_params)
-                if not result or result.get("status") not in {"success", "processing"}:
-                    error = (
-                        result.get("error", "Unknown error") if result else "No result"
-                    )
-                    raise RuntimeError(f"Generation failed: {error}")
-
-                self.circuit_breaker.reset(model)
+                if hedge and not hedge_state and index < len(ladder) - 1:
+                    try:
+                        model, result, started = await self._hedged_generate(
+                            model,
+                            params_for(model),
+                            ladder[index + 1 :],
+                            params_for,
+                            generation_function,
+                            attempted_models,
+                            hedge_state,
+                            on_hedge_cancelled,
+                        )
+                    finally:
+                        if hedge_state:
+                            actual_attempts += 1
+                else:
+                    result = await self._generate(generation_function, params_for(model))
+
+                await self.circuit_breaker.record_success(
+                    model, time.monotonic() - started
+                )
+                if hedge_state:
+                    provider = provider_name_for_model(model)
+                    static_index = models.index(model)
+                    model_type = "primary" if static_index == 0 else f"fallback{static_index}"
+                    result["model_used"] = model
+                    result["hedge"] = dict(hedge_state)
                 result.setdefault("model_used", model)
                 result["model_tier_used"] = model_type
                 if tier:
@@ -219,6 +854,7 @@ class ModelFallbackManager:
 
             except ProviderSkipError as exc:
                 actual_attempts -= 1
+                await self.circuit_breaker.release_probe(model)
                 logger.info("[ScriptModelRouter] featherless skipped (sub lapsed)")
                 attempted_models.append(
                     {
@@ -229,8 +865,26 @@ class ModelFallbackManager:
                     }
                 )
                 continue
+            except ProviderCapacityError as exc:
+                # Our own fleet-wide limit, not a provider failure: no breaker
+                # failure and no cooldown
+                actual_attempts -= 1
+                await self.circuit_breaker.release_probe(model)
+                at_capacity.add(provider)
+                logger.info("[FALLBACK] %s at capacity, trying other providers: %s", model, exc)
+                attempted_models.append(
+                    {
+                        "model": model,
+                        "status": "skipped",
+                        "reason": "provider_capacity",
+                        "error": str(exc),
+                    }
+                )
+                last_error = exc
+                continue
             except ProviderNotConfiguredError as exc:
                 actual_attempts -= 1
+                await self.circuit_breaker.release_probe(model)
                 logger.info("[FALLBACK] Provider not configured for %s: %s", model, exc)
                 attempted_models.append(
                     {
@@ -244,7 +898,9 @@ class ModelFallbackManager:
                 continue
             except Exception as exc:
                 last_error = exc
-                self.circuit_breaker.record_failure(model)
+                await self.circuit_breaker.record_failure(
+                    model, time.monotonic() - started
+                )
                 status_code = self._status_code(exc)
                 attempted_models.append(
                     {
@@ -257,7 +913,7 @@ class ModelFallbackManager:
                     }
                 )
                 if status_code in {429, 503} and provider != "unknown":
-                    await self._set_cooldown(provider)
+                    await self._set_cooldown(provider, exc)
 
                 # Preserve the existing safety rule for requests that may still be
                 # processing at the provider. Retrying could double-bill or duplicate
@@ -265,7 +921,7 @@ class ModelFallbackManager:
                 if self._is_timeout(exc):
                     break
 
-                if index < len(models) - 1 and status_code not in {429, 503}:
+                if index < len(ladder) - 1 and status_code not in {429, 503}:
                     await self.sleep(min(2**index, 3))
 
         logger.error(
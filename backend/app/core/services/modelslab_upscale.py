@@ -14,6 +14,7 @@ from typing import Dict, Any, Optional
 import aiohttp
 import asyncio
 from app.core.config import settings
+from app.core.services.provider_limiter import provider_limiter
 import logging
 
 logger = logging.getLogger(__name__)
@@ -32,10 +33,13 @@ UPSCALE_MODELS = {
 class ModelsLabUpscaleService:
     """ModelsLab V6 Image Upscaling Service for super resolution"""
 
-    def __init__(self):
+    def __init__(self, acquire_timeout: Optional[float] = None):
         if not settings.MODELSLAB_API_KEY:
             raise ValueError("MODELSLAB_API_KEY is required")
 
+        # Longest wait for a ModelsLab slot; None uses the provider default
+        self.acquire_timeout = acquire_timeout
+
         self.api_key = settings.MODELSLAB_API_KEY
         self.base_url = settings.MODELSLAB_V6_BASE_URL
         self.upscale_endpoint = f"{self.base_url}/image_editing/super_resolution"
@@ -86,7 +90,12 @@ class ModelsLabUpscaleService:
             )
             logger.info(f"[UPSCALE] Input image: {image_url[:80]}...")
 
-            async with aiohttp.ClientSession() as session:
+            async with (
+                provider_limiter.acquire(
+                    "modelslab", self.api_key, timeout=self.acquire_timeout
+                ),
+                aiohttp.ClientSession() as session,
+            ):
                 async with session.post(
                     self.upscale_endpoint,
                     json=payload,
@@ -4,6 +4,7 @@ import asyncio
 import random
 from app.core.config import settings
 from app.core.model_config import get_model_config
+from app.core.services.provider_limiter import ProviderCapacityError, provider_limiter
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,10 +13,13 @@ logger = logging.getLogger(__name__)
 class ModelsLabV7AudioService:
     """ModelsLab V7 Audio Service for TTS, Sound Effects, and Music Generation"""
 
-    def __init__(self):
+    def __init__(self, acquire_timeout: Optional[float] = None):
         if not settings.MODELSLAB_API_KEY:
             raise ValueError("MODELSLAB_API_KEY is required")
 
+        # Longest wait for a ModelsLab slot; None uses the provider default
+        self.acquire_timeout = acquire_timeout
+
         self.api_key = settings.MODELSLAB_API_KEY
         self.base_url = settings.MODELSLAB_BASE_URL  # v7 URL
         self.headers = {"Content-Type": "application/json"}
@@ -90,7 +94,12 @@ class ModelsLabV7AudioService:
                 f"[MODELSLAB V7 TTS] Using voice: {voice_id}, model: {model_id}"
             )
 
-            async with aiohttp.ClientSession() as session:
+            async with (
+                provider_limiter.acquire(
+                    "modelslab", self.api_key, timeout=self.acquire_timeout
+                ),
+                aiohttp.ClientSession() as session,
+            ):
                 async with session.post(
                     self.tts_endpoint, json=payload, headers=self.headers
                 ) as response:
@@ -109,6 +118,8 @@ class ModelsLabV7AudioService:
                             f"ModelsLab V7 TTS API error: {response.status} - {error_text}"
                         )
 
+        except ProviderCapacityError:
+            raise
         except Exception as e:
             logger.error(f"[MODELSLAB V7 TTS ERROR]: {str(e)}")
             raise e
@@ -138,7 +149,12 @@ class ModelsLabV7AudioService:
             )
             logger.info(f"[MODELSLAB V7 SFX] Duration: {duration}s, Model: {model_id}")
 
-            async with aiohttp.ClientSession() as session:
+            async with (
+                provider_limiter.acquire(
+                    "modelslab", self.api_key, timeout=self.acquire_timeout
+                ),
+                aiohttp.ClientSession() as session,
+            ):
                 async with session.post(
                     self.sound_effects_endpoint, json=payload, headers=self.headers
                 ) as response:
@@ -157,6 +173,8 @@ class ModelsLabV7AudioService:
                             f"ModelsLab V7 Sound Effects API error: {response.status} - {error_text}"
                         )
 
+        except ProviderCapacityError:
+            raise
         except Exception as e:
             logger.error(f"[MODELSLAB V7 SFX ERROR]: {str(e)}")
             raise e
@@ -176,7 +194,12 @@ class ModelsLabV7AudioService:
             logger.info(f"[MODELSLAB V7 MUSIC] Generating music: {description[:50]}...")
             logger.info(f"[MODELSLAB V7 MUSIC] Model: {model_id}")
 
-            async with aiohttp.ClientSession() as session:
+            async with (
+                provider_limiter.acquire(
+                    "modelslab", self.api_key, timeout=self.acquire_timeout
+                ),
+                aiohttp.ClientSession() as session,
+            ):
                 async with session.post(
                     self.music_endpoint, json=payload, headers=self.headers
                 ) as response:
@@ -195,6 +218,8 @@ class ModelsLabV7AudioService:
                             f"ModelsLab V7 Music API error: {response.status} - {error_text}"
                         )
 
+        except ProviderCapacityError:
+            raise
         except Exception as e:
             logger.error(f"[MODELSLAB V7 MUSIC ERROR]: {str(e)}")
             raise e
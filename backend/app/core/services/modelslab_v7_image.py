@@ -4,6 +4,7 @@ import asyncio
 from app.core.config import settings
 from app.core.model_config import get_model_config
 from app.core.services.model_fallback import fallback_manager
+from app.core.services.provider_limiter import ProviderCapacityError, provider_limiter
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,10 +13,13 @@ logger = logging.getLogger(__name__)
 class ModelsLabV7ImageService:
     """ModelsLab V7 Image Service for Runway text-to-image generation"""
 
-    def __init__(self):
+    def __init__(self, acquire_timeout: Optional[float] = None):
         if not settings.MODELSLAB_API_KEY:
             raise ValueError("MODELSLAB_API_KEY is required")
 
+        # Longest wait for a ModelsLab slot; None uses the provider default
+        self.acquire_timeout = acquire_timeout
+
         self.api_key = settings.MODELSLAB_API_KEY
         self.base_url = settings.MODELSLAB_BASE_URL  # v7 URL
         self.headers = {"Content-Type": "application/json"}
@@ -254,7 +258,12 @@ class ModelsLabV7ImageService:
             logger.info(f"[DEBUG] API endpoint: {self.image_endpoint}")
             logger.info(f"[DEBUG] API payload: {self._redact_payload(payload)}")
 
-            async with aiohttp.ClientSession() as session:
+            async with (
+                provider_limiter.acquire(
+                    "modelslab", self.api_key, timeout=self.acquire_timeout
+                ),
+                aiohttp.ClientSession() as session,
+            ):
                 # Submit generation request with extended timeout
                 async with session.post(
                     self.image_endpoint,
@@ -299,6 +308,8 @@ class ModelsLabV7ImageService:
                     # Handle immediate response (if synchronous)
                     return self._process_image_response(result, model_id)
 
+        except ProviderCapacityError:
+            raise
         except asyncio.TimeoutError as e:
             error_msg = f"Request timeout after 60s waiting for ModelsLab API response"
             logger.error(f"[MODELSLAB V7 IMAGE TIMEOUT]: {error_msg}")
@@ -541,7 +552,12 @@ class ModelsLabV7ImageService:
             )
             logger.info(f"[DEBUG] I2I Payload keys: {payload.keys()}")
 
-            async with aiohttp.ClientSession() as session:
+            async with (
+                provider_limiter.acquire(
+                    "modelslab", self.api_key, timeout=self.acquire_timeout
+                ),
+                aiohttp.ClientSession() as session,
+            ):
                 async with session.post(
                     self.image_to_image_endpoint,
                     json=payload,
@@ -569,6 +585,8 @@ class ModelsLabV7ImageService:
 
                     return self._process_image_response(result, model_id)
 
+        except ProviderCapacityError:
+            raise
         except Exception as e:
             logger.error(f"[MODELSLAB I2I ERROR]: {str(e)}")
             raise Exception(f"Image-to-Image generation failed: {str(e)}") from e
@@ -1099,7 +1117,12 @@ class ModelsLabV7ImageService:
 
             logger.info(f"[IMAGE EXPAND] Payload: {self._redact_payload(payload)}")
 
-            async with aiohttp.ClientSession() as session:
+            async with (
+                provider_limiter.acquire(
+                    "modelslab", self.api_key, timeout=self.acquire_timeout
+                ),
+                aiohttp.ClientSession() as session,
+            ):
                 async with session.post(
                     outpaint_url,
                     json=payload,
@@ -1146,6 +1169,8 @@ class ModelsLabV7ImageService:
                     error_msg = result.get("message", "Unknown outpainting error")
                     raise Exception(f"Outpainting failed: {error_msg}")
 
+        except ProviderCapacityError:
+            raise
         except Exception as e:
             logger.error(f"[IMAGE EXPAND ERROR]: {str(e)}")
             return {
@@ -1317,7 +1342,12 @@ class ModelsLabV7ImageService:
             logger.info(f"[NANO BANANA] Aspect ratio: {aspect_ratio}")
             logger.info(f"[NANO BANANA] Prompt: {prompt[:100]}...")
 
-            async with aiohttp.ClientSession() as session:
+            async with (
+                provider_limiter.acquire(
+                    "modelslab", self.api_key, timeout=self.acquire_timeout
+                ),
+                aiohttp.ClientSession() as session,
+            ):
                 async with session.post(
                     self.image_endpoint,
                     json=payload,
@@ -1357,6 +1387,8 @@ class ModelsLabV7ImageService:
 
                     return self._process_image_response(result, model_id)
 
+        except ProviderCapacityError:
+            raise
         except Exception as e:
             logger.error(f"[NANO BANANA ERROR]: {str(e)}")
             raise e
@@ -4,6 +4,7 @@ import asyncio
 from app.core.config import settings
 from app.core.model_config import get_model_config
 from app.core.services.model_fallback import fallback_manager
+from app.core.services.provider_limiter import ProviderCapacityError, provider_limiter
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,10 +13,13 @@ logger = logging.getLogger(__name__)
 class ModelsLabV7VideoService:
     """ModelsLab V7 Video Service for Veo 2 Video Generation and Lip Sync"""
 
-    def __init__(self):
+    def __init__(self, acquire_timeout: Optional[float] = None):
         if not settings.MODELSLAB_API_KEY:
             raise ValueError("MODELSLAB_API_KEY is required")
 
+        # Longest wait for a ModelsLab slot; None uses the provider default
+        self.acquire_timeout = acquire_timeout
+
         self.api_key = settings.MODELSLAB_API_KEY
         self.base_url = settings.MODELSLAB_BASE_URL  # v7 URL
         self.headers = {"Content-Type": "application/json"}
@@ -164,7 +168,12 @@ class ModelsLabV7VideoService:
                 logger.info(f"[MODELSLAB V7 VIDEO] Image: {image_url}")
                 logger.info(f"[MODELSLAB V7 VIDEO] Prompt: {prompt[:100]}...")
 
-                async with aiohttp.ClientSession() as session:
+                async with (
+                    provider_limiter.acquire(
+                        "modelslab", self.api_key, timeout=self.acquire_timeout
+                    ),
+                    aiohttp.ClientSession() as session,
+                ):
                     async with session.post(
                         self.image_to_video_endpoint,
                         json=payload,
@@ -239,6 +248,10 @@ class ModelsLabV7VideoService:
 
                         return processed_response
 
+            except ProviderCapacityError:
+                # Every model here shares the ModelsLab slots; falling back
+                # would only queue for them again
+                raise
             except Exception as e:
                 logger.error(
                     f"[MODELSLAB V7 VIDEO ERROR] with {current_description}: {self._redact(str(e))}"
@@ -276,7 +289,12 @@ class ModelsLabV7VideoService:
             logger.info(f"[MODELSLAB V7 LIPSYNC] Video: {video_url}")
             logger.info(f"[MODELSLAB V7 LIPSYNC] Audio: {audio_url}")
 
-            async with aiohttp.ClientSession() as session:
+            async with (
+                provider_limiter.acquire(
+                    "modelslab", self.api_key, timeout=self.acquire_timeout
+                ),
+                aiohttp.ClientSession() as session,
+            ):
                 async with session.post(
                     self.lip_sync_endpoint,
                     json=payload,
@@ -316,6 +334,8 @@ class ModelsLabV7VideoService:
 
                     return processed_response
 
+        except ProviderCapacityError:
+            raise
         except Exception as e:
             logger.error(f"[MODELSLAB V7 LIPSYNC ERROR]: {self._redact(str(e))}")
             raise RuntimeError(
@@ -1662,7 +1682,7 @@ engaging visual storytelling, seamless transitions, cinematic composition.
         Returns:
             Dict with status, frame_url (original), upscaled_frame_url, and metadata
         """
-        import subprocess
+        from app.tracing.tracer import traced_run
         import tempfile
         import os
         import base64
@@ -1674,7 +1694,7 @@ engaging visual storytelling, seamless transitions, cinematic composition.
         try:
             # Step 1: Check if FFmpeg is available
             try:
-                result = subprocess.run(
+                result = traced_run(
                     ["ffmpeg", "-version"], capture_output=True, text=True, timeout=5
                 )
                 if result.returncode != 0:
@@ -1736,7 +1756,7 @@ engaging visual storytelling, seamless transitions, cinematic composition.
                 ]
 
                 logger.info(f"[CONSISTENCY LOOP] Extracting last frame...")
-                result = subprocess.run(
+                result = traced_run(
                     ffmpeg_cmd, capture_output=True, text=True, timeout=30
                 )
 
@@ -1856,7 +1876,12 @@ engaging visual storytelling, seamless transitions, cinematic composition.
 
             logger.info(f"[UPSCALE FRAME] Starting upscale with model: {model_id}")
 
-            async with aiohttp.ClientSession() as session:
+            async with (
+                provider_limiter.acquire(
+                    "modelslab", self.api_key, timeout=self.acquire_timeout
+                ),
+                aiohttp.ClientSession() as session,
+            ):
                 async with session.post(
                     upscale_endpoint,
                     json=payload,
@@ -1899,6 +1924,8 @@ engaging visual storytelling, seamless transitions, cinematic composition.
                         "error": "No output URL in upscale response",
                     }
 
+        except ProviderCapacityError:
+            raise
         except Exception as e:
             logger.error(f"[UPSCALE FRAME] Error: {str(e)}")
             return {
@@ -8,6 +8,7 @@ from typing import Any, Dict, Optional
 import httpx
 
 from app.core.config import settings
+from app.core.services.provider_limiter import provider_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -37,10 +38,13 @@ class PiAPIClient:
         start = time.monotonic()
         logger.info("[PiAPI] Creating %s task with model %s", task_type, model)
         try:
-            async with httpx.AsyncClient(
-                base_url=self._base_url_for_client(),
-                timeout=self.timeout_seconds,
-            ) as client:
+            async with (
+                provider_limiter.acquire("piapi", self.api_key),
+                httpx.AsyncClient(
+                    base_url=self._base_url_for_client(),
+                    timeout=self.timeout_seconds,
+                ) as client,
+            ):
                 response = await client.post(
                     self._task_path(),
                     json=payload,
@@ -0,0 +1,423 @@
+"""
+Fleet-wide rate and concurrency limits per provider and API key.
+
+Every API and Celery process shares one token bucket and one concurrency
+semaphore per (provider, API key) in Redis. Limits are configured in
+app/core/provider_limits.py. Adapters wrap provider calls in
+``provider_limiter.acquire(provider, api_key)``. That call waits for a
+concurrency slot, then for a rate token, and raises ProviderCapacityError
+if neither comes within the provider's acquire_timeout_seconds (default
+PROVIDER_LIMIT_ACQUIRE_TIMEOUT_SECONDS).
+
+- **Token bucket.** The bucket refills at requests_per_minute and holds up to
+  `burst` tokens. A caller that finds it empty reserves the next token and
+  sleeps until it is due. Callers queue in order instead of polling.
+- **Semaphore.** The semaphore is a sorted set of leases. A held slot is
+  renewed in the background. A crashed worker's slot expires after
+  lease_seconds.
+- **Fleet backoff.** After a 429, backoff() empties the bucket for a while.
+  Every process then slows down together, instead of each one sleeping on
+  its own. retry_after_seconds() turns the provider's Retry-After into that
+  wait, capped at BACKOFF_MAX_SECONDS.
+
+Both updates run as Lua scripts, so they are atomic across processes. API
+keys are identified by a short hash, never stored. Without Redis the limits
+are enforced per process, so the fleet can exceed them by the number of
+processes until Redis is back.
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.provider_limits import PROVIDER_LIMITS, ProviderLimit
+from app.core.services.redis import redis_client
+from app.tracing.tracer import span
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "provider_limit"
+# After a failed connect, Redis is not retried for this long
+REDIS_RETRY_SECONDS = 5.0
+SLOT_POLL_MIN_SECONDS = 0.05
+SLOT_POLL_MAX_SECONDS = 1.0
+# Backoff after a 429/503: the provider's Retry-After, else the default,
+# never longer than the cap
+BACKOFF_DEFAULT_SECONDS = 30.0
+BACKOFF_MAX_SECONDS = 300.0
+
+# KEYS[1] bucket hash. ARGV: now, tokens per second, capacity, max wait, ttl.
+# Returns the seconds to wait for the reserved token (0 if one was free), or
+# -1 without reserving when the wait would exceed max wait.
+TAKE_TOKEN_SCRIPT = """
+local now = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local capacity = tonumber(ARGV[3])
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+local updated = tonumber(redis.call('HGET', KEYS[1], 'ts'))
+if tokens == nil or updated == nil then
+  tokens = capacity
+  updated = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens < 1 then
+  wait = (1 - tokens) / rate
+  if wait > tonumber(ARGV[4]) then
+    return '-1'
+  end
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+return tostring(wait)
+"""
+
+# KEYS[1] lease sorted set. ARGV: now, limit, lease expiry, holder, ttl.
+ACQUIRE_SLOT_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[2]) then
+  redis.call('ZADD', KEYS[1], ARGV[3], ARGV[4])
+  redis.call('EXPIRE', KEYS[1], ARGV[5])
+  return 1
+end
+return 0
+"""
+
+
+class ProviderCapacityError(RuntimeError):
+    """No slot or rate token for a provider within the acquire timeout."""
+
+    def __init__(self, message: str, provider: Optional[str] = None):
+        super().__init__(message)
+        self.provider = provider
+
+
+def retry_after_seconds(error: BaseException) -> float:
+    """Seconds a 429/503 error asks callers to wait, capped at BACKOFF_MAX_SECONDS."""
+    value = getattr(error, "retry_after", None)
+    if value is None:
+        response = getattr(error, "response", None)
+        headers = getattr(error, "headers", None) or getattr(response, "headers", None)
+        if headers is not None:
+            try:
+                value = headers.get("retry-after") or headers.get("Retry-After")
+            except Exception:
+                value = None
+    seconds = None
+    if value is not None:
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            try:
+                retry_at = parsedate_to_datetime(str(value))
+                seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                seconds = None
+    if seconds is None or seconds <= 0:
+        seconds = BACKOFF_DEFAULT_SECONDS
+    return min(seconds, BACKOFF_MAX_SECONDS)
+
+
+def reserve_token(
+    tokens: Optional[float],
+    updated: Optional[float],
+    now: float,
+    rate: float,
+    capacity: float,
+    max_wait: float,
+) -> Tuple[Optional[float], float]:
+    """
+    Python version of TAKE_TOKEN_SCRIPT for the per-process fallback.
+    Returns the new token count (None if nothing was reserved) and the wait.
+    """
+    if tokens is None or updated is None:
+        tokens, updated = capacity, now
+    tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+    wait = 0.0
+    if tokens < 1:
+        wait = (1 - tokens) / rate
+        if wait > max_wait:
+            return None, -1.0
+    return tokens - 1, wait
+
+
+class ProviderLimiter:
+    def __init__(
+        self,
+        redis_service=redis_client,
+        limits: Optional[Dict[str, ProviderLimit]] = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.redis = redis_service
+        self.limits = PROVIDER_LIMITS if limits is None else limits
+        self.sleep = sleep
+        self._redis_retry_at = 0.0
+        self._local_slots: Dict[Tuple[int, str], asyncio.Semaphore] = {}
+        self._local_buckets: Dict[str, Tuple[float, float]] = {}
+
+    @staticmethod
+    def key_id(api_key: Optional[str]) -> str:
+        if not api_key:
+            return "default"
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+    def redis_key(self, provider: str, api_key: Optional[str], kind: str) -> str:
+        return f"{KEY_PREFIX}:{provider}:{self.key_id(api_key)}:{kind}"
+
+    async def _client(self):
+        if self.redis is None:
+            return None
+        if not getattr(self.redis, "is_connected", False):
+            if time.monotonic() < self._redis_retry_at:
+                return None
+            try:
+                await self.redis.connect()
+            except Exception as exc:
+                logger.warning("[PROVIDER LIMIT] Redis connect failed: %s", exc)
+            if not getattr(self.redis, "is_connected", False):
+                self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+                return None
+        return self.redis.redis_client
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def acquire(
+        self,
+        provider: str,
+        api_key: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[None]:
+        """
+        Hold a concurrency slot and one rate token for a provider call.
+
+        The block is also the provider span of the pipeline trace; its
+        ``wait_ms`` attribute is the time spent queueing for the limits.
+        """
+        with span(provider, "provider") as call_span:
+            limit = self.limits.get(provider)
+            if limit is None or not settings.PROVIDER_LIMITS_ENABLED:
+                yield
+                return
+
+            if timeout is None:
+                timeout = limit.acquire_timeout_seconds
+            if timeout is None:
+                timeout = settings.PROVIDER_LIMIT_ACQUIRE_TIMEOUT_SECONDS
+            started = time.monotonic()
+            deadline = started + timeout
+            release = await self._acquire_slot(provider, api_key, limit, deadline)
+            try:
+                await self._take_token(provider, api_key, limit, deadline)
+                if call_span is not None:
+                    call_span.set(wait_ms=round((time.monotonic() - started) * 1000, 1))
+                yield
+            finally:
+                await release()
+
+    async def backoff(
+        self, provider: str, api_key: Optional[str] = None, seconds: float = 30.0
+    ) -> None:
+        """
+        Empty the provider's bucket so the whole fleet waits about `seconds`
+        before its next request (after a 429).
+        """
+        limit = self.limits.get(provider)
+        if limit is None or not limit.requests_per_minute:
+            return
+        rate = limit.requests_per_minute / 60.0
+        tokens = 1 - rate * seconds
+        now = time.time()
+        self._local_buckets[f"{provider}:{self.key_id(api_key)}"] = (tokens, now)
+        try:
+            client = await self._client()
+            if client is None:
+                return
+            key = self.redis_key(provider, api_key, "bucket")
+            await client.hset(key, mapping={"tokens": str(tokens), "ts": str(now)})
+            await client.expire(key, self._bucket_ttl(limit, seconds))
+            logger.warning(
+                "[PROVIDER LIMIT] %s backing off fleet-wide for %.0fs", provider, seconds
+            )
+        except Exception as exc:
+            logger.warning("[PROVIDER LIMIT] Backoff write failed: %s", exc)
+
+    # ------------------------------------------------------------------
+    # Concurrency
+    # ------------------------------------------------------------------
+
+    async def _acquire_slot(
+        self,
+        provider: str,
+        api_key: Optional[str],
+        limit: ProviderLimit,
+        deadline: float,
+    ) -> Callable[[], Awaitable[None]]:
+        if not limit.max_concurrent:
+            return _noop
+
+        key = self.redis_key(provider, api_key, "slots")
+        holder = uuid.uuid4().hex
+        attempt = 0
+        while True:
+            try:
+                client = await self._client()
+                if client is None:
+                    return await self._acquire_local_slot(provider, api_key, limit, deadline)
+                now = time.time()
+                acquired = await client.eval(
+                    ACQUIRE_SLOT_SCRIPT,
+                    1,
+                    key,
+                    now,
+                    limit.max_concurrent,
+                    now + limit.lease_seconds,
+                    holder,
+                    limit.lease_seconds * 2,
+                )
+            except Exception as exc:
+                logger.warning("[PROVIDER LIMIT] Slot acquire failed, limiting locally: %s", exc)
+                return await self._acquire_local_slot(provider, api_key, limit, deadline)
+            if int(acquired):
+                break
+            delay = min(SLOT_POLL_MAX_SECONDS, SLOT_POLL_MIN_SECONDS * 2**attempt)
+            if time.monotonic() + delay > deadline:
+                raise ProviderCapacityError(
+                    f"{provider} at capacity ({limit.max_concurrent} calls in flight)",
+                    provider,
+                )
+            attempt += 1
+            await self.sleep(delay * random.uniform(0.5, 1.0))
+
+        renewal = asyncio.create_task(self._renew_slot(key, holder, limit.lease_seconds))
+
+        async def release() -> None:
+            renewal.cancel()
+            try:
+                client = await self._client()
+                if client is not None:
+                    await client.zrem(key, holder)
+            except Exception as exc:
+                logger.warning("[PROVIDER LIMIT] Slot release failed (lease expires): %s", exc)
+
+        return release
+
+    async def _renew_slot(self, key: str, holder: str, lease_seconds: int) -> None:
+        while True:
+            await asyncio.sleep(lease_seconds / 3)
+            try:
+                client = await self._client()
+                if client is not None:
+                    await client.zadd(key, {holder: time.time() + lease_seconds}, xx=True)
+            except Exception as exc:
+                logger.warning("[PROVIDER LIMIT] Slot renewal failed: %s", exc)
+
+    async def _acquire_local_slot(
+        self,
+        provider: str,
+        api_key: Optional[str],
+        limit: ProviderLimit,
+        deadline: float,
+    ) -> Callable[[], Awaitable[None]]:
+        # asyncio primitives belong to one event loop; Celery tasks run one each
+        slot_key = (id(asyncio.get_running_loop()), f"{provider}:{self.key_id(api_key)}")
+        semaphore = self._local_slots.get(slot_key)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(limit.max_concurrent)
+            self._local_slots[slot_key] = semaphore
+        try:
+            await asyncio.wait_for(semaphore.acquire(), max(0.0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            raise ProviderCapacityError(
+                f"{provider} at capacity ({limit.max_concurrent} calls in flight)",
+                provider,
+            ) from None
+
+        async def release() -> None:
+            semaphore.release()
+
+        return release
+
+    # ------------------------------------------------------------------
+    # Rate
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _bucket_ttl(limit: ProviderLimit, extra: float = 0.0) -> int:
+        refill_seconds = max(limit.burst, 1) * 60.0 / limit.requests_per_minute
+        return int(refill_seconds + extra) + 60
+
+    async def _take_token(
+        self,
+        provider: str,
+        api_key: Optional[str],
+        limit: ProviderLimit,
+        deadline: float,
+    ) -> None:
+        if not limit.requests_per_minute:
+            return
+        rate = limit.requests_per_minute / 60.0
+        capacity = max(limit.burst, 1)
+        max_wait = max(0.0, deadline - time.monotonic())
+        now = time.time()
+        try:
+            client = await self._client()
+            if client is None:
+                wait = self._take_local_token(provider, api_key, now, rate, capacity, max_wait)
+            else:
+                wait = float(
+                    await client.eval(
+                        TAKE_TOKEN_SCRIPT,
+                        1,
+                        self.redis_key(provider, api_key, "bucket"),
+                        now,
+                        rate,
+                        capacity,
+                        max_wait,
+                        self._bucket_ttl(limit),
+                    )
+                )
+        except Exception as exc:
+            logger.warning("[PROVIDER LIMIT] Token take failed, limiting locally: %s", exc)
+            wait = self._take_local_token(provider, api_key, now, rate, capacity, max_wait)
+
+        if wait < 0:
+            raise ProviderCapacityError(
+                f"{provider} request budget exhausted ({limit.requests_per_minute:g}/min)",
+                provider,
+            )
+        if wait > 0:
+            await self.sleep(wait)
+
+    def _take_local_token(
+        self,
+        provider: str,
+        api_key: Optional[str],
+        now: float,
+        rate: float,
+        capacity: float,
+        max_wait: float,
+    ) -> float:
+        bucket_key = f"{provider}:{self.key_id(api_key)}"
+        tokens, updated = self._local_buckets.get(bucket_key, (None, None))
+        tokens, wait = reserve_token(tokens, updated, now, rate, capacity, max_wait)
+        if tokens is not None:
+            self._local_buckets[bucket_key] = (tokens, now)
+        return wait
+
+
+async def _noop() -> None:
+    return None
+
+
+provider_limiter = ProviderLimiter()
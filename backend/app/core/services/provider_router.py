@@ -6,6 +6,8 @@ from anthropic import AsyncAnthropic
 from openai import AsyncOpenAI
 
 from app.core.config import settings
+from app.core.services.llm_cache import llm_response_cache
+from app.core.services.provider_limiter import provider_limiter, retry_after_seconds
 from app.core.services.redis import redis_client
 
 logger = logging.getLogger(__name__)
@@ -128,8 +130,25 @@ class ProviderRouter:
             logger.warning("[ProviderRouter] Featherless re-arm check failed: %s", exc)
             return False
 
-    async def chat_completion(self, model: str, messages: list, **kwargs) -> Any:
-        """Route a chat completion and normalize Anthropic to the OpenAI shape."""
+    async def chat_completion(
+        self, model: str, messages: list, cache_site: str | None = None, **kwargs
+    ) -> Any:
+        """Route a chat completion and normalize Anthropic to the OpenAI shape.
+
+        Passing cache_site opts the call into the response cache (see
+        app.core.services.llm_cache); its TTL is configured per site.
+        """
+        if cache_site:
+            return await llm_response_cache.get_or_call(
+                cache_site,
+                model,
+                messages,
+                kwargs,
+                lambda: self._chat_completion(model, messages, **kwargs),
+            )
+        return await self._chat_completion(model, messages, **kwargs)
+
+    async def _chat_completion(self, model: str, messages: list, **kwargs) -> Any:
         featherless_active = None
         if model.startswith("featherless/"):
             featherless_active = await self._featherless_active()
@@ -139,13 +158,23 @@ class ProviderRouter:
         client, resolved_model = self.get_client_and_model(
             model, featherless_active=featherless_active
         )
-        if model.startswith("anthropic/"):
-            return await self._anthropic_chat_completion(
-                client, resolved_model, messages, **kwargs
-            )
-        return await client.chat.completions.create(
-            model=resolved_model, messages=messages, **kwargs
-        )
+        provider = provider_name_for_model(model)
+        api_key = getattr(client, "api_key", None)
+        try:
+            async with provider_limiter.acquire(provider, api_key):
+                if model.startswith("anthropic/"):
+                    return await self._anthropic_chat_completion(
+                        client, resolved_model, messages, **kwargs
+                    )
+                return await client.chat.completions.create(
+                    model=resolved_model, messages=messages, **kwargs
+                )
+        except Exception as exc:
+            # Slow every process down for the provider's Retry-After instead
+            # of benching the provider
+            if getattr(exc, "status_code", None) in (429, 503):
+                await provider_limiter.backoff(provider, api_key, retry_after_seconds(exc))
+            raise
 
     @staticmethod
     async def _anthropic_chat_completion(
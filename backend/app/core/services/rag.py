@@ -4,7 +4,9 @@ from datetime import datetime
 from sqlmodel import select, col, desc
 from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.services.ai import AIService
+from app.core.services.context_builder import ContextBuilder
 from app.core.services.embeddings import EmbeddingsService
+from app.core.services.script_ast import attach_script_ast
 from app.books.models import Chapter, Book
 from app.videos.models import Script
 from app.plots.models import PlotOverview
@@ -26,8 +28,13 @@ class RAGService:
         chapter_id: uuid.UUID,
         include_adjacent: bool = True,
         use_vector_search: bool = True,
+        token_budget: Optional[int] = None,
     ) -> Dict[str, Any]:
-        """Retrieve chapter with surrounding context for better video generation"""
+        """Retrieve chapter with surrounding context for better video generation.
+
+        total_context is assembled by ContextBuilder within token_budget
+        (default RAG_CONTEXT_TOKEN_BUDGET); context_budget reports its use.
+        """
         try:
             # Get the target chapter
             statement = select(Chapter).where(Chapter.id == chapter_id)
@@ -78,51 +85,30 @@ class RAGService:
                         c.model_dump() for c in prev_chapters + next_chapters
                     ]
 
-                    # Add adjacent chapter content to total context
-                    adjacent_content = []
-                    for adj_chapter in context["adjacent_chapters"]:
-                        adjacent_content.append(
-                            f"Chapter {adj_chapter['chapter_number']}: {adj_chapter['title']}\n{adj_chapter['content'][:1000]}"
-                        )
-
-                    if adjacent_content:
-                        context["total_context"] = (
-                            "\n\n".join(adjacent_content)
-                            + "\n\n"
-                            + context["total_context"]
-                        )
-
             # Use vector search for similar content if enabled
             if use_vector_search:
                 try:
-                    similar_chunks = (
+                    context["similar_chunks"] = (
                         await self.embeddings_service.get_context_for_chapter(
                             chapter_id=chapter_id, context_chunks=5
                         )
                     )
-                    context["similar_chunks"] = similar_chunks
-
-                    # Add similar content to total context
-                    if similar_chunks:
-                        similar_content = []
-                        for chunk in similar_chunks:
-                            if chunk["chapter"]["id"] != str(
-                                chapter_id
-                            ):  # Don't include the current chapter
-                                similar_content.append(
-                                    f"Related content from Chapter {chunk['chapter']['chapter_number']}: {chunk['content_chunk']}"
-                                )
-
-                        if similar_content:
-                            context["total_context"] = (
-                                context["total_context"]
-                                + "\n\nRelated content:\n"
-                                + "\n".join(similar_content)
-                            )
-
                 except Exception as e:
                     print(f"Vector search failed, falling back to basic context: {e}")
 
+            # Fit chapter, neighbors and related chunks into the token budget
+            built = ContextBuilder(token_budget=token_budget).build(
+                context["chapter"],
+                context["adjacent_chapters"],
+                context["similar_chunks"],
+            )
+            context["total_context"] = built["text"]
+            context["context_budget"] = {
+                "budget": built["budget"],
+                "tokens": built["tokens"],
+                "sources": built["sources"],
+            }
+
             return context
 
         except Exception as e:
@@ -225,6 +211,7 @@ class RAGService:
                 created_at=datetime.now(),
                 status="draft",
             )
+            attach_script_ast(script_record)
             self.session.add(script_record)
             await self.session.commit()
             await self.session.refresh(script_record)
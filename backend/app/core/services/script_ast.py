@@ -0,0 +1,294 @@
+"""
+Compiled screenplay representation shared by every ScriptParser stage.
+
+The audio, video-prompt and scene-splitting passes used to re-split the same
+script text and re-run the same regexes on every line (dialogue patterns,
+sound-effect and camera extraction), once per stage and once per task retry.
+
+``compile_script`` does that work once and returns a ``ScriptAST``: one
+``ScriptLine`` per non-blank line, tagged with its kind and with the scene and
+shot numbering. Each line also carries the character-independent results of
+the line-level extractors. Every line has a stable ``node_id``
+(``s<scene>.<shot>.l<line>``) so stages can refer to the same line.
+
+ASTs are memoized by script hash in-process. ``attach_script_ast`` stores the
+compact form on a ``Script`` row when it is saved, and workers rebuild from
+it without touching the regexes.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+AST_VERSION = 1
+
+# Line kinds, by the first structural rule that matches
+ACT_SCENE = "act_scene"
+LOCATION = "location"
+SCENE_MARKER = "scene_marker"
+PARENTHETICAL = "parenthetical"
+SFX = "sfx"
+MUSIC = "music"
+TEXT = "text"
+
+ACT_SCENE_PATTERN = re.compile(
+    r"^\*?\*?\s*ACT\s+[IVX\d]+\s*[-–—]\s*SCENE\s+\d+", re.IGNORECASE
+)
+
+# (pattern, character group, dialogue group, report the name upper-cased),
+# in the order ScriptParser._detect_character_dialogue tries them
+_DIALOGUE_PATTERNS = (
+    (re.compile(r"^([A-Z][A-Z\s]+):\s*(.+)$"), 1, 2, False),
+    (re.compile(r'^"(.+)"\s*-\s*([A-Z][A-Za-z\s]+)$'), 2, 1, True),
+    (re.compile(r"^([A-Z][A-Z\s]+)\s*\((.+)\)$"), 1, 2, False),
+    (re.compile(r"^(.+)\s*\(([A-Z][A-Za-z\s]+)\)$"), 2, 1, True),
+    (re.compile(r"^([A-Z][A-Z\s]+)\s*-\s*(.+)$"), 1, 2, False),
+)
+
+_CUE_EXCLUDED_PREFIXES = ("SCENE", "INT.", "EXT.", "FADE", "CUT TO")
+
+_CACHE_SIZE = 64
+_cache: "OrderedDict[str, ScriptAST]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class ScriptLine(NamedTuple):
+    number: int  # 1-based line number in the script text
+    kind: str
+    # Scene and shot as the audio parsers count them: ACT/SCENE markers start
+    # a scene, INT./EXT. headings start a shot within it
+    scene: int
+    shot: int
+    # Running count of SCENE/INT./EXT. headings (the video-prompt numbering)
+    heading: int
+    text: str
+    # ALL-CAPS line that may name the speaker of the next line
+    cue: bool
+    # (character, dialogue) per dialogue pattern that matched, in pattern order
+    dialogue: Tuple[Tuple[str, str], ...] = ()
+    sound_effects: Tuple[str, ...] = ()
+    camera_movements: Tuple[str, ...] = ()
+    actions: Tuple[str, ...] = ()
+    transitions: Tuple[str, ...] = ()
+
+    @property
+    def node_id(self) -> str:
+        return f"s{self.scene}.{self.shot}.l{self.number}"
+
+    @property
+    def shot_type(self) -> str:
+        return "key_scene" if self.shot == 0 else "suggested_shot"
+
+    def speaker(self, character_keys: Iterable[str]) -> Optional[Tuple[str, str]]:
+        """First (character, dialogue) whose character is in character_keys (upper-cased)."""
+        for name, dialogue in self.dialogue:
+            if name.upper() in character_keys:
+                return name, dialogue
+        return None
+
+
+def script_hash(script: str) -> str:
+    return hashlib.sha256(script.encode("utf-8")).hexdigest()
+
+
+def dialogue_candidates(line: str) -> Tuple[Tuple[str, str], ...]:
+    candidates = []
+    for pattern, name_group, dialogue_group, upper in _DIALOGUE_PATTERNS:
+        match = pattern.match(line)
+        if match:
+            name = match.group(name_group).strip()
+            candidates.append(
+                (name.upper() if upper else name, match.group(dialogue_group).strip())
+            )
+    return tuple(candidates)
+
+
+def _classify(line: str) -> str:
+    if ACT_SCENE_PATTERN.match(line):
+        return ACT_SCENE
+    if line.startswith("INT.") or line.startswith("EXT."):
+        return LOCATION
+    if line.startswith("SCENE"):
+        return SCENE_MARKER
+    if line.startswith("(") and line.endswith(")"):
+        return PARENTHETICAL
+    if line.startswith("SFX:") or "SOUND:" in line.upper():
+        return SFX
+    if line.startswith("MUSIC:") or "BACKGROUND MUSIC:" in line.upper():
+        return MUSIC
+    return TEXT
+
+
+def _is_cue(line: str) -> bool:
+    return (
+        line.isupper()
+        and ":" not in line
+        and not line.startswith(_CUE_EXCLUDED_PREFIXES)
+    )
+
+
+class ScriptAST:
+    """Lines of one script with scene/shot numbering and per-line extractions."""
+
+    def __init__(self, digest: str, lines: List[ScriptLine], scene_count: int):
+        self.hash = digest
+        self.lines = lines
+        # Scenes counted by the audio parsers (0 if the script has no markers)
+        self.scene_count = scene_count
+
+    @classmethod
+    def build(cls, script: str, parser: Any) -> "ScriptAST":
+        """
+        Compile script text. ``parser`` is a ScriptParser, whose line-level
+        extractors are run once per line here.
+        """
+        lines: List[ScriptLine] = []
+        scene = shot = heading = 0
+        for index, raw in enumerate(script.split("\n")):
+            line = raw.strip()
+            if not line:
+                continue
+
+            kind = _classify(line)
+            if kind == ACT_SCENE or kind == SCENE_MARKER:
+                scene += 1
+                shot = 0
+            elif kind == LOCATION:
+                if scene > 0:
+                    shot += 1
+                else:
+                    scene, shot = 1, 0
+            if kind == LOCATION or kind == SCENE_MARKER:
+                heading += 1
+
+            lines.append(
+                ScriptLine(
+                    number=index + 1,
+                    kind=kind,
+                    scene=scene if scene > 0 else 1,
+                    shot=shot,
+                    heading=heading,
+                    text=line,
+                    cue=_is_cue(line),
+                    dialogue=dialogue_candidates(line),
+                    sound_effects=tuple(parser._extract_sound_effects(line)),
+                    camera_movements=tuple(parser._extract_camera_movements(line)),
+                    actions=tuple(parser._extract_character_actions(line)),
+                    transitions=tuple(parser._extract_scene_transitions(line)),
+                )
+            )
+        return cls(script_hash(script), lines, scene)
+
+    def scenes(self) -> List[Dict[str, Any]]:
+        """Lines grouped as scenes -> shots, with their node ids."""
+        scenes: "OrderedDict[int, OrderedDict[int, List[str]]]" = OrderedDict()
+        for line in self.lines:
+            shots = scenes.setdefault(line.scene, OrderedDict())
+            shots.setdefault(line.shot, []).append(line.node_id)
+        return [
+            {
+                "scene": scene,
+                "shots": [
+                    {"shot": shot, "node_ids": node_ids} for shot, node_ids in shots.items()
+                ],
+            }
+            for scene, shots in scenes.items()
+        ]
+
+    # ------------------------------------------------------------------
+    # Compact form (stored in scripts.script_ast)
+    # ------------------------------------------------------------------
+
+    def to_compact(self) -> Dict[str, Any]:
+        rows = []
+        for line in self.lines:
+            extras = {}
+            for key, value in (
+                ("d", [list(candidate) for candidate in line.dialogue]),
+                ("fx", list(line.sound_effects)),
+                ("cam", list(line.camera_movements)),
+                ("act", list(line.actions)),
+                ("tr", list(line.transitions)),
+            ):
+                if value:
+                    extras[key] = value
+            rows.append(
+                [
+                    line.number,
+                    line.kind,
+                    line.scene,
+                    line.shot,
+                    line.heading,
+                    line.text,
+                    int(line.cue),
+                    extras,
+                ]
+            )
+        return {
+            "version": AST_VERSION,
+            "hash": self.hash,
+            "scene_count": self.scene_count,
+            "lines": rows,
+        }
+
+    @classmethod
+    def from_compact(cls, data: Dict[str, Any]) -> "ScriptAST":
+        lines = [
+            ScriptLine(
+                number=number,
+                kind=kind,
+                scene=scene,
+                shot=shot,
+                heading=heading,
+                text=text,
+                cue=bool(cue),
+                dialogue=tuple(tuple(candidate) for candidate in extras.get("d", ())),
+                sound_effects=tuple(extras.get("fx", ())),
+                camera_movements=tuple(extras.get("cam", ())),
+                actions=tuple(extras.get("act", ())),
+                transitions=tuple(extras.get("tr", ())),
+            )
+            for number, kind, scene, shot, heading, text, cue, extras in data["lines"]
+        ]
+        return cls(data["hash"], lines, data["scene_count"])
+
+
+def compile_script(script: str, compact: Optional[Dict[str, Any]] = None) -> ScriptAST:
+    """
+    ScriptAST for script text, memoized by hash.
+
+    ``compact`` is a stored ``to_compact()`` form (e.g. ``Script.script_ast``);
+    it is used when it was compiled from this exact text by this AST version.
+    """
+    digest = script_hash(script)
+    with _cache_lock:
+        cached = _cache.get(digest)
+        if cached is not None:
+            _cache.move_to_end(digest)
+            return cached
+
+    if compact and compact.get("hash") == digest and compact.get("version") == AST_VERSION:
+        ast = ScriptAST.from_compact(compact)
+    else:
+        from app.core.services.script_parser import ScriptParser
+
+        ast = ScriptAST.build(script, ScriptParser())
+
+    with _cache_lock:
+        _cache[digest] = ast
+        _cache.move_to_end(digest)
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return ast
+
+
+def attach_script_ast(script_record: Any) -> None:
+    """Store the compiled AST on a Script row if its text changed since the last save."""
+    text = script_record.script or ""
+    digest = script_hash(text)
+    if script_record.script_hash == digest and script_record.script_ast:
+        return
+    script_record.script_hash = digest
+    script_record.script_ast = compile_script(text).to_compact()
@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Optional
 from app.core.model_config import ModelTier, SCRIPT_MODEL_CONFIG, get_model_config
 from app.core.services.model_fallback import fallback_manager
 from app.core.services.provider_router import provider_router
+from app.core.services.text_utils import TokenCounter
 
 logger = logging.getLogger(__name__)
 
@@ -32,9 +33,12 @@ class ScriptModelRouter:
         plot_context: Optional[Dict[str, Any]] = None,
         request_id: Optional[str] = None,
         user_id: Optional[str] = None,
+        hedge: bool = False,
     ) -> Dict[str, Any]:
         """
-        Generate script using tier-appropriate model with automatic fallback
+        Generate script using tier-appropriate model with automatic fallback.
+        Interactive callers pass hedge=True to race the next ladder model when
+        the current one runs past its p90 latency.
         """
         tier_str = (
             user_tier.value if isinstance(user_tier, ModelTier) else str(user_tier)
@@ -64,6 +68,14 @@ class ScriptModelRouter:
             generation_function=_generate_with_model,
             request_params={"model": config.primary},
             model_param_name="model",
+            hedge=hedge,
+            on_hedge_cancelled=self._hedge_cost_tracker(
+                self._prepare_script_messages(
+                    content, script_type, target_duration, plot_context
+                ),
+                config,
+                tier_str,
+            ),
         )
         telemetry = {
             "request_id": request_id,
@@ -75,6 +87,8 @@ class ScriptModelRouter:
             "latency_ms": round((time.monotonic() - started_at) * 1000, 2),
             "success": result.get("status") == "success",
         }
+        if result.get("hedge"):
+            telemetry["hedge"] = result["hedge"]
         if result.get("status") != "success":
             telemetry["error"] = result.get("error", "unknown")
         logger.info("[ScriptModelRouter] telemetry %s", json.dumps(telemetry))
@@ -352,6 +366,7 @@ What is it? You look worried.
         analysis_type: str = "summary",
         max_tokens: Optional[int] = None,
         system_prompt_override: Optional[str] = None,
+        hedge: bool = False,
     ) -> Dict[str, Any]:
         """
         Analyze content for various purposes (summary, keywords, difficulty, etc.)
@@ -363,6 +378,8 @@ What is it? You look worried.
                 as the user message directly. This allows callers (e.g. consultation)
                 to supply their own system prompt while still benefiting from the
                 fallback chain.
+            hedge: Race the next ladder model once the current one runs past its
+                p90 latency (interactive endpoints only).
         """
         tier_str = (
             user_tier.value if isinstance(user_tier, ModelTier) else str(user_tier)
@@ -440,8 +457,52 @@ What is it? You look worried.
             generation_function=_analyze_with_model,
             request_params={"model_id": config.primary},
             model_param_name="model_id",
+            hedge=hedge,
+            on_hedge_cancelled=self._hedge_cost_tracker(
+                [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message},
+                ],
+                config,
+                tier_str,
+            ),
         )
 
+    def _hedge_cost_tracker(
+        self, messages: List[Dict[str, str]], config: Any, tier_str: str
+    ):
+        """
+        Cost callback for a hedged call that lost the race and was cancelled.
+        Its prompt has been billed by the provider; output tokens are unknown,
+        so only the prompt is tracked.
+        """
+
+        async def _track(model: str, elapsed: float) -> None:
+            token_counter = TokenCounter()
+            input_tokens = sum(
+                token_counter.count_tokens(message["content"]) for message in messages
+            )
+            cost_per_1k_input = (
+                config.cost_per_1k_input if config.cost_per_1k_input else 0.0
+            )
+            tier_enum = (
+                ModelTier(tier_str)
+                if tier_str in [t.value for t in ModelTier]
+                else ModelTier.FREE
+            )
+            logger.info(
+                f"[ScriptModelRouter] Hedge loser {model} cancelled after {elapsed:.1f}s"
+            )
+            await self.cost_tracker.track(
+                user_tier=tier_enum,
+                model=model,
+                input_tokens=input_tokens,
+                output_tokens=0,
+                cost=(input_tokens / 1000) * cost_per_1k_input,
+            )
+
+        return _track
+
     async def _execute_analysis(
         self,
         model: str,
@@ -1,14 +1,26 @@
 import re
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
 import json
 
+from app.core.services.script_ast import (
+    ACT_SCENE,
+    LOCATION,
+    SCENE_MARKER,
+    ScriptLine,
+    compile_script,
+    dialogue_candidates,
+)
+
 
 class ScriptParser:
     def __init__(self):
         pass
 
     def parse_script_for_video_prompt(
-        self, script: str, characters: List[str]
+        self,
+        script: str,
+        characters: List[str],
+        stored_ast: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Parse script to extract components for enhanced video prompt generation"""
 
@@ -24,76 +36,61 @@ class ScriptParser:
             "scene_transitions": [],
         }
 
-        lines = script.split("\n")
-        current_scene = 0
+        script_ast = compile_script(script, stored_ast)
+        character_keys = {char.upper() for char in characters}
         current_character = None
 
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
+        for line in script_ast.lines:
+            text = line.text
 
             # Detect scene changes and extract camera directions
-            if (
-                line.startswith("SCENE")
-                or line.startswith("INT.")
-                or line.startswith("EXT.")
-            ):
-                current_scene += 1
+            if line.kind in (SCENE_MARKER, LOCATION):
                 current_character = None
 
                 # Extract camera movements from scene descriptions
-                camera_movements = self._extract_camera_movements(line)
+                camera_movements = list(line.camera_movements)
                 if camera_movements:
                     parsed_components["camera_movements"].extend(camera_movements)
 
                 # Add scene description
                 parsed_components["scene_descriptions"].append(
                     {
-                        "scene_number": current_scene,
-                        "description": line,
+                        "scene_number": line.heading,
+                        "description": text,
                         "camera_movements": camera_movements,
+                        "node_id": line.node_id,
                     }
                 )
                 continue
 
             # Extract camera movements from all lines (not just scene headers)
-            camera_movements = self._extract_camera_movements(line)
-            if camera_movements:
-                parsed_components["camera_movements"].extend(camera_movements)
+            if line.camera_movements:
+                parsed_components["camera_movements"].extend(line.camera_movements)
 
             # Check for character name (ALL CAPS at start of line)
-            if (
-                line.isupper()
-                and ":" not in line
-                and not line.startswith("SFX:")
-                and not line.startswith("MUSIC:")
-                and not line.startswith(("SCENE", "INT.", "EXT.", "FADE", "CUT TO"))
-            ):
-
+            if line.cue:
                 # Verify it's a known character (case-insensitive)
-                if any(char.upper() == line.upper() for char in characters):
-                    current_character = line
+                if text.upper() in character_keys:
+                    current_character = text
                     print(
-                        f"[VIDEO PROMPT PARSER] Detected character: {line} (line {i+1})"
+                        f"[VIDEO PROMPT PARSER] Detected character: {text} (line {line.number})"
                     )
                     continue
 
             # Extract character actions from parentheses
-            character_actions = self._extract_character_actions(line)
-            if character_actions:
-                for action in character_actions:
-                    parsed_components["character_actions"].append(
-                        {
-                            "character": current_character or "Unknown",
-                            "action": action,
-                            "scene": current_scene,
-                            "line_number": i + 1,
-                        }
-                    )
+            for action in line.actions:
+                parsed_components["character_actions"].append(
+                    {
+                        "character": current_character or "Unknown",
+                        "action": action,
+                        "scene": line.heading,
+                        "line_number": line.number,
+                        "node_id": line.node_id,
+                    }
+                )
 
             # Extract character dialogue with attribution
-            character_match = self._detect_character_dialogue(line, characters)
+            character_match = line.speaker(character_keys)
             if character_match:
                 character_name, dialogue = character_match
                 print(
@@ -103,35 +100,36 @@ class ScriptParser:
                     {
                         "character": character_name,
                         "text": dialogue,
-                        "scene": current_scene,
-                        "line_number": i + 1,
+                        "scene": line.heading,
+                        "line_number": line.number,
                         "attributed_dialogue": f"{character_name} says: {dialogue}",
+                        "node_id": line.node_id,
                     }
                 )
                 current_character = None
                 continue
 
             # Handle dialogue lines that follow character names
-            if current_character and self._is_dialogue_line(line):
+            if current_character and self._is_dialogue_line(text):
                 print(
-                    f"[VIDEO PROMPT PARSER] Found dialogue following character {current_character}: {line[:50]}..."
+                    f"[VIDEO PROMPT PARSER] Found dialogue following character {current_character}: {text[:50]}..."
                 )
                 parsed_components["character_dialogues"].append(
                     {
                         "character": current_character,
-                        "text": line,
-                        "scene": current_scene,
-                        "line_number": i + 1,
-                        "attributed_dialogue": f"{current_character} says: {line}",
+                        "text": text,
+                        "scene": line.heading,
+                        "line_number": line.number,
+                        "attributed_dialogue": f"{current_character} says: {text}",
+                        "node_id": line.node_id,
                     }
                 )
                 current_character = None
                 continue
 
             # Extract scene transitions
-            transitions = self._extract_scene_transitions(line)
-            if transitions:
-                parsed_components["scene_transitions"].extend(transitions)
+            if line.transitions:
+                parsed_components["scene_transitions"].extend(line.transitions)
 
         print(f"[VIDEO PROMPT PARSER] Parsing completed:")
         print(f"- Scenes: {len(parsed_components['scene_descriptions'])}")
@@ -361,6 +359,7 @@ class ScriptParser:
         scene_descriptions: List[str],
         script_style: str = "cinematic_movie",
         dialogue_moments: Dict[str, List[Dict]] = None,
+        stored_ast: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Parse script to extract different audio components based on style"""
 
@@ -415,11 +414,15 @@ class ScriptParser:
         # Handle cinematic movie style differently (includes both 'cinematic_movie' and 'cinematic')
         if script_style in ("cinematic_movie", "cinematic"):
             return self._parse_cinematic_movie_script(
-                script, cleaned_characters, scene_descriptions, dialogue_moments
+                script,
+                cleaned_characters,
+                scene_descriptions,
+                dialogue_moments,
+                stored_ast=stored_ast,
             )
         else:
             return self._parse_narration_script(
-                script, cleaned_characters, scene_descriptions
+                script, cleaned_characters, scene_descriptions, stored_ast=stored_ast
             )
 
     def _generate_sound_effects(self, scene_descriptions: List) -> List[Dict[str, Any]]:
@@ -583,12 +586,51 @@ class ScriptParser:
 
         return effects_found
 
+    @staticmethod
+    def _scene_info(line: ScriptLine) -> Dict[str, Any]:
+        """Scene number and shot of a line, as audio components record them."""
+        return {
+            "scene": line.scene,
+            "shot_type": line.shot_type,
+            "shot_index": line.shot,
+        }
+
+    @staticmethod
+    def _matches_character(script_name: str, char_name: str) -> bool:
+        """Relaxed match of a character cue against a known character name."""
+        script_upper = script_name.upper()
+        char_upper = char_name.upper()
+
+        # Exact match
+        if script_upper == char_upper:
+            return True
+
+        # Direct substring match (either direction)
+        if script_upper in char_upper or char_upper in script_upper:
+            return True
+
+        # Word-based matching: check if ALL words in script name appear in char name
+        # This handles "MRS. DURSLEY" matching "Mrs. Petunia Dursley"
+        script_words = script_upper.replace(".", "").split()
+        char_words = char_upper.replace(".", "").split()
+        if all(word in char_words for word in script_words):
+            return True
+
+        # Last name matching: check if last word matches
+        # This handles "DURSLEY" matching any Dursley
+        if script_words and char_words:
+            if script_words[-1] == char_words[-1]:
+                return True
+
+        return False
+
     def _parse_cinematic_movie_script(
         self,
         script: str,
         characters: List[str],
         scene_descriptions: List[str],
         dialogue_moments: Dict[str, List[Dict]] = None,
+        stored_ast: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Parse cinematic movie script with character dialogues"""
 
@@ -607,51 +649,25 @@ class ScriptParser:
             "sound_effects": [],
             "background_music": [],
         }
-        lines = script.split("\n")
-        current_scene = 0
-        current_sub_scene = 0  # Track sub-scenes (INT/EXT within same ACT+SCENE)
+        script_ast = compile_script(script, stored_ast)
+        character_keys = {char.upper() for char in characters}
         current_character = None
 
-        # Regex pattern for ACT+SCENE markers (e.g., **ACT I - SCENE 1**, ACT I - SCENE 1, etc.)
-        act_scene_pattern = re.compile(
-            r"^\*?\*?\s*ACT\s+[IVX\d]+\s*[-–—]\s*SCENE\s+\d+", re.IGNORECASE
-        )
-
-        # Helper function to get current scene number as integer (no floats)
-        def get_scene_number():
-            return current_scene if current_scene > 0 else 1
-
-        # Helper function to get full scene info with shot_type
-        def get_scene_info():
-            return {
-                "scene": current_scene if current_scene > 0 else 1,
-                "shot_type": (
-                    "key_scene" if current_sub_scene == 0 else "suggested_shot"
-                ),
-                "shot_index": current_sub_scene,
-            }
-
         # Helper function to find matching shot index from dialogue_moments
-        def find_matching_shot_index(dialogue: str, scene_num: int) -> tuple:
+        def find_matching_shot_index(dialogue: str, line: ScriptLine) -> tuple:
             """
             Match dialogue to suggested shot's dialogue_preview.
             Returns: (shot_index, shot_type) - position-based index (1, 2, 3...) for suggested shots
             """
             if not dialogue_moments:
-                return (
-                    current_sub_scene,
-                    "key_scene" if current_sub_scene == 0 else "suggested_shot",
-                )
+                return (line.shot, line.shot_type)
 
             # Try both string and int keys for scene number
             scene_moments = dialogue_moments.get(
-                str(scene_num)
-            ) or dialogue_moments.get(scene_num, [])
+                str(line.scene)
+            ) or dialogue_moments.get(line.scene, [])
             if not scene_moments:
-                return (
-                    current_sub_scene,
-                    "key_scene" if current_sub_scene == 0 else "suggested_shot",
-                )
+                return (line.shot, line.shot_type)
 
             dialogue_lower = dialogue.lower().strip()
 
@@ -667,104 +683,49 @@ class ScriptParser:
                         return (idx + 1, "suggested_shot")
 
             # No match found, use fallback
-            return (
-                current_sub_scene,
-                "key_scene" if current_sub_scene == 0 else "suggested_shot",
-            )
+            return (line.shot, line.shot_type)
 
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
+        for script_line in script_ast.lines:
+            line = script_line.text
+            scene_info = self._scene_info(script_line)
 
-            # Check for ACT+SCENE markers first (primary scene boundary)
-            if act_scene_pattern.match(line):
-                current_scene += 1
-                current_sub_scene = 0  # Reset sub-scene counter
+            # ACT+SCENE markers are the primary scene boundary; INT./EXT. lines
+            # are sub-scene (shot) boundaries within one. The AST numbers both.
+            if script_line.kind == ACT_SCENE:
                 current_character = None  # Reset character context on scene change
                 continue
 
-            # Check for INT./EXT. lines (sub-scene boundaries within an ACT+SCENE)
-            if line.startswith("INT.") or line.startswith("EXT."):
-                # Only increment sub-scene if we're already in a scene
-                if current_scene > 0:
-                    current_sub_scene += 1
-                else:
-                    # If no ACT+SCENE marker seen yet, treat INT/EXT as scene 1
-                    current_scene = 1
-                    current_sub_scene = 0
-
+            if script_line.kind == LOCATION:
                 current_character = None  # Reset character context on location change
 
                 # Extract environmental sounds from scene description
                 scene_sounds = self._extract_scene_sounds(line)
                 if scene_sounds:
-                    scene_info = get_scene_info()
                     for sound in scene_sounds:
-                        sound["scene"] = scene_info["scene"]
-                        sound["shot_type"] = scene_info["shot_type"]
-                        sound["shot_index"] = scene_info["shot_index"]
+                        sound.update(scene_info)
                     audio_components["sound_effects"].extend(scene_sounds)
                 continue
 
             # Legacy: Handle standalone SCENE markers without ACT
-            if line.startswith("SCENE") and not act_scene_pattern.match(line):
-                current_scene += 1
-                current_sub_scene = 0
+            if script_line.kind == SCENE_MARKER:
                 current_character = None
                 continue
 
             # Check if line is a character name (ALL CAPS at start of line, no colon)
-            if (
-                line.isupper()
-                and ":" not in line
-                and not line.startswith("SFX:")
-                and not line.startswith("MUSIC:")
-                and not line.startswith(("SCENE", "INT.", "EXT.", "FADE", "CUT TO"))
-            ):
-
+            if script_line.cue:
                 # Verify it's a known character (case-insensitive)
-                # Relaxed matching: check multiple ways to match character names
-                def matches_character(script_name: str, char_name: str) -> bool:
-                    script_upper = script_name.upper()
-                    char_upper = char_name.upper()
-
-                    # Exact match
-                    if script_upper == char_upper:
-                        return True
-
-                    # Direct substring match (either direction)
-                    if script_upper in char_upper or char_upper in script_upper:
-                        return True
-
-                    # Word-based matching: check if ALL words in script name appear in char name
-                    # This handles "MRS. DURSLEY" matching "Mrs. Petunia Dursley"
-                    script_words = script_upper.replace(".", "").split()
-                    char_words = char_upper.replace(".", "").split()
-                    if all(word in char_words for word in script_words):
-                        return True
-
-                    # Last name matching: check if last word matches
-                    # This handles "DURSLEY" matching any Dursley
-                    if script_words and char_words:
-                        if script_words[-1] == char_words[-1]:
-                            return True
-
-                    return False
-
-                if any(matches_character(line, char) for char in characters):
+                if any(self._matches_character(line, char) for char in characters):
                     current_character = line
                     print(
-                        f"[SCRIPT PARSER DEBUG] Detected character: {line} (line {i+1})"
+                        f"[SCRIPT PARSER DEBUG] Detected character: {line} (line {script_line.number})"
                     )
                     continue
 
-            character_match = self._detect_character_dialogue(line, characters)
+            character_match = script_line.speaker(character_keys)
             if character_match:
                 character_name, dialogue = character_match
-                scene_info = get_scene_info()
                 matched_shot_index, matched_shot_type = find_matching_shot_index(
-                    dialogue, scene_info["scene"]
+                    dialogue, script_line
                 )
                 audio_components["character_dialogues"].append(
                     {
@@ -773,7 +734,8 @@ class ScriptParser:
                         "scene": scene_info["scene"],
                         "shot_type": matched_shot_type,
                         "shot_index": matched_shot_index,
-                        "line_number": i + 1,
+                        "line_number": script_line.number,
+                        "node_id": script_line.node_id,
                     }
                 )
                 current_character = None  # Reset after dialogue
@@ -854,7 +816,6 @@ class ScriptParser:
                 )
 
                 if is_audio_expression:
-                    scene_info = get_scene_info()
                     # Create a descriptive prompt for ElevenLabs SFX generation
                     description = f"{current_character} {expression}"
                     audio_components["sound_effects"].append(
@@ -867,7 +828,8 @@ class ScriptParser:
                             "shot_index": scene_info["shot_index"],
                             "audio_type": "expression",
                             "duration": 5.0,
-                            "line_number": i + 1,
+                            "line_number": script_line.number,
+                            "node_id": script_line.node_id,
                         }
                     )
                     print(
@@ -885,9 +847,8 @@ class ScriptParser:
                 or (not line.startswith("(") and len(line.split()) > 1)
             ):
                 dialogue = line.strip('"').strip("'")
-                scene_info = get_scene_info()
                 matched_shot_index, matched_shot_type = find_matching_shot_index(
-                    dialogue, scene_info["scene"]
+                    dialogue, script_line
                 )
                 audio_components["character_dialogues"].append(
                     {
@@ -896,16 +857,16 @@ class ScriptParser:
                         "scene": scene_info["scene"],
                         "shot_type": matched_shot_type,
                         "shot_index": matched_shot_index,
-                        "line_number": i + 1,
+                        "line_number": script_line.number,
+                        "node_id": script_line.node_id,
                     }
                 )
                 current_character = None  # Reset after dialogue
                 continue
 
             # Detect sound effects in parentheses or brackets
-            sound_effects = self._extract_sound_effects(line)
+            sound_effects = script_line.sound_effects
             if sound_effects:
-                scene_info = get_scene_info()
                 for effect in sound_effects:
                     audio_components["sound_effects"].append(
                         {
@@ -913,7 +874,8 @@ class ScriptParser:
                             "scene": scene_info["scene"],
                             "shot_type": scene_info["shot_type"],
                             "shot_index": scene_info["shot_index"],
-                            "line_number": i + 1,
+                            "line_number": script_line.number,
+                            "node_id": script_line.node_id,
                         }
                     )
                 continue
@@ -921,14 +883,14 @@ class ScriptParser:
             # Check for explicit sound/music cues
             if line.startswith("SFX:") or "SOUND:" in line.upper():
                 effect = line.replace("SFX:", "").replace("SOUND:", "").strip()
-                scene_info = get_scene_info()
                 audio_components["sound_effects"].append(
                     {
                         "description": effect,
                         "scene": scene_info["scene"],
                         "shot_type": scene_info["shot_type"],
                         "shot_index": scene_info["shot_index"],
-                        "line_number": i + 1,
+                        "line_number": script_line.number,
+                        "node_id": script_line.node_id,
                     }
                 )
                 continue
@@ -937,14 +899,14 @@ class ScriptParser:
                 music = (
                     line.replace("MUSIC:", "").replace("BACKGROUND MUSIC:", "").strip()
                 )
-                scene_info = get_scene_info()
                 audio_components["background_music"].append(
                     {
                         "description": music,
                         "scene": scene_info["scene"],
                         "shot_type": scene_info["shot_type"],
                         "shot_index": scene_info["shot_index"],
-                        "line_number": i + 1,
+                        "line_number": script_line.number,
+                        "node_id": script_line.node_id,
                     }
                 )
                 continue
@@ -965,7 +927,7 @@ class ScriptParser:
 
         # If we detected more scenes in the script than we have music cues for,
         # generate fallback music cues for the missing scenes
-        max_detected_scene = current_scene
+        max_detected_scene = script_ast.scene_count
         existing_music_scenes = {
             m.get("scene") for m in audio_components["background_music"]
         }
@@ -995,7 +957,11 @@ class ScriptParser:
         return audio_components
 
     def _parse_narration_script(
-        self, script: str, characters: List[str], scene_descriptions: List[str]
+        self,
+        script: str,
+        characters: List[str],
+        scene_descriptions: List[str],
+        stored_ast: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Parse regular narration script (existing logic)"""
 
@@ -1006,113 +972,64 @@ class ScriptParser:
             "background_music": [],
         }
 
-        # Split script into lines for processing
-        lines = script.split("\n")
-        current_scene = 0
-        current_sub_scene = 0  # Track sub-scenes (INT/EXT within same ACT+SCENE)
+        script_ast = compile_script(script, stored_ast)
+        character_keys = {char.upper() for char in characters}
 
-        # Regex pattern for ACT+SCENE markers (e.g., **ACT I - SCENE 1**, ACT I - SCENE 1, etc.)
-        act_scene_pattern = re.compile(
-            r"^\*?\*?\s*ACT\s+[IVX\d]+\s*[-–—]\s*SCENE\s+\d+", re.IGNORECASE
-        )
-
-        # Helper function to get current scene number as integer (no floats)
-        def get_scene_number():
-            return current_scene if current_scene > 0 else 1
-
-        # Helper function to get full scene info with shot_type
-        def get_scene_info():
-            return {
-                "scene": current_scene if current_scene > 0 else 1,
-                "shot_type": (
-                    "key_scene" if current_sub_scene == 0 else "suggested_shot"
-                ),
-                "shot_index": current_sub_scene,
-            }
-
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
+        for script_line in script_ast.lines:
+            line = script_line.text
+            scene_info = self._scene_info(script_line)
 
-            # Check for ACT+SCENE markers first (primary scene boundary)
-            if act_scene_pattern.match(line):
-                current_scene += 1
-                current_sub_scene = 0  # Reset sub-scene counter
+            # ACT+SCENE and standalone SCENE markers start a scene
+            if script_line.kind in (ACT_SCENE, SCENE_MARKER):
                 continue
 
-            # Check for INT./EXT. lines (sub-scene boundaries within an ACT+SCENE)
-            if line.startswith("INT.") or line.startswith("EXT."):
-                # Only increment sub-scene if we're already in a scene
-                if current_scene > 0:
-                    current_sub_scene += 1
-                else:
-                    # If no ACT+SCENE marker seen yet, treat INT/EXT as scene 1
-                    current_scene = 1
-                    current_sub_scene = 0
-
+            # INT./EXT. lines are sub-scene boundaries within an ACT+SCENE
+            if script_line.kind == LOCATION:
                 # Extract environmental sounds from scene description
                 scene_sounds = self._extract_scene_sounds(line)
                 if scene_sounds:
-                    scene_info = get_scene_info()
                     for sound in scene_sounds:
-                        sound["scene"] = scene_info["scene"]
-                        sound["shot_type"] = scene_info["shot_type"]
-                        sound["shot_index"] = scene_info["shot_index"]
+                        sound.update(scene_info)
                     audio_components["sound_effects"].extend(scene_sounds)
                 continue
 
-            # Legacy: Handle standalone SCENE markers without ACT
-            if line.startswith("SCENE") and not act_scene_pattern.match(line):
-                current_scene += 1
-                current_sub_scene = 0
-                continue
-
             # Detect character dialogue
-            character_match = self._detect_character_dialogue(line, characters)
+            character_match = script_line.speaker(character_keys)
             if character_match:
                 character_name, dialogue = character_match
-                scene_info = get_scene_info()
                 audio_components["character_dialogues"].append(
                     {
                         "character": character_name,
                         "text": dialogue,
-                        "scene": scene_info["scene"],
-                        "shot_type": scene_info["shot_type"],
-                        "shot_index": scene_info["shot_index"],
-                        "line_number": i + 1,
+                        **scene_info,
+                        "line_number": script_line.number,
+                        "node_id": script_line.node_id,
                     }
                 )
                 continue
 
             # Detect narrator text (descriptive text that's not dialogue)
-            if self._is_narrator_text(line, characters):
-                scene_info = get_scene_info()
+            if self._is_narrator_text(line, characters, script_line):
                 audio_components["narrator_segments"].append(
                     {
                         "text": line,
-                        "scene": scene_info["scene"],
-                        "shot_type": scene_info["shot_type"],
-                        "shot_index": scene_info["shot_index"],
-                        "line_number": i + 1,
+                        **scene_info,
+                        "line_number": script_line.number,
+                        "node_id": script_line.node_id,
                     }
                 )
                 continue
 
             # Detect sound effects in parentheses or brackets
-            sound_effects = self._extract_sound_effects(line)
-            if sound_effects:
-                scene_info = get_scene_info()
-                for effect in sound_effects:
-                    audio_components["sound_effects"].append(
-                        {
-                            "description": effect,
-                            "scene": scene_info["scene"],
-                            "shot_type": scene_info["shot_type"],
-                            "shot_index": scene_info["shot_index"],
-                            "line_number": i + 1,
-                        }
-                    )
+            for effect in script_line.sound_effects:
+                audio_components["sound_effects"].append(
+                    {
+                        "description": effect,
+                        **scene_info,
+                        "line_number": script_line.number,
+                        "node_id": script_line.node_id,
+                    }
+                )
 
         # Add scene-based background music
         # First try to use scene_descriptions if provided
@@ -1123,7 +1040,7 @@ class ScriptParser:
 
         # If we detected more scenes in the script than we have music cues for,
         # generate fallback music cues for the missing scenes
-        max_detected_scene = current_scene
+        max_detected_scene = script_ast.scene_count
         existing_music_scenes = {
             m.get("scene") for m in audio_components["background_music"]
         }
@@ -1149,85 +1066,28 @@ class ScriptParser:
     ) -> Tuple[str, str] | None:
         """Detect if a line contains character dialogue"""
 
-        # Pattern 1: CHARACTER: dialogue (case-insensitive matching)
-        colon_pattern = r"^([A-Z][A-Z\s]+):\s*(.+)$"
-        match = re.match(colon_pattern, line)
-        if match:
-            character_name = match.group(1).strip()
-            dialogue = match.group(2).strip()
-
-            # Check if it's a known character (case-insensitive)
-            if character_name in characters or any(
-                char.upper() == character_name.upper() for char in characters
-            ):
-                print(
-                    f"[SCRIPT PARSER DEBUG] Detected dialogue pattern 1: {character_name}: {dialogue[:50]}..."
-                )
-                return (character_name, dialogue)
-
-        # Pattern 2: "dialogue" - CHARACTER (case-insensitive)
-        quote_pattern = r'^"(.+)"\s*-\s*([A-Z][A-Za-z\s]+)$'
-        match = re.match(quote_pattern, line)
-        if match:
-            dialogue = match.group(1).strip()
-            character_name = match.group(2).strip().upper()
-
-            if character_name.upper() in [char.upper() for char in characters]:
-                print(
-                    f'[SCRIPT PARSER DEBUG] Detected dialogue pattern 2: "{dialogue[:50]}..." - {character_name}'
-                )
+        # Patterns (in order): CHARACTER: dialogue, "dialogue" - CHARACTER,
+        # CHARACTER (dialogue), dialogue (CHARACTER), CHARACTER - dialogue.
+        # The first one naming a known character (case-insensitive) wins.
+        character_keys = {char.upper() for char in characters}
+        for character_name, dialogue in dialogue_candidates(line):
+            if character_name.upper() in character_keys:
                 return (character_name, dialogue)
-
-        # Pattern 3: CHARACTER (dialogue)
-        paren_pattern = r"^([A-Z][A-Z\s]+)\s*\((.+)\)$"
-        match = re.match(paren_pattern, line)
-        if match:
-            character_name = match.group(1).strip()
-            dialogue = match.group(2).strip()
-
-            if character_name in characters or any(
-                char.upper() == character_name.upper() for char in characters
-            ):
-                print(
-                    f"[SCRIPT PARSER DEBUG] Detected dialogue pattern 3: {character_name} ({dialogue[:50]}...)"
-                )
-                return (character_name, dialogue)
-
-        # Pattern 4: dialogue (CHARACTER)
-        reverse_paren_pattern = r"^(.+)\s*\(([A-Z][A-Za-z\s]+)\)$"
-        match = re.match(reverse_paren_pattern, line)
-        if match:
-            dialogue = match.group(1).strip()
-            character_name = match.group(2).strip().upper()
-
-            if character_name.upper() in [char.upper() for char in characters]:
-                print(
-                    f"[SCRIPT PARSER DEBUG] Detected dialogue pattern 4: {dialogue[:50]}... ({character_name})"
-                )
-                return (character_name, dialogue)
-
-        # Pattern 5: CHARACTER - dialogue
-        dash_pattern = r"^([A-Z][A-Z\s]+)\s*-\s*(.+)$"
-        match = re.match(dash_pattern, line)
-        if match:
-            character_name = match.group(1).strip()
-            dialogue = match.group(2).strip()
-
-            if character_name in characters or any(
-                char.upper() == character_name.upper() for char in characters
-            ):
-                print(
-                    f"[SCRIPT PARSER DEBUG] Detected dialogue pattern 5: {character_name} - {dialogue[:50]}..."
-                )
-                return (character_name, dialogue)
-
         return None
 
-    def _is_narrator_text(self, line: str, characters: List[str]) -> bool:
+    def _is_narrator_text(
+        self,
+        line: str,
+        characters: List[str],
+        script_line: Optional[ScriptLine] = None,
+    ) -> bool:
         """Check if line is narrator text (not dialogue or stage directions)"""
 
         # Skip if it's character dialogue
-        if self._detect_character_dialogue(line, characters):
+        if script_line is not None:
+            if script_line.speaker({char.upper() for char in characters}):
+                return False
+        elif self._detect_character_dialogue(line, characters):
             return False
 
         # Skip if it's scene headers
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import asyncio
 import os
 import re
 import hashlib
@@ -6,6 +7,7 @@ from typing import Optional, BinaryIO
 from pathlib import Path
 from urllib.parse import urlsplit, urlunsplit
 from app.core.config import settings
+from app.tracing.tracer import traced
 import boto3
 from botocore.client import Config
 from botocore.exceptions import ClientError
@@ -130,6 +132,7 @@ class S3StorageService:
 
         return base
 
+    @traced("storage.upload", "storage", capture=("path",))
     async def upload(
         self, file_content: bytes, path: str, content_type: Optional[str] = None
     ) -> str:
@@ -142,9 +145,14 @@ class S3StorageService:
             if content_type:
                 extra_args["ContentType"] = content_type
 
-            # Upload using put_object (memory-efficient for bytes)
-            self.client.put_object(
-                Bucket=self.bucket_name, Key=path, Body=file_content, **extra_args
+            # Upload using put_object (memory-efficient for bytes); boto3 is
+            # blocking, so keep it off the event loop
+            await asyncio.to_thread(
+                self.client.put_object,
+                Bucket=self.bucket_name,
+                Key=path,
+                Body=file_content,
+                **extra_args,
             )
 
             # Generate public URL
@@ -161,6 +169,7 @@ class S3StorageService:
             )
             raise
 
+    @traced("storage.upload_stream", "storage", capture=("path",))
     async def upload_stream(
         self, file_stream: BinaryIO, path: str, content_type: Optional[str] = None
     ) -> str:
@@ -177,38 +186,9 @@ class S3StorageService:
         upload_fileobj without ContentType in ExtraArgs.
         """
         try:
-            # Read stream into bytes to use put_object (atomic, avoids multipart signing issues)
-            file_stream.seek(0, 2)  # Seek to end to get size
-            size = file_stream.tell()
-            file_stream.seek(0)
-
-            extra_args = {}
-            if content_type:
-                extra_args["ContentType"] = content_type
-
-            if size <= 5 * 1024 * 1024:  # ≤ 5MB: use put_object (atomic signing)
-                body = file_stream.read()
-                self.client.put_object(
-                    Bucket=self.bucket_name, Key=path, Body=body, **extra_args
-                )
-            else:
-                # > 5MB: use multipart upload, but avoid ContentType in ExtraArgs
-                # to prevent SignatureDoesNotMatch on some S3-compatible backends
-                self.client.upload_fileobj(
-                    file_stream, self.bucket_name, path, ExtraArgs={}
-                )
-                # Apply content type via a separate put_object metadata update if needed
-                if content_type:
-                    try:
-                        self.client.copy_object(
-                            Bucket=self.bucket_name,
-                            Key=path,
-                            CopySource={"Bucket": self.bucket_name, "Key": path},
-                            MetadataDirective="REPLACE",
-                            ContentType=content_type,
-                        )
-                    except Exception as meta_err:
-                        logger.warning(f"Failed to set ContentType for {path}: {meta_err}")
+            await asyncio.to_thread(
+                self._upload_stream_sync, file_stream, path, content_type
+            )
 
             if self.use_minio:
                 return f"{self._minio_public_url_base()}/{self.bucket_name}/{path}"
@@ -219,6 +199,43 @@ class S3StorageService:
             logger.error(f"Stream upload failed for {path}: {e}")
             raise
 
+    def _upload_stream_sync(
+        self, file_stream: BinaryIO, path: str, content_type: Optional[str]
+    ) -> None:
+        """Blocking body of upload_stream, run in a worker thread."""
+        # Read stream into bytes to use put_object (atomic, avoids multipart signing issues)
+        file_stream.seek(0, 2)  # Seek to end to get size
+        size = file_stream.tell()
+        file_stream.seek(0)
+
+        extra_args = {}
+        if content_type:
+            extra_args["ContentType"] = content_type
+
+        if size <= 5 * 1024 * 1024:  # ≤ 5MB: use put_object (atomic signing)
+            body = file_stream.read()
+            self.client.put_object(
+                Bucket=self.bucket_name, Key=path, Body=body, **extra_args
+            )
+        else:
+            # > 5MB: use multipart upload, but avoid ContentType in ExtraArgs
+            # to prevent SignatureDoesNotMatch on some S3-compatible backends
+            self.client.upload_fileobj(
+                file_stream, self.bucket_name, path, ExtraArgs={}
+            )
+            # Apply content type via a separate put_object metadata update if needed
+            if content_type:
+                try:
+                    self.client.copy_object(
+                        Bucket=self.bucket_name,
+                        Key=path,
+                        CopySource={"Bucket": self.bucket_name, "Key": path},
+                        MetadataDirective="REPLACE",
+                        ContentType=content_type,
+                    )
+                except Exception as meta_err:
+                    logger.warning(f"Failed to set ContentType for {path}: {meta_err}")
+
     @staticmethod
     def build_media_path(
         user_id: str,
@@ -242,6 +259,7 @@ class S3StorageService:
 
         return f"{base_path}/{record_id}.{ext}"
 
+    @traced("storage.persist_from_url", "storage", capture=("source_url", "dest_path"))
     async def persist_from_url(self, source_url: str, dest_path: str, content_type: Optional[str] = None, timeout_seconds: int = 120, max_retries: int = 3) -> str:
         """Download from external URL and persist to our S3 storage.
 
@@ -252,12 +270,16 @@ class S3StorageService:
         import httpx
         import asyncio
         import io
+        from app.core.async_runtime import shared_http_client
 
         last_error = None
         for attempt in range(max_retries):
             try:
-                async with httpx.AsyncClient(timeout=float(timeout_seconds), follow_redirects=True) as client:
-                    async with client.stream("GET", source_url) as response:
+                # Reuses the worker's pooled client inside Celery tasks
+                async with shared_http_client(timeout=float(timeout_seconds)) as client:
+                    async with client.stream(
+                        "GET", source_url, timeout=float(timeout_seconds)
+                    ) as response:
                         response.raise_for_status()
                         buffer = io.BytesIO()
                         async for chunk in response.aiter_bytes(chunk_size=8192):
@@ -312,17 +334,34 @@ class S3StorageService:
 
         return path
 
+    @traced("storage.download", "storage", capture=("path",))
     async def download(self, path: str) -> Optional[bytes]:
         """Download file from storage"""
         try:
             path = self._strip_url_prefix(path)
-            response = self.client.get_object(Bucket=self.bucket_name, Key=path)
-            return response["Body"].read()
+            return await asyncio.to_thread(self._get_object_bytes, path)
         except ClientError as e:
             if e.response["Error"]["Code"] == "NoSuchKey":
                 return None
             raise
 
+    def _get_object_bytes(self, path: str) -> bytes:
+        response = self.client.get_object(Bucket=self.bucket_name, Key=path)
+        return response["Body"].read()
+
+    async def exists(self, path: str) -> bool:
+        """Check whether an object (key or public URL) exists in storage"""
+        try:
+            path = self._strip_url_prefix(path)
+            await asyncio.to_thread(
+                self.client.head_object, Bucket=self.bucket_name, Key=path
+            )
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
     def get_public_url(self, path: str) -> str:
         """Get public URL for a file"""
         path = self._strip_url_prefix(path).lstrip("/")
@@ -351,7 +390,9 @@ class S3StorageService:
     async def delete(self, path: str) -> bool:
         """Delete file from storage"""
         try:
-            self.client.delete_object(Bucket=self.bucket_name, Key=path)
+            await asyncio.to_thread(
+                self.client.delete_object, Bucket=self.bucket_name, Key=path
+            )
             return True
         except Exception as e:
             logger.error(f"Delete failed for {path}: {e}")
@@ -1,4 +1,5 @@
 import re
+import threading
 import unicodedata
 import tiktoken
 from typing import List, Dict, Any, Optional, Tuple
@@ -6,6 +7,51 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# tiktoken encodings by model, loaded once per process
+_encodings: Dict[str, Any] = {}
+_encodings_lock = threading.Lock()
+
+# End of a sentence (with any closing quote/bracket) or a paragraph break
+_SENTENCE_END = re.compile(r"[.!?][\"'”’)\]]*(?=\s)|\n\s*\n")
+
+
+def get_encoding(model: str) -> Optional[Any]:
+    """
+    tiktoken encoding for a model, cached per process.
+
+    Returns None if the encoding cannot be loaded (tiktoken fetches BPE files
+    on first use); callers then estimate ~4 characters per token. Failures
+    are not cached, so a later call retries.
+    """
+    encoding = _encodings.get(model)
+    if encoding is not None:
+        return encoding
+    with _encodings_lock:
+        encoding = _encodings.get(model)
+        if encoding is None:
+            try:
+                try:
+                    encoding = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    # Fallback to cl100k_base encoding (used by gpt-3.5-turbo and gpt-4)
+                    encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                logger.warning(f"tiktoken encoding unavailable for {model}, estimating tokens: {e}")
+                return None
+            _encodings[model] = encoding
+    return encoding
+
+
+def cut_at_sentence_boundary(text: str) -> str:
+    """Drop a trailing partial sentence, or a partial word if no sentence ends past halfway."""
+    last_end = None
+    for match in _SENTENCE_END.finditer(text):
+        last_end = match.end()
+    if last_end is not None and last_end >= len(text) // 2:
+        return text[:last_end].rstrip()
+    space = text.rfind(" ")
+    return text[:space].rstrip() if space > 0 else text
+
 class TextSanitizer:
     """Comprehensive text sanitization utility for handling Unicode and encoding issues"""
     
@@ -106,11 +152,7 @@ class TokenCounter:
             model: OpenAI model name (default: gpt-3.5-turbo)
         """
         self.model = model
-        try:
-            self.encoding = tiktoken.encoding_for_model(model)
-        except KeyError:
-            # Fallback to cl100k_base encoding (used by gpt-3.5-turbo and gpt-4)
-            self.encoding = tiktoken.get_encoding("cl100k_base")
+        self.encoding = get_encoding(model)
     
     def count_tokens(self, text: str) -> int:
         """
@@ -122,6 +164,8 @@ class TokenCounter:
         Returns:
             Number of tokens
         """
+        if self.encoding is None:
+            return len(text) // 4
         try:
             return len(self.encoding.encode(text))
         except Exception as e:
@@ -129,6 +173,31 @@ class TokenCounter:
             # Fallback: rough estimate (1 token ≈ 4 characters)
             return len(text) // 4
     
+    def truncate_to_tokens(self, text: str, max_tokens: int) -> Tuple[str, int]:
+        """
+        Truncate text to at most max_tokens, ending on a sentence boundary.
+        
+        Args:
+            text: Text to truncate
+            max_tokens: Token limit
+            
+        Returns:
+            Tuple of (text, token count); text is unchanged if it already fits
+        """
+        if max_tokens <= 0 or not text:
+            return "", 0
+        if self.encoding is None:
+            if len(text) <= max_tokens * 4:
+                return text, len(text) // 4
+            head = text[: max_tokens * 4]
+        else:
+            tokens = self.encoding.encode(text)
+            if len(tokens) <= max_tokens:
+                return text, len(tokens)
+            head = self.encoding.decode(tokens[:max_tokens])
+        head = cut_at_sentence_boundary(head)
+        return head, self.count_tokens(head)
+    
     def count_message_tokens(self, messages: List[Dict[str, str]]) -> int:
         """
         Count tokens for a list of messages (system, user, assistant).
@@ -234,6 +303,8 @@ class TextChunker:
             # Find overlap start position
             overlap_start = self._find_overlap_start(text, end_pos, overlap_tokens)
             start_pos = overlap_start
+        
+        return chunks
     
     def _find_chunk_end(self, text: str, start_pos: int, max_tokens: int) -> int:
         """
@@ -0,0 +1,141 @@
+"""
+Multi-title locator for chapter content extraction.
+
+FileService used to search the whole book once per chapter title, and once
+more per case variant of it (exact, UPPER, lower, Title), with str.find or
+re.search loops. For an 80-chapter book that is hundreds of full-text passes.
+
+TitleLocator case-folds the text once and finds every occurrence of every
+title in a single regex scan. The regex is built as a character trie
+(``the (?:storm|sea)`` rather than ``the storm|the sea``), so the matcher
+branches per character instead of trying each title at each position, in
+the spirit of Aho-Corasick. The result is a position index shared by every
+lookup for that text.
+
+Positions are reported in the original text, so callers can still check the
+exact casing of a hit (``text[start:end]``).
+"""
+
+import re
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Titles longer than this are matched on their prefix, then verified in full
+_TRIE_PREFIX_CHARS = 200
+
+Span = Tuple[int, int]
+
+
+def _fold(text: str) -> Tuple[str, Optional[List[int]]]:
+    """
+    Lowercase text, with an offset map when lowercasing changes its length.
+
+    A few characters lowercase to two code points (e.g. "İ"); the map takes a
+    position in the folded text back to the original.
+    """
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded, None
+    offsets: List[int] = []
+    pieces: List[str] = []
+    for index, char in enumerate(text):
+        lowered = char.lower()
+        pieces.append(lowered)
+        offsets.extend([index] * len(lowered))
+    offsets.append(len(text))
+    return "".join(pieces), offsets
+
+
+def _trie_pattern(keys: Iterable[str]) -> str:
+    trie: Dict[str, dict] = {}
+    for key in keys:
+        node = trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # A key ending here makes the rest optional
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class TitleLocator:
+    """All occurrences of a set of titles in one text, found in one pass."""
+
+    def __init__(self, text: str, titles: Iterable[str]):
+        self.text = text
+        self._folded, self._offsets = _fold(text)
+
+        self._spans: Dict[str, List[Span]] = {}
+        folded_titles = {title.lower() for title in titles if title and title.strip()}
+        for folded_title in folded_titles:
+            self._spans[folded_title] = []
+        if not folded_titles:
+            return
+
+        # Candidate titles at a hit are looked up by their first few characters
+        key_len = min(len(title) for title in folded_titles)
+        buckets: Dict[str, List[str]] = {}
+        for folded_title in folded_titles:
+            buckets.setdefault(folded_title[:key_len], []).append(folded_title)
+
+        pattern = re.compile(
+            _trie_pattern({title[:_TRIE_PREFIX_CHARS] for title in folded_titles})
+        )
+        folded = self._folded
+        position = 0
+        while True:
+            match = pattern.search(folded, position)
+            if not match:
+                break
+            start = match.start()
+            for folded_title in buckets.get(folded[start : start + key_len], ()):
+                if folded.startswith(folded_title, start):
+                    self._spans[folded_title].append(
+                        self._original_span(start, start + len(folded_title))
+                    )
+            position = start + 1
+
+    def _original_span(self, start: int, end: int) -> Span:
+        if self._offsets is None:
+            return start, end
+        return self._offsets[start], self._offsets[end]
+
+    def __contains__(self, title: str) -> bool:
+        return title.lower() in self._spans
+
+    def spans(self, title: str, start: int = 0, end: Optional[int] = None) -> List[Span]:
+        """Case-insensitive occurrences of title starting in [start, end), in order."""
+        spans = self._spans.get(title.lower())
+        if spans is None:
+            raise KeyError(f"Title was not indexed: {title!r}")
+        lo = bisect_left(spans, (start, -1))
+        hi = len(spans) if end is None else bisect_left(spans, (end, -1))
+        return spans[lo:hi]
+
+    def positions(self, title: str, start: int = 0, end: Optional[int] = None) -> List[int]:
+        return [span[0] for span in self.spans(title, start, end)]
+
+    def first(self, title: str, start: int = 0) -> Optional[Span]:
+        """First occurrence starting at or after start, or None."""
+        spans = self.spans(title, start)
+        return spans[0] if spans else None
+
+    @property
+    def indexed_titles(self) -> List[str]:
+        return list(self._spans)
+
+    def exact_positions(self, variants: Iterable[str], start: int = 0) -> List[int]:
+        """Start positions where the original text is exactly one of variants."""
+        positions = set()
+        for variant in set(variants):
+            positions.update(
+                s for s, e in self.spans(variant, start) if self.text[s:e] == variant
+            )
+        return sorted(positions)
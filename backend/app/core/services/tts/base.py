@@ -46,6 +46,8 @@ class TTSResult:
 
 class TTSProvider(ABC):
     provider_name: str = "base"
+    # Parallel requests one worker may keep in flight against this provider
+    max_concurrent_requests: int = 4
 
     @abstractmethod
     async def synthesize(self, text: str, voice_id: Optional[str] = None, model: Optional[str] = None, **kwargs: Any) -> TTSResult:
@@ -8,6 +8,7 @@ from .base import TTSProvider, TTSResult, VoiceOption
 
 class GoogleTTSProvider(TTSProvider):
     provider_name = "google"
+    max_concurrent_requests = 8
 
     async def synthesize(self, text: str, voice_id: Optional[str] = None, model: Optional[str] = None, **kwargs: Any) -> TTSResult:
         if not settings.GOOGLE_TTS_API_KEY and not settings.GOOGLE_AI_STUDIO_API_KEY:
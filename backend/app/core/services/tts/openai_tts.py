@@ -8,6 +8,7 @@ from .base import TTSProvider, TTSResult, VoiceOption
 
 class OpenAITTSProvider(TTSProvider):
     provider_name = "openai"
+    max_concurrent_requests = 8
 
     async def synthesize(self, text: str, voice_id: Optional[str] = None, model: Optional[str] = None, **kwargs: Any) -> TTSResult:
         if not settings.OPENAI_API_KEY:
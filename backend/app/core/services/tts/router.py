@@ -85,5 +85,15 @@ class TTSRouter:
         provider_name, provider_model = self._parse_model(resolved_model)
         return self.providers[provider_name].max_chars_per_request(model=provider_model)
 
+    def max_concurrent_requests(self, user_tier: str, model: Optional[str] = None) -> int:
+        config = get_model_config("tts", user_tier)
+        resolved_model = model or (config.primary if config else "elevenlabs/eleven_turbo_v2")
+        provider_name, _ = self._parse_model(resolved_model)
+        return self.providers[provider_name].max_concurrent_requests
+
+    def resolve_model(self, user_tier: str, model: Optional[str] = None) -> str:
+        config = get_model_config("tts", user_tier)
+        return model or (config.primary if config else "elevenlabs/eleven_turbo_v2")
+
 
 tts_router = TTSRouter()
@@ -0,0 +1,141 @@
+"""
+Sentence- and paragraph-aware text segmentation for TTS requests.
+
+split_for_tts() packs whole sentences into chunks no longer than the
+provider's max_chars_per_request, preferring to break between paragraphs,
+then between sentences, then at clause punctuation and finally at word
+boundaries. A chunk is never cut mid-word unless a single word exceeds the
+limit, so the provider never receives half a sentence it would mispronounce
+or re-intonate.
+"""
+
+import re
+from typing import List
+
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Sentence end: terminal punctuation (incl. ellipsis), optional closing
+# quotes/brackets, then whitespace. Decimals like 3.5 have no whitespace.
+_SENTENCE_END_RE = re.compile(r"(?:[.!?]+|…)[\"'”’)\]]*(?=\s)")
+
+# Common abbreviations that end in a period but do not end a sentence
+_ABBREVIATIONS = frozenset(
+    {
+        "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "mt", "vs", "etc",
+        "e.g", "i.e", "no", "vol", "ch", "fig", "gen", "col", "lt", "capt",
+        "sgt", "rev", "hon", "inc", "ltd", "co",
+    }
+)
+
+_CLAUSE_BREAK_RE = re.compile(r"(?<=[;:,—–])\s+")
+
+
+def split_sentences(paragraph: str) -> List[str]:
+    """Split one paragraph into sentences, keeping terminal punctuation."""
+    text = _WHITESPACE_RE.sub(" ", paragraph).strip()
+    if not text:
+        return []
+
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END_RE.finditer(text):
+        end = match.end()
+        if text[match.start()] == ".":
+            word = text[start:match.start()].rsplit(" ", 1)[-1].lower()
+            # "Dr. Watson", "e.g. this" and initials like "J. R." continue the sentence
+            if word in _ABBREVIATIONS or (len(word) == 1 and word.isalpha()):
+                continue
+        sentence = text[start:end].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = end
+
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def _split_long_sentence(sentence: str, max_chars: int) -> List[str]:
+    """Break a sentence longer than max_chars at clauses, then words."""
+    pieces: List[str] = []
+    for clause in _CLAUSE_BREAK_RE.split(sentence):
+        if len(clause) <= max_chars:
+            pieces.append(clause)
+            continue
+        current = ""
+        for word in clause.split(" "):
+            while len(word) > max_chars:
+                if current:
+                    pieces.append(current)
+                    current = ""
+                pieces.append(word[:max_chars])
+                word = word[max_chars:]
+            candidate = f"{current} {word}" if current else word
+            if len(candidate) > max_chars:
+                pieces.append(current)
+                current = word
+            else:
+                current = candidate
+        if current:
+            pieces.append(current)
+    return _pack(pieces, max_chars, " ")
+
+
+def _pack(units: List[str], max_chars: int, separator: str) -> List[str]:
+    """Greedily join units into chunks of at most max_chars."""
+    chunks: List[str] = []
+    current = ""
+    for unit in units:
+        if not unit:
+            continue
+        candidate = f"{current}{separator}{unit}" if current else unit
+        if len(candidate) <= max_chars:
+            current = candidate
+        else:
+            if current:
+                chunks.append(current)
+            current = unit
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_for_tts(text: str, max_chars: int) -> List[str]:
+    """
+    Split text into TTS requests of at most max_chars characters.
+
+    Paragraph breaks are kept inside a chunk (as a blank line) so providers
+    still pause between paragraphs.
+    """
+    if not text or not text.strip():
+        return []
+    max_chars = max(1, int(max_chars))
+
+    chunks: List[str] = []
+    current = ""
+    for paragraph in _PARAGRAPH_RE.split(text.strip()):
+        units: List[str] = []
+        for sentence in split_sentences(paragraph):
+            if len(sentence) > max_chars:
+                units.extend(_split_long_sentence(sentence, max_chars))
+            else:
+                units.append(sentence)
+        if not units:
+            continue
+
+        packed = _pack(units, max_chars, " ")
+        # Continue the running chunk with this paragraph's first piece if it fits
+        first = packed[0]
+        candidate = f"{current}\n\n{first}" if current else first
+        if len(candidate) <= max_chars:
+            current = candidate
+            packed = packed[1:]
+        for piece in packed:
+            if current:
+                chunks.append(current)
+            current = piece
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,92 @@
+"""
+Phrase-level TTS synthesis cache.
+
+Synthesized speech is stored in the content-addressed media cache
+(app/media_cache) under media_type "tts", keyed by
+(provider/model, voice_id, voice settings, normalized text, user scope).
+Repeated dialogue lines, narrator boilerplate and task re-runs reuse the
+audio already persisted to storage instead of paying the provider again.
+
+Entries are keyed on the model that actually produced the audio
+(synthesized_model), not the one requested: audio from a fallback model is
+never served for a request of the primary.
+
+Callers leave cached seconds out of the billed duration, so every entry needs
+a duration. TTS providers do not report one, so it is probed from the stored
+audio when the entry is written, and on lookup for entries stored without it.
+"""
+
+from typing import Any, Dict, Optional
+
+from app.core.database import async_session
+from app.core.services.ffmpeg_utils import probe_audio_duration_from_url
+from app.media_cache.models import MediaCacheEntry
+from app.media_cache.service import MediaCacheService, build_media_cache_key
+
+TTS_CACHE_MEDIA_TYPE = "tts"
+
+
+def build_tts_cache_key(
+    *,
+    model: Optional[str],
+    voice_id: Optional[str],
+    text: str,
+    voice_settings: Optional[Dict[str, Any]] = None,
+    scope: Optional[str] = None,
+) -> str:
+    """model is the router form "provider/model", so the provider is part of the key."""
+    return build_media_cache_key(
+        media_type=TTS_CACHE_MEDIA_TYPE,
+        model_id=model,
+        prompt=text,
+        scope=scope,
+        extra={"voice_id": voice_id or "", "settings": voice_settings or {}},
+    )
+
+
+def synthesized_model(result: Dict[str, Any]) -> Optional[str]:
+    """Router form "provider/model" of the model that produced a synthesis result.
+
+    Accepts both TTSResult.to_dict() (provider, model) and the audio task
+    adapter shape (service, model_used); None when the model is not reported.
+    """
+    model = result.get("model_used") or result.get("model")
+    if not model or model == "unknown":
+        return None
+    if "/" in model:
+        return model
+    provider = result.get("provider") or result.get("service")
+    if not provider or provider == "tts_router":
+        return None
+    return f"{provider}/{model}"
+
+
+async def lookup_synthesis(cache_key: str) -> Optional[MediaCacheEntry]:
+    async with async_session() as session:
+        entry = await MediaCacheService(session).lookup(cache_key)
+    if entry is not None and entry.duration_seconds is None:
+        entry.duration_seconds = await probe_audio_duration_from_url(entry.media_url)
+    return entry
+
+
+async def store_synthesis(
+    cache_key: str,
+    *,
+    audio_url: str,
+    model: Optional[str],
+    user_id: Optional[str] = None,
+    duration_seconds: Optional[float] = None,
+    meta: Optional[dict] = None,
+) -> None:
+    if duration_seconds is None and MediaCacheService.enabled():
+        duration_seconds = await probe_audio_duration_from_url(audio_url)
+    async with async_session() as session:
+        await MediaCacheService(session).store(
+            cache_key,
+            media_type=TTS_CACHE_MEDIA_TYPE,
+            media_url=audio_url,
+            model_id=model,
+            user_id=user_id,
+            duration_seconds=duration_seconds,
+            meta=meta,
+        )
@@ -5,7 +5,6 @@ Uses backend/static/assets/watermark.png and burns watermark directly into media
 
 import math
 import os
-import subprocess
 import tempfile
 import uuid
 from typing import Optional, Tuple
@@ -15,6 +14,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.subscriptions.models import SubscriptionStatus, UserSubscription
+from app.tracing.tracer import traced_run
 
 
 WATERMARK_ASSET_PATH = os.path.join(
@@ -39,7 +39,7 @@ def _probe_video_dimensions(media_path: str) -> Optional[Tuple[int, int]]:
         "csv=s=x:p=0",
         media_path,
     ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = traced_run(cmd, capture_output=True, text=True)
     if result.returncode != 0 or not result.stdout.strip():
         print(f"[WATERMARK] ffprobe failed for {media_path}: {result.stderr}")
         return None
@@ -128,7 +128,7 @@ def apply_watermark_sync(input_path: str, output_path: str) -> bool:
     ]
 
     print("[WATERMARK] Applying embedded watermark to video")
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = traced_run(cmd, capture_output=True, text=True)
     if result.returncode != 0:
         print(f"[WATERMARK] Failed to apply video watermark: {result.stderr}")
         return False
@@ -166,7 +166,7 @@ def apply_image_watermark_sync(input_path: str, output_path: str) -> bool:
     ]
 
     print("[WATERMARK] Applying embedded watermark to image")
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = traced_run(cmd, capture_output=True, text=True)
     if result.returncode != 0:
         print(f"[WATERMARK] Failed to apply image watermark: {result.stderr}")
         return False
@@ -97,3 +97,43 @@ class CreditFailure(SQLModel, table=True):
         default=None,
         sa_column=Column(pg.TIMESTAMP(timezone=True), nullable=True),
     )
+
+
+class CreditBalance(SQLModel, table=True):
+    """
+    Materialized per-user balance, kept in step with credit_grants and
+    credit_transactions by CreditService and reconciled against them by the
+    reconcile_failed_credits beat task.
+    """
+
+    __tablename__ = "credit_balances"
+
+    user_id: uuid.UUID = Field(
+        sa_column=Column(pg.UUID(as_uuid=True), primary_key=True)
+    )
+    # Sum of credits_remaining over non-expired grants
+    credits_remaining: int = Field(
+        sa_column=Column(Integer, nullable=False, server_default=text("0"))
+    )
+    # Sum of amount over non-expired "reserved" transactions
+    credits_reserved: int = Field(
+        sa_column=Column(Integer, nullable=False, server_default=text("0"))
+    )
+    # Earliest expires_at among the grants and reservations counted above;
+    # past it the row is rebuilt from the ledger before use
+    valid_until: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(pg.TIMESTAMP(timezone=True), nullable=True),
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(
+            pg.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=text("CURRENT_TIMESTAMP"),
+        ),
+    )
+    reconciled_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(pg.TIMESTAMP(timezone=True), nullable=True),
+    )
@@ -9,6 +9,12 @@ Flow:
 
 For per-unit task deductions (idempotent):
     await service.deduct_for_operation(user_id, amount, operation_type, ref_id)
+
+Every operation that changes a user's balance first locks that user's
+credit_balances row. The row holds running totals of active grants and
+reservations, updated in the same transaction as the ledger rows, so a
+reservation costs one row lock instead of locking and summing every grant.
+New grants go through add_grant for the same reason.
 """
 
 import uuid
@@ -16,7 +22,7 @@ import math
 import logging
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone, timedelta
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 from sqlmodel import select, func
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -31,6 +37,99 @@ logger = logging.getLogger(__name__)
 # Reservations expire after 2 hours if not confirmed/released
 RESERVATION_TTL_HOURS = 2
 
+# Balance rows checked against the ledger per reconciliation run
+RECONCILE_BATCH_SIZE = 500
+
+# Totals of the active ledger rows per user. valid_until is the earliest
+# expiry among the rows counted: the totals stay exact until then.
+_LEDGER_TOTALS_SQL = text("""
+    SELECT u.user_id,
+           COALESCE(g.remaining, 0) AS credits_remaining,
+           COALESCE(t.reserved, 0) AS credits_reserved,
+           LEAST(g.min_expires_at, t.min_expires_at) AS valid_until
+    FROM unnest(CAST(:user_ids AS uuid[])) AS u(user_id)
+    LEFT JOIN LATERAL (
+        SELECT SUM(credits_remaining) AS remaining, MIN(expires_at) AS min_expires_at
+        FROM credit_grants
+        WHERE user_id = u.user_id AND expires_at > :now AND credits_remaining > 0
+    ) g ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT SUM(amount) AS reserved, MIN(expires_at) AS min_expires_at
+        FROM credit_transactions
+        WHERE user_id = u.user_id AND status = 'reserved' AND expires_at > :now
+    ) t ON TRUE
+""")
+
+# A new row starts out expired so the first lock builds it from the ledger
+_INSERT_BALANCE_SQL = text("""
+    INSERT INTO credit_balances (user_id, valid_until)
+    VALUES (:user_id, :now)
+    ON CONFLICT (user_id) DO NOTHING
+""")
+
+_LOCK_BALANCE_SQL = text("""
+    SELECT credits_remaining, credits_reserved, valid_until
+    FROM credit_balances
+    WHERE user_id = :user_id
+    FOR UPDATE
+""")
+
+_READ_BALANCE_SQL = text("""
+    SELECT credits_remaining, credits_reserved
+    FROM credit_balances
+    WHERE user_id = :user_id
+      AND (valid_until IS NULL OR valid_until > :now)
+""")
+
+_SET_BALANCE_SQL = text("""
+    UPDATE credit_balances
+    SET credits_remaining = :credits_remaining,
+        credits_reserved = :credits_reserved,
+        valid_until = :valid_until,
+        updated_at = NOW()
+    WHERE user_id = :user_id
+""")
+
+# LEAST ignores NULLs: a NULL valid_until (nothing expires) takes the new expiry
+_APPLY_DELTA_SQL = text("""
+    UPDATE credit_balances
+    SET credits_remaining = credits_remaining + :remaining_delta,
+        credits_reserved = credits_reserved + :reserved_delta,
+        valid_until = LEAST(valid_until, CAST(:expires_at AS timestamptz)),
+        updated_at = NOW()
+    WHERE user_id = :user_id
+""")
+
+_INVALIDATE_BALANCE_SQL = text("""
+    UPDATE credit_balances SET valid_until = :now, updated_at = NOW()
+    WHERE user_id = :user_id
+""")
+
+_LOCK_RECONCILE_BATCH_SQL = text("""
+    SELECT user_id, credits_remaining, credits_reserved
+    FROM credit_balances
+    ORDER BY reconciled_at NULLS FIRST
+    LIMIT :limit
+    FOR UPDATE SKIP LOCKED
+""")
+
+_RECONCILE_BALANCE_SQL = text("""
+    UPDATE credit_balances
+    SET credits_remaining = :credits_remaining,
+        credits_reserved = :credits_reserved,
+        valid_until = :valid_until,
+        reconciled_at = NOW(),
+        updated_at = NOW()
+    WHERE user_id = :user_id
+""")
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Naive timestamps are stored as UTC by the driver; compare them as such."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
 
 class CreditService:
     def __init__(self, session: AsyncSession):
@@ -60,6 +159,15 @@ class CreditService:
 
     async def get_effective_balance(self, user_id: uuid.UUID) -> int:
         """Available credits = raw balance minus pending reservations."""
+        result = await self.session.execute(
+            _READ_BALANCE_SQL,
+            {"user_id": user_id, "now": datetime.now(timezone.utc)},
+        )
+        row = result.first()
+        if row is not None:
+            return max(0, row[0] - row[1])
+
+        # No balance row yet, or one of its grants/reservations has expired
         raw = await self.get_raw_balance(user_id)
         pending = await self.get_pending_reservations(user_id)
         return max(0, raw - pending)
@@ -75,7 +183,8 @@ class CreditService:
         """
         Atomically check available balance and create a reservation.
 
-        Uses SELECT FOR UPDATE on credit_grants to prevent double-spending.
+        Uses SELECT FOR UPDATE on the user's credit_balances row to prevent
+        double-spending.
         Raises ValueError if insufficient credits.
         Returns the reservation transaction id.
         """
@@ -85,25 +194,9 @@ class CreditService:
         now = datetime.now(timezone.utc)
         expires_at = now + timedelta(hours=RESERVATION_TTL_HOURS)
 
-        # Lock active grant rows to prevent concurrent over-commitment
-        # Note: FOR UPDATE cannot be used with aggregate functions in PostgreSQL,
-        # so we lock the rows first, then sum separately
-        lock_stmt = text("""
-            SELECT id, credits_remaining
-            FROM credit_grants
-            WHERE user_id = :user_id
-              AND expires_at > NOW()
-              AND credits_remaining > 0
-            ORDER BY id
-            FOR UPDATE
-        """)
-        lock_result = await self.session.execute(lock_stmt, {"user_id": str(user_id)})
-        locked_rows = lock_result.fetchall()
-        raw_balance = sum(row[1] for row in locked_rows)
-
-        # Also fetch current pending reservation total (without locking transactions table)
-        pending = await self.get_pending_reservations(user_id)
-        effective = max(0, raw_balance - pending)
+        # One row lock per user serializes concurrent reservations
+        balance = await self._lock_balance(user_id, now)
+        effective = max(0, balance["credits_remaining"] - balance["credits_reserved"])
 
         if effective < amount:
             raise ValueError(
@@ -121,6 +214,7 @@ class CreditService:
         )
         self.session.add(transaction)
         await self.session.flush()  # get the id without committing
+        await self._apply_balance_delta(user_id, reserved_delta=amount, expires_at=expires_at)
         return transaction.id
 
     async def confirm_deduction(
@@ -134,9 +228,13 @@ class CreditService:
         If actual_amount < reserved amount, only the actual amount is deducted.
         Returns True on success, False if reservation not found or already settled.
         """
-        stmt = select(CreditTransaction).where(
-            CreditTransaction.id == reservation_id,
-            CreditTransaction.status == "reserved",
+        stmt = (
+            select(CreditTransaction)
+            .where(
+                CreditTransaction.id == reservation_id,
+                CreditTransaction.status == "reserved",
+            )
+            .with_for_update()
         )
         result = await self.session.exec(stmt)
         transaction = result.first()
@@ -148,6 +246,9 @@ class CreditService:
             )
             return False
 
+        now = datetime.now(timezone.utc)
+        await self._lock_balance(transaction.user_id, now)
+
         deduct_amount = actual_amount if actual_amount is not None else transaction.amount
         if deduct_amount > 0:
             success = await deduct_credits(
@@ -163,8 +264,14 @@ class CreditService:
                     transaction.user_id,
                     deduct_amount,
                 )
+                await self._invalidate_balance(transaction.user_id, now)
                 return False
 
+        await self._apply_balance_delta(
+            transaction.user_id,
+            remaining_delta=-deduct_amount,
+            reserved_delta=-self._held_amount(transaction, now),
+        )
         transaction.status = "confirmed"
         transaction.amount = deduct_amount
         self.session.add(transaction)
@@ -175,9 +282,13 @@ class CreditService:
         Release a reservation without deducting any credits.
         Returns True if found and released, False otherwise.
         """
-        stmt = select(CreditTransaction).where(
-            CreditTransaction.id == reservation_id,
-            CreditTransaction.status == "reserved",
+        stmt = (
+            select(CreditTransaction)
+            .where(
+                CreditTransaction.id == reservation_id,
+                CreditTransaction.status == "reserved",
+            )
+            .with_for_update()
         )
         result = await self.session.exec(stmt)
         transaction = result.first()
@@ -189,6 +300,11 @@ class CreditService:
             )
             return False
 
+        now = datetime.now(timezone.utc)
+        await self._lock_balance(transaction.user_id, now)
+        await self._apply_balance_delta(
+            transaction.user_id, reserved_delta=-self._held_amount(transaction, now)
+        )
         transaction.status = "released"
         self.session.add(transaction)
         return True
@@ -289,12 +405,15 @@ class CreditService:
             )
             return True
 
+        now = datetime.now(timezone.utc)
+        await self._lock_balance(user_id, now)
         success = await deduct_credits(
             user_id=user_id,
             amount=amount,
             session=self.session,
         )
         if not success:
+            await self._invalidate_balance(user_id, now)
             logger.warning(
                 "deduct_for_operation: insufficient credits user=%s amount=%d op=%s ref=%s",
                 user_id,
@@ -312,8 +431,118 @@ class CreditService:
             ref_id=ref_id,
         )
         self.session.add(transaction)
+        await self._apply_balance_delta(user_id, remaining_delta=-amount)
         return True
 
+    async def add_grant(self, grant: CreditGrant) -> CreditGrant:
+        """
+        Add a credit grant and count it in the user's balance row.
+
+        Not committed here — callers are responsible for committing.
+        """
+        now = datetime.now(timezone.utc)
+        await self._lock_balance(grant.user_id, now)
+        self.session.add(grant)
+        await self.session.flush()
+
+        expires_at = _as_utc(grant.expires_at)
+        if grant.credits_remaining > 0 and expires_at is not None and expires_at > now:
+            await self._apply_balance_delta(
+                grant.user_id,
+                remaining_delta=grant.credits_remaining,
+                expires_at=expires_at,
+            )
+        return grant
+
+    async def reconcile_balances(self, limit: int = RECONCILE_BATCH_SIZE) -> Dict[str, int]:
+        """
+        Rebuild the least recently reconciled balance rows from the ledger.
+
+        Rows currently locked by a credit operation are skipped until the next
+        run. Drift is logged, since it means a balance change bypassed
+        CreditService. Not committed here.
+        """
+        result = await self.session.execute(_LOCK_RECONCILE_BATCH_SQL, {"limit": limit})
+        stored = {row[0]: (row[1], row[2]) for row in result.fetchall()}
+        if not stored:
+            return {"checked": 0, "drifted": 0}
+
+        ledger = await self._ledger_totals(list(stored), datetime.now(timezone.utc))
+        drifted = 0
+        for row in ledger:
+            expected = (row["credits_remaining"], row["credits_reserved"])
+            if stored[row["user_id"]] != expected:
+                drifted += 1
+                logger.warning(
+                    "[CREDIT RECONCILE] Balance drift user=%s stored=%s ledger=%s",
+                    row["user_id"],
+                    stored[row["user_id"]],
+                    expected,
+                )
+        await self.session.execute(_RECONCILE_BALANCE_SQL, ledger)
+        return {"checked": len(stored), "drifted": drifted}
+
+    # ------------------------------------------------------------------
+    # Balance row helpers
+    # ------------------------------------------------------------------
+
+    async def _ledger_totals(
+        self, user_ids: Sequence[uuid.UUID], now: datetime
+    ) -> List[Dict[str, Any]]:
+        result = await self.session.execute(
+            _LEDGER_TOTALS_SQL, {"user_ids": list(user_ids), "now": now}
+        )
+        return [dict(row) for row in result.mappings().all()]
+
+    async def _lock_balance(self, user_id: uuid.UUID, now: datetime) -> Dict[str, Any]:
+        """
+        Lock the user's balance row, creating or rebuilding it from the ledger
+        if it is missing or something it counts has expired.
+        """
+        await self.session.execute(_INSERT_BALANCE_SQL, {"user_id": user_id, "now": now})
+        result = await self.session.execute(_LOCK_BALANCE_SQL, {"user_id": user_id})
+        balance = dict(result.mappings().one())
+
+        if balance["valid_until"] is not None and balance["valid_until"] <= now:
+            balance = (await self._ledger_totals([user_id], now))[0]
+            await self.session.execute(_SET_BALANCE_SQL, balance)
+        return balance
+
+    async def _apply_balance_delta(
+        self,
+        user_id: uuid.UUID,
+        remaining_delta: int = 0,
+        reserved_delta: int = 0,
+        expires_at: Optional[datetime] = None,
+    ) -> None:
+        """Adjust a balance row already locked by _lock_balance."""
+        await self.session.execute(
+            _APPLY_DELTA_SQL,
+            {
+                "user_id": user_id,
+                "remaining_delta": remaining_delta,
+                "reserved_delta": reserved_delta,
+                "expires_at": expires_at,
+            },
+        )
+
+    async def _invalidate_balance(self, user_id: uuid.UUID, now: datetime) -> None:
+        """Force a rebuild from the ledger on the next lock or read."""
+        await self.session.execute(_INVALIDATE_BALANCE_SQL, {"user_id": user_id, "now": now})
+
+    @staticmethod
+    def _held_amount(transaction: CreditTransaction, now: datetime) -> int:
+        """
+        Credits a reservation holds in a freshly locked balance row.
+
+        An expired reservation is no longer counted: the row was rebuilt
+        without it once its expiry passed.
+        """
+        expires_at = _as_utc(transaction.expires_at)
+        if expires_at is None or expires_at <= now:
+            return 0
+        return transaction.amount
+
 
 def credits_for_audio_duration(duration_seconds: float) -> int:
     """Convert audio duration to credit cost (ceiling, 1 credit/second)."""
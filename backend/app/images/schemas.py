@@ -15,6 +15,7 @@ class SceneImageRequest(BaseModel):
     character_image_urls: Optional[List[str]] = None
     is_suggested_shot: bool = False  # For suggested shot special handling
     shot_index: Optional[int] = None  # 0 = Key Scene, 1+ = Suggested Shots
+    regenerate: bool = False  # User asked for a new image: skip the media cache
 
 
 class CharacterImageRequest(BaseModel):
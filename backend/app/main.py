@@ -60,13 +60,22 @@ async def lifespan(app: FastAPI):
         await seed_admin_users()
 
         await health_checker.add_service("database", health_checker.check_database)
-        await health_checker.add_service("celery", health_checker.check_celery)
         await health_checker.add_service("redis", health_checker.check_redis)
+        await health_checker.add_service("broker", health_checker.check_broker)
+        await health_checker.add_service(
+            "celery", health_checker.check_celery, depends_on=["broker"]
+        )
+        await health_checker.add_service(
+            "storage", health_checker.check_storage, timeout=10.0, critical=False
+        )
+        await health_checker.add_provider_services()
 
         if not await startup_health_check():
             logger.warning(
                 "Some services failed health check during startup - continuing in degraded mode"
             )
+        # Health endpoints serve the snapshot this keeps fresh
+        health_checker.start_prober()
         logger.info("Application startup complete")
         yield
     except Exception as e:
@@ -0,0 +1 @@
+# Content-addressed cache of generated media (images, audio, scene videos)
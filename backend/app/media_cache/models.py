@@ -0,0 +1,56 @@
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+from sqlmodel import Field, SQLModel, Column
+from sqlalchemy.dialects import postgresql as pg
+from sqlalchemy import String, Integer, text
+
+
+class MediaCacheEntry(SQLModel, table=True):
+    """
+    Maps a content hash of a generation request to media already in storage.
+
+    Rows never own the S3 object: they point at media persisted by a previous
+    successful generation and expire together with the bucket lifecycle rule.
+    """
+
+    __tablename__ = "media_cache_entries"
+
+    id: uuid.UUID = Field(
+        sa_column=Column(
+            pg.UUID(as_uuid=True),
+            primary_key=True,
+            server_default=text("gen_random_uuid()"),
+        ),
+        default_factory=uuid.uuid4,
+    )
+    # sha256 hex of the canonical request (see build_media_cache_key)
+    cache_key: str = Field(
+        sa_column=Column(String(64), nullable=False, unique=True, index=True)
+    )
+    # "image" | "audio" | "video" | "tts"
+    media_type: str = Field(sa_column=Column(String, nullable=False, index=True))
+    model_id: Optional[str] = Field(default=None, sa_column=Column(String, nullable=True))
+    user_id: Optional[uuid.UUID] = Field(
+        default=None, sa_column=Column(pg.UUID(as_uuid=True), nullable=True, index=True)
+    )
+    media_url: str = Field(sa_column=Column(String, nullable=False))
+    clean_url: Optional[str] = Field(default=None, sa_column=Column(String, nullable=True))
+    duration_seconds: Optional[float] = Field(default=None)
+    meta: Optional[dict] = Field(default=None, sa_column=Column(pg.JSONB, nullable=True))
+    hit_count: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default=text("0")))
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(
+            pg.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=text("CURRENT_TIMESTAMP"),
+        ),
+    )
+    last_hit_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(pg.TIMESTAMP(timezone=True), nullable=True)
+    )
+    # Matches the storage lifecycle expiry of the referenced object
+    expires_at: datetime = Field(
+        sa_column=Column(pg.TIMESTAMP(timezone=True), nullable=False, index=True)
+    )
@@ -0,0 +1,231 @@
+"""
+MediaCacheService — content-addressed lookup of previously generated media.
+
+A cache key is the sha256 of a canonical description of a generation request:
+    key = build_media_cache_key(
+        media_type="image", model_id=..., prompt=..., input_urls=[...],
+        aspect_ratio="16:9", scope=user_id,
+    )
+    entry = await MediaCacheService(session).lookup(key)
+    if entry is None:
+        # ... call the provider and persist the result to storage ...
+        await MediaCacheService(session).store(key, media_type="image", media_url=url, ...)
+
+Entries point at objects that a previous successful generation already
+persisted to our bucket, so a hit costs no provider call and no upload.
+Entries expire with the storage lifecycle (MEDIA_CACHE_TTL_DAYS) and are
+dropped on lookup when the referenced object no longer exists.
+
+Cache failures are never fatal: lookup() returns None and store() is a
+no-op when the cache table or storage is unavailable.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import unicodedata
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.media_cache.models import MediaCacheEntry
+
+logger = logging.getLogger(__name__)
+
+# Bump when the key material changes so old entries stop matching
+MEDIA_CACHE_KEY_VERSION = 1
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: Optional[str]) -> str:
+    """Unicode-normalize and collapse whitespace; case is kept (it can matter)."""
+    if not prompt:
+        return ""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", prompt)).strip()
+
+
+def media_input_digest(url: Optional[str]) -> Optional[str]:
+    """
+    Identity hash of an input media URL.
+
+    Generated media is written once under a unique object key, so the key path
+    identifies the content. Host and query string are ignored so the internal,
+    public and provider-facing URLs of one object hash the same.
+    """
+    if not url:
+        return None
+    parsed = urlparse(url)
+    identity = parsed.path if parsed.scheme and parsed.netloc else url.split("?", 1)[0]
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+def build_media_cache_key(
+    *,
+    media_type: str,
+    model_id: Optional[str],
+    prompt: Optional[str],
+    input_urls: Iterable[Optional[str]] = (),
+    aspect_ratio: Optional[str] = None,
+    duration: Optional[float] = None,
+    seed: Optional[int] = None,
+    scope: Optional[str] = None,
+    extra: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Canonical sha256 key for a generation request.
+
+    scope keeps entries private to one user; input order is significant
+    (reference images and init audio are positional for providers).
+    """
+    material = {
+        "v": MEDIA_CACHE_KEY_VERSION,
+        "media_type": media_type,
+        "model_id": model_id or "",
+        "prompt": normalize_prompt(prompt),
+        "inputs": [media_input_digest(url) for url in input_urls if url],
+        "aspect_ratio": aspect_ratio or "",
+        "duration": round(float(duration), 2) if duration is not None else None,
+        "seed": seed,
+        "scope": str(scope) if scope else "",
+        "extra": extra or {},
+    }
+    canonical = json.dumps(material, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MediaCacheService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def enabled() -> bool:
+        return bool(settings.MEDIA_CACHE_ENABLED)
+
+    async def lookup(self, cache_key: str) -> Optional[MediaCacheEntry]:
+        """Return a live entry for cache_key and record the hit, or None."""
+        if not self.enabled():
+            return None
+        try:
+            now = datetime.now(timezone.utc)
+            result = await self.session.exec(
+                select(MediaCacheEntry).where(
+                    MediaCacheEntry.cache_key == cache_key,
+                    MediaCacheEntry.expires_at > now,
+                )
+            )
+            entry = result.first()
+            if entry is None:
+                return None
+
+            if not await self._object_exists(entry.media_url):
+                logger.info("[MediaCache] Dropping %s: object no longer in storage", cache_key[:12])
+                await self.invalidate(cache_key)
+                return None
+
+            await self.session.execute(
+                update(MediaCacheEntry)
+                .where(MediaCacheEntry.id == entry.id)
+                .values(hit_count=MediaCacheEntry.hit_count + 1, last_hit_at=now)
+            )
+            await self.session.commit()
+            logger.info(
+                "[MediaCache] HIT %s type=%s model=%s", cache_key[:12], entry.media_type, entry.model_id
+            )
+            return entry
+        except Exception as e:
+            logger.warning("[MediaCache] lookup failed for %s: %s", cache_key[:12], e)
+            await self._safe_rollback()
+            return None
+
+    async def store(
+        self,
+        cache_key: str,
+        *,
+        media_type: str,
+        media_url: str,
+        model_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        clean_url: Optional[str] = None,
+        duration_seconds: Optional[float] = None,
+        meta: Optional[dict] = None,
+    ) -> None:
+        """Upsert the entry for cache_key pointing at already-persisted media."""
+        if not self.enabled() or not media_url:
+            return
+        try:
+            now = datetime.now(timezone.utc)
+            values = {
+                "cache_key": cache_key,
+                "media_type": media_type,
+                "model_id": model_id,
+                "user_id": uuid.UUID(str(user_id)) if user_id else None,
+                "media_url": media_url,
+                "clean_url": clean_url,
+                "duration_seconds": duration_seconds,
+                "meta": meta,
+                "created_at": now,
+                "expires_at": now + timedelta(days=settings.MEDIA_CACHE_TTL_DAYS),
+            }
+            stmt = pg_insert(MediaCacheEntry).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[MediaCacheEntry.cache_key],
+                set_={
+                    key: stmt.excluded[key]
+                    for key in (
+                        "model_id",
+                        "media_url",
+                        "clean_url",
+                        "duration_seconds",
+                        "meta",
+                        "created_at",
+                        "expires_at",
+                    )
+                },
+            )
+            await self.session.execute(stmt)
+            await self.session.commit()
+        except Exception as e:
+            logger.warning("[MediaCache] store failed for %s: %s", cache_key[:12], e)
+            await self._safe_rollback()
+
+    async def invalidate(self, cache_key: str) -> None:
+        await self.session.execute(
+            delete(MediaCacheEntry).where(MediaCacheEntry.cache_key == cache_key)
+        )
+        await self.session.commit()
+
+    async def purge_expired(self) -> int:
+        """Delete entries whose storage objects have reached lifecycle expiry."""
+        result = await self.session.execute(
+            delete(MediaCacheEntry).where(
+                MediaCacheEntry.expires_at <= datetime.now(timezone.utc)
+            )
+        )
+        await self.session.commit()
+        return result.rowcount or 0
+
+    @staticmethod
+    async def _object_exists(media_url: str) -> bool:
+        from app.core.services.storage import get_storage_service
+
+        try:
+            return await get_storage_service().exists(media_url)
+        except Exception as e:
+            # Storage unreachable: trust the entry rather than regenerate
+            logger.warning("[MediaCache] existence check failed: %s", e)
+            return True
+
+    async def _safe_rollback(self) -> None:
+        try:
+            await self.session.rollback()
+        except Exception:
+            pass
@@ -25,6 +25,7 @@ from app.core.services.embeddings import EmbeddingsService
 from app.api.services.plot import PlotService
 from app.credits.constants import TEXT_GEN
 from app.credits.service import CreditService
+from app.api.services.subscription import SubscriptionManager
 
 
 def _extract_text_content(temp_path: str, suffix: str) -> str:
@@ -462,18 +463,24 @@ async def _process_project_upload_background(
 
             # Dispatch embedding generation as a separate Celery task
             from app.tasks.embedding_tasks import generate_project_embeddings_task
-            generate_project_embeddings_task.delay(project_id, book_id)
+            priority = await SubscriptionManager(session).get_task_priority(user_uuid)
+            generate_project_embeddings_task.apply_async(
+                args=[project_id, book_id], priority=priority
+            )
             print(f"[BG UPLOAD] Embedding task dispatched for project={project_id}")
 
             # Dispatch plot generation as a separate Celery task (single-file only)
             if not is_multi_script and input_prompt:
                 from app.tasks.plot_tasks import generate_plot_task
-                generate_plot_task.delay(
-                    project_id=project_id,
-                    book_id=book_id,
-                    user_id=user_id,
-                    input_prompt=input_prompt,
-                    project_type=project_type_value,
+                generate_plot_task.apply_async(
+                    kwargs=dict(
+                        project_id=project_id,
+                        book_id=book_id,
+                        user_id=user_id,
+                        input_prompt=input_prompt,
+                        project_type=project_type_value,
+                    ),
+                    priority=priority,
                 )
                 print(f"[BG UPLOAD] Plot task dispatched for project={project_id}")
 
@@ -1028,7 +1035,10 @@ class ProjectService:
 
             # Dispatch deferred Celery tasks now that chapters are committed to DB
             from app.tasks.embedding_tasks import generate_project_embeddings_task
-            generate_project_embeddings_task.delay(str(project.id), str(book.id))
+            priority = await SubscriptionManager(self.session).get_task_priority(user_id)
+            generate_project_embeddings_task.apply_async(
+                args=[str(project.id), str(book.id)], priority=priority
+            )
             print(f"[PROJECT UPLOAD] Embedding task dispatched for project={project.id}")
 
             if not is_multi_script and input_prompt:
@@ -1036,12 +1046,15 @@ class ProjectService:
                 project_type_str = (
                     project_type.value if hasattr(project_type, "value") else str(project_type)
                 )
-                generate_plot_task.delay(
-                    project_id=str(project.id),
-                    book_id=str(book.id),
-                    user_id=str(user_id),
-                    input_prompt=input_prompt,
-                    project_type=project_type_str,
+                generate_plot_task.apply_async(
+                    kwargs=dict(
+                        project_id=str(project.id),
+                        book_id=str(book.id),
+                        user_id=str(user_id),
+                        input_prompt=input_prompt,
+                        project_type=project_type_str,
+                    ),
+                    priority=priority,
                 )
                 print(f"[PROJECT UPLOAD] Plot task dispatched for project={project.id}")
 
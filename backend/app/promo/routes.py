@@ -10,6 +10,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.auth import get_current_active_user
 from app.core.database import get_session
 from app.auth.models import User
+from app.credits.service import CreditService
 from app.promo.models import PromoCode, CreditGrant, GrantType
 from app.promo.schemas import (
     RedeemPromoRequest,
@@ -76,7 +77,7 @@ async def redeem_promo_code(
         promo_code_id=promo.id,
         grant_type=GrantType.PROMO,
     )
-    session.add(grant)
+    await CreditService(session).add_grant(grant)
 
     # Increment redemption counter
     promo.current_redemptions += 1
@@ -1,7 +1,7 @@
 from celery import current_task
 from app.tasks.celery_app import celery_app
+from app.core.async_runtime import run_async
 from app.core.services.ai import AIService
-import asyncio
 from app.core.services.tts.router import TTSRouter
 from app.api.services.video import VideoService
 
@@ -37,7 +37,7 @@ def generate_voice_task(self, text: str, character: str, emotion: str = "neutral
         async def _synthesize():
             result = await tts_router.synthesize(text=text, user_tier="basic", voice_id=character)
             return result.get("audio_url", result.get("url", ""))
-        audio_url = asyncio.run(_synthesize())
+        audio_url = run_async(_synthesize())
 
         return {"status": "SUCCESS", "audio_url": audio_url}
     except Exception as e:
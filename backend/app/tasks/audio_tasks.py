@@ -1,5 +1,5 @@
 from app.tasks.celery_app import celery_app
-import asyncio
+from app.core.async_runtime import run_async
 from typing import Dict, Any, List, Optional
 from app.core.services.script_parser import ScriptParser
 from app.core.database import get_session
@@ -7,12 +7,20 @@ from app.core.config import settings
 from datetime import datetime, timezone
 from app.core.services.pipeline import PipelineManager, PipelineStep
 from app.core.services.modelslab_v7_audio import ModelsLabV7AudioService
+from app.core.services.media_repository import MediaBatchWriter
 from app.videos.models import VideoGeneration, AudioGeneration, Script
 from app.subscriptions.models import UserSubscription
 from app.plots.models import Character  # For character description lookup
 from sqlmodel import select
 import uuid
 from app.core.model_config import get_model_config, ModelConfig
+from app.media_cache.service import MediaCacheService, build_media_cache_key
+from app.core.services.tts.synthesis_cache import (
+    build_tts_cache_key,
+    lookup_synthesis,
+    store_synthesis,
+    synthesized_model,
+)
 from app.core.services.elevenlabs import ElevenLabsService
 from contextlib import asynccontextmanager
 from celery.utils.log import get_task_logger
@@ -169,6 +177,7 @@ def generate_all_audio_for_video(self, video_generation_id: str):
                 dialogue_moments=script_data.get(
                     "dialogue_moments"
                 ),  # For automatic shot matching
+                stored_ast=script_data.get("script_ast"),
             )
 
             logger.warning(f"[AUDIO PARSER] Using script style: {script_style}")
@@ -497,6 +506,7 @@ def generate_all_audio_for_video(self, video_generation_id: str):
                 user_id,
                 script_id=script_id_str,
                 scene_dialogue_durations=scene_dialogue_durations,
+                regenerate=bool(task_meta.get("regenerate")),
             )
 
             # Generate background music (KAN-373: pass dialogue durations for proportional music)
@@ -508,6 +518,7 @@ def generate_all_audio_for_video(self, video_generation_id: str):
                 user_id,
                 script_id=script_id_str,
                 scene_dialogue_durations=scene_dialogue_durations,
+                regenerate=bool(task_meta.get("regenerate")),
             )
 
             # Compile results
@@ -631,7 +642,7 @@ def generate_all_audio_for_video(self, video_generation_id: str):
 
             raise Exception(error_message)
 
-    return asyncio.run(async_generate_audio())
+    return run_async(async_generate_audio())
 
 
 async def generate_narrator_audio(
@@ -653,101 +664,145 @@ async def generate_narrator_audio(
     # Use V7 service voice mapping
     narrator_voice = audio_service.narrator_voices["professional"]
 
-    for i, segment in enumerate(narrator_segments):
-        try:
-            scene_id = segment.get("scene", 1)
-            shot_type = segment.get("shot_type", "key_scene")
-            shot_index = segment.get("shot_index", 0)
-            print(
-                f"[NARRATOR AUDIO] Processing segment {i+1}/{len(narrator_segments)} for scene {scene_id} ({shot_type})"
-            )
-            print(
-                f"[AUDIO GEN] Generating narrator audio for scene_{scene_id}: {segment['text'][:50]}..."
-            )
-
-            # Generate audio
-            result = {}
+    # Rows are written in batches and at the end of the stage
+    async with MediaBatchWriter(session_factory=session_scope) as media:
+        for i, segment in enumerate(narrator_segments):
             try:
-                from app.tasks.tts_router_adapter import _generate_tts_via_router
-                
-                # Get user tier for router
-                user_tier = "free"
-                if user_id:
-                    async with session_scope() as session:
-                        from app.subscriptions.models import UserSubscription
-                        sub_stmt = select(UserSubscription).where(UserSubscription.user_id == uuid.UUID(user_id))
-                        sub_res = await session.exec(sub_stmt)
-                        sub = sub_res.first()
-                        user_tier = sub.tier if sub else "free"
-
-                result = await _generate_tts_via_router(
-                    user_id=user_id,
-                    user_tier=user_tier,
-                    text=segment["text"],
+                scene_id = segment.get("scene", 1)
+                shot_type = segment.get("shot_type", "key_scene")
+                shot_index = segment.get("shot_index", 0)
+                print(
+                    f"[NARRATOR AUDIO] Processing segment {i+1}/{len(narrator_segments)} for scene {scene_id} ({shot_type})"
+                )
+                print(
+                    f"[AUDIO GEN] Generating narrator audio for scene_{scene_id}: {segment['text'][:50]}..."
+                )
+
+                # Identical lines (same voice, settings and text) are synthesized once
+                tts_key_fields = dict(
                     voice_id=narrator_voice,
-                    model="elevenlabs/eleven_multilingual_v2",
-                    speed=1.0,
+                    text=segment["text"],
+                    voice_settings={"speed": 1.0},
+                    scope=user_id,
                 )
-            except Exception as e:
-                # Handle adapter failure
-                print(f"[NARRATOR AUDIO] ❌ Router Adapter failed: {e}")
-                raise e
+                tts_cache_key = build_tts_cache_key(
+                    model="elevenlabs/eleven_multilingual_v2", **tts_key_fields
+                )
+                cached_tts = await lookup_synthesis(tts_cache_key)
+
+                # Generate audio
+                result = {}
+                if cached_tts is not None:
+                    result = {
+                        "status": "success",
+                        "audio_url": cached_tts.media_url,
+                        "audio_time": cached_tts.duration_seconds or 0,
+                        "model_used": cached_tts.model_id,
+                        "service": (cached_tts.meta or {}).get("service", "tts_router"),
+                        "cached": True,
+                    }
+                    print(f"[NARRATOR AUDIO] Reusing cached synthesis for identical line")
+                else:
+                    try:
+                        from app.tasks.tts_router_adapter import _generate_tts_via_router
+                
+                        # Get user tier for router
+                        user_tier = "free"
+                        if user_id:
+                            async with session_scope() as session:
+                                from app.subscriptions.models import UserSubscription
+                                sub_stmt = select(UserSubscription).where(UserSubscription.user_id == uuid.UUID(user_id))
+                                sub_res = await session.exec(sub_stmt)
+                                sub = sub_res.first()
+                                user_tier = sub.tier if sub else "free"
+
+                        result = await _generate_tts_via_router(
+                            user_id=user_id,
+                            user_tier=user_tier,
+                            text=segment["text"],
+                            voice_id=narrator_voice,
+                            model="elevenlabs/eleven_multilingual_v2",
+                            speed=1.0,
+                        )
+                    except Exception as e:
+                        # Handle adapter failure
+                        print(f"[NARRATOR AUDIO] ❌ Router Adapter failed: {e}")
+                        raise e
 
 
-            # Extract audio URL from response
-            audio_url = None
-            duration = 0
+                # Extract audio URL from response
+                audio_url = None
+                duration = 0
 
-            if result.get("status") == "success":
-                audio_url = result.get("audio_url")
-                duration = result.get("audio_time", 0)
+                if result.get("status") == "success":
+                    audio_url = result.get("audio_url")
+                    duration = result.get("audio_time", 0)
 
-                if not audio_url:
-                    raise Exception("No audio URL in V7 response")
+                    if not audio_url:
+                        raise Exception("No audio URL in V7 response")
 
-                # Persist audio from CDN to our own S3 storage
-                original_cdn_url = audio_url
-                try:
-                    from app.core.services.storage import get_storage_service, S3StorageService
-                    import uuid as _uuid_mod
-                    storage = get_storage_service()
-                    s3_path = S3StorageService.build_media_path(
-                        user_id=str(user_id) if user_id else 'system',
-                        media_type='audio',
-                        record_id=str(_uuid_mod.uuid4()),
-                        extension='mp3',
+                    # Persist audio from CDN to our own S3 storage
+                    original_cdn_url = audio_url
+                    if cached_tts is not None:
+                        # Cached synthesis already lives in our storage
+                        original_cdn_url = (cached_tts.meta or {}).get("provider_audio_url") or audio_url
+                    else:
+                        try:
+                            from app.core.services.storage import get_storage_service, S3StorageService
+                            import uuid as _uuid_mod
+                            storage = get_storage_service()
+                            s3_path = S3StorageService.build_media_path(
+                                user_id=str(user_id) if user_id else 'system',
+                                media_type='audio',
+                                record_id=str(_uuid_mod.uuid4()),
+                                extension='mp3',
+                            )
+                            audio_url = await storage.persist_from_url(audio_url, s3_path, content_type='audio/mpeg')
+                            logger.info(f'[AudioTask] Persisted audio to S3: {s3_path}')
+                        except Exception as persist_error:
+                            logger.error(f'[AudioTask] Failed to persist audio to S3: {persist_error}')
+                            raise Exception(f'Audio generated but failed to persist to storage: {persist_error}')
+
+                    # KAN-166: If API didn't report duration (fallback paths return audio_time:0),
+                    # probe the actual audio file to get real duration
+                    if duration <= 0 and audio_url:
+                        try:
+                            from app.core.services.ffmpeg_utils import probe_audio_duration_from_url
+                            probed = await probe_audio_duration_from_url(audio_url)
+                            if probed and probed > 0:
+                                duration = probed
+                                print(f"[NARRATOR AUDIO] KAN-166: Probed actual duration: {duration}s")
+                        except Exception as probe_err:
+                            print(f"[NARRATOR AUDIO] KAN-166: Duration probe failed: {probe_err}")
+
+                    # Keyed on the model that produced the audio, which differs
+                    # from the requested one when the fallback chain kicked in
+                    produced_model = synthesized_model(result)
+                    if cached_tts is None and produced_model:
+                        await store_synthesis(
+                            build_tts_cache_key(model=produced_model, **tts_key_fields),
+                            audio_url=audio_url,
+                            model=produced_model,
+                            user_id=user_id,
+                            duration_seconds=float(duration) if duration else None,
+                            meta={
+                                "provider_audio_url": original_cdn_url,
+                                "service": result.get("service"),
+                            },
+                        )
+                else:
+                    raise Exception(
+                        f"V7 Audio generation failed: {result.get('error', 'Unknown error')}"
                     )
-                    audio_url = await storage.persist_from_url(audio_url, s3_path, content_type='audio/mpeg')
-                    logger.info(f'[AudioTask] Persisted audio to S3: {s3_path}')
-                except Exception as persist_error:
-                    logger.error(f'[AudioTask] Failed to persist audio to S3: {persist_error}')
-                    raise Exception(f'Audio generated but failed to persist to storage: {persist_error}')
 
-                # KAN-166: If API didn't report duration (fallback paths return audio_time:0),
-                # probe the actual audio file to get real duration
-                if duration <= 0 and audio_url:
-                    try:
-                        from app.core.services.ffmpeg_utils import probe_audio_duration_from_url
-                        probed = await probe_audio_duration_from_url(audio_url)
-                        if probed and probed > 0:
-                            duration = probed
-                            print(f"[NARRATOR AUDIO] KAN-166: Probed actual duration: {duration}s")
-                    except Exception as probe_err:
-                        print(f"[NARRATOR AUDIO] KAN-166: Duration probe failed: {probe_err}")
-            else:
-                raise Exception(
-                    f"V7 Audio generation failed: {result.get('error', 'Unknown error')}"
+                print(
+                    f"[DEBUG] Inserting narrator audio record for video_gen {video_gen_id}"
+                )
+                print(
+                    f"[DEBUG] Audio record chapter_id: {chapter_id}, user_id: {user_id}, script_id: {script_id}"
                 )
 
-            print(
-                f"[DEBUG] Inserting narrator audio record for video_gen {video_gen_id}"
-            )
-            print(
-                f"[DEBUG] Audio record chapter_id: {chapter_id}, user_id: {user_id}, script_id: {script_id}"
-            )
-
-            # Create audio record
-            async with session_scope() as session:
+                # Create audio record
                 audio_record = AudioGeneration(
                     video_generation_id=uuid.UUID(video_gen_id),
                     user_id=uuid.UUID(user_id) if user_id else None,
@@ -775,12 +830,10 @@ async def generate_narrator_audio(
                         ),
                     },
                 )
-                session.add(audio_record)
-                await session.commit()
-                await session.refresh(audio_record)
+                await media.add(audio_record)
 
-                # Deduct credits for actual audio duration
-                if user_id and duration and float(duration) > 0:
+                # Deduct credits for actual audio duration; cached lines cost nothing
+                if user_id and cached_tts is None and duration and float(duration) > 0:
                     try:
                         from app.credits.service import CreditService, credits_for_audio_duration
                         from app.credits.constants import OperationType
@@ -789,14 +842,15 @@ async def generate_narrator_audio(
                             # Accumulate; reservation will be confirmed after the loop
                             _total_audio_credits += credit_cost
                         else:
-                            credit_svc = CreditService(session)
-                            await credit_svc.deduct_for_operation(
-                                user_id=uuid.UUID(user_id),
-                                amount=credit_cost,
-                                operation_type=OperationType.AUDIO_GEN,
-                                ref_id=f"audio_gen:{audio_record.id}",
-                            )
-                            await session.commit()
+                            async with session_scope() as session:
+                                credit_svc = CreditService(session)
+                                await credit_svc.deduct_for_operation(
+                                    user_id=uuid.UUID(user_id),
+                                    amount=credit_cost,
+                                    operation_type=OperationType.AUDIO_GEN,
+                                    ref_id=f"audio_gen:{audio_record.id}",
+                                )
+                                await session.commit()
                     except Exception as credit_err:
                         logger.warning("[CREDITS] Narrator audio credit deduction failed: %s", credit_err)
 
@@ -813,15 +867,14 @@ async def generate_narrator_audio(
                     }
                 )
 
-            print(
-                f"[NARRATOR AUDIO] ✅ Generated segment {i+1} - Duration: {duration}s"
-            )
+                print(
+                    f"[NARRATOR AUDIO] ✅ Generated segment {i+1} - Duration: {duration}s"
+                )
 
-        except Exception as e:
-            print(f"[NARRATOR AUDIO] ❌ Failed segment {i+1}: {str(e)}")
+            except Exception as e:
+                print(f"[NARRATOR AUDIO] ❌ Failed segment {i+1}: {str(e)}")
 
-            # Store failed record
-            async with session_scope() as session:
+                # Store failed record
                 failed_record = AudioGeneration(
                     video_generation_id=uuid.UUID(video_gen_id),
                     user_id=uuid.UUID(user_id) if user_id else None,
@@ -843,8 +896,7 @@ async def generate_narrator_audio(
                         ),
                     },
                 )
-                session.add(failed_record)
-                await session.commit()
+                await media.add(failed_record)
 
     # Confirm the pre-reserved credits with actual total (if reservation was provided)
     if credit_reservation_id and user_id and _total_audio_credits > 0:
@@ -1154,197 +1206,235 @@ async def generate_character_audio(
         except Exception as e:
             logger.warning(f"[CHARACTER AUDIO] Could not load emotional map: {e}")
 
-    for i, dialogue in enumerate(character_dialogues):
-        try:
-            character_name = _safe_str(dialogue.get("character", ""))
-            scene_id = dialogue.get("scene", 1)
-            dialogue_text = _safe_str(dialogue.get("text", ""))
-            shot_type = dialogue.get(
-                "shot_type", "key_scene"
-            )  # key_scene or suggested_shot
-            shot_index = dialogue.get("shot_index", 0)
-
-            print(
-                f"[CHARACTER AUDIO] Processing dialogue {i+1}/{len(character_dialogues)} for {character_name} in scene {scene_id} ({shot_type})"
-            )
+    # Rows are written in batches and at the end of the stage
+    async with MediaBatchWriter(session_factory=session_scope) as media:
+        for i, dialogue in enumerate(character_dialogues):
+            try:
+                character_name = _safe_str(dialogue.get("character", ""))
+                scene_id = dialogue.get("scene", 1)
+                dialogue_text = _safe_str(dialogue.get("text", ""))
+                shot_type = dialogue.get(
+                    "shot_type", "key_scene"
+                )  # key_scene or suggested_shot
+                shot_index = dialogue.get("shot_index", 0)
 
-            # Determine Emotion Style
-            style_value = 0.0
-            emotion_info = "neutral"
+                print(
+                    f"[CHARACTER AUDIO] Processing dialogue {i+1}/{len(character_dialogues)} for {character_name} in scene {scene_id} ({shot_type})"
+                )
 
-            # Lookup in emotional map
-            char_key = _safe_str(character_name).upper().strip()
-            text_key = _safe_str(dialogue_text).strip()[:30]
+                # Determine Emotion Style
+                style_value = 0.0
+                emotion_info = "neutral"
 
-            # Try exact match first, then fuzzy
-            map_entry = emotional_map_lookup.get((char_key, text_key))
+                # Lookup in emotional map
+                char_key = _safe_str(character_name).upper().strip()
+                text_key = _safe_str(dialogue_text).strip()[:30]
 
-            if map_entry:
-                emotional_state = map_entry.get("emotional_state", "neutral")
-                intensity = map_entry.get("emotional_intensity", "medium")
-                style_value = get_emotion_style(emotional_state)
+                # Try exact match first, then fuzzy
+                map_entry = emotional_map_lookup.get((char_key, text_key))
 
-                # Adjust style based on intensity
-                if intensity == "high":
-                    style_value = min(1.0, style_value * 1.25)
-                elif intensity == "low":
-                    style_value = style_value * 0.75
+                if map_entry:
+                    emotional_state = map_entry.get("emotional_state", "neutral")
+                    intensity = map_entry.get("emotional_intensity", "medium")
+                    style_value = get_emotion_style(emotional_state)
 
-                emotion_info = f"{emotional_state} ({intensity})"
-                print(
-                    f"[CHARACTER AUDIO] Applied emotional cue: {emotion_info} -> style={style_value:.2f}"
-                )
+                    # Adjust style based on intensity
+                    if intensity == "high":
+                        style_value = min(1.0, style_value * 1.25)
+                    elif intensity == "low":
+                        style_value = style_value * 0.75
 
-            # Assign voice to character if not already assigned
-            if character_name not in character_voice_mapping:
-                # Detect gender and select appropriate voice
-                gender = detect_character_gender(character_name)
-
-                # Try getting accent from DB
-                char_key_for_desc = _safe_str(character_name).upper().strip()
-                accent = "neutral"
-                if char_key_for_desc in character_descriptions:
-                    accent = (
-                        character_descriptions[char_key_for_desc]
-                        .get("accent", "neutral")
-                        .lower()
+                    emotion_info = f"{emotional_state} ({intensity})"
+                    print(
+                        f"[CHARACTER AUDIO] Applied emotional cue: {emotion_info} -> style={style_value:.2f}"
                     )
 
-                # Predefined mapping for common accents to ElevenLabs voice IDs (v2 multilingual)
-                ACCENT_VOICE_MAP = {
-                    ("male", "british"): "bIHbv24MWmeRgasZH58o",  # Adam
-                    ("female", "british"): "EXAVITQu4vr4xnSDxMaL",  # Bella
-                    ("male", "american"): "29vD33N1CtxCmqQRPOHJ",  # Drew
-                    ("female", "american"): "21m00Tcm4TlvDq8ikWAM",  # Rachel
-                    ("male", "australian"): "D38z5RcWu1voky8IGSia",  # Callum
-                    ("female", "australian"): "piTKgcLEGmPE4e6mUC4i",  # Matilda
-                    (
-                        "male",
-                        "nigerian",
-                    ): "Yko7PKHZNXotIF8SEI7W",  # Generic fallback placeholder
-                    ("female", "nigerian"): "LcfcDJNUP1GQjivn0011",
-                }
+                # Assign voice to character if not already assigned
+                if character_name not in character_voice_mapping:
+                    # Detect gender and select appropriate voice
+                    gender = detect_character_gender(character_name)
+
+                    # Try getting accent from DB
+                    char_key_for_desc = _safe_str(character_name).upper().strip()
+                    accent = "neutral"
+                    if char_key_for_desc in character_descriptions:
+                        accent = (
+                            character_descriptions[char_key_for_desc]
+                            .get("accent", "neutral")
+                            .lower()
+                        )
 
-                voice_name = "Default Voice"
-                voice_id = None
+                    # Predefined mapping for common accents to ElevenLabs voice IDs (v2 multilingual)
+                    ACCENT_VOICE_MAP = {
+                        ("male", "british"): "bIHbv24MWmeRgasZH58o",  # Adam
+                        ("female", "british"): "EXAVITQu4vr4xnSDxMaL",  # Bella
+                        ("male", "american"): "29vD33N1CtxCmqQRPOHJ",  # Drew
+                        ("female", "american"): "21m00Tcm4TlvDq8ikWAM",  # Rachel
+                        ("male", "australian"): "D38z5RcWu1voky8IGSia",  # Callum
+                        ("female", "australian"): "piTKgcLEGmPE4e6mUC4i",  # Matilda
+                        (
+                            "male",
+                            "nigerian",
+                        ): "Yko7PKHZNXotIF8SEI7W",  # Generic fallback placeholder
+                        ("female", "nigerian"): "LcfcDJNUP1GQjivn0011",
+                    }
 
-                if accent != "neutral" and (gender, accent) in ACCENT_VOICE_MAP:
-                    voice_id = ACCENT_VOICE_MAP[(gender, accent)]
-                    voice_name = f"{accent.capitalize()} {gender.capitalize()}"
-                    print(
-                        f"[CHARACTER AUDIO] Found accent '{accent}' for {character_name}: Using mapped voice {voice_id}"
-                    )
-                else:
-                    if gender == "female" and female_voices:
-                        # Select from female voices
-                        voice_index = hash(character_name) % len(female_voices)
-                        voice_name, voice_id = female_voices[voice_index]
-                        print(
-                            f"[CHARACTER AUDIO] Detected FEMALE: {character_name} -> {voice_name}"
-                        )
-                    elif gender == "male" and male_voices:
-                        # Select from male voices
-                        voice_index = hash(character_name) % len(male_voices)
-                        voice_name, voice_id = male_voices[voice_index]
+                    voice_name = "Default Voice"
+                    voice_id = None
+
+                    if accent != "neutral" and (gender, accent) in ACCENT_VOICE_MAP:
+                        voice_id = ACCENT_VOICE_MAP[(gender, accent)]
+                        voice_name = f"{accent.capitalize()} {gender.capitalize()}"
                         print(
-                            f"[CHARACTER AUDIO] Detected MALE: {character_name} -> {voice_name}"
+                            f"[CHARACTER AUDIO] Found accent '{accent}' for {character_name}: Using mapped voice {voice_id}"
                         )
                     else:
-                        # Unknown gender - use hash-based selection from all voices
-                        voice_index = hash(character_name) % len(all_voices)
-                        voice_name, voice_id = all_voices[voice_index]
-                        print(
-                            f"[CHARACTER AUDIO] Unknown gender: {character_name} -> {voice_name}"
-                        )
+                        if gender == "female" and female_voices:
+                            # Select from female voices
+                            voice_index = hash(character_name) % len(female_voices)
+                            voice_name, voice_id = female_voices[voice_index]
+                            print(
+                                f"[CHARACTER AUDIO] Detected FEMALE: {character_name} -> {voice_name}"
+                            )
+                        elif gender == "male" and male_voices:
+                            # Select from male voices
+                            voice_index = hash(character_name) % len(male_voices)
+                            voice_name, voice_id = male_voices[voice_index]
+                            print(
+                                f"[CHARACTER AUDIO] Detected MALE: {character_name} -> {voice_name}"
+                            )
+                        else:
+                            # Unknown gender - use hash-based selection from all voices
+                            voice_index = hash(character_name) % len(all_voices)
+                            voice_name, voice_id = all_voices[voice_index]
+                            print(
+                                f"[CHARACTER AUDIO] Unknown gender: {character_name} -> {voice_name}"
+                            )
 
-                character_voice_mapping[character_name] = {
-                    "voice_name": voice_name,
-                    "voice_id": voice_id,
-                    "detected_gender": gender,
-                    "accent": accent,
-                }
-                print(
-                    f"[CHARACTER AUDIO] Assigned voice '{voice_name}' ({gender}) to {character_name}"
-                )
+                    character_voice_mapping[character_name] = {
+                        "voice_name": voice_name,
+                        "voice_id": voice_id,
+                        "detected_gender": gender,
+                        "accent": accent,
+                    }
+                    print(
+                        f"[CHARACTER AUDIO] Assigned voice '{voice_name}' ({gender}) to {character_name}"
+                    )
 
-            voice_info = character_voice_mapping[character_name]
+                voice_info = character_voice_mapping[character_name]
 
-            # Generate audio
-            result = {}
-            try:
-                from app.tasks.tts_router_adapter import _generate_tts_via_router
-                
-                # Get user tier for router
-                user_tier = "free"
-                if user_id:
-                    async with session_scope() as session:
-                        from app.subscriptions.models import UserSubscription
-                        sub_stmt = select(UserSubscription).where(UserSubscription.user_id == uuid.UUID(user_id))
-                        sub_res = await session.exec(sub_stmt)
-                        sub = sub_res.first()
-                        user_tier = sub.tier if sub else "free"
-
-                result = await _generate_tts_via_router(
-                    user_id=user_id,
-                    user_tier=user_tier,
-                    text=dialogue["text"],
+                # Identical lines (same voice, settings and text) are synthesized once
+                tts_key_fields = dict(
                     voice_id=voice_info["voice_id"],
-                    model="elevenlabs/eleven_multilingual_v2",
-                    speed=1.0,
-                    style=style_value,
+                    text=dialogue["text"],
+                    voice_settings={"speed": 1.0, "style": style_value},
+                    scope=user_id,
                 )
-            except Exception as e:
-                # Handle adapter failure
-                print(f"[CHARACTER AUDIO] ❌ Router Adapter failed: {e}")
-                raise e
+                tts_cache_key = build_tts_cache_key(
+                    model="elevenlabs/eleven_multilingual_v2", **tts_key_fields
+                )
+                cached_tts = await lookup_synthesis(tts_cache_key)
+
+                # Generate audio
+                result = {}
+                if cached_tts is not None:
+                    result = {
+                        "status": "success",
+                        "audio_url": cached_tts.media_url,
+                        "audio_time": cached_tts.duration_seconds or 0,
+                        "model_used": cached_tts.model_id,
+                        "service": (cached_tts.meta or {}).get("service", "tts_router"),
+                        "cached": True,
+                    }
+                    print(f"[CHARACTER AUDIO] Reusing cached synthesis for identical line")
+                else:
+                    try:
+                        from app.tasks.tts_router_adapter import _generate_tts_via_router
+                
+                        # Get user tier for router
+                        user_tier = "free"
+                        if user_id:
+                            async with session_scope() as session:
+                                from app.subscriptions.models import UserSubscription
+                                sub_stmt = select(UserSubscription).where(UserSubscription.user_id == uuid.UUID(user_id))
+                                sub_res = await session.exec(sub_stmt)
+                                sub = sub_res.first()
+                                user_tier = sub.tier if sub else "free"
+
+                        result = await _generate_tts_via_router(
+                            user_id=user_id,
+                            user_tier=user_tier,
+                            text=dialogue["text"],
+                            voice_id=voice_info["voice_id"],
+                            model="elevenlabs/eleven_multilingual_v2",
+                            speed=1.0,
+                            style=style_value,
+                        )
+                    except Exception as e:
+                        # Handle adapter failure
+                        print(f"[CHARACTER AUDIO] ❌ Router Adapter failed: {e}")
+                        raise e
 
 
-            audio_url = None
-            duration = 0
+                audio_url = None
+                duration = 0
 
-            if result.get("status") == "success":
-                audio_url = result.get("audio_url")
-                duration = result.get("audio_time", 0)
+                if result.get("status") == "success":
+                    audio_url = result.get("audio_url")
+                    duration = result.get("audio_time", 0)
 
-                if not audio_url:
-                    raise Exception("No audio URL in response")
+                    if not audio_url:
+                        raise Exception("No audio URL in response")
 
-                # ElevenLabs pre-persists to S3; other providers return external URLs
-                if "minio" not in (audio_url or "").lower():
-                    try:
-                        from app.core.services.storage import get_storage_service, S3StorageService
-                        import uuid as _uuid_mod
-                        storage = get_storage_service()
-                        s3_path = S3StorageService.build_media_path(
-                            user_id=str(user_id) if user_id else 'system',
-                            media_type='audio',
-                            record_id=str(_uuid_mod.uuid4()),
-                            extension='mp3',
+                    # ElevenLabs pre-persists to S3; other providers return external URLs.
+                    # Cached synthesis is always in our storage already.
+                    if cached_tts is None and "minio" not in (audio_url or "").lower():
+                        try:
+                            from app.core.services.storage import get_storage_service, S3StorageService
+                            import uuid as _uuid_mod
+                            storage = get_storage_service()
+                            s3_path = S3StorageService.build_media_path(
+                                user_id=str(user_id) if user_id else 'system',
+                                media_type='audio',
+                                record_id=str(_uuid_mod.uuid4()),
+                                extension='mp3',
+                            )
+                            audio_url = await storage.persist_from_url(audio_url, s3_path, content_type='audio/mpeg')
+                            logger.info(f'[AudioTask] Persisted audio to S3: {s3_path}')
+                        except Exception as persist_error:
+                            logger.error(f'[AudioTask] Failed to persist audio to S3: {persist_error}')
+                            raise Exception(f'Audio generated but failed to persist to storage: {persist_error}')
+
+                    # KAN-166: If API didn't report duration (fallback paths return audio_time:0),
+                    # probe the actual audio file to get real duration
+                    if duration <= 0 and audio_url:
+                        try:
+                            from app.core.services.ffmpeg_utils import probe_audio_duration_from_url
+                            probed = await probe_audio_duration_from_url(audio_url)
+                            if probed and probed > 0:
+                                duration = probed
+                                print(f"[CHARACTER AUDIO] KAN-166: Probed actual duration: {duration}s")
+                        except Exception as probe_err:
+                            print(f"[CHARACTER AUDIO] KAN-166: Duration probe failed: {probe_err}")
+
+                    # Keyed on the model that produced the audio, which differs
+                    # from the requested one when the fallback chain kicked in
+                    produced_model = synthesized_model(result)
+                    if cached_tts is None and produced_model:
+                        await store_synthesis(
+                            build_tts_cache_key(model=produced_model, **tts_key_fields),
+                            audio_url=audio_url,
+                            model=produced_model,
+                            user_id=user_id,
+                            duration_seconds=float(duration) if duration else None,
+                            meta={"service": result.get("service")},
                         )
-                        audio_url = await storage.persist_from_url(audio_url, s3_path, content_type='audio/mpeg')
-                        logger.info(f'[AudioTask] Persisted audio to S3: {s3_path}')
-                    except Exception as persist_error:
-                        logger.error(f'[AudioTask] Failed to persist audio to S3: {persist_error}')
-                        raise Exception(f'Audio generated but failed to persist to storage: {persist_error}')
-
-                # KAN-166: If API didn't report duration (fallback paths return audio_time:0),
-                # probe the actual audio file to get real duration
-                if duration <= 0 and audio_url:
-                    try:
-                        from app.core.services.ffmpeg_utils import probe_audio_duration_from_url
-                        probed = await probe_audio_duration_from_url(audio_url)
-                        if probed and probed > 0:
-                            duration = probed
-                            print(f"[CHARACTER AUDIO] KAN-166: Probed actual duration: {duration}s")
-                    except Exception as probe_err:
-                        print(f"[CHARACTER AUDIO] KAN-166: Duration probe failed: {probe_err}")
-            else:
-                raise Exception(
-                    f"V7 Audio generation failed: {result.get('error', 'Unknown error')}"
-                )
+                else:
+                    raise Exception(
+                        f"V7 Audio generation failed: {result.get('error', 'Unknown error')}"
+                    )
 
-            # Store in database
-            async with session_scope() as session:
+                # Store in database
                 audio_record = AudioGeneration(
                     video_generation_id=uuid.UUID(video_gen_id),
                     user_id=uuid.UUID(user_id) if user_id else None,
@@ -1376,12 +1466,10 @@ async def generate_character_audio(
                         ),
                     },
                 )
-                session.add(audio_record)
-                await session.commit()
-                await session.refresh(audio_record)
+                await media.add(audio_record)
 
-                # Deduct credits for actual audio duration
-                if user_id and duration and float(duration) > 0:
+                # Deduct credits for actual audio duration; cached lines cost nothing
+                if user_id and cached_tts is None and duration and float(duration) > 0:
                     try:
                         from app.credits.service import CreditService, credits_for_audio_duration
                         from app.credits.constants import OperationType
@@ -1390,14 +1478,15 @@ async def generate_character_audio(
                             # Accumulate; reservation will be confirmed after the loop
                             _total_audio_credits += credit_cost
                         else:
-                            credit_svc = CreditService(session)
-                            await credit_svc.deduct_for_operation(
-                                user_id=uuid.UUID(user_id),
-                                amount=credit_cost,
-                                operation_type=OperationType.AUDIO_GEN,
-                                ref_id=f"audio_gen:{audio_record.id}",
-                            )
-                            await session.commit()
+                            async with session_scope() as session:
+                                credit_svc = CreditService(session)
+                                await credit_svc.deduct_for_operation(
+                                    user_id=uuid.UUID(user_id),
+                                    amount=credit_cost,
+                                    operation_type=OperationType.AUDIO_GEN,
+                                    ref_id=f"audio_gen:{audio_record.id}",
+                                )
+                                await session.commit()
                     except Exception as credit_err:
                         logger.warning("[CREDITS] Character audio credit deduction failed: %s", credit_err)
 
@@ -1417,21 +1506,20 @@ async def generate_character_audio(
                     }
                 )
 
-            print(
-                f"[CHARACTER AUDIO] ✅ Generated dialogue {i+1} for {character_name} - Duration: {duration}s"
-            )
+                print(
+                    f"[CHARACTER AUDIO] ✅ Generated dialogue {i+1} for {character_name} - Duration: {duration}s"
+                )
 
-        except Exception as e:
-            print(
-                f"[CHARACTER AUDIO] ❌ Failed dialogue {i+1} for {dialogue.get('character', 'Unknown')}: {str(e)}"
-            )
+            except Exception as e:
+                print(
+                    f"[CHARACTER AUDIO] ❌ Failed dialogue {i+1} for {dialogue.get('character', 'Unknown')}: {str(e)}"
+                )
 
-            character_name = dialogue["character"]
-            voice_info = character_voice_mapping.get(
-                character_name, {"voice_name": "unknown", "voice_id": "unknown"}
-            )
+                character_name = dialogue["character"]
+                voice_info = character_voice_mapping.get(
+                    character_name, {"voice_name": "unknown", "voice_id": "unknown"}
+                )
 
-            async with session_scope() as session:
                 failed_record = AudioGeneration(
                     video_generation_id=uuid.UUID(video_gen_id),
                     user_id=uuid.UUID(user_id) if user_id else None,
@@ -1454,8 +1542,7 @@ async def generate_character_audio(
                         "service": "modelslab_v7",
                     },
                 )
-                session.add(failed_record)
-                await session.commit()
+                await media.add(failed_record)
 
     # Store character voice mappings
     if character_voice_mapping:
@@ -1527,92 +1614,131 @@ async def generate_sound_effects_audio(
     user_id: Optional[str],
     script_id: Optional[str] = None,
     scene_dialogue_durations: Optional[Dict[int, float]] = None,
+    regenerate: bool = False,
 ) -> List[Dict[str, Any]]:
     """Generate sound effects audio.
 
     KAN-373: Accepts scene_dialogue_durations to cap SFX duration proportionally
     to the scene's actual dialogue length, preventing credit overcharging.
+    regenerate (a user-requested retry) skips the media cache lookup.
     """
 
     print(f"[SOUND EFFECTS] Generating sound effects...")
     effects_results = []
     _total_sfx_credits = 0  # KAN-373: track credits for SFX
 
-    for i, effect in enumerate(sound_effects):
-        try:
-            scene_id = effect.get("scene", 1)
-            shot_type = effect.get("shot_type", "key_scene")
-            shot_index = effect.get("shot_index", 0)
-
-            # KAN-373: Cap SFX duration to dialogue * 1.5 (min 3s, max 30s)
-            requested_dur = effect.get("duration", 10.0)
-            actual_dur = min(30.0, max(3.0, requested_dur))
-            if scene_dialogue_durations is not None and len(scene_dialogue_durations) > 0:
-                dialogue_dur = scene_dialogue_durations.get(scene_id, 0.0)
-                if dialogue_dur > 0:
-                    cap = max(3.0, dialogue_dur * 1.5)
-                    actual_dur = min(actual_dur, cap)
-                    if actual_dur < requested_dur:
-                        print(
-                            f"[SOUND EFFECTS] KAN-373: Capped SFX from {requested_dur}s to {actual_dur}s "
-                            f"(dialogue {dialogue_dur}s * 1.5)"
-                        )
-                # KAN-373: If dialogue_dur is 0, keep the default cap (min(30, max(3, requested)))
-            # KAN-373: If no dialogue durations available, keep the default cap
-
-            print(
-                f"[SOUND EFFECTS] Processing effect {i+1}/{len(sound_effects)}: {effect['description']} (scene {scene_id}, {shot_type}, dur={actual_dur}s)"
-            )
-
-            # Use V7 sound effects generation (KAN-373: uses capped actual_dur)
-            result = await audio_service.generate_sound_effect(
-                description=effect["description"],
-                duration=actual_dur,
-                model_id="eleven_sound_effect",
-            )
+    # Rows are written in batches and at the end of the stage
+    async with MediaBatchWriter(session_factory=session_scope) as media:
+        for i, effect in enumerate(sound_effects):
+            try:
+                scene_id = effect.get("scene", 1)
+                shot_type = effect.get("shot_type", "key_scene")
+                shot_index = effect.get("shot_index", 0)
+
+                # KAN-373: Cap SFX duration to dialogue * 1.5 (min 3s, max 30s)
+                requested_dur = effect.get("duration", 10.0)
+                actual_dur = min(30.0, max(3.0, requested_dur))
+                if scene_dialogue_durations is not None and len(scene_dialogue_durations) > 0:
+                    dialogue_dur = scene_dialogue_durations.get(scene_id, 0.0)
+                    if dialogue_dur > 0:
+                        cap = max(3.0, dialogue_dur * 1.5)
+                        actual_dur = min(actual_dur, cap)
+                        if actual_dur < requested_dur:
+                            print(
+                                f"[SOUND EFFECTS] KAN-373: Capped SFX from {requested_dur}s to {actual_dur}s "
+                                f"(dialogue {dialogue_dur}s * 1.5)"
+                            )
+                    # KAN-373: If dialogue_dur is 0, keep the default cap (min(30, max(3, requested)))
+                # KAN-373: If no dialogue durations available, keep the default cap
 
-            if result.get("status") == "success":
-                audio_url = result.get("audio_url")
-                provider_audio_time = result.get("audio_time")
-                duration = cap_generated_audio_duration(provider_audio_time, actual_dur)
-
-                if not audio_url:
-                    raise Exception("No audio URL in V7 response")
-
-                # KAN-373: Trim audio to capped duration BEFORE storage.
-                # Always trim so stored file duration matches DB duration even when provider
-                # reports 0/null audio_time or returns shorter/longer audio.
-                from app.core.services.storage import get_storage_service, S3StorageService
-                import uuid as _uuid_mod
-                storage = get_storage_service()
-                s3_path = S3StorageService.build_media_path(
-                    user_id=str(user_id) if user_id else 'system',
-                    media_type='audio',
-                    record_id=str(_uuid_mod.uuid4()),
-                    extension='mp3',
+                print(
+                    f"[SOUND EFFECTS] Processing effect {i+1}/{len(sound_effects)}: {effect['description']} (scene {scene_id}, {shot_type}, dur={actual_dur}s)"
                 )
-                original_cdn_url = audio_url
 
-                try:
-                    from app.core.services.ffmpeg_utils import download_trim_and_upload
-                    trimmed_url, trimmed_dur = await download_trim_and_upload(
-                        audio_url, storage, s3_path, actual_dur, content_type='audio/mpeg'
+                # Same description, model and capped duration: reuse the clip
+                audio_cache_key = build_media_cache_key(
+                    media_type="audio",
+                    model_id="eleven_sound_effect",
+                    prompt=effect["description"],
+                    duration=actual_dur,
+                    scope=user_id,
+                )
+                cached_audio = None
+                if not regenerate:
+                    async with session_scope() as cache_session:
+                        cached_audio = await MediaCacheService(cache_session).lookup(audio_cache_key)
+
+                if cached_audio is not None:
+                    result = {
+                        "status": "success",
+                        "audio_url": cached_audio.media_url,
+                        "audio_time": cached_audio.duration_seconds,
+                        "model_used": cached_audio.model_id,
+                    }
+                else:
+                    # Use V7 sound effects generation (KAN-373: uses capped actual_dur)
+                    result = await audio_service.generate_sound_effect(
+                        description=effect["description"],
+                        duration=actual_dur,
+                        model_id="eleven_sound_effect",
                     )
-                    if trimmed_url:
-                        logger.info(f"[SOUND EFFECTS] KAN-373: Trimmed audio to {trimmed_dur}s (cap {actual_dur}s)")
-                        audio_url = trimmed_url
-                        duration = trimmed_dur
+
+                if result.get("status") == "success":
+                    audio_url = result.get("audio_url")
+                    provider_audio_time = result.get("audio_time")
+                    duration = cap_generated_audio_duration(provider_audio_time, actual_dur)
+
+                    if not audio_url:
+                        raise Exception("No audio URL in V7 response")
+
+                    if cached_audio is not None:
+                        # Already trimmed and persisted by the generation that filled the cache
+                        original_cdn_url = (cached_audio.meta or {}).get("provider_audio_url") or audio_url
                     else:
-                        # Fallback: persist original
-                        audio_url = await storage.persist_from_url(audio_url, s3_path, content_type='audio/mpeg')
-                except Exception as trim_err:
-                    logger.warning(f"[SOUND EFFECTS] KAN-373: Audio trim failed: {trim_err}")
-                    audio_url = await storage.persist_from_url(audio_url, s3_path, content_type='audio/mpeg')
+                        # KAN-373: Trim audio to capped duration BEFORE storage.
+                        # Always trim so stored file duration matches DB duration even when provider
+                        # reports 0/null audio_time or returns shorter/longer audio.
+                        from app.core.services.storage import get_storage_service, S3StorageService
+                        import uuid as _uuid_mod
+                        storage = get_storage_service()
+                        s3_path = S3StorageService.build_media_path(
+                            user_id=str(user_id) if user_id else 'system',
+                            media_type='audio',
+                            record_id=str(_uuid_mod.uuid4()),
+                            extension='mp3',
+                        )
+                        original_cdn_url = audio_url
 
-                # Using passed script_id
+                        try:
+                            from app.core.services.ffmpeg_utils import download_trim_and_upload
+                            trimmed_url, trimmed_dur = await download_trim_and_upload(
+                                audio_url, storage, s3_path, actual_dur, content_type='audio/mpeg'
+                            )
+                            if trimmed_url:
+                                logger.info(f"[SOUND EFFECTS] KAN-373: Trimmed audio to {trimmed_dur}s (cap {actual_dur}s)")
+                                audio_url = trimmed_url
+                                duration = trimmed_dur
+                            else:
+                                # Fallback: persist original
+                                audio_url = await storage.persist_from_url(audio_url, s3_path, content_type='audio/mpeg')
+                        except Exception as trim_err:
+                            logger.warning(f"[SOUND EFFECTS] KAN-373: Audio trim failed: {trim_err}")
+                            audio_url = await storage.persist_from_url(audio_url, s3_path, content_type='audio/mpeg')
+
+                        async with session_scope() as cache_session:
+                            await MediaCacheService(cache_session).store(
+                                audio_cache_key,
+                                media_type="audio",
+                                media_url=audio_url,
+                                model_id=result.get("model_used", "eleven_sound_effect"),
+                                user_id=user_id,
+                                duration_seconds=float(duration),
+                                meta={"provider_audio_url": original_cdn_url},
+                            )
 
-                # Store in database
-                async with session_scope() as session:
+                    # Using passed script_id
+
+                    # Store in database
                     audio_record = AudioGeneration(
                         video_generation_id=uuid.UUID(video_gen_id),
                         user_id=uuid.UUID(user_id) if user_id else None,
@@ -1638,9 +1764,7 @@ async def generate_sound_effects_audio(
                             ),
                         },
                     )
-                    session.add(audio_record)
-                    await session.commit()
-                    await session.refresh(audio_record)
+                    await media.add(audio_record)
 
                     effects_results.append(
                         {
@@ -1656,35 +1780,35 @@ async def generate_sound_effects_audio(
                         }
                     )
 
-                    # KAN-373: Track credits for actual SFX duration
-                    if user_id and duration and float(duration) > 0:
+                    # KAN-373: Track credits for actual SFX duration; cached clips cost nothing
+                    if user_id and cached_audio is None and duration and float(duration) > 0:
                         try:
                             from app.credits.service import CreditService, credits_for_audio_duration
                             from app.credits.constants import OperationType
                             credit_cost = credits_for_audio_duration(float(duration))
                             _total_sfx_credits += credit_cost
-                            credit_svc = CreditService(session)
-                            await credit_svc.deduct_for_operation(
-                                user_id=uuid.UUID(user_id),
-                                amount=credit_cost,
-                                operation_type=OperationType.AUDIO_GEN,
-                                ref_id=f"audio_sfx:{audio_record.id}",
-                            )
-                            await session.commit()
+                            async with session_scope() as session:
+                                credit_svc = CreditService(session)
+                                await credit_svc.deduct_for_operation(
+                                    user_id=uuid.UUID(user_id),
+                                    amount=credit_cost,
+                                    operation_type=OperationType.AUDIO_GEN,
+                                    ref_id=f"audio_sfx:{audio_record.id}",
+                                )
+                                await session.commit()
                         except Exception as credit_err:
                             logger.warning("[CREDITS] SFX credit deduction failed: %s", credit_err)
 
-                print(f"[SOUND EFFECTS] ✅ Effect {i+1} completed: {audio_url}")
-            else:
-                raise Exception(
-                    f"V7 API returned error: {result.get('error', 'Unknown error')}"
-                )
+                    print(f"[SOUND EFFECTS] ✅ Effect {i+1} completed: {audio_url}")
+                else:
+                    raise Exception(
+                        f"V7 API returned error: {result.get('error', 'Unknown error')}"
+                    )
 
-        except Exception as e:
-            print(f"[SOUND EFFECTS] ❌ Failed: {effect['description']} - {str(e)}")
+            except Exception as e:
+                print(f"[SOUND EFFECTS] ❌ Failed: {effect['description']} - {str(e)}")
 
-            # Store failed record
-            async with session_scope() as session:
+                # Store failed record
                 failed_record = AudioGeneration(
                     video_generation_id=uuid.UUID(video_gen_id),
                     user_id=uuid.UUID(user_id) if user_id else None,
@@ -1699,9 +1823,8 @@ async def generate_sound_effects_audio(
                         "service": "modelslab_v7",
                     },
                 )
-                session.add(failed_record)
-                await session.commit()
-            continue
+                await media.add(failed_record)
+                continue
 
     print(
         f"[SOUND EFFECTS] Completed: {len(effects_results)}/{len(sound_effects)} effects"
@@ -1717,122 +1840,161 @@ async def generate_background_music(
     user_id: Optional[str],
     script_id: Optional[str] = None,
     scene_dialogue_durations: Optional[Dict[int, float]] = None,
+    regenerate: bool = False,
 ) -> List[Dict[str, Any]]:
     """Generate background music.
 
     KAN-373: Accepts scene_dialogue_durations to cap music duration proportionally
     to the scene's actual dialogue length, preventing credit overcharging.
+    regenerate (a user-requested retry) skips the media cache lookup.
     """
 
     logger.info(f"[BACKGROUND MUSIC] Generating background music...")
     music_results = []
     _total_bg_credits = 0  # KAN-373: track credits for BG music
 
-    for i, music_cue in enumerate(music_cues):
-        try:
-            scene_id = music_cue["scene"]
-            shot_type = music_cue.get("shot_type", "key_scene")
-            shot_index = music_cue.get("shot_index", 0)
-
-            # KAN-373: Cap music duration to dialogue * 1.2 (min 5s to avoid zero-duration)
-            requested_dur = music_cue.get("duration", 15.0)
-            actual_dur = requested_dur
-            if scene_dialogue_durations is not None and len(scene_dialogue_durations) > 0:
-                dialogue_dur = scene_dialogue_durations.get(scene_id, 0.0)
-                if dialogue_dur > 0:
-                    cap = max(5.0, dialogue_dur * 1.2)
-                    actual_dur = min(requested_dur, cap)
-                    if actual_dur < requested_dur:
-                        print(
-                            f"[BACKGROUND MUSIC] KAN-373: Capped music from {requested_dur}s to {actual_dur}s "
-                            f"(dialogue {dialogue_dur}s * 1.2)"
-                        )
+    # Rows are written in batches and at the end of the stage
+    async with MediaBatchWriter(session_factory=session_scope) as media:
+        for i, music_cue in enumerate(music_cues):
+            try:
+                scene_id = music_cue["scene"]
+                shot_type = music_cue.get("shot_type", "key_scene")
+                shot_index = music_cue.get("shot_index", 0)
+
+                # KAN-373: Cap music duration to dialogue * 1.2 (min 5s to avoid zero-duration)
+                requested_dur = music_cue.get("duration", 15.0)
+                actual_dur = requested_dur
+                if scene_dialogue_durations is not None and len(scene_dialogue_durations) > 0:
+                    dialogue_dur = scene_dialogue_durations.get(scene_id, 0.0)
+                    if dialogue_dur > 0:
+                        cap = max(5.0, dialogue_dur * 1.2)
+                        actual_dur = min(requested_dur, cap)
+                        if actual_dur < requested_dur:
+                            print(
+                                f"[BACKGROUND MUSIC] KAN-373: Capped music from {requested_dur}s to {actual_dur}s "
+                                f"(dialogue {dialogue_dur}s * 1.2)"
+                            )
+                    else:
+                        # KAN-373: Dialogue duration unavailable for this scene — apply default cap
+                        # to prevent provider generating excessively long audio (180s+)
+                        default_cap = min(requested_dur, 15.0)
+                        if default_cap < requested_dur:
+                            actual_dur = default_cap
+                            print(
+                                f"[BACKGROUND MUSIC] KAN-373: Default cap applied — music from {requested_dur}s to {actual_dur}s "
+                                f"(no dialogue duration available)"
+                            )
                 else:
-                    # KAN-373: Dialogue duration unavailable for this scene — apply default cap
-                    # to prevent provider generating excessively long audio (180s+)
+                    # KAN-373: No dialogue durations at all — apply default cap
                     default_cap = min(requested_dur, 15.0)
                     if default_cap < requested_dur:
                         actual_dur = default_cap
                         print(
                             f"[BACKGROUND MUSIC] KAN-373: Default cap applied — music from {requested_dur}s to {actual_dur}s "
-                            f"(no dialogue duration available)"
+                            f"(no dialogue durations available)"
                         )
-            else:
-                # KAN-373: No dialogue durations at all — apply default cap
-                default_cap = min(requested_dur, 15.0)
-                if default_cap < requested_dur:
-                    actual_dur = default_cap
-                    print(
-                        f"[BACKGROUND MUSIC] KAN-373: Default cap applied — music from {requested_dur}s to {actual_dur}s "
-                        f"(no dialogue durations available)"
-                    )
 
-            logger.info(
-                f"[BACKGROUND MUSIC] Processing scene {scene_id} ({shot_type}): {music_cue['description']} dur={actual_dur}s"
-            )
-
-            # Use V7 music generation (KAN-373: uses capped actual_dur instead of hard-coded 15.0)
-            result = await audio_service.generate_background_music(
-                description=music_cue["description"],
-                model_id="music_v1",
-                duration=actual_dur,
-            )
-
-            if result.get("status") == "success":
-                audio_url = result.get("audio_url")
-                provider_audio_time = result.get("audio_time")
-                duration = cap_generated_audio_duration(provider_audio_time, actual_dur)
-
-                if not audio_url:
-                    raise Exception("No audio URL in V7 response")
-
-                # KAN-373: Trim audio to capped duration BEFORE storage.
-                # Provider may generate longer audio than requested (e.g., 180s vs 15s requested).
-                # Always trim to actual_dur; also fixes providers that report 0/null audio_time
-                # so we don't accidentally persist untrimmed files.
-                from app.core.services.storage import get_storage_service, S3StorageService
-                import uuid as _uuid_mod
-                storage = get_storage_service()
-                s3_path = S3StorageService.build_media_path(
-                    user_id=str(user_id) if user_id else 'system',
-                    media_type='audio',
-                    record_id=str(_uuid_mod.uuid4()),
-                    extension='mp3',
+                logger.info(
+                    f"[BACKGROUND MUSIC] Processing scene {scene_id} ({shot_type}): {music_cue['description']} dur={actual_dur}s"
                 )
-                original_cdn_url = audio_url
 
-                try:
-                    from app.core.services.ffmpeg_utils import download_trim_and_upload
-                    trimmed_url, trimmed_dur = await download_trim_and_upload(
-                        audio_url, storage, s3_path, actual_dur, content_type='audio/mpeg'
+                # Same description, model and capped duration: reuse the clip
+                audio_cache_key = build_media_cache_key(
+                    media_type="audio",
+                    model_id="music_v1",
+                    prompt=music_cue["description"],
+                    duration=actual_dur,
+                    scope=user_id,
+                )
+                cached_audio = None
+                if not regenerate:
+                    async with session_scope() as cache_session:
+                        cached_audio = await MediaCacheService(cache_session).lookup(audio_cache_key)
+
+                if cached_audio is not None:
+                    result = {
+                        "status": "success",
+                        "audio_url": cached_audio.media_url,
+                        "audio_time": cached_audio.duration_seconds,
+                        "model_used": cached_audio.model_id,
+                    }
+                else:
+                    # Use V7 music generation (KAN-373: uses capped actual_dur instead of hard-coded 15.0)
+                    result = await audio_service.generate_background_music(
+                        description=music_cue["description"],
+                        model_id="music_v1",
+                        duration=actual_dur,
                     )
-                    if trimmed_url:
-                        logger.info(f"[BACKGROUND MUSIC] KAN-373: Trimmed audio to {trimmed_dur}s (cap {actual_dur}s)")
-                        audio_url = trimmed_url
-                        duration = trimmed_dur
+
+                if result.get("status") == "success":
+                    audio_url = result.get("audio_url")
+                    provider_audio_time = result.get("audio_time")
+                    duration = cap_generated_audio_duration(provider_audio_time, actual_dur)
+
+                    if not audio_url:
+                        raise Exception("No audio URL in V7 response")
+
+                    if cached_audio is not None:
+                        # Already trimmed and persisted by the generation that filled the cache
+                        original_cdn_url = (cached_audio.meta or {}).get("provider_audio_url") or audio_url
                     else:
-                        # Fallback: persist original
-                        audio_url = await storage.persist_from_url(audio_url, s3_path, content_type='audio/mpeg')
-                except Exception as trim_err:
-                    logger.warning(f"[BACKGROUND MUSIC] KAN-373: Audio trim failed: {trim_err}")
-                    audio_url = await storage.persist_from_url(audio_url, s3_path, content_type='audio/mpeg')
-                logger.info(f'[AudioTask] Persisted audio to S3: {s3_path}')
+                        # KAN-373: Trim audio to capped duration BEFORE storage.
+                        # Provider may generate longer audio than requested (e.g., 180s vs 15s requested).
+                        # Always trim to actual_dur; also fixes providers that report 0/null audio_time
+                        # so we don't accidentally persist untrimmed files.
+                        from app.core.services.storage import get_storage_service, S3StorageService
+                        import uuid as _uuid_mod
+                        storage = get_storage_service()
+                        s3_path = S3StorageService.build_media_path(
+                            user_id=str(user_id) if user_id else 'system',
+                            media_type='audio',
+                            record_id=str(_uuid_mod.uuid4()),
+                            extension='mp3',
+                        )
+                        original_cdn_url = audio_url
 
-                # KAN-166: If API didn't report duration, probe actual file
-                if duration <= 0 and audio_url:
-                    try:
-                        from app.core.services.ffmpeg_utils import probe_audio_duration_from_url
-                        probed = await probe_audio_duration_from_url(audio_url)
-                        if probed and probed > 0:
-                            duration = cap_generated_audio_duration(probed, actual_dur)
-                            print(f"[BACKGROUND MUSIC] KAN-166: Probed actual duration: {duration}s")
-                    except Exception as probe_err:
-                        print(f"[BACKGROUND MUSIC] KAN-166: Duration probe failed: {probe_err}")
+                        try:
+                            from app.core.services.ffmpeg_utils import download_trim_and_upload
+                            trimmed_url, trimmed_dur = await download_trim_and_upload(
+                                audio_url, storage, s3_path, actual_dur, content_type='audio/mpeg'
+                            )
+                            if trimmed_url:
+                                logger.info(f"[BACKGROUND MUSIC] KAN-373: Trimmed audio to {trimmed_dur}s (cap {actual_dur}s)")
+                                audio_url = trimmed_url
+                                duration = trimmed_dur
+                            else:
+                                # Fallback: persist original
+                                audio_url = await storage.persist_from_url(audio_url, s3_path, content_type='audio/mpeg')
+                        except Exception as trim_err:
+                            logger.warning(f"[BACKGROUND MUSIC] KAN-373: Audio trim failed: {trim_err}")
+                            audio_url = await storage.persist_from_url(audio_url, s3_path, content_type='audio/mpeg')
+                        logger.info(f'[AudioTask] Persisted audio to S3: {s3_path}')
 
-                # Using passed script_id
+                        async with session_scope() as cache_session:
+                            await MediaCacheService(cache_session).store(
+                                audio_cache_key,
+                                media_type="audio",
+                                media_url=audio_url,
+                                model_id=result.get("model_used", "music_v1"),
+                                user_id=user_id,
+                                duration_seconds=float(duration),
+                                meta={"provider_audio_url": original_cdn_url},
+                            )
 
-                # Store in database
-                async with session_scope() as session:
+                    # KAN-166: If API didn't report duration, probe actual file
+                    if duration <= 0 and audio_url:
+                        try:
+                            from app.core.services.ffmpeg_utils import probe_audio_duration_from_url
+                            probed = await probe_audio_duration_from_url(audio_url)
+                            if probed and probed > 0:
+                                duration = cap_generated_audio_duration(probed, actual_dur)
+                                print(f"[BACKGROUND MUSIC] KAN-166: Probed actual duration: {duration}s")
+                        except Exception as probe_err:
+                            print(f"[BACKGROUND MUSIC] KAN-166: Duration probe failed: {probe_err}")
+
+                    # Using passed script_id
+
+                    # Store in database
                     audio_record = AudioGeneration(
                         video_generation_id=uuid.UUID(video_gen_id),
                         user_id=uuid.UUID(user_id) if user_id else None,
@@ -1856,9 +2018,7 @@ async def generate_background_music(
                             "model_used": result.get("model_used", "music_v1"),
                         },
                     )
-                    session.add(audio_record)
-                    await session.commit()
-                    await session.refresh(audio_record)
+                    await media.add(audio_record)
 
                     music_results.append(
                         {
@@ -1871,37 +2031,38 @@ async def generate_background_music(
                         }
                     )
 
-                    # KAN-373: Charge credits based on actual_dur (capped requested), not provider duration
-                    if user_id and actual_dur and float(actual_dur) > 0:
+                    # KAN-373: Charge credits based on actual_dur (capped requested), not provider duration;
+                    # cached clips cost nothing
+                    if user_id and cached_audio is None and actual_dur and float(actual_dur) > 0:
                         try:
                             from app.credits.service import CreditService, credits_for_audio_duration
                             from app.credits.constants import OperationType
                             credit_cost = credits_for_audio_duration(float(actual_dur))
                             _total_bg_credits += credit_cost
-                            credit_svc = CreditService(session)
-                            await credit_svc.deduct_for_operation(
-                                user_id=uuid.UUID(user_id),
-                                amount=credit_cost,
-                                operation_type=OperationType.AUDIO_GEN,
-                                ref_id=f"audio_bg:{audio_record.id}",
-                            )
-                            await session.commit()
+                            async with session_scope() as session:
+                                credit_svc = CreditService(session)
+                                await credit_svc.deduct_for_operation(
+                                    user_id=uuid.UUID(user_id),
+                                    amount=credit_cost,
+                                    operation_type=OperationType.AUDIO_GEN,
+                                    ref_id=f"audio_bg:{audio_record.id}",
+                                )
+                                await session.commit()
                         except Exception as credit_err:
                             logger.warning("[CREDITS] BG music credit deduction failed: %s", credit_err)
 
-                print(f"[BACKGROUND MUSIC] ✅ Generated for Scene {music_cue['scene']}")
-            else:
-                raise Exception(
-                    f"V7 API returned error: {result.get('error', 'Unknown error')}"
-                )
+                    print(f"[BACKGROUND MUSIC] ✅ Generated for Scene {music_cue['scene']}")
+                else:
+                    raise Exception(
+                        f"V7 API returned error: {result.get('error', 'Unknown error')}"
+                    )
 
-        except Exception as e:
-            print(
-                f"[BACKGROUND MUSIC] ❌ Failed for Scene {music_cue['scene']}: {str(e)}"
-            )
+            except Exception as e:
+                print(
+                    f"[BACKGROUND MUSIC] ❌ Failed for Scene {music_cue['scene']}: {str(e)}"
+                )
 
-            # Store failed record
-            async with session_scope() as session:
+                # Store failed record
                 failed_record = AudioGeneration(
                     video_generation_id=uuid.UUID(video_gen_id),
                     user_id=uuid.UUID(user_id) if user_id else None,
@@ -1916,8 +2077,7 @@ async def generate_background_music(
                         "service": "modelslab_v7",
                     },
                 )
-                session.add(failed_record)
-                await session.commit()
+                await media.add(failed_record)
 
     print(
         f"[BACKGROUND MUSIC] Completed: {len(music_results)}/{len(music_cues)} music tracks"
@@ -2165,7 +2325,7 @@ def generate_chapter_audio_task(
 
             raise Exception(error_message)
 
-    return asyncio.run(async_generate_chapter_audio())
+    return run_async(async_generate_chapter_audio())
 
 
 @celery_app.task(bind=True)
@@ -2189,29 +2349,20 @@ def export_chapter_audio_mix_task(
             # Update export status to processing (assuming you have an AudioExport model)
             # For now, just proceed with mixing
 
-            # Prepare audio tracks for mixing
-            audio_tracks = []
-            for audio_file in audio_files:
-                if audio_file.get("audio_url"):
-                    track_info = {
-                        "url": audio_file["audio_url"],
-                        "type": audio_file.get("audio_type"),
-                        "volume": (
-                            mix_settings.get(
-                                f"{audio_file.get('audio_type')}_volume", 1.0
-                            )
-                            if mix_settings
-                            else 1.0
-                        ),
-                    }
-                    audio_tracks.append(track_info)
-
+            # Every clip goes into one ffmpeg filter graph: clips are placed
+            # by scene, music is ducked under dialogue and the mix is
+            # loudness-normalized. <type>_volume keys of mix_settings set gains.
+            audio_tracks = [a for a in audio_files if a.get("audio_url")]
             if not audio_tracks:
                 raise Exception("No valid audio tracks found for mixing")
 
-            # Use ElevenLabs service for mixing
             audio_service = ElevenLabsService()
-            mix_result = audio_service.mix_audio_tracks(audio_tracks, user_id)
+            mix_result = await audio_service.mix_audio_tracks(
+                audio_tracks,
+                user_id,
+                mix_settings=mix_settings,
+                output_format=export_format,
+            )
 
             if mix_result and mix_result.get("audio_url"):
                 download_url = mix_result["audio_url"]
@@ -2229,4 +2380,4 @@ def export_chapter_audio_mix_task(
             print(f"[AUDIO EXPORT ERROR] {error_message}")
             raise Exception(error_message)
 
-    return asyncio.run(async_export_audio())
+    return run_async(async_export_audio())
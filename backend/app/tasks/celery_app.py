@@ -1,23 +1,136 @@
+from fnmatch import fnmatchcase
+
 from celery import Celery
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
+from kombu import Queue
+
 from app.core.config import settings
 
 
-def _task_queue_routes(queue_name: str) -> dict[str, dict[str, str]]:
+CELERY_QUEUE_NAME = settings.CELERY_TASK_DEFAULT_QUEUE
+
+# Workload queues. Each family runs on a worker pool sized for its workload
+# (see docker/production/fastapi/celery/worker/start.sh):
+#   io   - provider submit/poll loops (image, video, audio, lipsync, LLM); threads
+#   cpu  - ffmpeg merges, mixes and bulk storage transfers; prefork
+#   fast - emails, embeddings, plot, credit housekeeping; short time limits
+CELERY_IO_QUEUE = f"{CELERY_QUEUE_NAME}.io"
+CELERY_CPU_QUEUE = f"{CELERY_QUEUE_NAME}.cpu"
+CELERY_FAST_QUEUE = f"{CELERY_QUEUE_NAME}.fast"
+
+# Highest priority value accepted by the workload queues (0..9).
+CELERY_MAX_PRIORITY = 9
+
+# Per-queue execution limits (seconds). Tasks that declare their own
+# time_limit in the decorator keep it.
+QUEUE_TIME_LIMITS: dict[str, dict[str, int]] = {
+    CELERY_IO_QUEUE: {"time_limit": 25 * 60, "soft_time_limit": 24 * 60},
+    CELERY_CPU_QUEUE: {"time_limit": 40 * 60, "soft_time_limit": 38 * 60},
+    CELERY_FAST_QUEUE: {"time_limit": 5 * 60, "soft_time_limit": 4 * 60},
+}
+
+# Relative importance per subscription tier (higher runs first).
+TIER_TASK_PRIORITIES: dict[str, int] = {
+    "free": 1,
+    "basic": 3,
+    "standard": 4,
+    "pro": 5,
+    "premium": 6,
+    "professional": 8,
+    "enterprise": 9,
+}
+
+
+def _task_queue_routes(
+    io_queue: str, cpu_queue: str, fast_queue: str
+) -> dict[str, dict[str, str]]:
+    # Exact task names are matched before glob patterns, so the ffmpeg-bound
+    # audio export stays on the cpu queue while the rest of audio_tasks is io.
     return {
-        "app.tasks.image_tasks.*": {"queue": queue_name},
-        "app.tasks.video_tasks.*": {"queue": queue_name},
-        "app.tasks.audio_tasks.*": {"queue": queue_name},
-        "app.tasks.ai_tasks.*": {"queue": queue_name},
-        "app.tasks.blockchain_tasks.*": {"queue": queue_name},
-        "app.tasks.merge_tasks.*": {"queue": queue_name},
-        "app.tasks.lipsync_tasks.*": {"queue": queue_name},
-        "app.tasks.embedding_tasks.*": {"queue": queue_name},
-        "app.tasks.plot_tasks.*": {"queue": queue_name},
-        "send_email_task": {"queue": queue_name},
+        "app.tasks.audio_tasks.export_chapter_audio_mix_task": {"queue": cpu_queue},
+        "app.tasks.image_tasks.*": {"queue": io_queue},
+        "app.tasks.video_tasks.*": {"queue": io_queue},
+        "app.tasks.audio_tasks.*": {"queue": io_queue},
+        "app.tasks.ai_tasks.*": {"queue": io_queue},
+        "app.tasks.lipsync_tasks.*": {"queue": io_queue},
+        "app.audiobooks.tasks.*": {"queue": io_queue},
+        "app.tasks.blockchain_tasks.*": {"queue": io_queue},
+        "app.tasks.merge_tasks.*": {"queue": cpu_queue},
+        "app.tasks.media_backfill_task.*": {"queue": cpu_queue},
+        "app.tasks.embedding_tasks.*": {"queue": fast_queue},
+        "app.tasks.plot_tasks.*": {"queue": fast_queue},
+        "app.tasks.credit_tasks.*": {"queue": fast_queue},
+        "app.tasks.media_cache_tasks.*": {"queue": fast_queue},
+        "app.tasks.tracing_tasks.*": {"queue": fast_queue},
+        "send_email_task": {"queue": fast_queue},
     }
 
 
-CELERY_QUEUE_NAME = settings.CELERY_TASK_DEFAULT_QUEUE
+TASK_ROUTES = _task_queue_routes(CELERY_IO_QUEUE, CELERY_CPU_QUEUE, CELERY_FAST_QUEUE)
+
+
+def queue_for_task(task_name: str) -> str:
+    """Return the queue a task name is routed to (default queue if unrouted)."""
+    route = TASK_ROUTES.get(task_name)
+    if route is None:
+        for pattern, candidate in TASK_ROUTES.items():
+            if "*" in pattern and fnmatchcase(task_name, pattern):
+                route = candidate
+                break
+    return route["queue"] if route else CELERY_QUEUE_NAME
+
+
+def priority_for_tier(tier) -> int:
+    """
+    Map a subscription tier to a Celery message priority.
+
+    Accepts a SubscriptionTier enum or its string value. The result is already
+    translated for the configured broker: RabbitMQ treats higher numbers as
+    more urgent, the Redis transport consumes lower numbers first.
+    """
+    value = str(getattr(tier, "value", tier) or "free").lower()
+    rank = TIER_TASK_PRIORITIES.get(value, TIER_TASK_PRIORITIES["free"])
+    if settings.CELERY_BROKER_URL.startswith(("redis://", "rediss://")):
+        return CELERY_MAX_PRIORITY - rank
+    return rank
+
+
+def request_priority(task) -> int | None:
+    """Priority of the message the running task came from, for its follow-ups."""
+    return (task.request.delivery_info or {}).get("priority")
+
+
+class QueueLimitAnnotations:
+    """Apply the per-queue time limits from QUEUE_TIME_LIMITS to each task."""
+
+    def annotate(self, task):
+        if task.time_limit is not None or task.soft_time_limit is not None:
+            return None
+        return QUEUE_TIME_LIMITS.get(queue_for_task(task.name))
+
+    def annotate_any(self):
+        return None
+
+
+def _task_queues() -> tuple[Queue, ...]:
+    # The default queue is declared without x-max-priority so existing
+    # RabbitMQ queues are not redeclared with conflicting arguments.
+    # Short tasks are listed first so a worker consuming every queue reaches
+    # them before the long io/cpu jobs.
+    priority_args = {"x-max-priority": CELERY_MAX_PRIORITY + 1}
+    return (
+        Queue(CELERY_FAST_QUEUE, queue_arguments=priority_args),
+        Queue(CELERY_QUEUE_NAME),
+        Queue(CELERY_IO_QUEUE, queue_arguments=priority_args),
+        Queue(CELERY_CPU_QUEUE, queue_arguments=priority_args),
+    )
 
 
 # Create Celery app using environment-configured broker and backend
@@ -44,13 +157,15 @@ celery_app.conf.update(
     result_backend_max_retires=10,
     result_expires=3600,  # 1 hour
     # Task execution limits
+    # Global fallback; per-queue limits come from QueueLimitAnnotations
     task_time_limit=25 * 60,  # 25 minutes hard limit (supports 20min image gen)
     task_soft_time_limit=25 * 60,  # 25 minutes soft limit
+    task_annotations=(QueueLimitAnnotations(),),
     # Reliability settings
     task_acks_late=True,  # Acknowledge tasks after completion
     task_reject_on_worker_lost=True,  # Reject tasks if worker crashes
     # Worker performance settings
-    worker_prefetch_multiplier=1,  # Fetch one task at a time
+    worker_prefetch_multiplier=1,  # Fetch one task at a time (overridden per pool by start.sh)
     worker_max_tasks_per_child=1000,  # Restart worker after 1000 tasks
     worker_max_memory_per_child=50000,  # KB - restart if exceeds ~50MB
     # Retry settings
@@ -59,8 +174,18 @@ celery_app.conf.update(
     # Queue settings
     task_default_queue=CELERY_QUEUE_NAME,
     task_create_missing_queues=True,
+    # A worker started without -Q consumes every queue (local dev)
+    task_queues=_task_queues(),
     # Explicit task routes to ensure correct queue
-    task_routes=_task_queue_routes(CELERY_QUEUE_NAME),
+    task_routes=TASK_ROUTES,
+    # Subscription-tier priorities (see priority_for_tier)
+    task_default_priority=priority_for_tier("free"),
+    # Priority steps order messages within a queue. Queues are polled
+    # round-robin (kombu's default): a strict queue order would starve the
+    # later queues of an all-queues worker behind long video jobs.
+    broker_transport_options={
+        "priority_steps": list(range(CELERY_MAX_PRIORITY + 1)),
+    },
     # Timezone settings (from original config)
     timezone="UTC",
     enable_utc=True,
@@ -79,6 +204,8 @@ celery_app.conf.imports = [
     "app.tasks.embedding_tasks",
     "app.tasks.plot_tasks",
     "app.tasks.media_backfill_task",
+    "app.tasks.media_cache_tasks",
+    "app.tasks.tracing_tasks",
 ]
 
 # Celery Beat periodic schedule
@@ -91,6 +218,14 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.credit_tasks.reconcile_failed_credits",
         "schedule": 900,  # every 15 minutes (seconds)
     },
+    "purge-expired-media-cache": {
+        "task": "app.tasks.media_cache_tasks.purge_expired_media_cache",
+        "schedule": 3600,  # hourly (seconds)
+    },
+    "purge-old-pipeline-spans": {
+        "task": "app.tasks.tracing_tasks.purge_old_pipeline_spans",
+        "schedule": 3600,  # hourly (seconds)
+    },
 }
 
 # Auto-discover tasks from specific modules (only works for packages with a tasks.py module)
@@ -100,3 +235,45 @@ celery_app.autodiscover_tasks(
     ],
     force=True,
 )
+
+
+@worker_process_init.connect
+def _start_worker_async_runtime(**kwargs):
+    """Give each prefork child its own long-lived event loop and DB pool."""
+    from app.core.async_runtime import runtime
+    from app.core.database import engine
+
+    # Pooled connections inherited through fork() belong to the parent.
+    engine.sync_engine.dispose(close=False)
+    runtime.start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _stop_worker_async_runtime(**kwargs):
+    from app.core.async_runtime import runtime
+
+    runtime.shutdown()
+
+
+@before_task_publish.connect
+def _inject_trace_headers(headers=None, **kwargs):
+    """Carry the publishing span to the worker (app.tracing.propagation)."""
+    from app.tracing.propagation import inject_headers
+
+    if headers is not None:
+        inject_headers(headers)
+
+
+@task_prerun.connect
+def _begin_task_trace(task_id=None, task=None, args=None, kwargs=None, **extra):
+    from app.tracing.propagation import begin_task
+
+    begin_task(task_id, task, tuple(args or ()), dict(kwargs or {}))
+
+
+@task_postrun.connect
+def _finish_task_trace(task_id=None, state=None, **extra):
+    from app.tracing.propagation import finish_task
+
+    finish_task(task_id, state)
@@ -2,12 +2,12 @@
 Periodic Celery tasks for credit system maintenance.
 """
 
-import asyncio
 import logging
 import uuid
 from datetime import datetime, timezone, timedelta
 
 from app.tasks.celery_app import celery_app
+from app.core.async_runtime import run_async
 from app.core.database import async_session
 from sqlalchemy import text
 from sqlmodel import select
@@ -28,12 +28,14 @@ def release_zombie_reservations(self):
 
     Runs every 10 minutes via Celery beat.
     """
-    return asyncio.run(_async_release_zombie_reservations())
+    return run_async(_async_release_zombie_reservations())
 
 
 async def _async_release_zombie_reservations():
     cutoff = datetime.now(timezone.utc) - timedelta(hours=ZOMBIE_THRESHOLD_HOURS)
 
+    # These reservations are past expires_at, so credit_balances rows no
+    # longer count them and need no adjustment here.
     async with async_session() as session:
         try:
             result = await session.execute(
@@ -85,8 +87,10 @@ def reconcile_failed_credits(self):
     - On success: marks status='resolved'
     - On failure: increments retry_count
     - After 3 failures: marks status='voided' and logs an alert
+    - Then rebuilds the least recently reconciled credit_balances rows from
+      the ledger and logs any drift
     """
-    return asyncio.run(_async_reconcile_failed_credits())
+    return run_async(_async_reconcile_failed_credits())
 
 
 async def _async_reconcile_failed_credits():
@@ -165,13 +169,26 @@ async def _async_reconcile_failed_credits():
                     session.add(failure)
 
             await session.commit()
+
+            balances = await CreditService(session).reconcile_balances()
+            await session.commit()
+
             logger.info(
-                "[CREDIT RECONCILE] Done — resolved=%d voided=%d total=%d",
+                "[CREDIT RECONCILE] Done — resolved=%d voided=%d total=%d "
+                "balances_checked=%d balances_drifted=%d",
                 resolved,
                 voided,
                 len(failures),
+                balances["checked"],
+                balances["drifted"],
             )
-            return {"resolved": resolved, "voided": voided, "total": len(failures)}
+            return {
+                "resolved": resolved,
+                "voided": voided,
+                "total": len(failures),
+                "balances_checked": balances["checked"],
+                "balances_drifted": balances["drifted"],
+            }
 
         except Exception as e:
             logger.error("[CREDIT RECONCILE] Error: %s", e)
@@ -3,12 +3,12 @@ Deferred Celery tasks for generating embeddings after project upload completes.
 Decouples slow Google/OpenAI API calls from the upload flow (KAN-105/KAN-106).
 """
 
-import asyncio
 import logging
 import time
 import uuid
 
 from app.tasks.celery_app import celery_app
+from app.core.async_runtime import run_async
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +20,11 @@ logger = logging.getLogger(__name__)
 )
 def generate_project_embeddings_task(self, project_id: str, book_id: str):
     """Deferred embedding generation for all chapters in a project."""
-    return asyncio.run(_async_generate_project_embeddings(self, project_id, book_id))
+    return run_async(_async_generate_project_embeddings(self, project_id, book_id))
 
 
 async def _async_generate_project_embeddings(task, project_id: str, book_id: str):
+    from app.chapter_changes.service import ChapterChangeTracker
     from app.core.database import async_session
     from app.core.services.embeddings import EmbeddingsService
     from app.books.models import Chapter as ChapterModel
@@ -54,10 +55,17 @@ async def _async_generate_project_embeddings(task, project_id: str, book_id: str
                 )
                 return {"status": "skipped", "reason": "no chapters"}
 
-            logger.info("[EMBED TASK] Generating embeddings for %d chapters.", total)
+            # Chapters whose embeddings match their current content are skipped
+            pending = await ChapterChangeTracker(session).stale(chapters, "embeddings")
+            logger.info(
+                "[EMBED TASK] Generating embeddings for %d of %d chapters (%d unchanged).",
+                len(pending),
+                total,
+                total - len(pending),
+            )
 
             failed = 0
-            for idx, chapter in enumerate(chapters):
+            for idx, chapter in enumerate(pending):
                 chapter_start = time.time()
                 try:
                     embeddings_service = EmbeddingsService(session)
@@ -68,7 +76,7 @@ async def _async_generate_project_embeddings(task, project_id: str, book_id: str
                     logger.info(
                         "[EMBED TASK] Chapter %d/%d (id=%s) embedded in %.2fs",
                         idx + 1,
-                        total,
+                        len(pending),
                         chapter.id,
                         elapsed,
                     )
@@ -78,7 +86,7 @@ async def _async_generate_project_embeddings(task, project_id: str, book_id: str
                     logger.error(
                         "[EMBED TASK] Failed to embed chapter %d/%d (id=%s): %s",
                         idx + 1,
-                        total,
+                        len(pending),
                         chapter.id,
                         e,
                     )
@@ -97,7 +105,7 @@ async def _async_generate_project_embeddings(task, project_id: str, book_id: str
             proj_result = await session.exec(proj_stmt)
             project = proj_result.first()
             if project:
-                if failed > 0 and failed == total:
+                if failed > 0 and failed == len(pending):
                     project.upload_status = "completed_partial"
                     logger.warning(
                         "[EMBED TASK] All embeddings failed — marking project as completed_partial"
@@ -109,7 +117,8 @@ async def _async_generate_project_embeddings(task, project_id: str, book_id: str
             return {
                 "status": "SUCCESS",
                 "total": total,
-                "embedded": total - failed,
+                "embedded": len(pending) - failed,
+                "unchanged": total - len(pending),
                 "failed": failed,
                 "elapsed_seconds": round(total_elapsed, 2),
             }
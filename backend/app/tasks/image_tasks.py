@@ -1,4 +1,5 @@
-from app.tasks.celery_app import celery_app
+from app.tasks.celery_app import celery_app, priority_for_tier
+from app.core.async_runtime import run_async
 import asyncio
 from typing import Dict, Any, List, Optional
 from app.core.database import async_session, engine
@@ -16,6 +17,12 @@ from app.core.services.watermark import (
     persist_image_with_embedded_watermark,
 )
 from app.api.services.subscription import SubscriptionManager
+from app.core.model_config import get_model_config
+from app.credits.constants import SCENE_IMAGE_GEN
+from app.media_cache.service import MediaCacheService, build_media_cache_key
+from app.core.services.media_repository import MediaBatchWriter
+from app.videos.models import ImageGeneration
+from app.tracing.tracer import span_each
 from sqlmodel import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
@@ -26,7 +33,7 @@ logger = logging.getLogger(__name__)
 @celery_app.task(bind=True)
 def generate_all_images_for_video(self, video_generation_id: str):
     """Main task to generate all images for a video generation with pipeline support"""
-    return asyncio.run(async_generate_all_images_for_video(video_generation_id))
+    return run_async(async_generate_all_images_for_video(video_generation_id))
 
 
 async def async_generate_all_images_for_video(video_generation_id: str):
@@ -143,7 +150,9 @@ async def async_generate_all_images_for_video(video_generation_id: str):
                 print(f"[PIPELINE] Starting video generation after image skip")
                 from app.tasks.video_tasks import generate_all_videos_for_generation
 
-                generate_all_videos_for_generation.delay(video_generation_id)
+                generate_all_videos_for_generation.apply_async(
+                    args=[video_generation_id], priority=priority_for_tier(user_tier)
+                )
 
                 return {
                     "status": "success",
@@ -400,173 +409,146 @@ async def generate_character_images_optimized(
     character_results = []
     _total_image_credits = 0  # accumulated when credit_reservation_id is provided
 
-    for i, character in enumerate(characters):
-        try:
-            print(f"[CHARACTER IMAGE {i+1}] Processing: {character}")
+    # Rows are written in batches and at the end of the stage
+    async with MediaBatchWriter(session) as media:
+        for i, character in enumerate(characters):
+            try:
+                print(f"[CHARACTER IMAGE {i+1}] Processing: {character}")
 
-            character_description = (
-                f"Detailed character portrait, {style} style, expressive features"
-            )
+                character_description = (
+                    f"Detailed character portrait, {style} style, expressive features"
+                )
 
-            result = await image_service.generate_character_image(
-                character_name=character,
-                character_description=character_description,
-                style=style,
-                aspect_ratio="3:4",
-                user_tier=user_tier,
-            )
+                result = await image_service.generate_character_image(
+                    character_name=character,
+                    character_description=character_description,
+                    style=style,
+                    aspect_ratio="3:4",
+                    user_tier=user_tier,
+                )
 
-            if result.get("status") == "success":
-                image_url = result.get("image_url")
+                if result.get("status") == "success":
+                    image_url = result.get("image_url")
 
-                if not image_url:
-                    raise Exception("No image URL in V7 response")
+                    if not image_url:
+                        raise Exception("No image URL in V7 response")
 
-                # Preserve provider CDN URL before replacing canonical URL with persisted storage URL.
-                original_cdn_url = image_url
-                original_cdn_url_created_at = datetime.now(timezone.utc).isoformat()
+                    # Preserve provider CDN URL before replacing canonical URL with persisted storage URL.
+                    original_cdn_url = image_url
+                    original_cdn_url_created_at = datetime.now(timezone.utc).isoformat()
 
-                # Persist image from CDN to our own S3 storage
-                try:
-                    from app.core.services.storage import get_storage_service, S3StorageService
-                    import uuid as _uuid_mod
-                    storage = get_storage_service()
-                    s3_path = S3StorageService.build_media_path(
-                        user_id=str(user_id) if user_id else 'system',
-                        media_type='images',
-                        record_id=str(_uuid_mod.uuid4()),
-                        extension='png',
-                        scope_id=str(video_gen_id),
-                    )
-                    image_url = await persist_image_with_embedded_watermark(
-                        image_url, s3_path, storage, content_type="image/png"
+                    # Persist image from CDN to our own S3 storage
+                    try:
+                        from app.core.services.storage import get_storage_service, S3StorageService
+                        import uuid as _uuid_mod
+                        storage = get_storage_service()
+                        s3_path = S3StorageService.build_media_path(
+                            user_id=str(user_id) if user_id else 'system',
+                            media_type='images',
+                            record_id=str(_uuid_mod.uuid4()),
+                            extension='png',
+                            scope_id=str(video_gen_id),
+                        )
+                        image_url = await persist_image_with_embedded_watermark(
+                            image_url, s3_path, storage, content_type="image/png"
+                        )
+                        logger.info(f"[ImageTask] Persisted watermarked character image to S3: {s3_path}")
+                    except Exception as persist_error:
+                        logger.error(f"[ImageTask] Failed to persist watermarked character image: {persist_error}")
+                        raise
+
+                    # Store in database (written with the rest of the stage's rows)
+                    record_id = await media.add(
+                        ImageGeneration(
+                            video_generation_id=video_gen_id,
+                            image_type="character",
+                            image_prompt=f"Character: {character}, {character_description}",
+                            image_url=image_url,
+                            character_name=character,
+                            style=style,
+                            status="completed",
+                            sequence_order=i + 1,
+                            model_id=result.get("model_used", "seedream-t2i"),
+                            aspect_ratio="3:4",
+                            generation_time_seconds=result.get("generation_time", 0),
+                            meta={
+                                "service": "modelslab_v7",
+                                "service_provider": "modelslab_v7",
+                                "model_used": result.get("model_used", "seedream-t2i"),
+                                "generation_time": result.get("generation_time", 0),
+                                "provider_image_url": original_cdn_url,
+                                "original_cdn_url": original_cdn_url,
+                                "provider_cdn_url": original_cdn_url,
+                                "cdn_url": original_cdn_url,
+                                "provider_url_created_at": original_cdn_url_created_at,
+                                "original_cdn_url_created_at": original_cdn_url_created_at,
+                            },
+                        )
                     )
-                    logger.info(f"[ImageTask] Persisted watermarked character image to S3: {s3_path}")
-                except Exception as persist_error:
-                    logger.error(f"[ImageTask] Failed to persist watermarked character image: {persist_error}")
-                    raise
 
-                # Store in database
-                image_record_data = {
-                    "video_generation_id": video_gen_id,
-                    "image_type": "character",
-                    "prompt": f"Character: {character}, {character_description}",
-                    "image_url": image_url,
-                    "character_name": character,
-                    "style": style,
-                    "status": "completed",
-                    "sequence_order": i + 1,
-                    "model_id": result.get("model_used", "seedream-t2i"),
-                    "aspect_ratio": "3:4",
-                    "service_provider": "modelslab_v7",
-                    "generation_time_seconds": result.get("generation_time", 0),
-                    "metadata": json.dumps(
+                    # Deduct 1 credit per successfully generated image
+                    if user_id:
+                        try:
+                            from app.credits.service import CreditService
+                            from app.credits.constants import OperationType, IMAGE_GEN
+                            if credit_reservation_id:
+                                # Accumulate; reservation will be confirmed after the loop
+                                _total_image_credits += IMAGE_GEN
+                            else:
+                                credit_svc = CreditService(session)
+                                await credit_svc.deduct_for_operation(
+                                    user_id=_uuid.UUID(str(user_id)),
+                                    amount=IMAGE_GEN,
+                                    operation_type=OperationType.IMAGE_GEN,
+                                    ref_id=f"image_gen:{record_id}",
+                                )
+                                await session.commit()
+                        except Exception as credit_err:
+                            logger.warning("[CREDITS] Character image credit deduction failed: %s", credit_err)
+
+                    character_results.append(
                         {
-                            "service": "modelslab_v7",
-                            "model_used": result.get("model_used", "seedream-t2i"),
-                            "generation_time": result.get("generation_time", 0),
-                            "provider_image_url": original_cdn_url,
-                            "original_cdn_url": original_cdn_url,
-                            "provider_cdn_url": original_cdn_url,
-                            "cdn_url": original_cdn_url,
-                            "provider_url_created_at": original_cdn_url_created_at,
-                            "original_cdn_url_created_at": original_cdn_url_created_at,
+                            "id": record_id,
+                            "character": character,
+                            "image_url": image_url,
+                            "style": style,
+                            "status": "success",
                         }
-                    ),
-                }
-
-                insert_query = text(
-                    """
-                    INSERT INTO image_generations (
-                        video_generation_id, image_type, prompt, image_url, character_name, style, status,
-                        sequence_order, model_id, aspect_ratio, service_provider, generation_time_seconds, metadata
-                    ) VALUES (
-                        :video_generation_id, :image_type, :prompt, :image_url, :character_name, :style, :status,
-                        :sequence_order, :model_id, :aspect_ratio, :service_provider, :generation_time_seconds, :metadata
-                    ) RETURNING id
-                """
-                )
-
-                db_result = await session.execute(insert_query, image_record_data)
-                await session.commit()
-                record_id = db_result.scalar()
+                    )
 
-                # Deduct 1 credit per successfully generated image
-                if user_id:
-                    try:
-                        from app.credits.service import CreditService
-                        from app.credits.constants import OperationType, IMAGE_GEN
-                        if credit_reservation_id:
-                            # Accumulate; reservation will be confirmed after the loop
-                            _total_image_credits += IMAGE_GEN
-                        else:
-                            credit_svc = CreditService(session)
-                            await credit_svc.deduct_for_operation(
-                                user_id=_uuid.UUID(str(user_id)),
-                                amount=IMAGE_GEN,
-                                operation_type=OperationType.IMAGE_GEN,
-                                ref_id=f"image_gen:{record_id}",
-                            )
-                            await session.commit()
-                    except Exception as credit_err:
-                        logger.warning("[CREDITS] Character image credit deduction failed: %s", credit_err)
+                    print(f"[CHARACTER IMAGE {i+1}] ✅ Success: {character}")
 
-                character_results.append(
-                    {
-                        "id": record_id,
-                        "character": character,
-                        "image_url": image_url,
-                        "style": style,
-                        "status": "success",
-                    }
-                )
+                else:
+                    raise Exception(
+                        f"V7 Image generation failed: {result.get('error', 'Unknown error')}"
+                    )
 
-                print(f"[CHARACTER IMAGE {i+1}] ✅ Success: {character}")
+                # Brief pause between requests
+                await asyncio.sleep(1)
 
-            else:
-                raise Exception(
-                    f"V7 Image generation failed: {result.get('error', 'Unknown error')}"
+            except Exception as e:
+                print(f"[CHARACTER IMAGE {i+1}] ❌ Failed {character}: {str(e)}")
+
+                # Store failed record
+                await media.add(
+                    ImageGeneration(
+                        video_generation_id=video_gen_id,
+                        image_type="character",
+                        character_name=character,
+                        style=style,
+                        status="failed",
+                        error_message=str(e),
+                        sequence_order=i + 1,
+                        image_prompt=f"Character: {character}, {character_description}",
+                        model_id="seedream-t2i",
+                        aspect_ratio="3:4",
+                        meta={"service": "modelslab_v7", "service_provider": "modelslab_v7", "error": str(e)},
+                    )
                 )
 
-            # Brief pause between requests
-            await asyncio.sleep(1)
-
-        except Exception as e:
-            print(f"[CHARACTER IMAGE {i+1}] ❌ Failed {character}: {str(e)}")
-
-            # Store failed record
-            failed_record_data = {
-                "video_generation_id": video_gen_id,
-                "image_type": "character",
-                "character_name": character,
-                "style": style,
-                "status": "failed",
-                "error_message": str(e),
-                "sequence_order": i + 1,
-                "prompt": f"Character: {character}, {character_description}",
-                "model_id": "seedream-t2i",
-                "aspect_ratio": "3:4",
-                "service_provider": "modelslab_v7",
-                "metadata": json.dumps({"service": "modelslab_v7", "error": str(e)}),
-            }
-
-            fail_insert_query = text(
-                """
-                INSERT INTO image_generations (
-                    video_generation_id, image_type, character_name, style, status, error_message,
-                    sequence_order, prompt, model_id, aspect_ratio, service_provider, metadata
-                ) VALUES (
-                    :video_generation_id, :image_type, :character_name, :style, :status, :error_message,
-                    :sequence_order, :prompt, :model_id, :aspect_ratio, :service_provider, :metadata
+                character_results.append(
+                    {"character": character, "status": "failed", "error": str(e)}
                 )
-            """
-            )
-            await session.execute(fail_insert_query, failed_record_data)
-            await session.commit()
-
-            character_results.append(
-                {"character": character, "status": "failed", "error": str(e)}
-            )
 
     # Confirm or release the pre-reserved credits with actual total
     if credit_reservation_id and user_id:
@@ -624,203 +606,176 @@ async def generate_scene_images_optimized(
     scene_results = []
     _total_image_credits = 0  # accumulated when credit_reservation_id is provided
 
-    for i, scene in enumerate(scene_descriptions):
-        try:
-            # Handle different scene description formats
-            if isinstance(scene, dict):
-                scene_text = scene.get("description", scene.get("text", str(scene)))
-                scene_number = scene.get("scene_number", i + 1)
-            else:
-                scene_text = str(scene)
-                scene_number = i + 1
-
-            print(f"[SCENE IMAGE {i+1}] Processing: {scene_text[:50]}...")
-
-            # Add style modifiers for better image generation (matches frontend options)
-            style_modifiers = {
-                "realistic": "photorealistic scene, natural lighting, high detail, realistic environment",
-                "cinematic": "cinematic composition, dramatic lighting, film-like atmosphere, professional cinematography",
-                "cartoon": "animated cartoon style, stylized characters, vibrant colors, clean lines",
-                "animated": "animated scene, stylized environment, vibrant colors, fluid motion aesthetic",
-                "fantasy": "fantasy art style, magical atmosphere, mystical lighting, ethereal environment",
-                "sketch": "pencil sketch style, hand-drawn appearance, artistic linework, illustration",
-                "comic": "comic book style, bold outlines, dynamic composition, vibrant panel art",
-            }
-            style_suffix = style_modifiers.get(
-                style.lower(), style_modifiers.get("cinematic", "")
-            )
-            enhanced_scene_text = f"{scene_text}. {style_suffix}. High quality, detailed background, no text, no watermark."
+    # Rows are written in batches and at the end of the stage
+    async with MediaBatchWriter(session) as media:
+        for i, scene in enumerate(span_each(scene_descriptions, "scene")):
+            try:
+                # Handle different scene description formats
+                if isinstance(scene, dict):
+                    scene_text = scene.get("description", scene.get("text", str(scene)))
+                    scene_number = scene.get("scene_number", i + 1)
+                else:
+                    scene_text = str(scene)
+                    scene_number = i + 1
 
-            # ✅ OPTIMIZATION: Try with shorter timeout first
-            result = await image_service.generate_scene_image(
-                scene_description=enhanced_scene_text,
-                style=style,
-                aspect_ratio="16:9",
-                user_tier=user_tier,
-            )
+                print(f"[SCENE IMAGE {i+1}] Processing: {scene_text[:50]}...")
 
-            if result.get("status") == "success":
-                image_url = result.get("image_url")
+                # Add style modifiers for better image generation (matches frontend options)
+                style_modifiers = {
+                    "realistic": "photorealistic scene, natural lighting, high detail, realistic environment",
+                    "cinematic": "cinematic composition, dramatic lighting, film-like atmosphere, professional cinematography",
+                    "cartoon": "animated cartoon style, stylized characters, vibrant colors, clean lines",
+                    "animated": "animated scene, stylized environment, vibrant colors, fluid motion aesthetic",
+                    "fantasy": "fantasy art style, magical atmosphere, mystical lighting, ethereal environment",
+                    "sketch": "pencil sketch style, hand-drawn appearance, artistic linework, illustration",
+                    "comic": "comic book style, bold outlines, dynamic composition, vibrant panel art",
+                }
+                style_suffix = style_modifiers.get(
+                    style.lower(), style_modifiers.get("cinematic", "")
+                )
+                enhanced_scene_text = f"{scene_text}. {style_suffix}. High quality, detailed background, no text, no watermark."
+
+                # ✅ OPTIMIZATION: Try with shorter timeout first
+                result = await image_service.generate_scene_image(
+                    scene_description=enhanced_scene_text,
+                    style=style,
+                    aspect_ratio="16:9",
+                    user_tier=user_tier,
+                )
 
-                if not image_url:
-                    raise Exception("No image URL in V7 response")
+                if result.get("status") == "success":
+                    image_url = result.get("image_url")
 
-                # Preserve provider CDN URL before replacing canonical URL with persisted storage URL.
-                original_cdn_url = image_url
-                original_cdn_url_created_at = datetime.now(timezone.utc).isoformat()
+                    if not image_url:
+                        raise Exception("No image URL in V7 response")
 
-                # Persist image from CDN to our own S3 storage
-                try:
-                    from app.core.services.storage import get_storage_service, S3StorageService
-                    import uuid as _uuid_mod
-                    storage = get_storage_service()
-                    s3_path = S3StorageService.build_media_path(
-                        user_id=str(user_id) if user_id else 'system',
-                        media_type='images',
-                        record_id=str(_uuid_mod.uuid4()),
-                        extension='png',
-                        scope_id=str(video_gen_id),
-                    )
-                    image_url = await persist_image_with_embedded_watermark(
-                        image_url, s3_path, storage, content_type="image/png"
+                    # Preserve provider CDN URL before replacing canonical URL with persisted storage URL.
+                    original_cdn_url = image_url
+                    original_cdn_url_created_at = datetime.now(timezone.utc).isoformat()
+
+                    # Persist image from CDN to our own S3 storage
+                    try:
+                        from app.core.services.storage import get_storage_service, S3StorageService
+                        import uuid as _uuid_mod
+                        storage = get_storage_service()
+                        s3_path = S3StorageService.build_media_path(
+                            user_id=str(user_id) if user_id else 'system',
+                            media_type='images',
+                            record_id=str(_uuid_mod.uuid4()),
+                            extension='png',
+                            scope_id=str(video_gen_id),
+                        )
+                        image_url = await persist_image_with_embedded_watermark(
+                            image_url, s3_path, storage, content_type="image/png"
+                        )
+                        logger.info(f"[ImageTask] Persisted watermarked scene image to S3: {s3_path}")
+                    except Exception as persist_error:
+                        logger.error(f"[ImageTask] Failed to persist watermarked scene image: {persist_error}")
+                        raise
+
+                    # Store in database (written with the rest of the stage's rows)
+                    record_id = await media.add(
+                        ImageGeneration(
+                            video_generation_id=video_gen_id,
+                            image_type="scene",
+                            image_prompt=f"Scene: {scene_text}",
+                            image_url=image_url,
+                            scene_number=scene_number,
+                            style=style,
+                            status="completed",
+                            sequence_order=i + 1,
+                            model_id=result.get("model_used", "seedream-t2i"),
+                            aspect_ratio="16:9",
+                            generation_time_seconds=result.get("generation_time", 0),
+                            meta={
+                                "service": "modelslab_v7",
+                                "service_provider": "modelslab_v7",
+                                "model_used": result.get("model_used", "seedream-t2i"),
+                                "generation_time": result.get("generation_time", 0),
+                                "provider_image_url": original_cdn_url,
+                                "original_cdn_url": original_cdn_url,
+                                "provider_cdn_url": original_cdn_url,
+                                "cdn_url": original_cdn_url,
+                                "provider_url_created_at": original_cdn_url_created_at,
+                                "original_cdn_url_created_at": original_cdn_url_created_at,
+                            },
+                        )
                     )
-                    logger.info(f"[ImageTask] Persisted watermarked scene image to S3: {s3_path}")
-                except Exception as persist_error:
-                    logger.error(f"[ImageTask] Failed to persist watermarked scene image: {persist_error}")
-                    raise
 
-                # Store in database
-                image_record_data = {
-                    "video_generation_id": video_gen_id,
-                    "image_type": "scene",
-                    "prompt": f"Scene: {scene_text}",
-                    "image_url": image_url,
-                    "scene_number": scene_number,
-                    "style": style,
-                    "status": "completed",
-                    "sequence_order": i + 1,
-                    "model_id": result.get("model_used", "seedream-t2i"),
-                    "aspect_ratio": "16:9",
-                    "service_provider": "modelslab_v7",
-                    "generation_time_seconds": result.get("generation_time", 0),
-                    "metadata": json.dumps(
+                    # Deduct 1 credit per successfully generated scene image
+                    if user_id:
+                        try:
+                            from app.credits.service import CreditService
+                            from app.credits.constants import OperationType, IMAGE_GEN
+                            if credit_reservation_id:
+                                # Accumulate; reservation will be confirmed after the loop
+                                _total_image_credits += IMAGE_GEN
+                            else:
+                                credit_svc = CreditService(session)
+                                await credit_svc.deduct_for_operation(
+                                    user_id=_uuid.UUID(str(user_id)),
+                                    amount=IMAGE_GEN,
+                                    operation_type=OperationType.IMAGE_GEN,
+                                    ref_id=f"image_gen:{record_id}",
+                                )
+                                await session.commit()
+                        except Exception as credit_err:
+                            logger.warning("[CREDITS] Scene image credit deduction failed: %s", credit_err)
+
+                    scene_results.append(
                         {
-                            "service": "modelslab_v7",
-                            "model_used": result.get("model_used", "seedream-t2i"),
-                            "generation_time": result.get("generation_time", 0),
-                            "provider_image_url": original_cdn_url,
+                            "id": record_id,
+                            "scene_number": scene_number,
+                            "image_url": image_url,
                             "original_cdn_url": original_cdn_url,
                             "provider_cdn_url": original_cdn_url,
-                            "cdn_url": original_cdn_url,
                             "provider_url_created_at": original_cdn_url_created_at,
-                            "original_cdn_url_created_at": original_cdn_url_created_at,
+                            "description": scene_text,
+                            "style": style,
+                            "status": "success",
                         }
-                    ),
-                }
+                    )
 
-                insert_query = text(
-                    """
-                    INSERT INTO image_generations (
-                        video_generation_id, image_type, prompt, image_url, scene_number, style, status,
-                        sequence_order, model_id, aspect_ratio, service_provider, generation_time_seconds, metadata
-                    ) VALUES (
-                        :video_generation_id, :image_type, :prompt, :image_url, :scene_number, :style, :status,
-                        :sequence_order, :model_id, :aspect_ratio, :service_provider, :generation_time_seconds, :metadata
-                    ) RETURNING id
-                """
-                )
+                    print(f"[SCENE IMAGE {i+1}] ✅ Success: {image_url[:50]}...")
 
-                db_result = await session.execute(insert_query, image_record_data)
-                await session.commit()
-                record_id = db_result.scalar()
+                else:
+                    raise Exception(
+                        f"V7 Image generation failed: {result.get('error', 'Unknown error')}"
+                    )
 
-                # Deduct 1 credit per successfully generated scene image
-                if user_id:
-                    try:
-                        from app.credits.service import CreditService
-                        from app.credits.constants import OperationType, IMAGE_GEN
-                        if credit_reservation_id:
-                            # Accumulate; reservation will be confirmed after the loop
-                            _total_image_credits += IMAGE_GEN
-                        else:
-                            credit_svc = CreditService(session)
-                            await credit_svc.deduct_for_operation(
-                                user_id=_uuid.UUID(str(user_id)),
-                                amount=IMAGE_GEN,
-                                operation_type=OperationType.IMAGE_GEN,
-                                ref_id=f"image_gen:{record_id}",
-                            )
-                            await session.commit()
-                    except Exception as credit_err:
-                        logger.warning("[CREDITS] Scene image credit deduction failed: %s", credit_err)
+                # ✅ OPTIMIZATION: Brief pause between requests
+                await asyncio.sleep(2)
+
+            except Exception as e:
+                print(f"[SCENE IMAGE {i+1}] ❌ Failed: {str(e)}")
+
+                # Store failed record
+                await media.add(
+                    ImageGeneration(
+                        video_generation_id=video_gen_id,
+                        image_type="scene",
+                        scene_number=scene_number if "scene_number" in locals() else i + 1,
+                        image_prompt=scene_text if "scene_text" in locals() else "Unknown scene",
+                        style=style,
+                        status="failed",
+                        error_message=str(e),
+                        sequence_order=i + 1,
+                        model_id="seedream-t2i",
+                        aspect_ratio="16:9",
+                        meta={"service": "modelslab_v7", "service_provider": "modelslab_v7", "error": str(e)},
+                    )
+                )
 
                 scene_results.append(
                     {
-                        "id": record_id,
-                        "scene_number": scene_number,
-                        "image_url": image_url,
-                        "original_cdn_url": original_cdn_url,
-                        "provider_cdn_url": original_cdn_url,
-                        "provider_url_created_at": original_cdn_url_created_at,
-                        "description": scene_text,
-                        "style": style,
-                        "status": "success",
+                        "scene_number": (
+                            scene_number if "scene_number" in locals() else i + 1
+                        ),
+                        "status": "failed",
+                        "error": str(e),
                     }
                 )
 
-                print(f"[SCENE IMAGE {i+1}] ✅ Success: {image_url[:50]}...")
-
-            else:
-                raise Exception(
-                    f"V7 Image generation failed: {result.get('error', 'Unknown error')}"
-                )
-
-            # ✅ OPTIMIZATION: Brief pause between requests
-            await asyncio.sleep(2)
-
-        except Exception as e:
-            print(f"[SCENE IMAGE {i+1}] ❌ Failed: {str(e)}")
-
-            # Store failed record
-            failed_record_data = {
-                "video_generation_id": video_gen_id,
-                "image_type": "scene",
-                "scene_number": scene_number if "scene_number" in locals() else i + 1,
-                "prompt": scene_text if "scene_text" in locals() else "Unknown scene",
-                "style": style,
-                "status": "failed",
-                "error_message": str(e),
-                "sequence_order": i + 1,
-                "model_id": "seedream-t2i",
-                "aspect_ratio": "16:9",
-                "service_provider": "modelslab_v7",
-                "metadata": json.dumps({"service": "modelslab_v7", "error": str(e)}),
-            }
-
-            fail_insert_query = text(
-                """
-                INSERT INTO image_generations (
-                    video_generation_id, image_type, scene_number, prompt, style, status, error_message,
-                    sequence_order, model_id, aspect_ratio, service_provider, metadata
-                ) VALUES (
-                    :video_generation_id, :image_type, :scene_number, :prompt, :style, :status, :error_message,
-                    :sequence_order, :model_id, :aspect_ratio, :service_provider, :metadata
-                )
-            """
-            )
-            await session.execute(fail_insert_query, failed_record_data)
-            await session.commit()
-
-            scene_results.append(
-                {
-                    "scene_number": (
-                        scene_number if "scene_number" in locals() else i + 1
-                    ),
-                    "status": "failed",
-                    "error": str(e),
-                }
-            )
-
     # Confirm or release the pre-reserved credits with actual total
     if credit_reservation_id and user_id:
         try:
@@ -910,7 +865,7 @@ def generate_character_image_task(
     Returns:
         Dict containing task result with record_id and status
     """
-    return asyncio.run(
+    return run_async(
         async_generate_character_image_task(
             self.request.id,
             character_name,
@@ -1150,6 +1105,41 @@ async def async_generate_character_image_task(
             raise Exception(error_message)
 
 
+async def settle_scene_image_credits(
+    credit_reservation_id: Optional[str], user_id: Optional[str], amount: int
+) -> None:
+    """Confirm amount of the scene image route's reservation; 0 releases it."""
+    if not credit_reservation_id:
+        return
+    try:
+        from app.credits.service import CreditService
+        from app.credits.constants import OperationType
+        async with async_session() as credit_session:
+            credit_svc = CreditService(credit_session)
+            if amount > 0:
+                confirmed = await credit_svc.confirm_deduction(
+                    _uuid.UUID(credit_reservation_id), amount
+                )
+                if not confirmed and user_id:
+                    logger.warning(
+                        "[CREDITS] Scene image confirm_deduction returned False "
+                        "for reservation %s — logging failure",
+                        credit_reservation_id,
+                    )
+                    await credit_svc.log_credit_failure(
+                        user_id=_uuid.UUID(str(user_id)),
+                        reservation_id=_uuid.UUID(credit_reservation_id),
+                        amount=amount,
+                        operation_type=OperationType.SCENE_IMAGE_GEN,
+                        error_message="confirm_deduction returned False",
+                    )
+            else:
+                await credit_svc.release_reservation(_uuid.UUID(credit_reservation_id))
+            await credit_session.commit()
+    except Exception as credit_err:
+        logger.warning("[CREDITS] Scene image reservation confirm/release failed: %s", credit_err)
+
+
 @celery_app.task(bind=True)
 def generate_scene_image_task(
     self,
@@ -1167,6 +1157,8 @@ def generate_scene_image_task(
     character_ids: Optional[List[str]] = None,
     character_image_urls: Optional[List[str]] = None,
     is_suggested_shot: bool = False,  # For suggested shot special handling
+    regenerate: bool = False,
+    credit_reservation_id: Optional[str] = None,
 ) -> None:
     """
     Asynchronous Celery task for generating scene images with retry mechanism.
@@ -1186,8 +1178,11 @@ def generate_scene_image_task(
         character_ids: Optional list of character image IDs to use as style references
         character_image_urls: Optional list of direct character image URLs
         is_suggested_shot: If True, maintains same background with only pose changes
+        regenerate: User asked for a new image; skips the media cache lookup
+        credit_reservation_id: Route reservation, confirmed when the provider
+            generates the image and released on a cache hit or final failure
     """
-    return asyncio.run(
+    return run_async(
         async_generate_scene_image_task(
             record_id,
             scene_description,
@@ -1203,6 +1198,8 @@ def generate_scene_image_task(
             character_ids=character_ids,
             character_image_urls=character_image_urls,
             is_suggested_shot=is_suggested_shot,
+            regenerate=regenerate,
+            credit_reservation_id=credit_reservation_id,
             task_instance=self,
         )
     )
@@ -1223,6 +1220,8 @@ async def async_generate_scene_image_task(
     character_ids: Optional[List[str]] = None,
     character_image_urls: Optional[List[str]] = None,
     is_suggested_shot: bool = False,
+    regenerate: bool = False,
+    credit_reservation_id: Optional[str] = None,
     task_instance: Any = None,
 ):
     """Async implementation of scene image generation task"""
@@ -1245,9 +1244,11 @@ async def async_generate_scene_image_task(
                 record_check = result.scalar()
                 if not record_check:
                     logger.error(f"[SceneImageTask] Record {record_id} not found")
+                    await settle_scene_image_credits(credit_reservation_id, user_id, 0)
                     return
             except Exception as e:
                 logger.error(f"[SceneImageTask] Failed to verify record: {e}")
+                await settle_scene_image_credits(credit_reservation_id, user_id, 0)
                 return
 
             # Update status to in_progress with transaction safety
@@ -1406,15 +1407,50 @@ async def async_generate_scene_image_task(
                 except Exception as cdn_error:
                     logger.warning(f"[SceneImageTask] CDN fallback lookup failed: {cdn_error}")
 
-            image_service = ModelsLabV7ImageService()
-            result = await image_service.generate_scene_image(
-                scene_description=final_description,
-                style=style or "cinematic",
-                aspect_ratio=aspect_ratio or "16:9",
-                user_tier=user_tier,
-                character_image_urls=final_character_urls,
-                is_suggested_shot=is_suggested_shot,  # Pass flag for low-strength I2I
+            # Reuse an identical earlier generation (same model ladder, prompt,
+            # references and framing) instead of paying the provider again
+            image_model_config = get_model_config("image", str(user_tier or "free"))
+
+            def scene_image_cache_key(model_id: Optional[str]) -> str:
+                return build_media_cache_key(
+                    media_type="image",
+                    model_id=model_id,
+                    prompt=final_description,
+                    input_urls=final_character_urls,
+                    aspect_ratio=aspect_ratio or "16:9",
+                    scope=user_id,
+                    extra={"style": style or "cinematic", "suggested_shot": is_suggested_shot},
+                )
+
+            image_cache_key = scene_image_cache_key(
+                image_model_config.primary if image_model_config else None
             )
+            # A regeneration asks for a new image; its result replaces the entry
+            cached_image = None
+            if not regenerate:
+                async with async_session() as cache_session:
+                    cached_image = await MediaCacheService(cache_session).lookup(image_cache_key)
+
+            if cached_image is not None:
+                cached_meta = cached_image.meta or {}
+                result = {
+                    "status": "success",
+                    "image_url": cached_image.media_url,
+                    "generation_time": 0,
+                    "model_used": cached_image.model_id,
+                    "provider_image_url": cached_meta.get("provider_image_url"),
+                }
+                logger.info(f"[SceneImageTask] Reusing cached image for scene {scene_number}")
+            else:
+                image_service = ModelsLabV7ImageService()
+                result = await image_service.generate_scene_image(
+                    scene_description=final_description,
+                    style=style or "cinematic",
+                    aspect_ratio=aspect_ratio or "16:9",
+                    user_tier=user_tier,
+                    character_image_urls=final_character_urls,
+                    is_suggested_shot=is_suggested_shot,  # Pass flag for low-strength I2I
+                )
 
             # Extract result data
             # Check for error in result (fallback manager returns dict on error)
@@ -1430,41 +1466,61 @@ async def async_generate_scene_image_task(
             if not image_url:
                 raise Exception("No image URL returned from ModelsLab service")
 
-            # Persist both watermarked and clean copies to S3 storage
             clean_url = None
-            try:
-                from app.core.services.storage import get_storage_service, S3StorageService
-                import uuid as _uuid_mod
-                storage = get_storage_service()
-                image_scope = str(script_id or chapter_id or 'global')
-                wm_s3_path = S3StorageService.build_media_path(
-                    user_id=str(user_id) if user_id else 'system',
-                    media_type='images',
-                    record_id=str(_uuid_mod.uuid4()),
-                    extension='png',
-                    scope_id=image_scope,
-                )
-                clean_s3_path = S3StorageService.build_media_path(
-                    user_id=str(user_id) if user_id else 'system',
-                    media_type='images',
-                    record_id=str(_uuid_mod.uuid4()),
-                    extension='png',
-                    scope_id=image_scope,
-                )
+            if cached_image is not None:
+                # Cached media already lives in our bucket (watermarked + clean)
+                provider_image_url = result.get("provider_image_url") or image_url
+                clean_url = cached_image.clean_url
+            else:
+                # Persist both watermarked and clean copies to S3 storage
                 try:
-                    image_url, clean_url = await persist_image_with_both_versions(
-                        image_url, wm_s3_path, clean_s3_path, storage, content_type="image/png"
+                    from app.core.services.storage import get_storage_service, S3StorageService
+                    import uuid as _uuid_mod
+                    storage = get_storage_service()
+                    image_scope = str(script_id or chapter_id or 'global')
+                    wm_s3_path = S3StorageService.build_media_path(
+                        user_id=str(user_id) if user_id else 'system',
+                        media_type='images',
+                        record_id=str(_uuid_mod.uuid4()),
+                        extension='png',
+                        scope_id=image_scope,
                     )
-                    logger.info(f"[SceneImageTask] Persisted watermarked + clean images to S3")
-                except Exception:
-                    # Fallback to watermarked-only
-                    image_url = await persist_image_with_embedded_watermark(
-                        image_url, wm_s3_path, storage, content_type="image/png"
+                    clean_s3_path = S3StorageService.build_media_path(
+                        user_id=str(user_id) if user_id else 'system',
+                        media_type='images',
+                        record_id=str(_uuid_mod.uuid4()),
+                        extension='png',
+                        scope_id=image_scope,
                     )
-                    logger.info(f"[SceneImageTask] Persisted watermarked image to S3 (clean fallback failed)")
-            except Exception as persist_error:
-                logger.error(f"[SceneImageTask] Failed to persist image to S3: {persist_error}")
-                raise
+                    try:
+                        image_url, clean_url = await persist_image_with_both_versions(
+                            image_url, wm_s3_path, clean_s3_path, storage, content_type="image/png"
+                        )
+                        logger.info(f"[SceneImageTask] Persisted watermarked + clean images to S3")
+                    except Exception:
+                        # Fallback to watermarked-only
+                        image_url = await persist_image_with_embedded_watermark(
+                            image_url, wm_s3_path, storage, content_type="image/png"
+                        )
+                        logger.info(f"[SceneImageTask] Persisted watermarked image to S3 (clean fallback failed)")
+                except Exception as persist_error:
+                    logger.error(f"[SceneImageTask] Failed to persist image to S3: {persist_error}")
+                    raise
+
+                # Keyed on the model that produced the image, so a fallback
+                # model's image is never served for a request of the primary
+                produced_model = result.get("model_used")
+                if produced_model:
+                    async with async_session() as cache_session:
+                        await MediaCacheService(cache_session).store(
+                            scene_image_cache_key(produced_model),
+                            media_type="image",
+                            media_url=image_url,
+                            clean_url=clean_url,
+                            model_id=produced_model,
+                            user_id=user_id,
+                            meta={"provider_image_url": provider_image_url},
+                        )
 
             # Prepare metadata with scene info
             existing_metadata = {}
@@ -1557,6 +1613,13 @@ async def async_generate_scene_image_task(
                 )
                 raise
 
+            # A cached image cost no generation, so it is not charged
+            await settle_scene_image_credits(
+                credit_reservation_id,
+                user_id,
+                0 if cached_image is not None else SCENE_IMAGE_GEN,
+            )
+
             logger.info(
                 f"[SceneImageTask] Task completed successfully for record {record_id}"
             )
@@ -1714,4 +1777,5 @@ async def async_generate_scene_image_task(
             logger.error(
                 f"[SceneImageTask] Final failure for record {record_id}: {error_message}"
             )
+            await settle_scene_image_credits(credit_reservation_id, user_id, 0)
             raise Exception(error_message)
@@ -1,16 +1,82 @@
 from app.tasks.celery_app import celery_app
-import asyncio
-from typing import Dict, Any, List, Optional
+from app.core.async_runtime import run_async
+from app.core.config import settings
+from typing import Dict, Any, List, Optional, Tuple
 from app.core.services.modelslab_v7_video import ModelsLabV7VideoService
 from app.core.database import async_session
 from sqlalchemy import text
+import asyncio
 import json
 
+LIPSYNC_PROVIDER = "modelslab"
+
+# Scene results are written to lipsync_data["scene_progress"][scene_id] as
+# each scene finishes, so a rerun after a crash or failure only redoes the
+# scenes that did not complete.
+_RECORD_SCENE_PROGRESS_SQL = text(
+    """
+    UPDATE video_generations
+    SET lipsync_data = jsonb_set(
+            jsonb_set(
+                COALESCE(lipsync_data, '{}'::jsonb),
+                '{scene_progress}',
+                COALESCE(lipsync_data->'scene_progress', '{}'::jsonb)
+            ),
+            ARRAY['scene_progress', CAST(:scene_key AS text)],
+            CAST(:entry AS jsonb)
+        )
+    WHERE id = :id
+"""
+)
+
+# Provider semaphores are shared by every lip-sync task running on the
+# worker's event loop (see app.core.async_runtime)
+_provider_semaphores: Dict[Tuple[int, str], asyncio.Semaphore] = {}
+
+
+def provider_semaphore(provider: str) -> asyncio.Semaphore:
+    """Semaphore bounding in-flight lip-sync jobs for provider on this event loop"""
+    key = (id(asyncio.get_running_loop()), provider)
+    semaphore = _provider_semaphores.get(key)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(
+            max(1, settings.LIPSYNC_CONCURRENCY_PER_PROVIDER)
+        )
+        _provider_semaphores[key] = semaphore
+    return semaphore
+
+
+def completed_scene_results(lipsync_data: Any) -> Dict[str, Dict[str, Any]]:
+    """Results of scenes that finished lip sync in an earlier run, by scene key"""
+    if isinstance(lipsync_data, str):
+        lipsync_data = json.loads(lipsync_data)
+    progress = (lipsync_data or {}).get("scene_progress") or {}
+    return {
+        scene_key: entry["result"]
+        for scene_key, entry in progress.items()
+        if entry.get("status") == "completed" and entry.get("result")
+    }
+
+
+async def record_scene_progress(
+    video_gen_id: str, scene_key: str, entry: Dict[str, Any]
+) -> None:
+    async with async_session() as session:
+        await session.execute(
+            _RECORD_SCENE_PROGRESS_SQL,
+            {
+                "id": video_gen_id,
+                "scene_key": scene_key,
+                "entry": json.dumps(entry, default=str),
+            },
+        )
+        await session.commit()
+
 
 @celery_app.task(bind=True)
 def apply_lip_sync_to_generation(self, video_generation_id: str):
     """Main task to apply lip sync to all character dialogue in a video generation"""
-    return asyncio.run(async_apply_lip_sync_to_generation(video_generation_id))
+    return run_async(async_apply_lip_sync_to_generation(video_generation_id))
 
 
 async def async_apply_lip_sync_to_generation(video_generation_id: str):
@@ -65,6 +131,13 @@ async def async_apply_lip_sync_to_generation(video_generation_id: str):
             print(f"- Character images: {len(character_images)}")
             print(f"- Quality tier: {quality_tier}")
 
+            # Scenes completed by an earlier run are reused, not regenerated
+            previous_results = completed_scene_results(video_gen.get("lipsync_data"))
+            if previous_results:
+                print(
+                    f"[LIP SYNC] Resuming: {len(previous_results)} scenes already lip-synced"
+                )
+
             # Apply lip sync
             modelslab_service = ModelsLabV7VideoService()
 
@@ -75,7 +148,7 @@ async def async_apply_lip_sync_to_generation(video_generation_id: str):
                 audio_files,
                 character_images,
                 quality_tier,
-                session,
+                previous_results=previous_results,
             )
 
             # Calculate statistics
@@ -108,10 +181,12 @@ async def async_apply_lip_sync_to_generation(video_generation_id: str):
                 "completed" if current_status == "completed" else "lipsync_completed"
             )
 
+            # Merged so the per-scene progress written during the run is kept
             final_update = text(
                 """
                 UPDATE video_generations 
-                SET lipsync_data = :lipsync_data, 
+                SET lipsync_data = COALESCE(lipsync_data, '{}'::jsonb)
+                        || CAST(:lipsync_data AS jsonb), 
                     generation_status = :status 
                 WHERE id = :id
             """
@@ -119,7 +194,7 @@ async def async_apply_lip_sync_to_generation(video_generation_id: str):
             await session.execute(
                 final_update,
                 {
-                    "lipsync_data": json.dumps(lipsync_data_result),
+                    "lipsync_data": json.dumps(lipsync_data_result, default=str),
                     "status": final_status,
                     "id": video_generation_id,
                 },
@@ -178,12 +253,20 @@ async def apply_lip_sync_to_scenes(
     audio_files: Dict[str, Any],
     character_images: List[Dict[str, Any]],
     quality_tier: str,
-    session,
+    previous_results: Optional[Dict[str, Dict[str, Any]]] = None,
 ) -> List[Dict[str, Any]]:
-    """Apply lip sync to scenes that have character dialogue"""
+    """
+    Apply lip sync to scenes that have character dialogue.
+
+    Scenes run concurrently, bounded by the provider semaphore, and each one
+    uses its own database session. Every scene's outcome is recorded in
+    lipsync_data as soon as it finishes. Scenes in previous_results (see
+    completed_scene_results) are reused while their video is unchanged. Results are in scene order, with
+    None for scenes that have no dialogue or failed.
+    """
 
     print(f"[SCENE LIP SYNC] Processing scene lip sync...")
-    lipsync_results = []
+    previous_results = previous_results or {}
 
     # Filter valid scene videos
     valid_scene_videos = [
@@ -200,44 +283,68 @@ async def apply_lip_sync_to_scenes(
 
     print(f"[SCENE LIP SYNC] Using model: {lipsync_model}")
 
-    for scene_video in valid_scene_videos:
-        try:
-            scene_id = scene_video.get("scene_id")
-            print(f"[SCENE LIP SYNC] Processing scene: {scene_id}")
+    semaphore = provider_semaphore(LIPSYNC_PROVIDER)
 
-            # Find character dialogue for this scene
-            scene_character_audio = find_character_audio_for_scene(
-                scene_id, character_audio_files
-            )
+    async def process_scene(scene_video: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        scene_id = scene_video.get("scene_id")
+        scene_key = str(scene_id)
 
-            if not scene_character_audio:
-                print(f"[SCENE LIP SYNC] No character dialogue for scene {scene_id}")
-                lipsync_results.append(None)
-                continue
+        # Only while the scene's video is the one that was lip-synced; a
+        # regenerated scene video needs a new lip-sync pass
+        previous = previous_results.get(scene_key)
+        if previous and previous.get("original_video_url") == scene_video.get("video_url"):
+            print(f"[SCENE LIP SYNC] Scene {scene_id} already lip-synced, reusing")
+            return previous
 
-            # Apply lip sync to this scene
-            lipsync_result = await apply_lip_sync_to_single_scene(
-                modelslab_service,
-                video_gen_id,
-                scene_video,
-                scene_character_audio,
-                character_images,
-                lipsync_model,
-                session,
-            )
+        # Find character dialogue for this scene
+        scene_character_audio = find_character_audio_for_scene(
+            scene_id, character_audio_files
+        )
+
+        if not scene_character_audio:
+            print(f"[SCENE LIP SYNC] No character dialogue for scene {scene_id}")
+            return None
 
-            lipsync_results.append(lipsync_result)
+        error = None
+        try:
+            async with semaphore:
+                print(f"[SCENE LIP SYNC] Processing scene: {scene_id}")
+                async with async_session() as scene_session:
+                    lipsync_result = await apply_lip_sync_to_single_scene(
+                        modelslab_service,
+                        video_gen_id,
+                        scene_video,
+                        scene_character_audio,
+                        character_images,
+                        lipsync_model,
+                        scene_session,
+                    )
+        except Exception as e:
+            lipsync_result = None
+            error = str(e)
 
-            if lipsync_result:
-                print(f"[SCENE LIP SYNC] ✅ Scene {scene_id} lip sync completed")
-            else:
-                print(f"[SCENE LIP SYNC] ❌ Scene {scene_id} lip sync failed")
+        if lipsync_result:
+            print(f"[SCENE LIP SYNC] ✅ Scene {scene_id} lip sync completed")
+            entry = {"status": "completed", "result": lipsync_result}
+        else:
+            print(
+                f"[SCENE LIP SYNC] ❌ Scene {scene_id} lip sync failed"
+                + (f": {error}" if error else "")
+            )
+            entry = {"status": "failed", "error": error}
 
+        try:
+            await record_scene_progress(video_gen_id, scene_key, entry)
         except Exception as e:
             print(
-                f"[SCENE LIP SYNC] ❌ Scene {scene_video.get('scene_id')} error: {str(e)}"
+                f"[SCENE LIP SYNC] Could not record progress for scene {scene_id}: {str(e)}"
             )
-            lipsync_results.append(None)
+
+        return lipsync_result
+
+    lipsync_results = list(
+        await asyncio.gather(*(process_scene(v) for v in valid_scene_videos))
+    )
 
     successful_lipsync = len([r for r in lipsync_results if r is not None])
     print(
@@ -278,29 +385,32 @@ async def apply_lip_sync_to_single_scene(
         return None
 
     try:
-        # Step 1: Detect faces in the video
-        print(f"[SINGLE SCENE LIP SYNC] Detecting faces in scene {scene_id}")
-        face_detection_result = await modelslab_service.detect_faces_in_video(video_url)
-
+        # Step 1: Detect faces in the video, where the service supports it;
+        # otherwise the lip-sync model locates the speaking face itself
         detected_faces = []
-        if face_detection_result.get("status") == "success":
-            detected_faces = face_detection_result.get("faces", [])
-        else:
-            # Wait for completion if async
-            request_id = face_detection_result.get("id")
-            if request_id:
-                final_result = await modelslab_service.wait_for_completion(
-                    request_id, max_wait_time=300
-                )
-                detected_faces = final_result.get("faces", [])
+        detect_faces_in_video = getattr(modelslab_service, "detect_faces_in_video", None)
+        if detect_faces_in_video is not None:
+            print(f"[SINGLE SCENE LIP SYNC] Detecting faces in scene {scene_id}")
+            face_detection_result = await detect_faces_in_video(video_url)
 
-        if not detected_faces:
-            print(f"[SINGLE SCENE LIP SYNC] No faces detected in scene {scene_id}")
-            return None
+            if face_detection_result.get("status") == "success":
+                detected_faces = face_detection_result.get("faces", [])
+            else:
+                # Wait for completion if async
+                request_id = face_detection_result.get("id")
+                if request_id:
+                    final_result = await modelslab_service.wait_for_completion(
+                        request_id, max_wait_time=300
+                    )
+                    detected_faces = final_result.get("faces", [])
 
-        print(
-            f"[SINGLE SCENE LIP SYNC] Detected {len(detected_faces)} faces in scene {scene_id}"
-        )
+            if not detected_faces:
+                print(f"[SINGLE SCENE LIP SYNC] No faces detected in scene {scene_id}")
+                return None
+
+            print(
+                f"[SINGLE SCENE LIP SYNC] Detected {len(detected_faces)} faces in scene {scene_id}"
+            )
 
         # Step 2: Map character audio to detected faces
         character_face_mappings = map_characters_to_faces(
@@ -322,11 +432,10 @@ async def apply_lip_sync_to_single_scene(
 
             print(f"[SINGLE SCENE LIP SYNC] Applying lip sync to {character_name}")
 
-            # Generate lip sync
+            # Generate lip sync (polls the provider until the job finishes)
             lipsync_result = await modelslab_service.generate_lip_sync(
                 video_url=video_url,
                 audio_url=audio_url,
-                face_regions=[face_region] if face_region else None,
                 model_id=lipsync_model,
             )
 
@@ -334,7 +443,9 @@ async def apply_lip_sync_to_single_scene(
             lipsync_video_url = None
             if lipsync_result.get("status") == "success":
                 output = lipsync_result.get("output", [])
-                lipsync_video_url = output[0] if output else None
+                lipsync_video_url = (
+                    output[0] if output else lipsync_result.get("video_url")
+                )
                 if isinstance(lipsync_video_url, dict):
                     lipsync_video_url = lipsync_video_url.get(
                         "url"
@@ -393,7 +504,9 @@ async def apply_lip_sync_to_single_scene(
             "characters_processed": [r["character_name"] for r in lipsync_results],
             "faces_detected": len(detected_faces),
             "lipsync_model": lipsync_model,
-            "processing_method": "face_detection_and_lipsync",
+            "processing_method": (
+                "face_detection_and_lipsync" if detected_faces else "lipsync"
+            ),
         }
 
         result = await session.execute(
@@ -418,7 +531,7 @@ async def apply_lip_sync_to_single_scene(
         record_id = result.scalar()
 
         return {
-            "id": record_id,
+            "id": str(record_id) if record_id is not None else None,
             "scene_id": scene_id,
             "original_video_url": video_url,
             "lipsync_video_url": final_lipsync_url,
@@ -1,4 +1,5 @@
 from app.tasks.celery_app import celery_app
+from app.core.async_runtime import run_async
 from app.core.database import async_session
 from app.core.services.storage import get_storage_service, S3StorageService
 from sqlalchemy import text
@@ -13,7 +14,7 @@ logger = logging.getLogger(__name__)
 @celery_app.task(bind=True, time_limit=3600, soft_time_limit=3500)
 def backfill_media_to_s3(self, batch_size=20, dry_run=False):
     """Backfill existing ModelsLab CDN URLs to our own S3 storage."""
-    return asyncio.run(async_backfill_media_to_s3(batch_size, dry_run))
+    return run_async(async_backfill_media_to_s3(batch_size, dry_run))
 
 
 async def async_backfill_media_to_s3(batch_size=20, dry_run=False):
@@ -0,0 +1,36 @@
+"""
+Periodic Celery tasks for media cache maintenance.
+"""
+
+import logging
+
+from app.tasks.celery_app import celery_app
+from app.core.async_runtime import run_async
+from app.core.database import async_session
+from app.media_cache.service import MediaCacheService
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(bind=True, name="app.tasks.media_cache_tasks.purge_expired_media_cache")
+def purge_expired_media_cache(self):
+    """
+    Drop media cache entries past MEDIA_CACHE_TTL_DAYS.
+
+    Entries expire together with the storage lifecycle of the objects they
+    point at, so expired rows would only ever miss. Runs hourly via Celery beat.
+    """
+    return run_async(_async_purge_expired_media_cache())
+
+
+async def _async_purge_expired_media_cache():
+    async with async_session() as session:
+        try:
+            purged = await MediaCacheService(session).purge_expired()
+            if purged:
+                logger.info("[MEDIA CACHE] Purged %d expired entries", purged)
+            return {"purged": purged}
+        except Exception as e:
+            logger.error("[MEDIA CACHE] Error purging expired entries: %s", e)
+            await session.rollback()
+            raise
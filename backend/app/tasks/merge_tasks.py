@@ -1,22 +1,28 @@
 from app.tasks.celery_app import celery_app
-import asyncio
-import subprocess
+from app.core.async_runtime import run_async
 import os
 import tempfile
-import requests
+import asyncio
 from typing import Dict, Any, List, Optional, Tuple
 from app.core.database import async_session, engine
+from app.core.services.audio_mixer import AudioMixer, MixTrack, tracks_from_audio_files
 from app.core.services.file import FileService
+from app.core.services.media_repository import ProgressWriter
+from app.tracing.tracer import span_each, traced_run
 from app.core.services.watermark import apply_watermark, check_has_watermark, apply_watermark_sync
 import json
 from app.merges.schemas import MergeQualityTier, FFmpegParameters, MergeInputFile
 from app.videos.models import VideoGeneration, VideoSegment
 from sqlmodel import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+from sqlalchemy import func, text
 import uuid
 
 
+# Coalesced progress writers of the merges running in this worker, by merge id
+_merge_progress: Dict[str, ProgressWriter] = {}
+
+
 async def update_merge_progress(
     merge_id: str,
     progress_percentage: float,
@@ -24,83 +30,38 @@ async def update_merge_progress(
     statistics: Optional[Dict[str, Any]] = None,
     session: AsyncSession = None,
 ):
-    """Update merge operation progress in database"""
-    try:
-        # Update merge_operations table with progress
-        # We assume MergeOperation model exists (need to check, but for now using raw SQL or generic update if model not available)
-        # Since I don't have MergeOperation model imported, I might need to find it.
-        # For now, I'll assume it exists in app.merge.models or similar.
-        # If not, I'll use text() for raw SQL as fallback, but better to find model.
-
-        # Checking if MergeOperation model exists...
-        # I'll use a raw update for now if I can't find it, but let's try to be safe.
-        # Actually, let's just print for now if session is not provided, but it should be.
+    """
+    Update merge operation progress in database.
 
+    Writes are coalesced through a ProgressWriter on their own short-lived
+    sessions: repeated values are skipped, steps reported in quick
+    succession become one UPDATE, and the 100% update is written at once.
+    """
+    try:
         if not session:
             print("[PROGRESS ERROR] No session provided for update_merge_progress")
             return
 
-        # Assuming MergeOperation model is available or using raw SQL
-        # I'll use raw SQL for now to be safe as I haven't checked MergeOperation model
-        from sqlalchemy import text
-
-        update_query = text(
-            """
-            UPDATE merge_operations 
-            SET progress = :progress, 
-                merge_status = :status, 
-                updated_at = NOW(),
-                processing_stats = :stats
-            WHERE id = :id
-        """
-        )
-
-        status = "IN_PROGRESS" if progress_percentage < 100 else "COMPLETED"
-        stats_json = json.dumps(statistics) if statistics else None
-
-        # Handle stats update - if stats is None, we might not want to overwrite existing stats?
-        # The original code overwrites if provided.
+        writer = _merge_progress.get(merge_id)
+        if writer is None:
+            writer = _merge_progress[merge_id] = ProgressWriter(
+                "merge_operations",
+                uuid.UUID(str(merge_id)),
+                async_session,
+                touch={"updated_at": func.now()},
+            )
 
+        values: Dict[str, Any] = {
+            "progress": int(progress_percentage),
+            "merge_status": "IN_PROGRESS" if progress_percentage < 100 else "COMPLETED",
+        }
         if statistics:
-            update_query = text(
-                """
-                UPDATE merge_operations 
-                SET progress = :progress, 
-                    merge_status = :status, 
-                    updated_at = NOW(),
-                    processing_stats = :stats
-                WHERE id = :id
-            """
-            )
-            await session.execute(
-                update_query,
-                {
-                    "progress": int(progress_percentage),
-                    "status": status,
-                    "stats": stats_json,
-                    "id": merge_id,
-                },
-            )
-        else:
-            update_query = text(
-                """
-                UPDATE merge_operations 
-                SET progress = :progress, 
-                    merge_status = :status, 
-                    updated_at = NOW()
-                WHERE id = :id
-            """
-            )
-            await session.execute(
-                update_query,
-                {
-                    "progress": int(progress_percentage),
-                    "status": status,
-                    "id": merge_id,
-                },
-            )
+            values["processing_stats"] = statistics
 
-        await session.commit()
+        final = progress_percentage >= 100
+        await writer.update(final=final, **values)
+        if final:
+            _merge_progress.pop(merge_id, None)
 
         print(f"[PROGRESS] {merge_id}: {progress_percentage:.1f}% - {current_step}")
         if statistics:
@@ -109,6 +70,28 @@ async def update_merge_progress(
         print(f"[PROGRESS UPDATE ERROR] {str(e)}")
 
 
+def discard_merge_progress(merge_id: str) -> None:
+    """Drop unwritten progress of a merge that failed, so it can't overwrite the failure."""
+    writer = _merge_progress.pop(merge_id, None)
+    if writer is not None:
+        writer.cancel()
+
+
+async def _record_scene_media_built(session, chapter_id) -> None:
+    """Mark the chapter's scene media as matching its current script inputs."""
+    from app.books.models import Chapter
+    from app.chapter_changes.service import ChapterChangeTracker
+
+    try:
+        chapter = await session.get(Chapter, chapter_id)
+        if chapter is None:  # generations for Creator-mode artifacts have no chapter row
+            return
+        await ChapterChangeTracker(session).mark_built([chapter], "scene_media")
+        await session.commit()
+    except Exception as e:
+        print(f"[CHAPTER CHANGES] Could not record scene media for {chapter_id}: {e}")
+
+
 def get_quality_settings(
     quality_tier: MergeQualityTier, custom_params: Optional[FFmpegParameters] = None
 ) -> Dict[str, Any]:
@@ -184,7 +167,7 @@ def get_quality_settings(
 @celery_app.task(bind=True)
 def merge_audio_video_for_generation(self, video_generation_id: str):
     """Main task to merge audio and video for a video generation"""
-    return asyncio.run(async_merge_audio_video_for_generation(video_generation_id))
+    return run_async(async_merge_audio_video_for_generation(video_generation_id))
 
 
 async def async_merge_audio_video_for_generation(video_generation_id: str):
@@ -315,6 +298,7 @@ async def async_merge_audio_video_for_generation(video_generation_id: str):
 
             session.add(video_gen)
             await session.commit()
+            await _record_scene_media_built(session, video_gen.chapter_id)
 
             success_message = f"Audio+Video merge completed! Final video ready"
             print(f"[AUDIO VIDEO MERGE SUCCESS] {success_message}")
@@ -417,7 +401,7 @@ async def merge_audio_video_scenes(
 
         # Merge each scene with its audio
         merged_scenes = []
-        for i, scene_video in enumerate(valid_scene_videos):
+        for i, scene_video in enumerate(span_each(valid_scene_videos, "scene merge")):
             try:
                 print(
                     f"[SCENE MERGE] Processing scene {i+1}/{len(valid_scene_videos)}: {scene_video.get('scene_id')}"
@@ -639,33 +623,20 @@ async def merge_single_scene(
             video_path = os.path.join(temp_dir, f"{scene_id}_video.mp4")
             await download_file(video_url, video_path)
 
-            # Download and prepare audio files
-            audio_files_paths = []
-
-            # Download narrator audio
-            for i, narrator in enumerate(scene_audio.get("narrator", [])):
-                if narrator.get("audio_url"):
-                    audio_path = os.path.join(temp_dir, f"{scene_id}_narrator_{i}.mp3")
-                    await download_file(narrator["audio_url"], audio_path)
-                    audio_files_paths.append(audio_path)
-
-            # Download character audio
-            for i, character in enumerate(scene_audio.get("characters", [])):
-                if character.get("audio_url"):
-                    audio_path = os.path.join(temp_dir, f"{scene_id}_character_{i}.mp3")
-                    await download_file(character["audio_url"], audio_path)
-                    audio_files_paths.append(audio_path)
-
-            # Download sound effects
-            for i, effect in enumerate(scene_audio.get("sound_effects", [])):
-                if effect.get("audio_url"):
-                    audio_path = os.path.join(temp_dir, f"{scene_id}_effect_{i}.mp3")
-                    await download_file(effect["audio_url"], audio_path)
-                    audio_files_paths.append(audio_path)
-
-            if not audio_files_paths:
+            # Narrator, character and sound-effect clips are downloaded
+            # concurrently and rendered in one ffmpeg filter graph
+            scene_tracks = tracks_from_audio_files(
+                [dict(a, type="narrator") for a in scene_audio.get("narrator", [])]
+                + [dict(a, type="character") for a in scene_audio.get("characters", [])]
+                + [
+                    dict(a, type="sound_effects")
+                    for a in scene_audio.get("sound_effects", [])
+                ]
+            )
+
+            if not scene_tracks:
                 print(
-                    f"[SINGLE SCENE MERGE] No valid audio files downloaded for scene {scene_id}"
+                    f"[SINGLE SCENE MERGE] No valid audio files for scene {scene_id}"
                 )
                 return {
                     "scene_id": scene_id,
@@ -674,15 +645,8 @@ async def merge_single_scene(
                     "has_audio": False,
                 }
 
-            # Mix audio files if multiple
             mixed_audio_path = os.path.join(temp_dir, f"{scene_id}_mixed_audio.mp3")
-
-            if len(audio_files_paths) == 1:
-                # Single audio file
-                mixed_audio_path = audio_files_paths[0]
-            else:
-                # Mix multiple audio files
-                await mix_audio_files(audio_files_paths, mixed_audio_path)
+            await AudioMixer().mix(scene_tracks, mixed_audio_path)
 
             # Merge audio with video
             output_path = os.path.join(temp_dir, f"{scene_id}_merged.mp4")
@@ -705,7 +669,7 @@ async def merge_single_scene(
                 "video_url": merged_video_url,
                 "duration": scene_video.get("duration", 3.0),
                 "has_audio": True,
-                "audio_tracks_used": len(audio_files_paths),
+                "audio_tracks_used": len(scene_tracks),
             }
 
     except Exception as e:
@@ -714,38 +678,13 @@ async def merge_single_scene(
 
 
 async def mix_audio_files(audio_paths: List[str], output_path: str):
-    """Mix multiple audio files using FFmpeg"""
-
-    if len(audio_paths) == 1:
-        # Copy single file
-        subprocess.run(["cp", audio_paths[0], output_path], check=True)
-        return
-
-    # Build FFmpeg command for mixing
-    cmd = ["ffmpeg", "-y"]  # -y to overwrite output
-
-    # Add input files
-    for audio_path in audio_paths:
-        cmd.extend(["-i", audio_path])
-
-    # Add filter complex for mixing
-    if len(audio_paths) == 2:
-        cmd.extend(["-filter_complex", "[0:a][1:a]amix=inputs=2:duration=longest[out]"])
-        cmd.extend(["-map", "[out]"])
-    else:
-        # For more than 2 files
-        inputs = "".join([f"[{i}:a]" for i in range(len(audio_paths))])
-        filter_complex = f"{inputs}amix=inputs={len(audio_paths)}:duration=longest[out]"
-        cmd.extend(["-filter_complex", filter_complex])
-        cmd.extend(["-map", "[out]"])
-
-    cmd.append(output_path)
+    """Mix local audio files, all starting at 0, in one ffmpeg filter graph"""
 
     print(f"[AUDIO MIX] Mixing {len(audio_paths)} audio files")
-    result = subprocess.run(cmd, capture_output=True, text=True)
-
-    if result.returncode != 0:
-        raise Exception(f"FFmpeg audio mixing failed: {result.stderr}")
+    await AudioMixer().mix(
+        [MixTrack(source=path, role="sfx", start_seconds=0.0) for path in audio_paths],
+        output_path,
+    )
 
 
 async def merge_audio_with_video_ffmpeg(
@@ -773,7 +712,7 @@ async def merge_audio_with_video_ffmpeg(
     ]
 
     print(f"[VIDEO AUDIO MERGE] Merging audio with video")
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = traced_run(cmd, capture_output=True, text=True)
 
     if result.returncode != 0:
         raise Exception(f"FFmpeg video/audio merge failed: {result.stderr}")
@@ -825,7 +764,7 @@ async def generate_scene_transition(
             "2",
             first_frame_path,
         ]
-        result = subprocess.run(cmd_extract, capture_output=True, text=True)
+        result = traced_run(cmd_extract, capture_output=True, text=True)
         if result.returncode != 0:
             print(f"[TRANSITION] Failed to extract first frame: {result.stderr}")
             return None
@@ -865,7 +804,7 @@ async def generate_scene_transition(
             transition_output,
         ]
 
-        result = subprocess.run(cmd_transition, capture_output=True, text=True)
+        result = traced_run(cmd_transition, capture_output=True, text=True)
         if result.returncode != 0:
             print(f"[TRANSITION] Failed to create transition: {result.stderr}")
             return None
@@ -912,7 +851,7 @@ async def apply_video_filters(
         ]
 
         print(f"[FILTERS] Applying filters: {filter_string}")
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = traced_run(cmd, capture_output=True, text=True)
 
         if result.returncode != 0:
             print(f"[FILTERS] Failed to apply filters: {result.stderr}")
@@ -1010,7 +949,7 @@ async def reencode_video(
 
         start_time = time.time()
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = traced_run(cmd, capture_output=True, text=True)
 
         processing_time = time.time() - start_time
 
@@ -1110,7 +1049,7 @@ async def concatenate_final_video(
 
             start_time = time.time()
 
-            result = subprocess.run(cmd_concat, capture_output=True, text=True)
+            result = traced_run(cmd_concat, capture_output=True, text=True)
 
             if result.returncode != 0:
                 raise Exception(f"FFmpeg concatenation failed: {result.stderr}")
@@ -1270,7 +1209,7 @@ def prepare_download_metadata(
 )
 def process_manual_merge(self, merge_id: str, user_id: str):
     """Process a manual merge operation with user-controlled parameters"""
-    return asyncio.run(async_process_manual_merge(merge_id, user_id))
+    return run_async(async_process_manual_merge(merge_id, user_id))
 
 
 async def async_process_manual_merge(merge_id: str, user_id: str):
@@ -1397,6 +1336,7 @@ async def async_process_manual_merge(merge_id: str, user_id: str):
         except Exception as e:
             error_message = str(e)
             print(f"[MANUAL MERGE ERROR] {merge_id}: {error_message}")
+            discard_merge_progress(merge_id)
 
             # Update status to failed
             try:
@@ -1645,7 +1585,7 @@ async def apply_input_processing(
 
     cmd.append(output_path)
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = traced_run(cmd, capture_output=True, text=True)
     if result.returncode != 0:
         # If processing fails, return original
         print(f"[INPUT PROCESSING] Failed to process {input_path}: {result.stderr}")
@@ -1708,7 +1648,7 @@ async def concatenate_manual_inputs(
         raw_concat,
     ]
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = traced_run(cmd, capture_output=True, text=True)
     if result.returncode != 0:
         raise Exception(f"Concatenation failed: {result.stderr}")
 
@@ -1740,7 +1680,7 @@ def process_merge_preview(self, preview_id: str, user_id: str):
         }
 
         # Process the preview
-        result = asyncio.run(perform_merge_preview(preview_data, user_id))
+        result = run_async(perform_merge_preview(preview_data, user_id))
 
         print(f"[MERGE PREVIEW] Completed preview {preview_id}")
 
@@ -1872,7 +1812,7 @@ async def extract_preview_segment(
         output_path,
     ]
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = traced_run(cmd, capture_output=True, text=True)
     if result.returncode != 0:
         print(f"[PREVIEW SEGMENT] Failed to extract segment: {result.stderr}")
         return None
@@ -1910,7 +1850,7 @@ async def concatenate_preview_segments(
         output_path,
     ]
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    result = traced_run(cmd, capture_output=True, text=True)
     if result.returncode != 0:
         raise Exception(f"Preview concatenation failed: {result.stderr}")
 
@@ -1919,13 +1859,9 @@ async def concatenate_preview_segments(
 
 async def download_file(url: str, local_path: str):
     """Download file from URL to local path"""
+    from app.core.services.ffmpeg_utils import download_to_file
 
-    response = requests.get(url, stream=True)
-    response.raise_for_status()
-
-    with open(local_path, "wb") as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            f.write(chunk)
+    await asyncio.to_thread(download_to_file, url, local_path)
 
 
 @celery_app.task(
@@ -1935,7 +1871,7 @@ async def download_file(url: str, local_path: str):
 )
 def generate_merge_preview(self, merge_id: str):
     """Generate a preview clip (first 10 seconds) from the merged video"""
-    return asyncio.run(async_generate_merge_preview(merge_id))
+    return run_async(async_generate_merge_preview(merge_id))
 
 
 async def async_generate_merge_preview(merge_id: str):
@@ -2051,7 +1987,7 @@ async def generate_video_preview_clip(video_url: str, merge_id: str) -> Optional
             ]
 
             print(f"[PREVIEW CLIP] Generating 10-second preview from {video_url}")
-            result = subprocess.run(cmd, capture_output=True, text=True, cwd=temp_dir)
+            result = traced_run(cmd, capture_output=True, text=True, cwd=temp_dir)
 
             if result.returncode != 0:
                 print(f"[PREVIEW CLIP ERROR] FFmpeg failed: {result.stderr}")
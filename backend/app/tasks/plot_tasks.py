@@ -2,11 +2,11 @@
 Deferred Celery task for plot generation after project upload completes (KAN-105/KAN-106).
 """
 
-import asyncio
 import logging
 import uuid
 
 from app.tasks.celery_app import celery_app
+from app.core.async_runtime import run_async
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +25,7 @@ def generate_plot_task(
     project_type: str,
 ):
     """Deferred plot generation for a project after upload completes."""
-    return asyncio.run(
+    return run_async(
         _async_generate_plot(self, project_id, book_id, user_id, input_prompt, project_type)
     )
 
@@ -0,0 +1,37 @@
+"""
+Periodic Celery tasks for pipeline tracing maintenance.
+"""
+
+import logging
+
+from app.tasks.celery_app import celery_app
+from app.core.async_runtime import run_async
+from app.core.config import settings
+from app.core.database import async_session
+from app.tracing.service import purge_old_spans
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(bind=True, name="app.tasks.tracing_tasks.purge_old_pipeline_spans")
+def purge_old_pipeline_spans(self):
+    """
+    Drop pipeline_spans rows older than TRACING_RETENTION_DAYS.
+
+    Every traced task writes its spans to the table, so without a retention
+    window it grows without bound. Runs hourly via Celery beat.
+    """
+    return run_async(_async_purge_old_pipeline_spans())
+
+
+async def _async_purge_old_pipeline_spans():
+    async with async_session() as session:
+        try:
+            purged = await purge_old_spans(session, settings.TRACING_RETENTION_DAYS)
+            if purged:
+                logger.info("[TRACING] Purged %d pipeline spans", purged)
+            return {"purged": purged}
+        except Exception as e:
+            logger.error("[TRACING] Error purging pipeline spans: %s", e)
+            await session.rollback()
+            raise
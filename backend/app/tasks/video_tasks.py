@@ -1,4 +1,5 @@
-from app.tasks.celery_app import celery_app
+from app.tasks.celery_app import celery_app, priority_for_tier, request_priority
+from app.core.async_runtime import run_async
 import asyncio
 from typing import Dict, Any, List, Optional, Tuple
 from celery.utils.log import get_task_logger
@@ -11,10 +12,11 @@ from sqlalchemy import bindparam, text
 from app.videos.models import VideoGeneration, VideoSegment
 from app.subscriptions.models import UserSubscription
 from app.core.model_config import get_model_config, ModelConfig
+from app.media_cache.service import MediaCacheService, build_media_cache_key
+from app.tracing.tracer import span_each, traced_run
 import json
 import subprocess
 import os
-import requests
 import tempfile
 import uuid
 import ipaddress
@@ -24,6 +26,7 @@ from app.core.services.file import FileService
 from app.core.config import settings
 
 from app.core.services.modelslab_v7_video import ModelsLabV7VideoService
+from app.core.services.media_repository import MediaBatchWriter
 from app.videos.association_integrity import (
     extract_shot_selections,
     dedupe_scene_videos,
@@ -1048,7 +1051,7 @@ async def update_pipeline_step(
 @celery_app.task(bind=True)
 def generate_all_videos_for_generation(self, video_generation_id: str):
     """Main task to generate all videos for a video generation with automatic retry"""
-    return asyncio.run(async_generate_all_videos_for_generation(video_generation_id))
+    return run_async(async_generate_all_videos_for_generation(video_generation_id))
 
 
 async def async_generate_all_videos_for_generation(video_generation_id: str):
@@ -1266,6 +1269,7 @@ async def async_generate_all_videos_for_generation(video_generation_id: str):
                 session=session,
                 scene_numbers=target_scene_numbers,
                 selected_audio_ids=selected_audio_ids,
+                regenerate=bool(task_meta.get("regenerate")),
             )
 
             # Compile results
@@ -1280,6 +1284,12 @@ async def async_generate_all_videos_for_generation(video_generation_id: str):
             total_duration = sum(
                 [v.get("duration", 0) for v in video_results if v is not None]
             )
+            # Clips served from the media cache cost no generation
+            billed_duration = sum(
+                v.get("duration", 0)
+                for v in video_results
+                if v is not None and not v.get("cached")
+            )
 
             # Get the first successful video URL for the video_url column
             first_video_url = None
@@ -1347,8 +1357,8 @@ async def async_generate_all_videos_for_generation(video_generation_id: str):
                     from app.credits.constants import OperationType
                     credit_svc = CreditService(session)
                     actual_cost = (
-                        credits_for_video_duration(float(total_duration))
-                        if successful_videos > 0 and total_duration > 0
+                        credits_for_video_duration(float(billed_duration))
+                        if successful_videos > 0 and billed_duration > 0
                         else 0
                     )
                     confirmed = await credit_svc.confirm_deduction(
@@ -1494,6 +1504,7 @@ async def async_generate_all_videos_for_generation(video_generation_id: str):
                     automatic_video_retry_task.apply_async(
                         args=[video_generation_id],
                         countdown=30,  # 30 seconds initial delay
+                        priority=priority_for_tier(locals().get("user_tier")),
                     )
 
                     print(
@@ -1562,12 +1573,10 @@ async def pad_audio_to_min_duration(
             output_path = temp_output.name
 
         try:
-            # Download audio
-            response = requests.get(audio_url, stream=True)
-            response.raise_for_status()
-            with open(input_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            # Download audio off the worker's shared event loop
+            from app.core.services.ffmpeg_utils import download_to_file
+
+            await asyncio.to_thread(download_to_file, audio_url, input_path)
 
             # Pad with silence using ffmpeg
             # -af apad: add silence indefinitely
@@ -1588,8 +1597,12 @@ async def pad_audio_to_min_duration(
                 output_path,
             ]
 
-            process = subprocess.run(
-                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
+            process = await asyncio.to_thread(
+                traced_run,
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=True,
             )
 
             # Upload padded audio
@@ -1629,8 +1642,13 @@ async def generate_scene_videos(
     session: AsyncSession = None,
     scene_numbers: List[int] = None,
     selected_audio_ids: List[str] = None,
+    regenerate: bool = False,
 ) -> List[Dict[str, Any]]:
-    """Generate videos for each scene using V7 Veo 2 image-to-video with sequential processing and key scene shots"""
+    """Generate videos for each scene using V7 Veo 2 image-to-video with sequential processing and key scene shots
+
+    regenerate (a user-requested retry) skips the media cache lookup; clips
+    served from the cache are marked "cached" and not charged.
+    """
 
     print(
         f"[SCENE VIDEOS V7] Generating scene videos sequentially with key scene shots..."
@@ -1664,7 +1682,9 @@ async def generate_scene_videos(
             script_parser = ScriptParser()
             characters = script_data.get("characters", [])
             parsed_components = script_parser.parse_script_for_video_prompt(
-                script=script_data["script"], characters=characters
+                script=script_data["script"],
+                characters=characters,
+                stored_ast=script_data.get("script_ast"),
             )
             print(f"[SCENE VIDEOS V7] ✅ Parsed script for enhanced prompt generation:")
             print(
@@ -1697,561 +1717,552 @@ async def generate_scene_videos(
 
     db_user_id = _safe_uuid_string(user_id)
 
-    for i, scene_description in enumerate(scene_descriptions):
-        scene_num = i + 1
-        scene_id = f"scene_{scene_num}"
-        provider_attempt = None
-        provider_attempt_persisted = False
-        try:
-            scene_num, scene_id = resolve_scene_identity(i, scene_numbers)
-            scene_image = scene_images[i] if i < len(scene_images) else None
-            target_image_url = (
-                scene_image.get("image_url")
-                if scene_image and scene_image.get("image_url")
-                else None
-            )
-            target_shot_index = scene_image.get("shot_index", 0) if scene_image else 0
+    # Rows are written in batches and at the end of the stage
+    async with MediaBatchWriter(session) as media:
+        for i, scene_description in enumerate(span_each(scene_descriptions, "scene")):
+            scene_num = i + 1
+            scene_id = f"scene_{scene_num}"
+            provider_attempt = None
+            provider_attempt_persisted = False
+            try:
+                scene_num, scene_id = resolve_scene_identity(i, scene_numbers)
+                scene_image = scene_images[i] if i < len(scene_images) else None
+                target_image_url = (
+                    scene_image.get("image_url")
+                    if scene_image and scene_image.get("image_url")
+                    else None
+                )
+                target_shot_index = scene_image.get("shot_index", 0) if scene_image else 0
 
-            print(
-                f"[SCENE VIDEOS V7] Processing {scene_id} ({i+1}/{len(scene_descriptions)})"
-            )
+                print(
+                    f"[SCENE VIDEOS V7] Processing {scene_id} ({i+1}/{len(scene_descriptions)})"
+                )
 
-            if previous_scene_number != scene_num:
-                previous_shot_frame_url = None
-                previous_shot_frame_provider_url = None
-                previous_shot_frame_metadata = None
-                previous_scene_number = scene_num
-
-            # Determine the starting image for this scene/shot.
-            starting_image_url = None
-            dependency_metadata = None
-
-            if int(target_shot_index or 0) == 0:
-                # Key/base scene: always use its own scene image/reference. Do
-                # not inherit frames from any previous scene.
-                if not scene_image or not scene_image.get("image_url"):
-                    raise Exception(f"No valid key scene image found for {scene_id}")
-                starting_image_url = scene_image["image_url"]
-                print(f"[SCENE VIDEOS V7] Using original key scene image for {scene_id}")
-            else:
-                # Suggested shot: enforced dependency on previous shot video's
-                # extracted/upscaled frame. Do not silently fall back to a base
-                # image if the dependency is missing.
-                dependency_metadata = previous_shot_frame_metadata or {}
-                if not previous_shot_frame_url:
-                    readiness_error = dependency_metadata.get("provider_readiness_error")
-                    if readiness_error:
+                if previous_scene_number != scene_num:
+                    previous_shot_frame_url = None
+                    previous_shot_frame_provider_url = None
+                    previous_shot_frame_metadata = None
+                    previous_scene_number = scene_num
+
+                # Determine the starting image for this scene/shot.
+                starting_image_url = None
+                dependency_metadata = None
+
+                if int(target_shot_index or 0) == 0:
+                    # Key/base scene: always use its own scene image/reference. Do
+                    # not inherit frames from any previous scene.
+                    if not scene_image or not scene_image.get("image_url"):
+                        raise Exception(f"No valid key scene image found for {scene_id}")
+                    starting_image_url = scene_image["image_url"]
+                    print(f"[SCENE VIDEOS V7] Using original key scene image for {scene_id}")
+                else:
+                    # Suggested shot: enforced dependency on previous shot video's
+                    # extracted/upscaled frame. Do not silently fall back to a base
+                    # image if the dependency is missing.
+                    dependency_metadata = previous_shot_frame_metadata or {}
+                    if not previous_shot_frame_url:
+                        readiness_error = dependency_metadata.get("provider_readiness_error")
+                        if readiness_error:
+                            raise Exception(
+                                f"continuity-frame provider-readiness error for {scene_id} shot {target_shot_index}: {readiness_error}"
+                            )
                         raise Exception(
+                            f"Missing previous shot frame dependency for {scene_id} shot {target_shot_index}"
+                        )
+                    if not previous_shot_frame_provider_url:
+                        readiness_error = dependency_metadata.get("provider_readiness_error") or "no provider-readable continuity frame URL"
+                        readiness_message = (
                             f"continuity-frame provider-readiness error for {scene_id} shot {target_shot_index}: {readiness_error}"
                         )
-                    raise Exception(
-                        f"Missing previous shot frame dependency for {scene_id} shot {target_shot_index}"
-                    )
-                if not previous_shot_frame_provider_url:
-                    readiness_error = dependency_metadata.get("provider_readiness_error") or "no provider-readable continuity frame URL"
-                    readiness_message = (
-                        f"continuity-frame provider-readiness error for {scene_id} shot {target_shot_index}: {readiness_error}"
-                    )
-                    provider_attempt = _build_provider_attempt_diagnostic(
-                        scene_id=scene_id,
-                        scene_number=scene_num,
-                        original_image_url=previous_shot_frame_url,
-                        provider_image_url=None,
-                        original_audio_url=None,
-                        provider_audio_url=None,
-                        model=primary_model_id,
-                        status="configuration_error",
-                        exception=readiness_message,
-                        canonical_image_url=previous_shot_frame_url,
-                        canonical_audio_url=None,
-                    )
-                    raise Exception(readiness_message)
-                starting_image_url = previous_shot_frame_url
-                print(
-                    f"[SCENE VIDEOS V7] Using previous shot frame for {scene_id} shot {target_shot_index}: "
-                    f"canonical={starting_image_url}, provider={previous_shot_frame_provider_url}"
-                )
-
-            # Determine model ID before audio check (needed for duration limits)
-            current_model_id = primary_model_id
-            min_audio = modelslab_service.get_min_audio_duration(current_model_id)
-
-            # Find audio for lip sync / audio-reactive
-            scene_audio = find_scene_audio(
-                scene_id, audio_files, selected_audio_ids=selected_audio_ids
-            )
-            init_audio_url = None
-
-            if scene_audio:
-                audio_duration = scene_audio.get("duration", 0)
-                max_audio = modelslab_service.get_max_audio_duration(current_model_id)
-
-                # KAN-166: Fix duration validation — audio_duration <= 0 means unknown duration
-                # Previously, `audio_duration > 0` guard caused audio with unknown duration to
-                # bypass min/max validation entirely, passing 0s audio to the video API.
-                if audio_duration <= 0:
-                    audio_url_available = scene_audio.get("audio_url")
-                    if audio_url_available:
-                        # Unknown duration — probe the file to get actual duration
-                        try:
-                            from app.core.services.ffmpeg_utils import probe_audio_duration_from_url
-                            probe_audio_url = normalize_media_url_for_internal_access(scene_audio.get("audio_url"))
-                            probed = await probe_audio_duration_from_url(probe_audio_url)
-                            if probed and probed > 0:
-                                audio_duration = probed
-                                print(f"[SCENE AUDIO] {scene_id}: KAN-166 probed duration={audio_duration}s")
-                        except Exception as probe_err:
-                            print(f"[SCENE AUDIO] {scene_id}: KAN-166 duration probe failed: {probe_err}")
-
-                if max_audio and audio_duration > 0 and audio_duration > max_audio:
-                    print(
-                        f"[SCENE AUDIO] {scene_id}: duration ({audio_duration}s) exceeds max ({max_audio}s). Skipping audio."
-                    )
-                elif min_audio and audio_duration > 0 and audio_duration < min_audio:
+                        provider_attempt = _build_provider_attempt_diagnostic(
+                            scene_id=scene_id,
+                            scene_number=scene_num,
+                            original_image_url=previous_shot_frame_url,
+                            provider_image_url=None,
+                            original_audio_url=None,
+                            provider_audio_url=None,
+                            model=primary_model_id,
+                            status="configuration_error",
+                            exception=readiness_message,
+                            canonical_image_url=previous_shot_frame_url,
+                            canonical_audio_url=None,
+                        )
+                        raise Exception(readiness_message)
+                    starting_image_url = previous_shot_frame_url
                     print(
-                        f"[SCENE AUDIO] {scene_id}: duration ({audio_duration}s) below min ({min_audio}s). Padding with silence..."
+                        f"[SCENE VIDEOS V7] Using previous shot frame for {scene_id} shot {target_shot_index}: "
+                        f"canonical={starting_image_url}, provider={previous_shot_frame_provider_url}"
                     )
 
-                    try:
-                        # Attempt to pad audio
-                        padded_url = await pad_audio_to_min_duration(
-                            normalize_media_url_for_internal_access(scene_audio.get("audio_url")), min_audio, user_id
+                # Determine model ID before audio check (needed for duration limits)
+                current_model_id = primary_model_id
+                min_audio = modelslab_service.get_min_audio_duration(current_model_id)
+
+                # Find audio for lip sync / audio-reactive
+                scene_audio = find_scene_audio(
+                    scene_id, audio_files, selected_audio_ids=selected_audio_ids
+                )
+                init_audio_url = None
+
+                if scene_audio:
+                    audio_duration = scene_audio.get("duration", 0)
+                    max_audio = modelslab_service.get_max_audio_duration(current_model_id)
+
+                    # KAN-166: Fix duration validation — audio_duration <= 0 means unknown duration
+                    # Previously, `audio_duration > 0` guard caused audio with unknown duration to
+                    # bypass min/max validation entirely, passing 0s audio to the video API.
+                    if audio_duration <= 0:
+                        audio_url_available = scene_audio.get("audio_url")
+                        if audio_url_available:
+                            # Unknown duration — probe the file to get actual duration
+                            try:
+                                from app.core.services.ffmpeg_utils import probe_audio_duration_from_url
+                                probe_audio_url = normalize_media_url_for_internal_access(scene_audio.get("audio_url"))
+                                probed = await probe_audio_duration_from_url(probe_audio_url)
+                                if probed and probed > 0:
+                                    audio_duration = probed
+                                    print(f"[SCENE AUDIO] {scene_id}: KAN-166 probed duration={audio_duration}s")
+                            except Exception as probe_err:
+                                print(f"[SCENE AUDIO] {scene_id}: KAN-166 duration probe failed: {probe_err}")
+
+                    if max_audio and audio_duration > 0 and audio_duration > max_audio:
+                        print(
+                            f"[SCENE AUDIO] {scene_id}: duration ({audio_duration}s) exceeds max ({max_audio}s). Skipping audio."
+                        )
+                    elif min_audio and audio_duration > 0 and audio_duration < min_audio:
+                        print(
+                            f"[SCENE AUDIO] {scene_id}: duration ({audio_duration}s) below min ({min_audio}s). Padding with silence..."
                         )
 
-                        if padded_url:
-                            init_audio_url = padded_url
-                            print(
-                                f"[SCENE AUDIO] {scene_id}: Usage padded audio: {padded_url}"
-                            )
-                        else:
-                            print(
-                                f"[SCENE AUDIO] {scene_id}: Failed to pad audio, skipping."
+                        try:
+                            # Attempt to pad audio
+                            padded_url = await pad_audio_to_min_duration(
+                                normalize_media_url_for_internal_access(scene_audio.get("audio_url")), min_audio, user_id
                             )
+
+                            if padded_url:
+                                init_audio_url = padded_url
+                                print(
+                                    f"[SCENE AUDIO] {scene_id}: Usage padded audio: {padded_url}"
+                                )
+                            else:
+                                print(
+                                    f"[SCENE AUDIO] {scene_id}: Failed to pad audio, skipping."
+                                )
+                                init_audio_url = None
+                        except Exception as e:
+                            print(f"[SCENE AUDIO] {scene_id}: Error padding audio: {e}")
                             init_audio_url = None
-                    except Exception as e:
-                        print(f"[SCENE AUDIO] {scene_id}: Error padding audio: {e}")
+                    elif audio_duration <= 0:
+                        # KAN-166: Audio with duration <= 0 (even after probing) is effectively broken
+                        print(
+                            f"[SCENE AUDIO] {scene_id}: duration unknown/unproable ({audio_duration}s). Skipping audio."
+                        )
                         init_audio_url = None
-                elif audio_duration <= 0:
-                    # KAN-166: Audio with duration <= 0 (even after probing) is effectively broken
-                    print(
-                        f"[SCENE AUDIO] {scene_id}: duration unknown/unproable ({audio_duration}s). Skipping audio."
-                    )
-                    init_audio_url = None
+                    else:
+                        init_audio_url = scene_audio.get("audio_url")
+                        print(
+                            f"[SCENE AUDIO] {scene_id}: using audio id={scene_audio.get('id')}, "
+                            f"type={scene_audio.get('audio_type')}, duration={audio_duration}s, "
+                            f"model={current_model_id} (limit={max_audio}s)"
+                        )
                 else:
-                    init_audio_url = scene_audio.get("audio_url")
                     print(
-                        f"[SCENE AUDIO] {scene_id}: using audio id={scene_audio.get('id')}, "
-                        f"type={scene_audio.get('audio_type')}, duration={audio_duration}s, "
-                        f"model={current_model_id} (limit={max_audio}s)"
+                        f"[SCENE AUDIO] {scene_id}: no audio selected, generating without init_audio"
                     )
-            else:
-                print(
-                    f"[SCENE AUDIO] {scene_id}: no audio selected, generating without init_audio"
-                )
-
-            # Decide on Model: Dialogue (Audio) vs Narration (Visual Only)
-            # If we have init_audio, we MIGHT want to use a specific lip-sync capable model if the primary isn't one
-            # But per plan, tiers like Standard+ use Omni/Wan which support it.
-            # Free/Basic might use seedance (no lip sync) or wan2.5 (lip sync).
-
-            logger_msg = f"[SCENE VIDEOS V7] Generating video for {scene_id} using {current_model_id}"
-            if init_audio_url:
-                logger_msg += " with Audio Reactive/Lip Sync"
-            print(logger_msg)
-
-            # Build enhanced video prompt using image generation prompt if available
-            scene_image_for_prompt = None
-            if i < len(scene_images) and scene_images[i] is not None:
-                scene_image_for_prompt = scene_images[i]
-
-            image_prompt = (
-                scene_image_for_prompt.get("prompt", "")
-                if scene_image_for_prompt
-                else ""
-            )
 
-            if image_prompt and image_prompt.strip():
-                # Combine scene description with image prompt for richer video generation
-                enhanced_prompt = f"{scene_description}. Visual style: {image_prompt}"
-                print(
-                    f"[SCENE VIDEOS V7] Using enhanced prompt with image prompt for {scene_id}"
-                )
-            else:
-                enhanced_prompt = scene_description
-                print(
-                    f"[SCENE VIDEOS V7] No image prompt available, using scene description for {scene_id}"
+                # Decide on Model: Dialogue (Audio) vs Narration (Visual Only)
+                # If we have init_audio, we MIGHT want to use a specific lip-sync capable model if the primary isn't one
+                # But per plan, tiers like Standard+ use Omni/Wan which support it.
+                # Free/Basic might use seedance (no lip sync) or wan2.5 (lip sync).
+
+                logger_msg = f"[SCENE VIDEOS V7] Generating video for {scene_id} using {current_model_id}"
+                if init_audio_url:
+                    logger_msg += " with Audio Reactive/Lip Sync"
+                print(logger_msg)
+
+                # Build enhanced video prompt using image generation prompt if available
+                scene_image_for_prompt = None
+                if i < len(scene_images) and scene_images[i] is not None:
+                    scene_image_for_prompt = scene_images[i]
+
+                image_prompt = (
+                    scene_image_for_prompt.get("prompt", "")
+                    if scene_image_for_prompt
+                    else ""
                 )
 
-            # Normalize media URLs at the provider boundary. Stored MinIO URLs can
-            # be localhost/docker-internal URLs; ModelsLab needs externally
-            # reachable URLs, while earlier probes/downloads use internal URLs.
-            try:
-                if int(target_shot_index or 0) > 0:
-                    provider_source_image_url = previous_shot_frame_provider_url
-                    if not provider_source_image_url:
-                        raise ProviderMediaUrlConfigurationError(
-                            f"continuity-frame provider-readiness error for {scene_id} shot {target_shot_index}: "
-                            "no provider-readable continuity frame URL"
-                        )
+                if image_prompt and image_prompt.strip():
+                    # Combine scene description with image prompt for richer video generation
+                    enhanced_prompt = f"{scene_description}. Visual style: {image_prompt}"
+                    print(
+                        f"[SCENE VIDEOS V7] Using enhanced prompt with image prompt for {scene_id}"
+                    )
                 else:
-                    provider_source_image_url = select_provider_media_source(
-                        starting_image_url,
-                        scene_image_for_prompt or scene_image,
+                    enhanced_prompt = scene_description
+                    print(
+                        f"[SCENE VIDEOS V7] No image prompt available, using scene description for {scene_id}"
                     )
-                provider_source_audio_url = select_provider_media_source(
-                    init_audio_url,
-                    scene_audio,
-                )
-                provider_image_url = normalize_media_url_for_provider(provider_source_image_url)
-                provider_init_audio_url = (
-                    normalize_media_url_for_provider(provider_source_audio_url)
-                    if provider_source_audio_url
-                    else None
-                )
-            except ProviderMediaUrlConfigurationError as media_config_error:
+
+                # Normalize media URLs at the provider boundary. Stored MinIO URLs can
+                # be localhost/docker-internal URLs; ModelsLab needs externally
+                # reachable URLs, while earlier probes/downloads use internal URLs.
+                try:
+                    if int(target_shot_index or 0) > 0:
+                        provider_source_image_url = previous_shot_frame_provider_url
+                        if not provider_source_image_url:
+                            raise ProviderMediaUrlConfigurationError(
+                                f"continuity-frame provider-readiness error for {scene_id} shot {target_shot_index}: "
+                                "no provider-readable continuity frame URL"
+                            )
+                    else:
+                        provider_source_image_url = select_provider_media_source(
+                            starting_image_url,
+                            scene_image_for_prompt or scene_image,
+                        )
+                    provider_source_audio_url = select_provider_media_source(
+                        init_audio_url,
+                        scene_audio,
+                    )
+                    provider_image_url = normalize_media_url_for_provider(provider_source_image_url)
+                    provider_init_audio_url = (
+                        normalize_media_url_for_provider(provider_source_audio_url)
+                        if provider_source_audio_url
+                        else None
+                    )
+                except ProviderMediaUrlConfigurationError as media_config_error:
+                    provider_attempt = _build_provider_attempt_diagnostic(
+                        scene_id=scene_id,
+                        scene_number=scene_num,
+                        original_image_url=provider_source_image_url,
+                        provider_image_url=None,
+                        original_audio_url=provider_source_audio_url,
+                        provider_audio_url=None,
+                        model=current_model_id,
+                        status="configuration_error",
+                        exception=str(media_config_error),
+                        canonical_image_url=starting_image_url,
+                        canonical_audio_url=init_audio_url,
+                    )
+                    raise
+
+                log_provider_media_url_normalization("image_url", provider_source_image_url, provider_image_url)
+                log_provider_media_url_normalization("init_audio", provider_source_audio_url, provider_init_audio_url)
+
                 provider_attempt = _build_provider_attempt_diagnostic(
                     scene_id=scene_id,
                     scene_number=scene_num,
                     original_image_url=provider_source_image_url,
-                    provider_image_url=None,
+                    provider_image_url=provider_image_url,
                     original_audio_url=provider_source_audio_url,
-                    provider_audio_url=None,
+                    provider_audio_url=provider_init_audio_url,
                     model=current_model_id,
-                    status="configuration_error",
-                    exception=str(media_config_error),
+                    status="attempting",
                     canonical_image_url=starting_image_url,
                     canonical_audio_url=init_audio_url,
                 )
-                raise
-
-            log_provider_media_url_normalization("image_url", provider_source_image_url, provider_image_url)
-            log_provider_media_url_normalization("init_audio", provider_source_audio_url, provider_init_audio_url)
-
-            provider_attempt = _build_provider_attempt_diagnostic(
-                scene_id=scene_id,
-                scene_number=scene_num,
-                original_image_url=provider_source_image_url,
-                provider_image_url=provider_image_url,
-                original_audio_url=provider_source_audio_url,
-                provider_audio_url=provider_init_audio_url,
-                model=current_model_id,
-                status="attempting",
-                canonical_image_url=starting_image_url,
-                canonical_audio_url=init_audio_url,
-            )
-            logger.warning(
-                "[SCENE VIDEOS V7] Provider attempt scene_id=%s scene_number=%s model=%s image=%s audio=%s",
-                scene_id,
-                scene_num,
-                current_model_id,
-                provider_attempt.get("provider_image_url"),
-                provider_attempt.get("provider_audio_url"),
-            )
+                logger.warning(
+                    "[SCENE VIDEOS V7] Provider attempt scene_id=%s scene_number=%s model=%s image=%s audio=%s",
+                    scene_id,
+                    scene_num,
+                    current_model_id,
+                    provider_attempt.get("provider_image_url"),
+                    provider_attempt.get("provider_audio_url"),
+                )
 
-            # ✅ Generate video using ModelsLab Service
-            provider_result = await modelslab_service.generate_image_to_video(
-                image_url=provider_image_url,
-                prompt=enhanced_prompt,
-                model_id=current_model_id,
-                negative_prompt="",
-                init_audio=provider_init_audio_url if provider_init_audio_url else None,
-            )
+                # Identical regenerations (same start frame, audio, prompt and model)
+                # reuse the clip already persisted to our storage
+                video_cache_key = build_media_cache_key(
+                    media_type="video",
+                    model_id=current_model_id,
+                    prompt=enhanced_prompt,
+                    input_urls=[starting_image_url, init_audio_url],
+                    scope=user_id,
+                )
+                cached_video = None
+                if not regenerate:
+                    async with async_session() as cache_session:
+                        cached_video = await MediaCacheService(cache_session).lookup(video_cache_key)
+
+                if cached_video is not None:
+                    provider_result = {
+                        "status": "success",
+                        "video_url": cached_video.media_url,
+                        "model_used": cached_video.model_id,
+                        "cached": True,
+                    }
+                else:
+                    # ✅ Generate video using ModelsLab Service
+                    provider_result = await modelslab_service.generate_image_to_video(
+                        image_url=provider_image_url,
+                        prompt=enhanced_prompt,
+                        model_id=current_model_id,
+                        negative_prompt="",
+                        init_audio=provider_init_audio_url if provider_init_audio_url else None,
+                    )
 
-            provider_attempt["status"] = provider_result.get("status", "unknown")
-            if provider_result.get("error"):
-                provider_attempt["provider_error"] = str(provider_result.get("error"))[:500]
-                provider_attempt["exception"] = (
-                    f"V7 Video generation failed: {provider_result.get('error', 'Unknown error')}"
-                )[:500]
-            await _persist_provider_attempt_diagnostic(session, video_gen_id, provider_attempt)
-            provider_attempt_persisted = True
-
-            # Process result (Adapt old verify logic to new direct call result)
-            # generate_image_to_video returns dict with status/video_url or error
-
-            if provider_result.get("status") == "success":
-                video_url = provider_result.get("video_url")
-                has_lipsync = bool(init_audio_url)
-
-                # Persist video from CDN to our own S3 storage
-                if video_url:
-                    original_cdn_url = video_url
-                    try:
-                        from app.core.services.storage import (
-                            get_storage_service,
-                            S3StorageService,
-                        )
-                        import uuid as _uuid_mod
-
-                        storage = get_storage_service()
-                        s3_path = S3StorageService.build_media_path(
-                            user_id=str(user_id) if user_id else "system",
-                            media_type="video",
-                            record_id=str(_uuid_mod.uuid4()),
-                            extension="mp4",
-                        )
-                        video_url = await storage.persist_from_url(
-                            video_url,
-                            s3_path,
-                            content_type="video/mp4",
-                            timeout_seconds=300,
-                        )
-                        logger.info(f"[VideoTask] Persisted video to S3: {s3_path}")
-                    except Exception as persist_error:
-                        logger.error(
-                            f"[VideoTask] Failed to persist video to S3: {persist_error}"
-                        )
-                        raise Exception(
-                            f"Video generated but failed to persist to storage: {persist_error}"
-                        )
+                provider_attempt["status"] = provider_result.get("status", "unknown")
+                if provider_result.get("error"):
+                    provider_attempt["provider_error"] = str(provider_result.get("error"))[:500]
+                    provider_attempt["exception"] = (
+                        f"V7 Video generation failed: {provider_result.get('error', 'Unknown error')}"
+                    )[:500]
+                await _persist_provider_attempt_diagnostic(session, video_gen_id, provider_attempt)
+                provider_attempt_persisted = True
 
-                if video_url:
-                    # Extract/upscale only when the immediately following item is
-                    # another suggested shot in this same scene. Missing extraction
-                    # then blocks that shot instead of falling back silently.
-                    key_scene_shot_url = None
-                    upscaled_key_scene_shot_url = None
-                    frame_metadata = None
-                    next_scene_num = None
-                    next_shot_index = 0
-                    if i + 1 < len(scene_descriptions):
-                        next_scene_num, _next_scene_id = resolve_scene_identity(i + 1, scene_numbers)
-                        next_scene_image = scene_images[i + 1] if i + 1 < len(scene_images) else None
-                        next_shot_index = next_scene_image.get("shot_index", 0) if next_scene_image else 0
-
-                    should_prepare_continuity = (
-                        next_scene_num == scene_num and int(next_shot_index or 0) > 0
-                    )
+                # Process result (Adapt old verify logic to new direct call result)
+                # generate_image_to_video returns dict with status/video_url or error
+
+                if provider_result.get("status") == "success":
+                    video_url = provider_result.get("video_url")
+                    has_lipsync = bool(init_audio_url)
 
-                    if should_prepare_continuity:
-                        frame_metadata = {
-                            "source_video_url": video_url,
-                            "scene_number": scene_num,
-                            "shot_index": target_shot_index,
-                            "next_scene_number": next_scene_num,
-                            "next_shot_index": next_shot_index,
-                            # Canonical storage/internal URLs retained for UI/diagnostics.
-                            "extracted_frame_url": None,
-                            "upscaled_frame_url": None,
-                            "continuity_frame_url": None,
-                            # Provider-safe URLs only; provider calls must use these fields.
-                            "provider_extracted_frame_url": None,
-                            "provider_upscaled_frame_url": None,
-                            "continuity_frame_provider_url": None,
-                            "upscale_service": "modelslab",
-                        }
+                    # Persist video from CDN to our own S3 storage
+                    if video_url and cached_video is not None:
+                        original_cdn_url = (cached_video.meta or {}).get("provider_video_url") or video_url
+                    elif video_url:
+                        original_cdn_url = video_url
                         try:
-                            key_scene_shot_url = await extract_last_frame(video_url, user_id)
-                            frame_metadata["extracted_frame_url"] = key_scene_shot_url
-                            frame_metadata["continuity_frame_url"] = key_scene_shot_url
+                            from app.core.services.storage import (
+                                get_storage_service,
+                                S3StorageService,
+                            )
+                            import uuid as _uuid_mod
+
+                            storage = get_storage_service()
+                            s3_path = S3StorageService.build_media_path(
+                                user_id=str(user_id) if user_id else "system",
+                                media_type="video",
+                                record_id=str(_uuid_mod.uuid4()),
+                                extension="mp4",
+                            )
+                            video_url = await storage.persist_from_url(
+                                video_url,
+                                s3_path,
+                                content_type="video/mp4",
+                                timeout_seconds=300,
+                            )
+                            logger.info(f"[VideoTask] Persisted video to S3: {s3_path}")
+                        except Exception as persist_error:
+                            logger.error(
+                                f"[VideoTask] Failed to persist video to S3: {persist_error}"
+                            )
+                            raise Exception(
+                                f"Video generated but failed to persist to storage: {persist_error}"
+                            )
 
-                            if not key_scene_shot_url:
-                                frame_metadata["error"] = "last_frame_extraction_failed"
-                                previous_shot_frame_url = None
-                                previous_shot_frame_provider_url = None
-                                previous_shot_frame_metadata = frame_metadata
-                                print(f"[SCENE VIDEOS V7] ⚠️ Failed to extract shot frame for {scene_id}")
-                            else:
-                                try:
-                                    persisted_provider_frame_url = await persist_continuity_frame_for_provider(
-                                        key_scene_shot_url,
-                                        user_id,
-                                        label=f"scene-{scene_num}-shot-{target_shot_index}-extracted",
-                                    )
-                                    if persisted_provider_frame_url:
-                                        frame_metadata["provider_persisted_extracted_frame_url"] = persisted_provider_frame_url
-                                    provider_extracted_frame_url = persisted_provider_frame_url or normalize_media_url_for_provider(key_scene_shot_url)
-                                    frame_metadata["provider_extracted_frame_url"] = provider_extracted_frame_url
-                                except ProviderMediaUrlConfigurationError as provider_frame_error:
-                                    frame_metadata["provider_readiness_error"] = (
-                                        f"continuity-frame provider-readiness error: {provider_frame_error}"
-                                    )[:500]
-                                    previous_shot_frame_url = key_scene_shot_url
+                        async with async_session() as cache_session:
+                            await MediaCacheService(cache_session).store(
+                                video_cache_key,
+                                media_type="video",
+                                media_url=video_url,
+                                model_id=current_model_id,
+                                user_id=db_user_id,
+                                meta={"provider_video_url": original_cdn_url},
+                            )
+
+                    if video_url:
+                        # Extract/upscale only when the immediately following item is
+                        # another suggested shot in this same scene. Missing extraction
+                        # then blocks that shot instead of falling back silently.
+                        key_scene_shot_url = None
+                        upscaled_key_scene_shot_url = None
+                        frame_metadata = None
+                        next_scene_num = None
+                        next_shot_index = 0
+                        if i + 1 < len(scene_descriptions):
+                            next_scene_num, _next_scene_id = resolve_scene_identity(i + 1, scene_numbers)
+                            next_scene_image = scene_images[i + 1] if i + 1 < len(scene_images) else None
+                            next_shot_index = next_scene_image.get("shot_index", 0) if next_scene_image else 0
+
+                        should_prepare_continuity = (
+                            next_scene_num == scene_num and int(next_shot_index or 0) > 0
+                        )
+
+                        if should_prepare_continuity:
+                            frame_metadata = {
+                                "source_video_url": video_url,
+                                "scene_number": scene_num,
+                                "shot_index": target_shot_index,
+                                "next_scene_number": next_scene_num,
+                                "next_shot_index": next_shot_index,
+                                # Canonical storage/internal URLs retained for UI/diagnostics.
+                                "extracted_frame_url": None,
+                                "upscaled_frame_url": None,
+                                "continuity_frame_url": None,
+                                # Provider-safe URLs only; provider calls must use these fields.
+                                "provider_extracted_frame_url": None,
+                                "provider_upscaled_frame_url": None,
+                                "continuity_frame_provider_url": None,
+                                "upscale_service": "modelslab",
+                            }
+                            try:
+                                key_scene_shot_url = await extract_last_frame(video_url, user_id)
+                                frame_metadata["extracted_frame_url"] = key_scene_shot_url
+                                frame_metadata["continuity_frame_url"] = key_scene_shot_url
+
+                                if not key_scene_shot_url:
+                                    frame_metadata["error"] = "last_frame_extraction_failed"
+                                    previous_shot_frame_url = None
                                     previous_shot_frame_provider_url = None
                                     previous_shot_frame_metadata = frame_metadata
-                                    print(
-                                        f"[SCENE VIDEOS V7] ⚠️ Continuity frame not provider-ready for {scene_id}: "
-                                        f"{provider_frame_error}"
-                                    )
+                                    print(f"[SCENE VIDEOS V7] ⚠️ Failed to extract shot frame for {scene_id}")
                                 else:
                                     try:
-                                        upscaled_key_scene_shot_url = await upscale_frame(
-                                            provider_extracted_frame_url, user_tier="BASIC", user_id=user_id
+                                        persisted_provider_frame_url = await persist_continuity_frame_for_provider(
+                                            key_scene_shot_url,
+                                            user_id,
+                                            label=f"scene-{scene_num}-shot-{target_shot_index}-extracted",
                                         )
-                                        frame_metadata["upscaled_frame_url"] = upscaled_key_scene_shot_url
-                                        if upscaled_key_scene_shot_url and _is_provider_unsafe_url(upscaled_key_scene_shot_url):
-                                            persisted_upscaled_frame_url = await persist_continuity_frame_for_provider(
-                                                upscaled_key_scene_shot_url,
-                                                user_id,
-                                                label=f"scene-{scene_num}-shot-{target_shot_index}-upscaled",
+                                        if persisted_provider_frame_url:
+                                            frame_metadata["provider_persisted_extracted_frame_url"] = persisted_provider_frame_url
+                                        provider_extracted_frame_url = persisted_provider_frame_url or normalize_media_url_for_provider(key_scene_shot_url)
+                                        frame_metadata["provider_extracted_frame_url"] = provider_extracted_frame_url
+                                    except ProviderMediaUrlConfigurationError as provider_frame_error:
+                                        frame_metadata["provider_readiness_error"] = (
+                                            f"continuity-frame provider-readiness error: {provider_frame_error}"
+                                        )[:500]
+                                        previous_shot_frame_url = key_scene_shot_url
+                                        previous_shot_frame_provider_url = None
+                                        previous_shot_frame_metadata = frame_metadata
+                                        print(
+                                            f"[SCENE VIDEOS V7] ⚠️ Continuity frame not provider-ready for {scene_id}: "
+                                            f"{provider_frame_error}"
+                                        )
+                                    else:
+                                        try:
+                                            upscaled_key_scene_shot_url = await upscale_frame(
+                                                provider_extracted_frame_url, user_tier="BASIC", user_id=user_id
                                             )
-                                            if persisted_upscaled_frame_url:
-                                                frame_metadata["provider_persisted_upscaled_frame_url"] = persisted_upscaled_frame_url
-                                                frame_metadata["provider_upscaled_frame_url"] = persisted_upscaled_frame_url
+                                            frame_metadata["upscaled_frame_url"] = upscaled_key_scene_shot_url
+                                            if upscaled_key_scene_shot_url and _is_provider_unsafe_url(upscaled_key_scene_shot_url):
+                                                persisted_upscaled_frame_url = await persist_continuity_frame_for_provider(
+                                                    upscaled_key_scene_shot_url,
+                                                    user_id,
+                                                    label=f"scene-{scene_num}-shot-{target_shot_index}-upscaled",
+                                                )
+                                                if persisted_upscaled_frame_url:
+                                                    frame_metadata["provider_persisted_upscaled_frame_url"] = persisted_upscaled_frame_url
+                                                    frame_metadata["provider_upscaled_frame_url"] = persisted_upscaled_frame_url
+                                                else:
+                                                    frame_metadata["provider_upscaled_frame_url"] = normalize_media_url_for_provider(upscaled_key_scene_shot_url)
                                             else:
-                                                frame_metadata["provider_upscaled_frame_url"] = normalize_media_url_for_provider(upscaled_key_scene_shot_url)
-                                        else:
-                                            frame_metadata["provider_upscaled_frame_url"] = upscaled_key_scene_shot_url
-                                    except Exception as upscale_error:
-                                        frame_metadata["upscale_error"] = str(upscale_error)[:500]
-                                        upscaled_key_scene_shot_url = None
-
-                                    previous_shot_frame_url = key_scene_shot_url
-                                    previous_shot_frame_provider_url = frame_metadata.get("provider_upscaled_frame_url") or provider_extracted_frame_url
-                                    frame_metadata["continuity_frame_provider_url"] = previous_shot_frame_provider_url
-                                    previous_shot_frame_metadata = frame_metadata
-                                    print(
-                                        f"[SCENE VIDEOS V7] ✅ Prepared continuity frame for {scene_id}: "
-                                        f"canonical={previous_shot_frame_url}, provider={previous_shot_frame_provider_url}"
-                                    )
-                        except Exception as frame_error:
-                            frame_metadata["error"] = str(frame_error)[:500]
+                                                frame_metadata["provider_upscaled_frame_url"] = upscaled_key_scene_shot_url
+                                        except Exception as upscale_error:
+                                            frame_metadata["upscale_error"] = str(upscale_error)[:500]
+                                            upscaled_key_scene_shot_url = None
+
+                                        previous_shot_frame_url = key_scene_shot_url
+                                        previous_shot_frame_provider_url = frame_metadata.get("provider_upscaled_frame_url") or provider_extracted_frame_url
+                                        frame_metadata["continuity_frame_provider_url"] = previous_shot_frame_provider_url
+                                        previous_shot_frame_metadata = frame_metadata
+                                        print(
+                                            f"[SCENE VIDEOS V7] ✅ Prepared continuity frame for {scene_id}: "
+                                            f"canonical={previous_shot_frame_url}, provider={previous_shot_frame_provider_url}"
+                                        )
+                            except Exception as frame_error:
+                                frame_metadata["error"] = str(frame_error)[:500]
+                                previous_shot_frame_url = None
+                                previous_shot_frame_provider_url = None
+                                previous_shot_frame_metadata = frame_metadata
+                                print(f"[SCENE VIDEOS V7] ⚠️ Error preparing continuity frame for {scene_id}: {frame_error}")
+                        else:
                             previous_shot_frame_url = None
                             previous_shot_frame_provider_url = None
-                            previous_shot_frame_metadata = frame_metadata
-                            print(f"[SCENE VIDEOS V7] ⚠️ Error preparing continuity frame for {scene_id}: {frame_error}")
-                    else:
-                        previous_shot_frame_url = None
-                        previous_shot_frame_provider_url = None
-                        previous_shot_frame_metadata = None
-
-                    # Store in database
-                    try:
-                        insert_query = text(
-                            """
-                            INSERT INTO video_segments (
-                                video_generation_id, user_id, scene_id, scene_number, scene_description,
-                                video_url, status, target_duration,
-                                character_count, dialogue_count, action_count
-                            ) VALUES (
-                                :video_generation_id, :user_id, :scene_id, :scene_number, :scene_description,
-                                :video_url, :status, :target_duration,
-                                :character_count, :dialogue_count, :action_count
-                            ) RETURNING id
-                        """
+                            previous_shot_frame_metadata = None
+
+                        # Store in database (written with the rest of the stage's rows)
+                        video_record_id = str(
+                            await media.add(
+                                VideoSegment(
+                                    video_generation_id=video_gen_id,
+                                    user_id=db_user_id,
+                                    scene_id=scene_id,
+                                    scene_number=scene_num,
+                                    scene_description=scene_description,
+                                    video_url=video_url,
+                                    status="completed",
+                                    target_duration=5.0,
+                                )
+                            )
                         )
 
-                        result = await session.execute(
-                            insert_query,
+                        video_results.append(
                             {
-                                "video_generation_id": video_gen_id,
-                                "user_id": db_user_id,
+                                "id": video_record_id,
                                 "scene_id": scene_id,
                                 "scene_number": scene_num,
-                                "scene_description": scene_description,
+                                "shot_index": target_shot_index,
                                 "video_url": video_url,
-                                "status": "completed",
-                                "target_duration": 5.0,
-                                "character_count": 0,
-                                "dialogue_count": 0,
-                                "action_count": 0,
-                            },
+                                "original_cdn_url": original_cdn_url,
+                                "provider_cdn_url": original_cdn_url,
+                                "key_scene_shot_url": key_scene_shot_url,
+                                "extracted_frame_url": key_scene_shot_url,
+                                "upscaled_frame_url": upscaled_key_scene_shot_url,
+                                "continuity_frame_url": previous_shot_frame_url,
+                                "continuity_frame_provider_url": previous_shot_frame_provider_url,
+                                "frame_dependency": dependency_metadata,
+                                "frame_metadata": frame_metadata,
+                                "duration": 5.0,
+                                "source_image": starting_image_url,
+                                "target_image": target_image_url,
+                                "method": "veo2_image_to_video_sequential",
+                                "model": current_model_id,
+                                "has_lipsync": has_lipsync,
+                                "cached": cached_video is not None,
+                                "audio_id": scene_audio.get("id") if scene_audio else None,
+                                "audio_url": scene_audio.get("audio_url") if scene_audio else None,
+                                "audio_scene_number": scene_audio.get("scene_number") if scene_audio else None,
+                                "audio_duration": audio_duration if scene_audio else None,
+                                "scene_sequence": scene_num,
+                            }
                         )
-                        await session.commit()
-                        video_record_id = result.scalar()
-                        if video_record_id is not None:
-                            video_record_id = str(video_record_id)
-                    except Exception as e:
-                        print(f"[SCENE VIDEOS V7] Error inserting video segment: {e}")
-                        await session.rollback()
-                        video_record_id = None
-
-                    video_results.append(
-                        {
-                            "id": video_record_id,
-                            "scene_id": scene_id,
-                            "scene_number": scene_num,
-                            "shot_index": target_shot_index,
-                            "video_url": video_url,
-                            "original_cdn_url": original_cdn_url,
-                            "provider_cdn_url": original_cdn_url,
-                            "key_scene_shot_url": key_scene_shot_url,
-                            "extracted_frame_url": key_scene_shot_url,
-                            "upscaled_frame_url": upscaled_key_scene_shot_url,
-                            "continuity_frame_url": previous_shot_frame_url,
-                            "continuity_frame_provider_url": previous_shot_frame_provider_url,
-                            "frame_dependency": dependency_metadata,
-                            "frame_metadata": frame_metadata,
-                            "duration": 5.0,
-                            "source_image": starting_image_url,
-                            "target_image": target_image_url,
-                            "method": "veo2_image_to_video_sequential",
-                            "model": current_model_id,
-                            "has_lipsync": has_lipsync,
-                            "audio_id": scene_audio.get("id") if scene_audio else None,
-                            "audio_url": scene_audio.get("audio_url") if scene_audio else None,
-                            "audio_scene_number": scene_audio.get("scene_number") if scene_audio else None,
-                            "audio_duration": audio_duration if scene_audio else None,
-                            "scene_sequence": scene_num,
-                        }
-                    )
 
-                    print(
-                        f"[SCENE VIDEOS V7] ✅ Generated {scene_id} - Lip sync: {has_lipsync}, Key scene shot: {key_scene_shot_url is not None}"
-                    )
+                        print(
+                            f"[SCENE VIDEOS V7] ✅ Generated {scene_id} - Lip sync: {has_lipsync}, Key scene shot: {key_scene_shot_url is not None}"
+                        )
+                    else:
+                        raise Exception("No video URL in V7 response")
                 else:
-                    raise Exception("No video URL in V7 response")
-            else:
-                logger.error(
-                    "[SCENE VIDEOS V7] Provider failed scene_id=%s scene_number=%s model=%s error=%s",
-                    scene_id,
-                    scene_num,
-                    current_model_id,
-                    provider_result.get("error", "Unknown error"),
-                )
-                raise Exception(
-                    f"V7 Video generation failed: {provider_result.get('error', 'Unknown error')}"
-                )
+                    logger.error(
+                        "[SCENE VIDEOS V7] Provider failed scene_id=%s scene_number=%s model=%s error=%s",
+                        scene_id,
+                        scene_num,
+                        current_model_id,
+                        provider_result.get("error", "Unknown error"),
+                    )
+                    raise Exception(
+                        f"V7 Video generation failed: {provider_result.get('error', 'Unknown error')}"
+                    )
 
-        except Exception as e:
-            if provider_attempt and not provider_attempt_persisted:
-                provider_attempt["status"] = provider_attempt.get("status") or "exception"
-                provider_attempt["exception"] = str(e)[:500]
-                logger.error(
-                    "[SCENE VIDEOS V7] Provider/scene exception scene_id=%s scene_number=%s model=%s error=%s",
-                    scene_id,
-                    scene_num,
-                    provider_attempt.get("model"),
-                    str(e),
-                )
-                await _persist_provider_attempt_diagnostic(session, video_gen_id, provider_attempt)
-            print(f"[SCENE VIDEOS V7] ❌ Failed {scene_id}: {str(e)}")
+            except Exception as e:
+                if provider_attempt and not provider_attempt_persisted:
+                    provider_attempt["status"] = provider_attempt.get("status") or "exception"
+                    provider_attempt["exception"] = str(e)[:500]
+                    logger.error(
+                        "[SCENE VIDEOS V7] Provider/scene exception scene_id=%s scene_number=%s model=%s error=%s",
+                        scene_id,
+                        scene_num,
+                        provider_attempt.get("model"),
+                        str(e),
+                    )
+                    await _persist_provider_attempt_diagnostic(session, video_gen_id, provider_attempt)
+                print(f"[SCENE VIDEOS V7] ❌ Failed {scene_id}: {str(e)}")
 
-            # Store failed record
+                # Store failed record
 
-            try:
-                fail_insert_query = text(
-                    """
-                    INSERT INTO video_segments (
-                        video_generation_id, user_id, scene_id, scene_number, scene_description,
-                        status, character_count, dialogue_count, action_count
-                    ) VALUES (
-                        :video_generation_id, :user_id, :scene_id, :scene_number, :scene_description,
-                        :status, :character_count, :dialogue_count, :action_count
+                await media.add(
+                    VideoSegment(
+                        video_generation_id=video_gen_id,
+                        user_id=db_user_id,
+                        scene_id=scene_id,
+                        scene_number=scene_num,
+                        scene_description=scene_description,
+                        status="failed",
                     )
-                """
                 )
 
-                await session.execute(
-                    fail_insert_query,
-                    {
-                        "video_generation_id": video_gen_id,
-                        "user_id": db_user_id,
-                        "scene_id": scene_id,
-                        "scene_number": scene_num,
-                        "scene_description": scene_description,
-                        "status": "failed",
-                        "character_count": 0,
-                        "dialogue_count": 0,
-                        "action_count": 0,
-                    },
-                )
-                await session.commit()
-            except Exception as insert_err:
-                print(f"[SCENE VIDEOS V7] Error inserting failed record: {insert_err}")
-                await session.rollback()
-
-            video_results.append(None)
+                video_results.append(None)
 
     successful_videos = len([r for r in video_results if r is not None])
     print(
@@ -2263,7 +2274,7 @@ async def generate_scene_videos(
 @celery_app.task(bind=True)
 def retry_video_retrieval_task(self, video_generation_id: str, video_url: str = None):
     """Celery task to retry video retrieval for a failed video generation"""
-    return asyncio.run(async_retry_video_retrieval_task(video_generation_id, video_url))
+    return run_async(async_retry_video_retrieval_task(video_generation_id, video_url))
 
 
 async def async_retry_video_retrieval_task(
@@ -2474,10 +2485,16 @@ async def async_retry_video_retrieval_task(
 @celery_app.task(bind=True)
 def automatic_video_retry_task(self, video_generation_id: str):
     """Automatic retry task with exponential backoff for failed video retrievals"""
-    return asyncio.run(async_automatic_video_retry_task(video_generation_id))
+    return run_async(
+        async_automatic_video_retry_task(
+            video_generation_id, priority=request_priority(self)
+        )
+    )
 
 
-async def async_automatic_video_retry_task(video_generation_id: str):
+async def async_automatic_video_retry_task(
+    video_generation_id: str, priority: Optional[int] = None
+):
     """Async implementation of automatic retry task"""
     async with async_session() as session:
         try:
@@ -2620,6 +2637,7 @@ async def async_automatic_video_retry_task(video_generation_id: str):
                     automatic_video_retry_task.apply_async(
                         args=[video_generation_id],
                         countdown=actual_delay * 2,  # Double the delay for next retry
+                        priority=priority,
                     )
 
                 return {
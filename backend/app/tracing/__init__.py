@@ -0,0 +1 @@
+# Per-generation pipeline tracing (nested timing spans, exporters, waterfall)
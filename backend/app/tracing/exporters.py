@@ -0,0 +1,143 @@
+"""
+Span exporters selected by TRACING_EXPORTER.
+
+    table  - one batched INSERT into pipeline_spans per flush
+    jsonl  - one JSON object per line appended to TRACING_JSONL_PATH
+    none   - spans are dropped (timing still nests, nothing is written)
+
+Exporting runs when a task's root span ends. From a synchronous Celery task
+body the table write blocks on the worker's runtime loop (run_async); from
+code already running on an event loop it is scheduled as a task so the
+caller never waits on it. Both exporters swallow and log their own errors.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.tracing.tracer import Span, suppress_tracing
+
+logger = logging.getLogger(__name__)
+
+
+class SpanExporter:
+    def export(self, spans: List[Span]) -> None:
+        raise NotImplementedError
+
+
+class JsonlSpanExporter(SpanExporter):
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        lines = "".join(json.dumps(s.to_dict(), default=str) + "\n" for s in spans)
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._lock, open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(lines)
+        except OSError as exc:
+            logger.warning("[TRACING] Could not append spans to %s: %s", self.path, exc)
+
+
+def _row(span: Span) -> Dict[str, Any]:
+    generation_id: Optional[uuid.UUID] = None
+    if span.generation_id:
+        try:
+            generation_id = uuid.UUID(span.generation_id)
+        except ValueError:
+            pass
+    return {
+        "trace_id": span.trace_id,
+        "span_id": span.span_id,
+        "parent_id": span.parent_id,
+        "generation_id": generation_id,
+        "name": span.name[:255],
+        "kind": span.kind,
+        "status": span.status,
+        "error": span.error,
+        "started_at": span.started_at,
+        "duration_ms": span.duration_ms or 0.0,
+        "attributes": span.attributes or None,
+        "process": span.process,
+    }
+
+
+class TableSpanExporter(SpanExporter):
+    def __init__(self) -> None:
+        self._pending: Set[asyncio.Task] = set()
+
+    async def write(self, rows: List[Dict[str, Any]]) -> None:
+        from app.core.database import engine
+        from app.tracing.models import PipelineSpan
+
+        try:
+            with suppress_tracing():
+                async with engine.begin() as conn:
+                    await conn.execute(PipelineSpan.__table__.insert(), rows)
+        except Exception as exc:
+            logger.warning("[TRACING] Could not write %d spans: %s", len(rows), exc)
+
+    def export(self, spans: List[Span]) -> None:
+        rows = [_row(s) for s in spans]
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None:
+            from app.core.async_runtime import run_async
+
+            run_async(self.write(rows))
+            return
+        task = loop.create_task(self.write(rows))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+
+_exporter: Optional[SpanExporter] = None
+_exporter_key: Optional[tuple] = None
+
+
+def get_exporter() -> Optional[SpanExporter]:
+    """Exporter for the current settings (rebuilt when they change)."""
+    global _exporter, _exporter_key
+    key = (settings.TRACING_EXPORTER, settings.TRACING_JSONL_PATH)
+    if key != _exporter_key:
+        kind = settings.TRACING_EXPORTER.lower()
+        if kind == "table":
+            _exporter = TableSpanExporter()
+        elif kind == "jsonl":
+            _exporter = JsonlSpanExporter(settings.TRACING_JSONL_PATH)
+        else:
+            _exporter = None
+        _exporter_key = key
+    return _exporter
+
+
+def read_jsonl_spans(path: str, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Spans written by JsonlSpanExporter, optionally for one trace."""
+    spans: List[Dict[str, Any]] = []
+    try:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                if trace_id is not None and trace_id not in line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if trace_id is not None and record.get("trace_id") != trace_id:
+                    continue
+                record["started_at"] = datetime.fromisoformat(record["started_at"])
+                spans.append(record)
+    except FileNotFoundError:
+        pass
+    return spans
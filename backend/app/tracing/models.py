@@ -0,0 +1,47 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+from sqlmodel import Field, SQLModel, Column
+from sqlalchemy.dialects import postgresql as pg
+from sqlalchemy import String, Float, text
+
+
+class PipelineSpan(SQLModel, table=True):
+    """
+    One finished timing span of a generation pipeline.
+
+    trace_id is the hex of the VideoGeneration id, so every stage of a
+    generation shares a trace regardless of which worker ran it. parent_id
+    points at another span of the same trace; stage spans point at the
+    synthesized pipeline span (see app.tracing.tracer.pipeline_span_id).
+    """
+
+    __tablename__ = "pipeline_spans"
+
+    id: uuid.UUID = Field(
+        sa_column=Column(
+            pg.UUID(as_uuid=True),
+            primary_key=True,
+            server_default=text("gen_random_uuid()"),
+        ),
+        default_factory=uuid.uuid4,
+    )
+    trace_id: str = Field(sa_column=Column(String(32), nullable=False, index=True))
+    span_id: str = Field(sa_column=Column(String(16), nullable=False))
+    parent_id: Optional[str] = Field(default=None, sa_column=Column(String(16), nullable=True))
+    generation_id: Optional[uuid.UUID] = Field(
+        default=None, sa_column=Column(pg.UUID(as_uuid=True), nullable=True, index=True)
+    )
+    name: str = Field(sa_column=Column(String, nullable=False))
+    # "stage" | "task" | "scene" | "provider" | "ffmpeg" | "subprocess" | "storage" | "db" | ...
+    kind: str = Field(sa_column=Column(String, nullable=False, index=True))
+    # "ok" | "error" | "cancelled" | "retry"
+    status: str = Field(sa_column=Column(String, nullable=False, server_default=text("'ok'")))
+    error: Optional[str] = Field(default=None, sa_column=Column(String, nullable=True))
+    started_at: datetime = Field(
+        sa_column=Column(pg.TIMESTAMP(timezone=True), nullable=False, index=True)
+    )
+    duration_ms: float = Field(sa_column=Column(Float, nullable=False))
+    attributes: Optional[dict] = Field(default=None, sa_column=Column(pg.JSONB, nullable=True))
+    # "<hostname>:<pid>" of the worker that recorded the span
+    process: Optional[str] = Field(default=None, sa_column=Column(String, nullable=True))
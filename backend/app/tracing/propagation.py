@@ -0,0 +1,117 @@
+"""
+Carry pipeline traces across Celery tasks.
+
+The publishing side adds a W3C-style ``traceparent`` header
+(``00-<trace_id>-<span_id>-01``) and the generation id to every task message
+sent from inside a span (before_task_publish). The worker side opens a root
+span for the task from those headers (task_prerun) and closes it, exporting
+the task's spans, when the task returns (task_postrun).
+
+The four pipeline stage tasks always start a span, header or not, because
+their first argument is the generation id: they join the generation's trace
+as children of its synthesized pipeline span, so stages render side by side
+in the waterfall instead of each nesting under whichever stage queued it.
+The queuing span is kept on the stage as the ``triggered_by`` attribute.
+Any other task is traced only when it was queued from inside a trace.
+"""
+
+import re
+from typing import Any, Dict, Optional, Tuple
+
+from app.tracing.tracer import (
+    current_span,
+    pipeline_span_id,
+    start_trace,
+    trace_id_for,
+)
+
+TRACEPARENT_HEADER = "traceparent"
+GENERATION_HEADER = "trace_generation_id"
+
+# Celery task name -> pipeline stage; arg 0 is the VideoGeneration id
+PIPELINE_STAGES: Dict[str, str] = {
+    "app.tasks.audio_tasks.generate_all_audio_for_video": "audio",
+    "app.tasks.image_tasks.generate_all_images_for_video": "image",
+    "app.tasks.video_tasks.generate_all_videos_for_generation": "video",
+    "app.tasks.merge_tasks.merge_audio_video_for_generation": "merge",
+}
+
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+# task_id -> (open start_trace() context manager, its root span)
+_open_task_spans: Dict[str, Tuple[Any, Any]] = {}
+
+
+def format_traceparent(trace_id: str, span_id: str) -> str:
+    return f"00-{trace_id}-{span_id}-01"
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str]]:
+    match = _TRACEPARENT_RE.match(value or "")
+    return (match.group(1), match.group(2)) if match else None
+
+
+def inject_headers(headers: Dict[str, Any]) -> None:
+    """Add the current span to an outgoing task message's headers."""
+    current = current_span()
+    if current is None:
+        return
+    headers[TRACEPARENT_HEADER] = format_traceparent(current.trace_id, current.span_id)
+    if current.generation_id:
+        headers[GENERATION_HEADER] = current.generation_id
+
+
+def _header(request: Any, name: str) -> Optional[str]:
+    value = getattr(request, name, None)
+    if value is None:
+        value = (getattr(request, "headers", None) or {}).get(name)
+    return value
+
+
+def begin_task(task_id: str, task: Any, args: tuple, kwargs: dict) -> None:
+    """Open the root span of a task about to run in this worker thread."""
+    request = task.request
+    parent = parse_traceparent(_header(request, TRACEPARENT_HEADER))
+    stage = PIPELINE_STAGES.get(task.name)
+    generation_id = _header(request, GENERATION_HEADER)
+    attributes = {
+        "task": task.name,
+        "task_id": task_id,
+        "retries": getattr(request, "retries", None) or None,
+    }
+
+    if stage is not None:
+        generation_id = kwargs.get("video_generation_id") or (args[0] if args else generation_id)
+        if not generation_id:
+            return
+        trace_id = trace_id_for(generation_id)
+        parent_id = pipeline_span_id(trace_id)
+        if parent is not None and parent[0] == trace_id:
+            attributes["triggered_by"] = parent[1]
+        name, kind = stage, "stage"
+    elif parent is not None:
+        trace_id, parent_id = parent
+        name, kind = task.name.rsplit(".", 1)[-1], "task"
+    else:
+        return
+
+    manager = start_trace(
+        name, kind, generation_id, trace_id=trace_id, parent_id=parent_id, **attributes
+    )
+    root = manager.__enter__()
+    if root is None:
+        manager.__exit__(None, None, None)
+        return
+    _open_task_spans[task_id] = (manager, root)
+
+
+def finish_task(task_id: str, state: Optional[str] = None) -> None:
+    """Close (and export) the root span opened by begin_task."""
+    opened = _open_task_spans.pop(task_id, None)
+    if opened is None:
+        return
+    manager, root = opened
+    if state and state != "SUCCESS":
+        root.status = "retry" if state == "RETRY" else "error"
+        root.error = state
+    manager.__exit__(None, None, None)
@@ -0,0 +1,260 @@
+"""
+Read side of pipeline tracing: per-generation waterfalls and stage timings.
+
+    waterfall = await get_generation_waterfall(session, generation_id)
+    # {"generation_id", "trace_id", "started_at", "duration_ms",
+    #  "spans": [{"name", "kind", "depth", "offset_ms", "duration_ms", ...}],
+    #  "stages": {"audio": ms, ...}, "time_by_kind_ms": {"provider": ms, ...}}
+
+Rows come from pipeline_spans or, with TRACING_EXPORTER=jsonl, from the
+JSONL file. The pipeline root is synthesized from the stage spans (it is
+never recorded: no single process sees a generation start and finish), so
+the waterfall spans from the first stage start to the last span end.
+Spans whose parent was not exported (a worker killed mid-task) are attached
+to the pipeline root rather than dropped.
+
+summarize_pipeline_spans() aggregates stage and provider/ffmpeg/storage
+durations over a date range for MetricsService.get_generation_times().
+purge_old_spans() enforces TRACING_RETENTION_DAYS on the table.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.tracing.exporters import read_jsonl_spans
+from app.tracing.models import PipelineSpan
+from app.tracing.tracer import pipeline_span_id, trace_id_for
+
+# Span kinds reported by summarize_pipeline_spans (db spans are too many)
+SUMMARY_KINDS = ("stage", "task", "provider", "ffmpeg", "storage")
+
+
+async def purge_old_spans(session: AsyncSession, retention_days: Optional[int] = None) -> int:
+    """Delete spans that started more than retention_days ago."""
+    if retention_days is None:
+        retention_days = settings.TRACING_RETENTION_DAYS
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    result = await session.execute(
+        delete(PipelineSpan).where(PipelineSpan.started_at < cutoff)
+    )
+    await session.commit()
+    return result.rowcount or 0
+
+
+def _as_dict(row: PipelineSpan) -> Dict[str, Any]:
+    return {
+        "trace_id": row.trace_id,
+        "span_id": row.span_id,
+        "parent_id": row.parent_id,
+        "generation_id": str(row.generation_id) if row.generation_id else None,
+        "name": row.name,
+        "kind": row.kind,
+        "status": row.status,
+        "error": row.error,
+        "started_at": row.started_at,
+        "duration_ms": row.duration_ms,
+        "attributes": row.attributes,
+        "process": row.process,
+    }
+
+
+async def load_trace_spans(session: AsyncSession, trace_id: str) -> List[Dict[str, Any]]:
+    if settings.TRACING_EXPORTER.lower() == "jsonl":
+        return read_jsonl_spans(settings.TRACING_JSONL_PATH, trace_id)
+    result = await session.exec(
+        select(PipelineSpan)
+        .where(PipelineSpan.trace_id == trace_id)
+        .order_by(PipelineSpan.started_at)
+    )
+    return [_as_dict(row) for row in result.all()]
+
+
+def build_waterfall(spans: List[Dict[str, Any]], generation_id: str) -> Optional[Dict[str, Any]]:
+    """Order spans depth-first under a synthesized pipeline root."""
+    if not spans:
+        return None
+    trace_id = trace_id_for(generation_id)
+    root_id = pipeline_span_id(trace_id)
+
+    start = min(s["started_at"] for s in spans)
+    end = max(s["started_at"] + timedelta(milliseconds=s["duration_ms"] or 0) for s in spans)
+    known = {s["span_id"] for s in spans} | {root_id}
+
+    children: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for s in spans:
+        parent = s["parent_id"] if s["parent_id"] in known else root_id
+        children[parent].append(s)
+
+    def offset_ms(moment: datetime) -> float:
+        return round((moment - start).total_seconds() * 1000, 3)
+
+    rows: List[Dict[str, Any]] = [
+        {
+            "span_id": root_id,
+            "parent_id": None,
+            "name": "pipeline",
+            "kind": "pipeline",
+            "status": "error" if any(s["status"] == "error" and s["kind"] == "stage" for s in spans) else "ok",
+            "error": None,
+            "depth": 0,
+            "offset_ms": 0.0,
+            "duration_ms": offset_ms(end),
+            "attributes": None,
+            "process": None,
+        }
+    ]
+    # Iterative DFS; children in start order
+    stack = [(child, 1) for child in sorted(children[root_id], key=lambda s: s["started_at"], reverse=True)]
+    while stack:
+        current, depth = stack.pop()
+        rows.append(
+            {
+                "span_id": current["span_id"],
+                "parent_id": current["parent_id"] if current["parent_id"] in known else root_id,
+                "name": current["name"],
+                "kind": current["kind"],
+                "status": current["status"],
+                "error": current["error"],
+                "depth": depth,
+                "offset_ms": offset_ms(current["started_at"]),
+                "duration_ms": current["duration_ms"],
+                "attributes": current["attributes"],
+                "process": current["process"],
+            }
+        )
+        for child in sorted(children.get(current["span_id"], []), key=lambda s: s["started_at"], reverse=True):
+            stack.append((child, depth + 1))
+
+    stages: Dict[str, float] = defaultdict(float)
+    by_kind: Dict[str, float] = defaultdict(float)
+    for s in spans:
+        by_kind[s["kind"]] += s["duration_ms"] or 0
+        if s["kind"] == "stage":
+            stages[s["name"]] += s["duration_ms"] or 0
+
+    return {
+        "generation_id": str(generation_id),
+        "trace_id": trace_id,
+        "started_at": start.isoformat(),
+        "duration_ms": offset_ms(end),
+        "span_count": len(spans),
+        "stages": {name: round(ms, 3) for name, ms in stages.items()},
+        "time_by_kind_ms": {kind: round(ms, 3) for kind, ms in by_kind.items()},
+        "spans": rows,
+    }
+
+
+async def get_generation_waterfall(
+    session: AsyncSession, generation_id: str
+) -> Optional[Dict[str, Any]]:
+    spans = await load_trace_spans(session, trace_id_for(generation_id))
+    return build_waterfall(spans, generation_id)
+
+
+def _stats(seconds: List[float]) -> Dict[str, Any]:
+    if not seconds:
+        return {"average": 0, "min": 0, "max": 0, "count": 0}
+    return {
+        "average": round(sum(seconds) / len(seconds), 2),
+        "min": round(min(seconds), 2),
+        "max": round(max(seconds), 2),
+        "count": len(seconds),
+    }
+
+
+def _utc(moment: datetime) -> datetime:
+    return moment.astimezone(timezone.utc)
+
+
+def _summarize_records(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    stage_times: Dict[str, List[float]] = defaultdict(list)
+    kind_times: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+    pipelines: Dict[str, List[datetime]] = {}
+    for r in records:
+        seconds = (r["duration_ms"] or 0) / 1000
+        if r["kind"] == "stage":
+            stage_times[r["name"]].append(seconds)
+            ended = r["started_at"] + timedelta(seconds=seconds)
+            bounds = pipelines.setdefault(r["trace_id"], [r["started_at"], ended])
+            bounds[0] = min(bounds[0], r["started_at"])
+            bounds[1] = max(bounds[1], ended)
+        else:
+            kind_times[r["kind"]][r["name"]].append(seconds)
+    return {
+        "pipeline_total": _stats([(b[1] - b[0]).total_seconds() for b in pipelines.values()]),
+        "stages": {name: _stats(times) for name, times in stage_times.items()},
+        "spans": {
+            kind: {name: _stats(times) for name, times in names.items()}
+            for kind, names in kind_times.items()
+        },
+    }
+
+
+async def summarize_pipeline_spans(
+    session: AsyncSession, start_date: datetime, end_date: datetime
+) -> Dict[str, Any]:
+    """
+    Wall time per generation and per stage, and time per provider / ffmpeg /
+    storage operation, all in seconds in the {average, min, max, count} shape
+    of the other generation-time reports.
+    """
+    start, end = _utc(start_date), _utc(end_date)
+    if settings.TRACING_EXPORTER.lower() == "jsonl":
+        records = [
+            r
+            for r in read_jsonl_spans(settings.TRACING_JSONL_PATH)
+            if r["kind"] in SUMMARY_KINDS and start <= r["started_at"] <= end
+        ]
+        return _summarize_records(records)
+
+    window = (
+        PipelineSpan.started_at >= start,
+        PipelineSpan.started_at <= end,
+    )
+    stage_rows = (
+        await session.exec(
+            select(
+                PipelineSpan.trace_id,
+                PipelineSpan.name,
+                PipelineSpan.started_at,
+                PipelineSpan.duration_ms,
+            ).where(PipelineSpan.kind == "stage", *window)
+        )
+    ).all()
+    records = [
+        {"trace_id": t, "name": n, "kind": "stage", "started_at": s, "duration_ms": d}
+        for t, n, s, d in stage_rows
+    ]
+    summary = _summarize_records(records)
+
+    # Leaf operations are aggregated in SQL; there can be thousands per generation
+    seconds = PipelineSpan.duration_ms / 1000.0
+    kind_rows = (
+        await session.exec(
+            select(
+                PipelineSpan.kind,
+                PipelineSpan.name,
+                func.avg(seconds),
+                func.min(seconds),
+                func.max(seconds),
+                func.count(),
+            )
+            .where(PipelineSpan.kind.in_([k for k in SUMMARY_KINDS if k != "stage"]), *window)
+            .group_by(PipelineSpan.kind, PipelineSpan.name)
+        )
+    ).all()
+    for kind, name, average, minimum, maximum, count in kind_rows:
+        summary["spans"].setdefault(kind, {})[name] = {
+            "average": round(float(average), 2),
+            "min": round(float(minimum), 2),
+            "max": round(float(maximum), 2),
+            "count": count,
+        }
+    return summary
+
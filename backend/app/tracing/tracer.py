@@ -0,0 +1,387 @@
+"""
+Nested timing spans for the generation pipelines.
+
+A trace covers one VideoGeneration: its id is the hex of the generation UUID,
+so the audio, image, video and merge stages -- separate Celery tasks that may
+run on different workers -- all write into the same trace:
+
+    pipeline        synthesized from its stages when the trace is read back
+      stage         one per pipeline Celery task (app.tracing.propagation)
+        scene       one iteration of a per-scene loop (span_each)
+          provider  one provider_limiter.acquire() block
+          ffmpeg    one traced_run() subprocess
+          storage   one S3StorageService transfer (@traced)
+          db        one SQL statement (instrument_engine)
+
+The current span lives in a ContextVar, so spans nest across ``await``,
+``asyncio.gather`` children and ``run_async`` (which schedules the coroutine
+with a copy of the caller's context). Celery carries it between tasks in a
+``traceparent`` message header.
+
+Spans are only recorded inside an active trace: a DB query from an API
+request or an ffmpeg call from an untraced task costs one ContextVar lookup.
+Finished spans are buffered per process and handed to the configured exporter
+(app/tracing/exporters.py) when the local root span -- normally the Celery
+task -- ends, or earlier once MAX_BUFFERED_SPANS have piled up.
+"""
+
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import secrets
+import socket
+import subprocess
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Hand spans to the exporter early when a long stage has buffered this many
+MAX_BUFFERED_SPANS = 1000
+# Longest SQL / command line kept on a span
+MAX_ATTRIBUTE_CHARS = 300
+
+
+def process_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def trace_id_for(generation_id: Any) -> str:
+    """32-hex trace id of a generation (the UUID itself when it is one)."""
+    try:
+        return uuid.UUID(str(generation_id)).hex
+    except ValueError:
+        return hashlib.sha256(str(generation_id).encode()).hexdigest()[:32]
+
+
+def pipeline_span_id(trace_id: str) -> str:
+    """Span id of the synthesized pipeline root that every stage hangs off."""
+    return trace_id[:16]
+
+
+@dataclass
+class Span:
+    name: str
+    kind: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    generation_id: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    duration_ms: Optional[float] = None
+    status: str = "ok"
+    error: Optional[str] = None
+    process: str = field(default_factory=process_name)
+    local_root: bool = False
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "generation_id": self.generation_id,
+            "name": self.name,
+            "kind": self.kind,
+            "status": self.status,
+            "error": self.error,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes or None,
+            "process": self.process,
+        }
+
+
+_current: ContextVar[Optional[Span]] = ContextVar("pipeline_span", default=None)
+_suppressed: ContextVar[bool] = ContextVar("pipeline_tracing_suppressed", default=False)
+
+_buffer: List[Span] = []
+_buffer_lock = threading.Lock()
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+@contextmanager
+def suppress_tracing() -> Iterator[None]:
+    """Record nothing inside the block (used by the exporters' own writes)."""
+    token = _suppressed.set(True)
+    try:
+        yield
+    finally:
+        _suppressed.reset(token)
+
+
+def _open(
+    name: str,
+    kind: str,
+    trace_id: str,
+    parent_id: Optional[str],
+    generation_id: Optional[str],
+    attributes: Dict[str, Any],
+    local_root: bool = False,
+) -> Tuple[Span, Token]:
+    opened = Span(
+        name=name,
+        kind=kind,
+        trace_id=trace_id,
+        span_id=secrets.token_hex(8),
+        parent_id=parent_id,
+        generation_id=generation_id,
+        attributes={k: v for k, v in attributes.items() if v is not None},
+        local_root=local_root,
+    )
+    return opened, _current.set(opened)
+
+
+def _finish(finished: Span, token: Optional[Token], exc: Optional[BaseException] = None) -> None:
+    finished.duration_ms = round((time.perf_counter() - finished._start) * 1000, 3)
+    if exc is not None and not isinstance(exc, GeneratorExit):
+        if type(exc).__name__ == "CancelledError":
+            finished.status = "cancelled"
+        else:
+            finished.status = "error"
+            finished.error = f"{type(exc).__name__}: {exc}"[:MAX_ATTRIBUTE_CHARS]
+    if token is not None:
+        try:
+            _current.reset(token)
+        except ValueError:
+            # Closed from another context (an abandoned span_each generator
+            # collected later); that context's value is not ours to restore.
+            pass
+    with _buffer_lock:
+        _buffer.append(finished)
+        full = len(_buffer) >= MAX_BUFFERED_SPANS
+    if finished.local_root or full:
+        flush()
+
+
+def flush() -> None:
+    """Hand buffered spans to the exporter. Never raises."""
+    with _buffer_lock:
+        if not _buffer:
+            return
+        spans = _buffer[:]
+        _buffer.clear()
+
+    from app.tracing.exporters import get_exporter
+
+    exporter = get_exporter()
+    if exporter is None:
+        return
+    try:
+        exporter.export(spans)
+    except Exception as exc:
+        logger.warning("[TRACING] Exporting %d spans failed: %s", len(spans), exc)
+
+
+@contextmanager
+def start_trace(
+    name: str,
+    kind: str,
+    generation_id: Optional[Any] = None,
+    *,
+    trace_id: Optional[str] = None,
+    parent_id: Optional[str] = None,
+    **attributes: Any,
+) -> Iterator[Optional[Span]]:
+    """
+    Open a local root span. Spans opened inside the block nest under it, and
+    the buffered spans are exported when it closes.
+
+    Without trace_id the trace is the generation's (trace_id_for), or a fresh
+    one when there is no generation either.
+    """
+    if not settings.TRACING_ENABLED or _suppressed.get():
+        yield None
+        return
+    if trace_id is None:
+        trace_id = trace_id_for(generation_id) if generation_id else secrets.token_hex(16)
+    root, token = _open(
+        name,
+        kind,
+        trace_id,
+        parent_id,
+        str(generation_id) if generation_id else None,
+        attributes,
+        local_root=True,
+    )
+    try:
+        yield root
+    except BaseException as exc:
+        _finish(root, token, exc)
+        raise
+    else:
+        _finish(root, token)
+
+
+@contextmanager
+def span(name: str, kind: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Child of the current span; yields None (and records nothing) outside a trace."""
+    parent = _current.get()
+    if parent is None or _suppressed.get():
+        yield None
+        return
+    child, token = _open(
+        name, kind, parent.trace_id, parent.span_id, parent.generation_id, attributes
+    )
+    try:
+        yield child
+    except BaseException as exc:
+        _finish(child, token, exc)
+        raise
+    else:
+        _finish(child, token)
+
+
+def traced(
+    name: Optional[str] = None, kind: str = "internal", *, capture: Sequence[str] = ()
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Run each call of a sync or async function inside a span.
+
+    ``capture`` names arguments to copy onto the span's attributes, e.g.
+    ``@traced("storage.upload", "storage", capture=("path",))``.
+    """
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        span_name = name or func.__qualname__
+        signature = inspect.signature(func)
+
+        def attributes(args: tuple, kwargs: dict) -> Dict[str, Any]:
+            if not capture:
+                return {}
+            try:
+                bound = signature.bind_partial(*args, **kwargs).arguments
+            except TypeError:
+                return {}
+            return {key: str(bound[key])[:MAX_ATTRIBUTE_CHARS] for key in capture if key in bound}
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _current.get() is None:
+                    return await func(*args, **kwargs)
+                with span(span_name, kind, **attributes(args, kwargs)):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name, kind, **attributes(args, kwargs)):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def span_each(
+    items: Iterable[T], name: str, kind: str = "scene", **attributes: Any
+) -> Iterator[T]:
+    """
+    Iterate ``items`` with each loop body inside its own span::
+
+        for i, scene in enumerate(span_each(scenes, "scene")):
+            ...
+
+    The span gets the iteration ``index``; an exception escaping the loop body
+    ends the loop without marking the span (the body's own spans carry it).
+    """
+    for index, item in enumerate(items):
+        with span(name, kind, index=index, **attributes):
+            yield item
+
+
+def traced_run(cmd: Any, *args: Any, **kwargs: Any) -> subprocess.CompletedProcess:
+    """``subprocess.run`` inside an "ffmpeg" (ffmpeg/ffprobe) or "subprocess" span."""
+    if _current.get() is None:
+        return subprocess.run(cmd, *args, **kwargs)
+    argv = [str(part) for part in cmd] if isinstance(cmd, (list, tuple)) else str(cmd).split()
+    program = os.path.basename(argv[0]) if argv else "subprocess"
+    kind = "ffmpeg" if program.startswith(("ffmpeg", "ffprobe")) else "subprocess"
+    with span(program, kind, argv=" ".join(argv)[:MAX_ATTRIBUTE_CHARS]) as current:
+        result = subprocess.run(cmd, *args, **kwargs)
+        if current is not None:
+            current.set(returncode=result.returncode)
+            if result.returncode:
+                current.status = "error"
+        return result
+
+
+# ----------------------------------------------------------------------
+# DB queries
+# ----------------------------------------------------------------------
+
+_QUERY_SPANS_KEY = "pipeline_query_spans"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not settings.TRACING_DB_QUERIES or _suppressed.get():
+        return
+    parent = _current.get()
+    if parent is None:
+        return
+    query = Span(
+        name=(statement.split(None, 1)[0].upper() if statement else "query"),
+        kind="db",
+        trace_id=parent.trace_id,
+        span_id=secrets.token_hex(8),
+        parent_id=parent.span_id,
+        generation_id=parent.generation_id,
+        attributes={"statement": " ".join(statement.split())[:MAX_ATTRIBUTE_CHARS]},
+    )
+    if executemany:
+        query.attributes["executemany"] = True
+    conn.info.setdefault(_QUERY_SPANS_KEY, []).append(query)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    pending = conn.info.get(_QUERY_SPANS_KEY)
+    if not pending:
+        return
+    query = pending.pop()
+    rowcount = getattr(cursor, "rowcount", -1)
+    if rowcount is not None and rowcount >= 0:
+        query.attributes["rowcount"] = rowcount
+    _finish(query, None)
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    pending = conn.info.get(_QUERY_SPANS_KEY) if conn is not None else None
+    if pending:
+        _finish(pending.pop(), None, exception_context.original_exception)
+
+
+def instrument_engine(engine: Any) -> None:
+    """Record a "db" span for every statement run inside an active trace."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
@@ -9,11 +9,18 @@ Scoring dimensions:
 - Emotional Score: Impact, resonance, character moments
 - Visual Score: Cinematic potential, imagery quality
 - Narrative Score: Plot importance, story arc contribution
+
+Chapters are scored concurrently (TRAILER_SCORING_CONCURRENCY). The raw
+dimension scores do not depend on the tone weights, so they are cached by a
+hash of the chapter text sent to the model; re-analysis with other weights
+only re-ranks them.
 """
 
 import uuid
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
+import hashlib
+import heapq
 import logging
 import json
 import asyncio
@@ -34,10 +41,17 @@ from app.trailers.schemas import (
     SceneAnalysisResult,
 )
 from app.core.services.script_model_router import ScriptModelRouter
+from app.core.services.redis import redis_client
 from app.core.model_config import get_model_config
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+SCORING_MODEL = "openai/gpt-4o-mini"  # Fast, cost-effective for analysis
+# Bump when the scoring prompt changes so cached scores are not reused
+SCORE_CACHE_VERSION = 1
+SCORED_CONTENT_CHARS = 3000
+
 
 # Scoring weights for different trailer tones
 TONE_WEIGHTS = {
@@ -57,9 +71,10 @@ class TrailerSceneService:
     Uses LLM-based analysis to score scenes across multiple dimensions.
     """
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, redis_service=redis_client):
         self.session = session
         self.ai_service = ScriptModelRouter()
+        self.redis = redis_service
     
     async def analyze_project_for_trailer(
         self,
@@ -105,9 +120,13 @@ class TrailerSceneService:
             elif config.prefer_emotional:
                 weights = {"action": 0.15, "emotional": 0.45, "visual": 0.20, "narrative": 0.20}
             
-            for chapter in chapters:
-                chapter_scenes = await self._analyze_chapter(chapter, trailer_gen.id, weights)
-                all_scenes.extend(chapter_scenes)
+            async for chapters_done, top_scenes in self.iter_top_scenes(
+                chapters, trailer_gen.id, weights, config.max_scenes, all_scenes
+            ):
+                logger.info(
+                    f"[KAN-149] Scored {chapters_done}/{len(chapters)} chapters, "
+                    f"current top score {top_scenes[0].overall_score if top_scenes else 0:.2f}"
+                )
             
             # 4. Rank and select top scenes
             all_scenes.sort(key=lambda s: s.overall_score, reverse=True)
@@ -185,6 +204,48 @@ class TrailerSceneService:
         logger.info(f"[KAN-149] Found {len(all_chapters)} chapters for project {project_id}")
         return list(all_chapters)
     
+    async def iter_top_scenes(
+        self,
+        chapters: List[Any],
+        trailer_gen_id: uuid.UUID,
+        weights: Dict[str, float],
+        top_k: int,
+        all_scenes: Optional[List[TrailerScene]] = None,
+    ) -> AsyncIterator[Tuple[int, List[TrailerScene]]]:
+        """Score chapters concurrently, yielding the running top-K as each finishes.
+
+        Yields (chapters_done, top_k_scenes). Once iteration ends, all_scenes
+        (if given) holds every scene in chapter order, as a sequential pass
+        would have produced it.
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.TRAILER_SCORING_CONCURRENCY))
+        await self._ensure_redis()
+
+        async def analyze(index: int, chapter: Any) -> Tuple[int, List[TrailerScene]]:
+            async with semaphore:
+                return index, await self._analyze_chapter(chapter, trailer_gen_id, weights)
+
+        per_chapter: List[List[TrailerScene]] = [[] for _ in chapters]
+        top: List[Tuple[float, int, TrailerScene]] = []
+        order = 0
+        pending = [analyze(index, chapter) for index, chapter in enumerate(chapters)]
+        for chapters_done, next_done in enumerate(asyncio.as_completed(pending), start=1):
+            index, chapter_scenes = await next_done
+            per_chapter[index] = chapter_scenes
+            for scene in chapter_scenes:
+                order += 1
+                entry = (scene.overall_score, -order, scene)
+                if len(top) < top_k:
+                    heapq.heappush(top, entry)
+                elif entry[:2] > top[0][:2]:
+                    heapq.heapreplace(top, entry)
+            ranked = sorted(top, key=lambda entry: entry[:2], reverse=True)
+            yield chapters_done, [scene for _, _, scene in ranked]
+
+        if all_scenes is not None:
+            for chapter_scenes in per_chapter:
+                all_scenes.extend(chapter_scenes)
+
     async def _analyze_chapter(
         self,
         chapter: Any,
@@ -236,6 +297,11 @@ class TrailerSceneService:
         if len(chapter_content) < 100:
             # Not enough content to analyze
             return []
+
+        cache_key = self._score_cache_key(chapter_title, chapter_content)
+        cached = await self._get_cached_scores(cache_key)
+        if cached is not None:
+            return cached
         
         system_prompt = """You are a professional film trailer editor. Analyze the provided chapter content and identify potential trailer highlight moments.
 
@@ -267,7 +333,7 @@ Identify 3-8 highlight moments per chapter. Focus on moments that would create c
 Chapter Title: {chapter_title}
 
 Content:
-{chapter_content[:3000]}
+{chapter_content[:SCORED_CONTENT_CHARS]}
 
 Identify key moments suitable for a trailer and score them."""
 
@@ -276,7 +342,7 @@ Identify key moments suitable for a trailer and score them."""
             from app.core.services.provider_router import provider_router
             
             response = await provider_router.chat_completion(
-                model="openai/gpt-4o-mini",  # Fast, cost-effective for analysis
+                model=SCORING_MODEL,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt},
@@ -293,6 +359,7 @@ Identify key moments suitable for a trailer and score them."""
             if json_start >= 0 and json_end > json_start:
                 json_str = content[json_start:json_end]
                 scenes = json.loads(json_str)
+                await self._cache_scores(cache_key, scenes)
                 return scenes
             
             return []
@@ -310,6 +377,44 @@ Identify key moments suitable for a trailer and score them."""
                 "selection_reason": "Included as chapter representative (AI fallback)",
             }]
     
+    async def _ensure_redis(self) -> None:
+        # The score cache is optional: without Redis every chapter is scored
+        try:
+            if not getattr(self.redis, "is_connected", False):
+                await self.redis.connect()
+        except Exception as e:
+            logger.warning(f"[KAN-149] Score cache unavailable: {e}")
+
+    @staticmethod
+    def _score_cache_key(chapter_title: str, chapter_content: str) -> str:
+        """Hash of exactly what the scoring model sees for a chapter."""
+        digest = hashlib.sha256()
+        for part in (
+            f"trailer_scores:v{SCORE_CACHE_VERSION}",
+            SCORING_MODEL,
+            chapter_title,
+            chapter_content[:SCORED_CONTENT_CHARS],
+        ):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return f"trailer_scores:{digest.hexdigest()}"
+
+    async def _get_cached_scores(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
+        try:
+            cached = await self.redis.get_cached_ai_content(cache_key)
+        except Exception as e:
+            logger.warning(f"[KAN-149] Score cache read failed: {e}")
+            return None
+        if isinstance(cached, dict) and isinstance(cached.get("scenes"), list):
+            return cached["scenes"]
+        return None
+
+    async def _cache_scores(self, cache_key: str, scenes: List[Dict[str, Any]]) -> None:
+        try:
+            await self.redis.cache_ai_content(cache_key, {"scenes": scenes})
+        except Exception as e:
+            logger.warning(f"[KAN-149] Score cache write failed: {e}")
+
     def _estimate_scene_duration(self, scene: TrailerScene) -> float:
         """Estimate scene duration for trailer pacing.
         
@@ -3,7 +3,7 @@ from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
 from sqlmodel import Field, SQLModel, Column, Relationship
 from sqlalchemy.dialects import postgresql as pg
-from sqlalchemy import text, func, ForeignKey
+from sqlalchemy import String, text, func, ForeignKey
 from enum import Enum
 
 
@@ -348,6 +348,12 @@ class Script(SQLModel, table=True):
         default=[], sa_column=Column(pg.JSONB, server_default=text("'[]'::jsonb"))
     )
 
+    # Compiled script (app.core.services.script_ast), refreshed when the text changes
+    script_hash: Optional[str] = Field(default=None, sa_column=Column(String(64), nullable=True))
+    script_ast: Optional[Dict[str, Any]] = Field(
+        default=None, exclude=True, sa_column=Column(pg.JSONB, nullable=True)
+    )
+
     created_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
         sa_column=Column(
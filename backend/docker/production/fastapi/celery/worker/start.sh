@@ -3,10 +3,55 @@ set -o errexit
 set -o nounset
 set -o pipefail
 
+# Worker pool profile (see app/tasks/celery_app.py for the queue topology):
+#   io   - provider submit/poll tasks; thread pool, high concurrency. The
+#          thread pool does not enforce time limits; run_async does
+#          (app/core/async_runtime.py). All threads share the process's
+#          event loop, so blocking calls in tasks go through asyncio.to_thread
+#   cpu  - ffmpeg merge/mix tasks; prefork, one process per core
+#   fast - emails, embeddings, plot, credit housekeeping; prefork, prefetch 4
+#   all  - every queue on a single prefork pool (default, single-worker deploys)
+BASE_QUEUE="${CELERY_TASK_DEFAULT_QUEUE:-litink_tasks}"
+PROFILE="${CELERY_WORKER_PROFILE:-all}"
+
+case "$PROFILE" in
+  io)
+    QUEUES="${BASE_QUEUE}.io"
+    POOL="threads"
+    CONCURRENCY="${CELERY_WORKER_CONCURRENCY:-16}"
+    PREFETCH=1
+    ;;
+  cpu)
+    QUEUES="${BASE_QUEUE}.cpu"
+    POOL="prefork"
+    CONCURRENCY="${CELERY_WORKER_CONCURRENCY:-$(nproc)}"
+    PREFETCH=1
+    ;;
+  fast)
+    QUEUES="${BASE_QUEUE}.fast,${BASE_QUEUE}"
+    POOL="prefork"
+    CONCURRENCY="${CELERY_WORKER_CONCURRENCY:-4}"
+    PREFETCH=4
+    ;;
+  all)
+    QUEUES="${BASE_QUEUE}.fast,${BASE_QUEUE},${BASE_QUEUE}.io,${BASE_QUEUE}.cpu"
+    POOL="prefork"
+    CONCURRENCY="${CELERY_WORKER_CONCURRENCY:-2}"
+    PREFETCH=1
+    ;;
+  *)
+    echo "Unknown CELERY_WORKER_PROFILE: $PROFILE" >&2
+    exit 1
+    ;;
+esac
+
 exec celery \
   -A app.tasks.celery_app \
   worker \
-  -Q ${CELERY_TASK_DEFAULT_QUEUE:-litink_tasks} \
-  --concurrency=2 \
+  -Q "$QUEUES" \
+  -n "${PROFILE}@%h" \
+  --pool="$POOL" \
+  --concurrency="$CONCURRENCY" \
+  --prefetch-multiplier="$PREFETCH" \
   --max-memory-per-child=400000 \
   --loglevel=info
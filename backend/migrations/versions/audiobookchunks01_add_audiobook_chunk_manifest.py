@@ -0,0 +1,30 @@
+"""add chunk_manifest to audiobook_chapters
+
+Revision ID: audiobookchunks01
+Revises: mediacache01
+Create Date: 2026-10-18
+
+Records the TTS chunks rendered for each audiobook chapter so a retry only
+re-synthesizes chunks that failed or whose text changed.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "audiobookchunks01"
+down_revision: Union[str, Sequence[str], None] = "mediacache01"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE audiobook_chapters ADD COLUMN IF NOT EXISTS chunk_manifest JSONB"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE audiobook_chapters DROP COLUMN IF EXISTS chunk_manifest")
@@ -0,0 +1,67 @@
+"""add stored weighted tsvector columns and GIN indexes for book search
+
+Revision ID: booksearch01
+Revises: audiobookchunks01
+Create Date: 2026-10-18
+
+GET /books/search used to compute to_tsvector() over every chapter's content
+at query time, which no index can serve. The vectors are now generated
+columns maintained by Postgres on write:
+
+    books.search_vector    = title (A) || author_name (B) || description (C)
+    chapters.search_vector = title (A) || content (D)
+
+Adding a STORED generated column rewrites the table once.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "booksearch01"
+down_revision: Union[str, Sequence[str], None] = "audiobookchunks01"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE books ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A')
+                || setweight(to_tsvector('english', coalesce(author_name, '')), 'B')
+                || setweight(to_tsvector('english', coalesce(description, '')), 'C')
+            ) STORED
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE chapters ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A')
+                || setweight(to_tsvector('english', coalesce(content, '')), 'D')
+            ) STORED
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_books_search_vector
+            ON books USING GIN (search_vector)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_chapters_search_vector
+            ON chapters USING GIN (search_vector)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_chapters_search_vector")
+    op.execute("DROP INDEX IF EXISTS ix_books_search_vector")
+    op.execute("ALTER TABLE chapters DROP COLUMN IF EXISTS search_vector")
+    op.execute("ALTER TABLE books DROP COLUMN IF EXISTS search_vector")
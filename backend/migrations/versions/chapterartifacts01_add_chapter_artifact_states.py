@@ -0,0 +1,58 @@
+"""add chapter_artifact_states for incremental chapter regeneration
+
+Revision ID: chapterartifacts01
+Revises: pipelinespans01
+Create Date: 2026-10-18
+
+Records, per chapter and derived artifact (embeddings, plot, script, scene
+media), the hash of the chapter fields it was last built from and whether
+an edit or upstream rebuild has invalidated it (app.chapter_changes). Lets
+a structure save or regeneration redo only the chapters an edit touched.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "chapterartifacts01"
+down_revision: Union[str, Sequence[str], None] = "pipelinespans01"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS chapter_artifact_states (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            chapter_id UUID NOT NULL REFERENCES chapters(id) ON DELETE CASCADE,
+            book_id UUID NOT NULL,
+            artifact VARCHAR NOT NULL,
+            source_hash VARCHAR(64) NOT NULL,
+            dirty BOOLEAN NOT NULL DEFAULT false,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT uq_chapter_artifact_states_chapter_artifact
+                UNIQUE (chapter_id, artifact)
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_chapter_artifact_states_chapter_id
+            ON chapter_artifact_states (chapter_id)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_chapter_artifact_states_book_id
+            ON chapter_artifact_states (book_id)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_chapter_artifact_states_book_id")
+    op.execute("DROP INDEX IF EXISTS ix_chapter_artifact_states_chapter_id")
+    op.execute("DROP TABLE IF EXISTS chapter_artifact_states")
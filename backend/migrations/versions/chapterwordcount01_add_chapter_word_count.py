@@ -0,0 +1,44 @@
+"""add stored word_count column to chapters for chapter manifests
+
+Revision ID: chapterwordcount01
+Revises: booksearch01
+Create Date: 2026-10-18
+
+Book reads can ask for a chapter manifest (id, number, title, word count,
+summary) instead of every chapter's full content. The word count is a
+generated column maintained by Postgres on write, so a manifest query never
+reads or detoasts chapter content.
+
+Adding a STORED generated column rewrites the table once.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "chapterwordcount01"
+down_revision: Union[str, Sequence[str], None] = "booksearch01"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        r"""
+        ALTER TABLE chapters ADD COLUMN IF NOT EXISTS word_count integer
+            GENERATED ALWAYS AS (regexp_count(content, '\S+')) STORED
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_chapters_book_id_chapter_number
+            ON chapters (book_id, chapter_number)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_chapters_book_id_chapter_number")
+    op.execute("ALTER TABLE chapters DROP COLUMN IF EXISTS word_count")
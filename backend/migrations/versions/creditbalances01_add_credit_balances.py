@@ -0,0 +1,78 @@
+"""add materialized credit_balances table
+
+Revision ID: creditbalances01
+Revises: chapterwordcount01
+Create Date: 2026-10-18
+
+reserve_credits used to lock every active credit_grants row for the user and
+sum them, then sum every active reservation. credit_balances keeps one row
+per user with both totals, so a reservation locks and updates a single row.
+
+valid_until is the earliest expiry among the grants and reservations the
+totals include; once it passes, CreditService rebuilds the row from the
+ledger. The backfill below computes every user's row the same way.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "creditbalances01"
+down_revision: Union[str, Sequence[str], None] = "chapterwordcount01"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS credit_balances (
+            user_id UUID PRIMARY KEY,
+            credits_remaining INTEGER NOT NULL DEFAULT 0,
+            credits_reserved INTEGER NOT NULL DEFAULT 0,
+            valid_until TIMESTAMPTZ,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            reconciled_at TIMESTAMPTZ
+        )
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO credit_balances
+            (user_id, credits_remaining, credits_reserved, valid_until, reconciled_at)
+        SELECT u.user_id,
+               COALESCE(g.remaining, 0),
+               COALESCE(t.reserved, 0),
+               LEAST(g.min_expires_at, t.min_expires_at),
+               NOW()
+        FROM (
+            SELECT user_id FROM credit_grants
+            UNION
+            SELECT user_id FROM credit_transactions WHERE status = 'reserved'
+        ) u
+        LEFT JOIN LATERAL (
+            SELECT SUM(credits_remaining) AS remaining, MIN(expires_at) AS min_expires_at
+            FROM credit_grants
+            WHERE user_id = u.user_id AND expires_at > NOW() AND credits_remaining > 0
+        ) g ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT SUM(amount) AS reserved, MIN(expires_at) AS min_expires_at
+            FROM credit_transactions
+            WHERE user_id = u.user_id AND status = 'reserved' AND expires_at > NOW()
+        ) t ON TRUE
+        ON CONFLICT (user_id) DO NOTHING
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_credit_balances_reconciled_at
+            ON credit_balances (reconciled_at NULLS FIRST)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_credit_balances_reconciled_at")
+    op.execute("DROP TABLE IF EXISTS credit_balances")
@@ -0,0 +1,75 @@
+"""add media_cache_entries table for content-addressed media reuse
+
+Revision ID: mediacache01
+Revises: scriptstandard02
+Create Date: 2026-10-18
+
+Maps a sha256 of (model, normalized prompt, input media, aspect ratio,
+duration, seed, user scope) to generated media already persisted in
+storage, so identical regenerations skip the provider call.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "mediacache01"
+down_revision: Union[str, Sequence[str], None] = "scriptstandard02"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS media_cache_entries (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            cache_key VARCHAR(64) NOT NULL,
+            media_type VARCHAR NOT NULL,
+            model_id VARCHAR,
+            user_id UUID,
+            media_url VARCHAR NOT NULL,
+            clean_url VARCHAR,
+            duration_seconds DOUBLE PRECISION,
+            meta JSONB,
+            hit_count INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            last_hit_at TIMESTAMPTZ,
+            expires_at TIMESTAMPTZ NOT NULL
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS ix_media_cache_entries_cache_key
+            ON media_cache_entries (cache_key)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_media_cache_entries_media_type
+            ON media_cache_entries (media_type)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_media_cache_entries_user_id
+            ON media_cache_entries (user_id)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_media_cache_entries_expires_at
+            ON media_cache_entries (expires_at)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_media_cache_entries_expires_at")
+    op.execute("DROP INDEX IF EXISTS ix_media_cache_entries_user_id")
+    op.execute("DROP INDEX IF EXISTS ix_media_cache_entries_media_type")
+    op.execute("DROP INDEX IF EXISTS ix_media_cache_entries_cache_key")
+    op.execute("DROP TABLE IF EXISTS media_cache_entries")
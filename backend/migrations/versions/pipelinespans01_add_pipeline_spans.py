@@ -0,0 +1,76 @@
+"""add pipeline_spans table for per-generation tracing
+
+Revision ID: pipelinespans01
+Revises: scriptast01
+Create Date: 2026-10-18
+
+Stores finished timing spans (stage, scene, provider call, ffmpeg job,
+storage transfer, DB query) recorded by app.tracing, keyed by a trace id
+derived from the VideoGeneration id. Feeds the admin waterfall endpoint and
+the stage breakdown in generation-time metrics.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "pipelinespans01"
+down_revision: Union[str, Sequence[str], None] = "scriptast01"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS pipeline_spans (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            trace_id VARCHAR(32) NOT NULL,
+            span_id VARCHAR(16) NOT NULL,
+            parent_id VARCHAR(16),
+            generation_id UUID,
+            name VARCHAR NOT NULL,
+            kind VARCHAR NOT NULL,
+            status VARCHAR NOT NULL DEFAULT 'ok',
+            error VARCHAR,
+            started_at TIMESTAMPTZ NOT NULL,
+            duration_ms DOUBLE PRECISION NOT NULL,
+            attributes JSONB,
+            process VARCHAR
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_pipeline_spans_trace_id
+            ON pipeline_spans (trace_id)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_pipeline_spans_generation_id
+            ON pipeline_spans (generation_id)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_pipeline_spans_kind
+            ON pipeline_spans (kind)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_pipeline_spans_started_at
+            ON pipeline_spans (started_at)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_pipeline_spans_started_at")
+    op.execute("DROP INDEX IF EXISTS ix_pipeline_spans_kind")
+    op.execute("DROP INDEX IF EXISTS ix_pipeline_spans_generation_id")
+    op.execute("DROP INDEX IF EXISTS ix_pipeline_spans_trace_id")
+    op.execute("DROP TABLE IF EXISTS pipeline_spans")
@@ -0,0 +1,34 @@
+"""add compiled script AST columns to scripts
+
+Revision ID: scriptast01
+Revises: creditbalances01
+Create Date: 2026-10-18
+
+Scripts store the compact form of their compiled screenplay (scenes, shots,
+dialogue, SFX and music cues with stable node ids) next to the sha256 of the
+text it was compiled from. Generation tasks read it instead of re-parsing
+the script text in every stage.
+
+Existing rows are left NULL and are compiled lazily on next use or save.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "scriptast01"
+down_revision: Union[str, Sequence[str], None] = "creditbalances01"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE scripts ADD COLUMN IF NOT EXISTS script_hash VARCHAR(64)")
+    op.execute("ALTER TABLE scripts ADD COLUMN IF NOT EXISTS script_ast JSONB")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE scripts DROP COLUMN IF EXISTS script_ast")
+    op.execute("ALTER TABLE scripts DROP COLUMN IF EXISTS script_hash")
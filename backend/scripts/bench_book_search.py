@@ -0,0 +1,201 @@
+"""
+Benchmark GET /books/search: query-time to_tsvector() vs stored search_vector.
+
+Builds a throwaway schema with a synthetic corpus (default 5,000 chapters of
+~1,500 words across 250 books owned by one user), then times the legacy
+query the route used to run against BookSearchService, which matches on the
+GIN-indexed generated columns and only headlines the returned page.
+
+Usage (needs a Postgres reachable through DATABASE_URL):
+    python backend/scripts/bench_book_search.py --chapters 5000 --runs 5
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import string
+import sys
+import time
+import uuid
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from app.books.search import BookSearchService  # noqa: E402
+
+SCHEMA = "bench_book_search"
+QUERIES = ["ancient river", "storm lighthouse keeper", "forgotten kingdom"]
+
+# The predicate GET /books/search evaluated before stored vectors existed
+LEGACY_CHAPTER_SQL = text(
+    """
+    SELECT c.* FROM chapters c JOIN books b ON b.id = c.book_id
+    WHERE b.user_id = :user_id AND (
+        to_tsvector('english', coalesce(c.title, '')) @@ plainto_tsquery('english', :query)
+        OR to_tsvector('english', coalesce(c.content, '')) @@ plainto_tsquery('english', :query)
+    )
+    LIMIT 20
+    """
+)
+
+
+def _vocabulary(size: int) -> list:
+    rng = random.Random(42)
+    words = ["ancient", "river", "storm", "lighthouse", "keeper", "forgotten", "kingdom"]
+    while len(words) < size:
+        words.append("".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))))
+    return words
+
+
+async def _setup(conn, books: int, chapters: int, words_per_chapter: int, user_id: uuid.UUID):
+    await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    await conn.execute(text(f"SET search_path TO {SCHEMA}"))
+    await conn.execute(
+        text(
+            """
+            CREATE TABLE books (
+                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                user_id UUID NOT NULL,
+                title VARCHAR NOT NULL,
+                author_name VARCHAR,
+                description VARCHAR,
+                cover_image_url VARCHAR,
+                search_vector tsvector GENERATED ALWAYS AS (
+                    setweight(to_tsvector('english', coalesce(title, '')), 'A')
+                    || setweight(to_tsvector('english', coalesce(author_name, '')), 'B')
+                    || setweight(to_tsvector('english', coalesce(description, '')), 'C')
+                ) STORED
+            )
+            """
+        )
+    )
+    await conn.execute(
+        text(
+            """
+            CREATE TABLE chapters (
+                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                book_id UUID NOT NULL REFERENCES books(id),
+                title VARCHAR NOT NULL,
+                content TEXT NOT NULL,
+                chapter_number INTEGER,
+                search_vector tsvector GENERATED ALWAYS AS (
+                    setweight(to_tsvector('english', coalesce(title, '')), 'A')
+                    || setweight(to_tsvector('english', coalesce(content, '')), 'D')
+                ) STORED
+            )
+            """
+        )
+    )
+    rng = random.Random(7)
+    vocab = _vocabulary(4000)
+    book_ids = [uuid.uuid4() for _ in range(books)]
+    await conn.execute(
+        text(
+            "INSERT INTO books (id, user_id, title, author_name, description) "
+            "VALUES (:id, :user_id, :title, :author_name, :description)"
+        ),
+        [
+            {
+                "id": book_id,
+                "user_id": user_id,
+                "title": f"Book {n}",
+                "author_name": f"Author {n % 17}",
+                "description": " ".join(rng.choices(vocab, k=60)),
+            }
+            for n, book_id in enumerate(book_ids, start=1)
+        ],
+    )
+    insert_chapter = text(
+        "INSERT INTO chapters (book_id, title, content, chapter_number) "
+        "VALUES (:book_id, :title, :content, :chapter_number)"
+    )
+    for batch_start in range(0, chapters, 500):
+        await conn.execute(
+            insert_chapter,
+            [
+                {
+                    "book_id": book_ids[n % books],
+                    "title": f"Chapter {n}",
+                    "content": " ".join(rng.choices(vocab, k=words_per_chapter)),
+                    "chapter_number": n,
+                }
+                for n in range(batch_start, min(batch_start + 500, chapters))
+            ],
+        )
+    await conn.execute(text("CREATE INDEX ON books USING GIN (search_vector)"))
+    await conn.execute(text("CREATE INDEX ON chapters USING GIN (search_vector)"))
+    await conn.execute(text("CREATE INDEX ON chapters (book_id)"))
+    await conn.execute(text("ANALYZE books"))
+    await conn.execute(text("ANALYZE chapters"))
+
+
+async def _time(fn, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--books", type=int, default=250)
+    parser.add_argument("--chapters", type=int, default=5000)
+    parser.add_argument("--words", type=int, default=1500, help="words per chapter")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark schema")
+    args = parser.parse_args()
+
+    database_url = os.environ.get("DATABASE_URL")
+    if not database_url:
+        sys.exit("DATABASE_URL is not set")
+
+    engine = create_async_engine(database_url)
+    user_id = uuid.uuid4()
+    try:
+        async with engine.begin() as conn:
+            started = time.perf_counter()
+            await _setup(conn, args.books, args.chapters, args.words, user_id)
+            print(
+                f"Seeded {args.books} books / {args.chapters} chapters "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+
+        async with AsyncSession(engine) as session:
+            await session.execute(text(f"SET search_path TO {SCHEMA}"))
+            service = BookSearchService(session)
+
+            print(f"\n{'query':<28}{'legacy ms':>12}{'indexed ms':>12}{'speedup':>10}{'hits':>7}")
+            for query in QUERIES:
+                legacy = await _time(
+                    lambda: session.execute(
+                        LEGACY_CHAPTER_SQL, {"user_id": user_id, "query": query}
+                    ),
+                    args.runs,
+                )
+
+                indexed_ms = await _time(
+                    lambda: service.search_chapters(user_id, query, limit=21), args.runs
+                )
+                hits = len(await service.search_chapters(user_id, query, limit=21))
+                print(
+                    f"{query:<28}{legacy:>12.1f}{indexed_ms:>12.1f}"
+                    f"{legacy / indexed_ms:>9.1f}x{hits:>7}"
+                )
+    finally:
+        if not args.keep:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,443 @@
+"""
+Benchmark the audio, image, video and merge pipeline end to end, offline.
+
+Starts scripts/fake_providers.py in a subprocess and points the ModelsLab,
+PiAPI and ElevenLabs clients at it, so no provider account is touched. Each
+run seeds a user, book, chapter, script and video_generations row carrying a
+synthetic N-scene script, then runs the Celery stage bodies in order the way
+a worker does (task.run on the shared async runtime). Chained .delay() and
+.apply_async() calls are recorded instead of queued: the harness drives the
+stages itself. Between the image and video stages the generated images are
+handed over in the shape the /generate-video route stores.
+
+Per stage it reports wall time, CPU time (this process, plus ffmpeg and
+other children), peak RSS and the number of SQL statements executed.
+
+Needs a migrated Postgres (alembic upgrade head) in DATABASE_URL, MinIO
+reachable through the MINIO_* settings and ffmpeg on PATH for the video and
+merge stages. Seeded rows are deleted afterwards unless --keep is given.
+
+Usage:
+    python backend/scripts/bench_pipeline.py --scenes 4 --runs 3 --latency-ms 100
+"""
+
+import argparse
+import json
+import os
+import resource
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from scripts.fake_providers import provider_env  # noqa: E402
+
+STAGES = ("audio", "image", "video", "merge")
+CHARACTERS = ["Mara", "Theo"]
+LOCATIONS = ["LIGHTHOUSE STAIRS", "HARBOUR MARKET", "CLIFF PATH", "KEEPER'S COTTAGE"]
+
+
+@dataclass
+class StageResult:
+    stage: str
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    child_cpu_s: float = 0.0
+    peak_rss_mb: float = 0.0
+    queries: int = 0
+    ok: bool = False
+    status: str = ""
+    error: Optional[str] = None
+    deferred: List[str] = field(default_factory=list)
+
+
+def build_script(scenes: int) -> Dict[str, Any]:
+    """script_data for a synthetic cinematic script with one shot per scene."""
+    lines, descriptions = [], []
+    for n in range(1, scenes + 1):
+        location = LOCATIONS[(n - 1) % len(LOCATIONS)]
+        speaker, listener = CHARACTERS[n % 2], CHARACTERS[(n + 1) % 2]
+        lines += [
+            f"**ACT I - SCENE {n}**",
+            "",
+            f"INT. {location} - NIGHT",
+            "",
+            f"{speaker.upper()}: The lamp has to be lit before the tide turns, {listener}.",
+            f"{listener.upper()}: Then we climb now.",
+            "SFX: wind rattling the shutters",
+            "MUSIC: low strings, building",
+            "",
+        ]
+        descriptions.append(
+            {
+                "scene_number": n,
+                "description": f"{speaker} and {listener} on the {location.lower()} at night, storm outside",
+                "location": location,
+                "characters": [speaker, listener],
+            }
+        )
+    return {
+        "script": "\n".join(lines),
+        "characters": CHARACTERS,
+        "scene_descriptions": descriptions,
+        "video_style": "cinematic",
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_fake_providers(args) -> subprocess.Popen:
+    port = args.fake_port or _free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(SCRIPT_DIR, "fake_providers.py"),
+            "--port", str(port),
+            "--latency-ms", str(args.latency_ms),
+            "--failure-rate", str(args.failure_rate),
+            "--processing-polls", str(args.processing_polls),
+            "--seed", "7",
+        ]
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            urllib.request.urlopen(f"{base_url}/_fake/stats", timeout=1).read()
+            break
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise SystemExit("fake provider server did not start")
+            time.sleep(0.2)
+    process.base_url = base_url
+    return process
+
+
+def _peak_rss_mb() -> float:
+    """Peak RSS since the last _reset_peak_rss(), falling back to lifetime peak."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _reset_peak_rss() -> None:
+    # Linux resets VmHWM to the current RSS when "5" is written here
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        pass
+
+
+def _children_cpu() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenes", type=int, default=4)
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--tier", default="free")
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--processing-polls", type=int, default=0)
+    parser.add_argument("--fake-port", type=int, default=None)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--json", dest="json_path", help="also write raw results here")
+    parser.add_argument("--keep", action="store_true", help="keep seeded rows")
+    args = parser.parse_args()
+
+    fake = start_fake_providers(args)
+    # Settings are read at import time, so the environment has to point at
+    # the fake before anything under app/ is imported.
+    os.environ.update(provider_env(fake.base_url))
+    os.environ.setdefault("MODELSLAB_MEDIA_PUBLIC_URL", "https://media.bench.invalid")
+    try:
+        runs = [run_pipeline(args, n) for n in range(1, args.runs + 1)]
+        provider_stats = json.loads(
+            urllib.request.urlopen(f"{fake.base_url}/_fake/stats").read()
+        )
+    finally:
+        fake.send_signal(signal.SIGINT)
+        fake.wait(timeout=10)
+
+    report(runs, provider_stats)
+    if args.json_path:
+        with open(args.json_path, "w") as handle:
+            json.dump(
+                {"runs": [[vars(r) for r in run] for run in runs], "providers": provider_stats},
+                handle,
+                indent=2,
+            )
+
+
+def run_pipeline(args, run_number: int) -> List[StageResult]:
+    from celery.app.task import Task
+    from sqlalchemy import event
+
+    from app.core.async_runtime import run_async
+    from app.core.database import engine
+    from app.core.db_model_registry import load_models
+    from app.tasks.audio_tasks import generate_all_audio_for_video
+    from app.tasks.image_tasks import generate_all_images_for_video
+    from app.tasks.merge_tasks import merge_audio_video_for_generation
+    from app.tasks.video_tasks import generate_all_videos_for_generation
+
+    tasks = {
+        "audio": generate_all_audio_for_video,
+        "image": generate_all_images_for_video,
+        "video": generate_all_videos_for_generation,
+        "merge": merge_audio_video_for_generation,
+    }
+    load_models()
+    queries = [0]
+    deferred: List[str] = []
+
+    def count_query(*_):
+        queries[0] += 1
+
+    def record_apply_async(self, args=None, kwargs=None, **options):
+        deferred.append(self.name)
+
+    user_id, video_generation_id = run_async(seed(args.scenes, args.tier))
+    print(f"\nrun {run_number}: video_generation {video_generation_id}")
+
+    original_apply_async = Task.apply_async
+    Task.apply_async = record_apply_async
+    event.listen(engine.sync_engine, "before_cursor_execute", count_query)
+    results = []
+    try:
+        for stage in args.stages:
+            if stage == "video":
+                run_async(hand_over_images(video_generation_id))
+            result = StageResult(stage)
+            deferred.clear()
+            queries[0] = 0
+            _reset_peak_rss()
+            wall, cpu, child_cpu = time.perf_counter(), time.process_time(), _children_cpu()
+            try:
+                outcome = tasks[stage].run(video_generation_id)
+                result.ok = not (isinstance(outcome, dict) and outcome.get("status") in ("error", "failed"))
+                if isinstance(outcome, dict) and outcome.get("error"):
+                    result.error = str(outcome["error"])
+            except Exception as exc:
+                result.error = f"{type(exc).__name__}: {exc}"
+            result.wall_s = time.perf_counter() - wall
+            result.cpu_s = time.process_time() - cpu
+            result.child_cpu_s = _children_cpu() - child_cpu
+            result.peak_rss_mb = _peak_rss_mb()
+            result.queries = queries[0]
+            result.deferred = list(deferred)
+            result.status = run_async(generation_status(video_generation_id))
+            results.append(result)
+            print(
+                f"  {stage:<6} {'ok' if result.ok else 'FAILED':<7}"
+                f"{result.wall_s:>8.2f}s  status={result.status}"
+                + (f"  error={result.error[:120]}" if result.error else "")
+            )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_query)
+        Task.apply_async = original_apply_async
+        if not args.keep:
+            run_async(cleanup(user_id))
+    return results
+
+
+async def seed(scenes: int, tier: str):
+    from app.auth.models import User
+    from app.books.models import Book, Chapter
+    from app.core.database import async_session
+    from app.subscriptions.models import UserSubscription
+    from app.videos.models import Script, VideoGeneration
+
+    script_data = build_script(scenes)
+    user = User(
+        email=f"bench-{uuid.uuid4().hex[:12]}@bench.invalid",
+        hashed_password="!",
+        is_active=True,
+    )
+    async with async_session() as session:
+        session.add(user)
+        await session.flush()
+        session.add(UserSubscription(user_id=user.id, tier=tier))
+        book = Book(
+            user_id=user.id, title="Pipeline benchmark", book_type="fiction", total_chapters=1
+        )
+        session.add(book)
+        await session.flush()
+        chapter = Chapter(
+            book_id=book.id, title="The Lamp", content=script_data["script"], chapter_number=1
+        )
+        session.add(chapter)
+        await session.flush()
+        script = Script(
+            chapter_id=chapter.id,
+            user_id=user.id,
+            script_style="cinematic_movie",
+            script=script_data["script"],
+            video_style=script_data["video_style"],
+            status="ready",
+            characters=script_data["characters"],
+            scene_descriptions=script_data["scene_descriptions"],
+        )
+        session.add(script)
+        await session.flush()
+        video_generation = VideoGeneration(
+            chapter_id=chapter.id,
+            user_id=user.id,
+            script_id=script.id,
+            generation_status="pending",
+            script_data=script_data,
+        )
+        session.add(video_generation)
+        await session.commit()
+        return user.id, str(video_generation.id)
+
+
+async def hand_over_images(video_generation_id: str) -> None:
+    """Nest stage-generated images under image_data["images"] like the route does."""
+    from sqlalchemy import text
+
+    from app.core.database import engine
+
+    async with engine.begin() as conn:
+        row = (
+            await conn.execute(
+                text("SELECT image_data FROM video_generations WHERE id = :id"),
+                {"id": video_generation_id},
+            )
+        ).first()
+        image_data = (row and row[0]) or {}
+        if not image_data or "images" in image_data:
+            return
+        scene_images = []
+        for index, image in enumerate(image_data.get("scene_images") or [], start=1):
+            if image and image.get("image_url"):
+                scene_images.append(
+                    {
+                        **image,
+                        "url": image["image_url"],
+                        "scene_number": image.get("scene_number") or index,
+                        "shot_index": image.get("shot_index") or 0,
+                    }
+                )
+        images = {
+            "character_images": [i for i in image_data.get("character_images") or [] if i],
+            "scene_images": scene_images,
+        }
+        await conn.execute(
+            text(
+                "UPDATE video_generations SET image_data = :image_data, "
+                "generation_status = 'images_completed' WHERE id = :id"
+            ),
+            {"image_data": json.dumps({**image_data, "images": images}), "id": video_generation_id},
+        )
+
+
+async def generation_status(video_generation_id: str) -> str:
+    from sqlalchemy import text
+
+    from app.core.database import engine
+
+    async with engine.connect() as conn:
+        row = (
+            await conn.execute(
+                text("SELECT generation_status FROM video_generations WHERE id = :id"),
+                {"id": video_generation_id},
+            )
+        ).first()
+        return str(row[0]) if row else "missing"
+
+
+async def cleanup(user_id: uuid.UUID) -> None:
+    """Delete every row the run created, retrying tables blocked by foreign keys."""
+    from sqlalchemy import text
+
+    from app.auth.models import User
+    from app.core.database import engine
+
+    user_table = User.__table__.name
+    async with engine.connect() as conn:
+        tables = [
+            row[0]
+            for row in await conn.execute(
+                text(
+                    "SELECT table_name FROM information_schema.columns "
+                    "WHERE table_schema = current_schema() AND column_name = 'user_id'"
+                )
+            )
+        ]
+        await conn.commit()
+        # user_id is a UUID in most tables and a string in a few
+        statements = [
+            f'DELETE FROM "{table}" WHERE user_id::text = :user_id' for table in tables
+        ] + [
+            "DELETE FROM chapters WHERE book_id IN "
+            "(SELECT id FROM books WHERE user_id::text = :user_id)",
+            f'DELETE FROM "{user_table}" WHERE id::text = :user_id',
+        ]
+        for _ in range(4):
+            blocked = []
+            for statement in statements:
+                transaction = await conn.begin()
+                try:
+                    await conn.execute(text(statement), {"user_id": str(user_id)})
+                    await transaction.commit()
+                except Exception:
+                    await transaction.rollback()
+                    blocked.append(statement)
+            if not blocked:
+                return
+            statements = blocked
+        print(f"cleanup left rows behind for user {user_id}: {len(statements)} tables blocked")
+
+
+def report(runs: List[List[StageResult]], provider_stats: Dict[str, Any]) -> None:
+    print(
+        f"\n{'stage':<8}{'ok':>6}{'wall s':>10}{'cpu s':>9}{'child s':>9}"
+        f"{'peak MB':>10}{'queries':>9}{'deferred':>10}"
+    )
+    for stage in STAGES:
+        samples = [r for run in runs for r in run if r.stage == stage]
+        if not samples:
+            continue
+        print(
+            f"{stage:<8}{sum(r.ok for r in samples):>3}/{len(samples):<2}"
+            f"{statistics.median(r.wall_s for r in samples):>10.2f}"
+            f"{statistics.median(r.cpu_s for r in samples):>9.2f}"
+            f"{statistics.median(r.child_cpu_s for r in samples):>9.2f}"
+            f"{max(r.peak_rss_mb for r in samples):>10.1f}"
+            f"{statistics.median(r.queries for r in samples):>9.0f}"
+            f"{statistics.median(len(r.deferred) for r in samples):>10.0f}"
+        )
+    print("(medians over runs; peak MB is the maximum)")
+
+    print(f"\n{'provider call':<44}{'requests':>10}{'failed':>8}")
+    for call, count in sorted(provider_stats["requests"].items()):
+        print(f"{call:<44}{count:>10}{provider_stats['failures'].get(call, 0):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark BookStructureDetector on multi-thousand-page synthetic books.
+
+Each book has roughly 40 lines per page: chapter headings in the formats
+CHAPTER_PATTERNS covers, PART headings, front/back matter, a contents page,
+page numbers and prose. The benchmark times:
+
+  * classify  - building the LineIndex (one pass, compiled patterns)
+  * legacy    - the per-line re.match loop over raw pattern strings plus the
+                20-line forward rescan the detector ran before LineIndex
+  * detect    - detect_structure() end to end
+
+Usage:
+    python backend/scripts/bench_structure_detection.py --pages 1000 3000 6000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import re
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from app.core.services.file import BookStructureDetector  # noqa: E402
+
+LINES_PER_PAGE = 40
+WORDS = (
+    "the sea whale ship captain storm night harbor rope sail deck morning "
+    "river ancient keeper lantern tide island fog"
+).split()
+ROMAN = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X"]
+
+
+def build_book(pages: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    out = ["CONTENTS", ""]
+    out += [f"Chapter {n} The {rng.choice(WORDS).title()} {n * 9}" for n in range(1, 30)]
+    out += ["", "PREFACE", ""]
+    chapter = 0
+    while len(out) < pages * LINES_PER_PAGE:
+        chapter += 1
+        if chapter % 25 == 1:
+            out += ["", f"PART {ROMAN[(chapter // 25) % 10]}", ""]
+        style = chapter % 3
+        if style == 0:
+            out += ["", f"CHAPTER {chapter}. The {rng.choice(WORDS).title()}", ""]
+        elif style == 1:
+            out += ["", f"Chapter {ROMAN[chapter % 10]}", "", "A Title Line Here", ""]
+        else:
+            out += ["", f"{chapter % 999}. {rng.choice(WORDS).title()} {rng.choice(WORDS)}", ""]
+        for _ in range(rng.randint(60, 200)):
+            out.append(" ".join(rng.choices(WORDS, k=rng.randint(8, 16))).capitalize() + ".")
+            if rng.random() < 0.05:
+                out += ["", str(rng.randint(1, 999)), ""]
+    out += ["", "EPILOGUE", ""]
+    out += [" ".join(rng.choices(WORDS, k=12)) for _ in range(40)]
+    return "\n".join(out)
+
+
+def legacy_scan(detector: BookStructureDetector, lines) -> int:
+    """Cost model of the pre-LineIndex loop: every helper re-runs raw patterns."""
+    hits = 0
+    for line_num, raw in enumerate(lines):
+        line = raw.strip()
+        if not line:
+            continue
+        for patterns in (
+            detector.TOC_PATTERNS,
+            detector.SECTION_PATTERNS,
+            detector.SPECIAL_SECTIONS,
+            detector.CHAPTER_PATTERNS,
+        ):
+            for pattern in patterns:
+                if re.match(pattern, line):
+                    hits += 1
+                    break
+        # _has_substantial_following_content rescanned the next 20 lines
+        content_lines = 0
+        for i in range(line_num + 1, min(len(lines), line_num + 20)):
+            following = lines[i].strip()
+            if following and not re.match(r"^\d+$", following):
+                content_lines += 1
+        hits += content_lines >= 10
+    return hits
+
+
+def _time(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1000, 3000, 6000])
+    parser.add_argument("--skip-legacy", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{'pages':>7}{'lines':>10}{'classify ms':>14}{'legacy ms':>12}{'detect ms':>12}")
+    for pages in args.pages:
+        text = build_book(pages)
+        lines = text.split("\n")
+
+        detector = BookStructureDetector()
+        classify_ms = _time(lambda: detector._get_line_index(lines))
+
+        legacy_ms = float("nan")
+        if not args.skip_legacy:
+            legacy_ms = _time(lambda: legacy_scan(BookStructureDetector(), lines))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            detect_ms = _time(lambda: BookStructureDetector().detect_structure(text))
+
+        print(
+            f"{pages:>7}{len(lines):>10}{classify_ms:>14.0f}{legacy_ms:>12.0f}{detect_ms:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark chapter-title lookup: per-title str.find passes vs TitleLocator.
+
+FileService._find_title_occurrences used to scan the whole book four times
+per chapter (exact, UPPER, lower, Title case). TitleLocator indexes every
+title of every chapter in one pass over the case-folded text.
+
+Usage:
+    python backend/scripts/bench_title_locator.py --chapters 20 80 200 --words 4000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from app.core.services.title_locator import TitleLocator  # noqa: E402
+
+WORDS = (
+    "the sea whale ship captain storm night harbor rope sail deck morning "
+    "river ancient keeper lantern tide island fog"
+).split()
+
+
+def build_book(chapters: int, words_per_chapter: int, seed: int = 1):
+    rng = random.Random(seed)
+    titles = [
+        f"{' '.join(rng.choices(WORDS, k=3)).title()} {n}" for n in range(1, chapters + 1)
+    ]
+    parts = ["CONTENTS", *titles]
+    for title in titles:
+        parts += ["", title.upper(), " ".join(rng.choices(WORDS, k=words_per_chapter))]
+    return "\n".join(parts), titles
+
+
+def find_passes(text: str, titles) -> int:
+    hits = 0
+    for title in titles:
+        for variant in (title, title.upper(), title.lower(), title.title()):
+            start = 0
+            while (pos := text.find(variant, start)) != -1:
+                hits += 1
+                start = pos + 1
+    return hits
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chapters", type=int, nargs="+", default=[20, 80, 200])
+    parser.add_argument("--words", type=int, default=4000, help="words per chapter")
+    args = parser.parse_args()
+
+    print(f"{'chapters':>9}{'MB':>7}{'find passes ms':>16}{'locator ms':>12}")
+    for chapters in args.chapters:
+        text, titles = build_book(chapters, args.words)
+
+        started = time.perf_counter()
+        find_passes(text, titles)
+        find_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        variants = [v for t in titles for v in (t, t.upper(), t.lower(), t.title())]
+        locator = TitleLocator(text, variants)
+        for title in titles:
+            locator.exact_positions([title, title.upper(), title.lower(), title.title()])
+        locator_ms = (time.perf_counter() - started) * 1000
+
+        print(f"{chapters:>9}{len(text) / 1e6:>7.1f}{find_ms:>16.0f}{locator_ms:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
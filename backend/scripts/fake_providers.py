@@ -0,0 +1,411 @@
+"""
+Local stand-in for the ModelsLab V7, PiAPI task and ElevenLabs HTTP APIs.
+
+Answers with the response shapes the real services parse, after a
+configurable latency, and fails a configurable fraction of calls. Generated
+media (a tiny PNG, WAV and, when ffmpeg is on PATH, MP3/MP4) is served from
+/media so downstream downloads, uploads and ffmpeg merges run for real.
+
+Point the backend at it with the variables printed by --print-env:
+    MODELSLAB_BASE_URL, MODELSLAB_V6_BASE_URL, PIAPI_BASE_URL, ELEVENLABS_BASE_URL
+
+Runtime knobs (JSON, global or per provider):
+    POST /_fake/config {"latency_ms": 50, "providers": {"modelslab": {"failure_rate": 0.1}}}
+    GET  /_fake/stats   POST /_fake/reset
+
+Usage:
+    python backend/scripts/fake_providers.py --port 8900 --latency-ms 200 --failure-rate 0.05
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import random
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import uuid
+import wave
+import zlib
+from collections import Counter
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Dict, Optional
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(SCRIPT_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import JSONResponse, Response  # noqa: E402
+
+# ModelsLab endpoint (relative to the versioned base URL) -> media it returns
+MODELSLAB_ROUTES = {
+    "v7/images/text-to-image": "png",
+    "v7/images/image-to-image": "png",
+    "v7/video-fusion/image-to-video": "mp4",
+    "v7/video-fusion/lip-sync": "mp4",
+    "v7/voice/text-to-speech": "wav",
+    "v7/voice/sound-generation": "wav",
+    "v7/voice/music-gen": "wav",
+    "v6/image_editing/super_resolution": "png",
+}
+
+MEDIA_TYPES = {
+    "png": "image/png",
+    "wav": "audio/wav",
+    "mp3": "audio/mpeg",
+    "mp4": "video/mp4",
+}
+
+
+@dataclass
+class FakeProviderConfig:
+    latency_ms: float = 200.0
+    jitter_ms: float = 0.0
+    failure_rate: float = 0.0
+    # Fetch/poll calls answered with "processing" before a task completes;
+    # 0 makes ModelsLab answer synchronously.
+    processing_polls: int = 0
+    media_seconds: float = 1.0
+    providers: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def for_provider(self, provider: str) -> "FakeProviderConfig":
+        overrides = self.providers.get(provider) or {}
+        return replace(self, providers={}, **overrides)
+
+    def update(self, values: Dict[str, Any]) -> None:
+        for name, value in values.items():
+            if name == "providers":
+                for provider, overrides in value.items():
+                    self.providers.setdefault(provider, {}).update(overrides)
+            elif name in self.__dataclass_fields__:
+                setattr(self, name, type(getattr(self, name))(value))
+            else:
+                raise ValueError(f"Unknown setting: {name}")
+
+
+def tiny_png(width: int = 64, height: int = 64, rgb=(40, 90, 160)) -> bytes:
+    """Solid-colour PNG built with zlib, no imaging library needed."""
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        body = tag + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    row = b"\x00" + bytes(rgb) * width
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(row * height))
+        + chunk(b"IEND", b"")
+    )
+
+
+def tiny_wav(seconds: float = 1.0, rate: int = 16000, tone_hz: float = 440.0) -> bytes:
+    buffer = io.BytesIO()
+    frames = int(seconds * rate)
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(
+            b"".join(
+                struct.pack("<h", int(3000 * math.sin(2 * math.pi * tone_hz * n / rate)))
+                for n in range(frames)
+            )
+        )
+    return buffer.getvalue()
+
+
+def _ffmpeg_encode(args: list, suffix: str) -> Optional[bytes]:
+    if not shutil.which("ffmpeg"):
+        return None
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, f"out.{suffix}")
+        completed = subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error", *args, output],
+            capture_output=True,
+        )
+        if completed.returncode != 0:
+            return None
+        with open(output, "rb") as handle:
+            return handle.read()
+
+
+def tiny_mp3(seconds: float = 1.0) -> Optional[bytes]:
+    return _ffmpeg_encode(
+        ["-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}", "-b:a", "32k"], "mp3"
+    )
+
+
+def tiny_mp4(seconds: float = 1.0) -> Optional[bytes]:
+    return _ffmpeg_encode(
+        [
+            "-f", "lavfi", "-i", f"color=c=navy:s=64x64:d={seconds}:r=12",
+            "-f", "lavfi", "-i", f"anullsrc=r=16000:cl=mono:d={seconds}",
+            "-c:v", "libx264", "-pix_fmt", "yuv420p", "-c:a", "aac", "-shortest",
+        ],
+        "mp4",
+    )
+
+
+class FakeProviderState:
+    """Config, pending tasks and request counters shared by the routes."""
+
+    def __init__(self, config: FakeProviderConfig, seed: Optional[int] = None):
+        self.config = config
+        self.rng = random.Random(seed)
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.requests: Counter = Counter()
+        self.failures: Counter = Counter()
+        self._media: Dict[str, Optional[bytes]] = {}
+
+    def media(self, kind: str) -> Optional[bytes]:
+        if kind not in self._media:
+            seconds = self.config.media_seconds
+            builders = {
+                "png": tiny_png,
+                "wav": lambda: tiny_wav(seconds),
+                "mp3": lambda: tiny_mp3(seconds),
+                "mp4": lambda: tiny_mp4(seconds),
+            }
+            self._media[kind] = builders[kind]()
+        return self._media[kind]
+
+    async def call(self, provider: str, route: str) -> bool:
+        """Apply latency; return False when this call should fail."""
+        config = self.config.for_provider(provider)
+        self.requests[f"{provider} {route}"] += 1
+        delay = config.latency_ms + self.rng.uniform(0, config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if self.rng.random() < config.failure_rate:
+            self.failures[f"{provider} {route}"] += 1
+            return False
+        return True
+
+    def new_task(self, provider: str, kind: str, **extra: Any) -> str:
+        task_id = uuid.uuid4().hex
+        polls = self.config.for_provider(provider).processing_polls
+        self.tasks[task_id] = {"kind": kind, "polls_left": polls, **extra}
+        return task_id
+
+    def poll(self, task_id: str) -> Optional[bool]:
+        """True while the task is still processing, None for unknown ids."""
+        task = self.tasks.get(task_id)
+        if task is None:
+            return None
+        if task["polls_left"] > 0:
+            task["polls_left"] -= 1
+            return True
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "config": asdict(self.config),
+            "requests": dict(self.requests),
+            "failures": dict(self.failures),
+            "pending_tasks": sum(1 for t in self.tasks.values() if t["polls_left"] > 0),
+        }
+
+
+def create_app(
+    config: Optional[FakeProviderConfig] = None, seed: Optional[int] = None
+) -> FastAPI:
+    app = FastAPI(title="Fake media providers")
+    state = FakeProviderState(config or FakeProviderConfig(), seed=seed)
+    app.state.fake = state
+
+    def media_url(request: Request, kind: str) -> str:
+        return f"{str(request.base_url).rstrip('/')}/media/{uuid.uuid4().hex}.{kind}"
+
+    # ModelsLab: sync "success" or "processing" + fetch_result/future_links
+    def modelslab_output(request: Request, kind: str, task_id: str) -> Dict[str, Any]:
+        url = media_url(request, kind)
+        return {
+            "status": "success",
+            "id": task_id,
+            "output": [url],
+            "proxy_links": [url],
+            "generation_time": state.config.latency_ms / 1000,
+            "meta": {"fake": True},
+        }
+
+    @app.post("/modelslab/api/{version}/{path:path}")
+    async def modelslab(version: str, path: str, request: Request):
+        route = f"{version}/{path}"
+        if path.startswith("fetch/"):
+            task_id = path.split("/", 1)[1]
+            if not await state.call("modelslab", "fetch"):
+                return {"status": "error", "message": "Fake provider fetch failure"}
+            processing = state.poll(task_id)
+            if processing is None:
+                return {"status": "error", "message": f"Unknown request id {task_id}"}
+            if processing:
+                return {"status": "processing", "id": task_id, "eta": 1}
+            return modelslab_output(request, state.tasks[task_id]["kind"], task_id)
+
+        kind = MODELSLAB_ROUTES.get(route)
+        if kind is None:
+            return JSONResponse({"status": "error", "message": f"No fake for {route}"}, 404)
+        if not await state.call("modelslab", route):
+            # ModelsLab reports most failures as HTTP 200 with status "error"
+            return {"status": "error", "message": "Fake provider failure"}
+
+        task_id = state.new_task("modelslab", kind)
+        if not state.config.for_provider("modelslab").processing_polls:
+            return modelslab_output(request, kind, task_id)
+        base = str(request.base_url).rstrip("/")
+        return {
+            "status": "processing",
+            "id": task_id,
+            "eta": 1,
+            "fetch_result": f"{base}/modelslab/api/{version}/fetch/{task_id}",
+            "future_links": [],
+            "meta": {"fake": True},
+        }
+
+    # PiAPI unified task API
+    piapi_outputs = {"png": "image_url", "mp4": "video_url", "wav": "audio_url"}
+
+    @app.post("/piapi/api/v1/task")
+    async def piapi_create(request: Request):
+        payload = await request.json()
+        if not await state.call("piapi", "create_task"):
+            return JSONResponse({"code": 500, "message": "Fake provider failure"}, 500)
+        task_type = str(payload.get("task_type") or "")
+        kind = "mp4" if "video" in task_type else "wav" if (
+            "audio" in task_type or "tts" in task_type or "music" in task_type
+        ) else "png"
+        task_id = state.new_task("piapi", kind, model=payload.get("model"), task_type=task_type)
+        return {"code": 200, "data": {"task_id": task_id, "status": "pending"}}
+
+    @app.get("/piapi/api/v1/task/{task_id}")
+    async def piapi_poll(task_id: str, request: Request):
+        if not await state.call("piapi", "poll_task"):
+            return JSONResponse({"code": 500, "message": "Fake provider failure"}, 500)
+        processing = state.poll(task_id)
+        if processing is None:
+            return JSONResponse({"code": 404, "message": "task not found"}, 404)
+        task = state.tasks[task_id]
+        data = {"task_id": task_id, "model": task["model"], "task_type": task["task_type"]}
+        if processing:
+            data["status"] = "processing"
+        else:
+            data["status"] = "completed"
+            data["output"] = {piapi_outputs[task["kind"]]: media_url(request, task["kind"])}
+        return {"code": 200, "data": data}
+
+    # ElevenLabs: synchronous audio bytes
+    @app.post("/elevenlabs/v1/text-to-speech/{voice_id}")
+    async def elevenlabs_tts(voice_id: str):
+        if not await state.call("elevenlabs", "text-to-speech"):
+            return JSONResponse({"detail": {"status": "fake_failure"}}, 500)
+        audio = state.media("mp3")
+        if audio is not None:
+            return Response(audio, media_type=MEDIA_TYPES["mp3"])
+        return Response(state.media("wav"), media_type=MEDIA_TYPES["wav"])
+
+    @app.get("/elevenlabs/v1/voices")
+    async def elevenlabs_voices():
+        await state.call("elevenlabs", "voices")
+        return {
+            "voices": [
+                {"voice_id": "21m00Tcm4TlvDq8ikWAM", "name": "Rachel", "category": "premade"},
+                {"voice_id": "pNInz6obpgDQGcFmaJgB", "name": "Adam", "category": "premade"},
+            ]
+        }
+
+    @app.get("/media/{name}")
+    async def media(name: str):
+        kind = name.rsplit(".", 1)[-1]
+        if kind not in MEDIA_TYPES:
+            return Response(status_code=404)
+        body = state.media(kind)
+        if body is None:
+            return Response(f"{kind} needs ffmpeg on PATH", status_code=503)
+        return Response(body, media_type=MEDIA_TYPES[kind])
+
+    @app.get("/_fake/stats")
+    async def stats():
+        return state.stats()
+
+    @app.post("/_fake/config")
+    async def configure(request: Request):
+        try:
+            state.config.update(await request.json())
+        except (TypeError, ValueError) as exc:
+            return JSONResponse({"error": str(exc)}, 400)
+        state._media.clear()
+        return state.stats()
+
+    @app.post("/_fake/reset")
+    async def reset():
+        state.tasks.clear()
+        state.requests.clear()
+        state.failures.clear()
+        return state.stats()
+
+    return app
+
+
+def provider_env(base_url: str) -> Dict[str, str]:
+    """Settings that route the backend's provider clients to the fake."""
+    base_url = base_url.rstrip("/")
+    return {
+        "MODELSLAB_BASE_URL": f"{base_url}/modelslab/api/v7",
+        "MODELSLAB_V6_BASE_URL": f"{base_url}/modelslab/api/v6",
+        "PIAPI_BASE_URL": f"{base_url}/piapi/v1",
+        "ELEVENLABS_BASE_URL": f"{base_url}/elevenlabs/v1",
+        "MODELSLAB_API_KEY": "fake-modelslab-key",
+        "PIAPI_API_KEY_LITINKAI": "fake-piapi-key",
+        "ELEVENLABS_API_KEY": "fake-elevenlabs-key",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--processing-polls", type=int, default=0)
+    parser.add_argument("--media-seconds", type=float, default=1.0)
+    parser.add_argument(
+        "--provider-config",
+        type=json.loads,
+        default={},
+        help='per-provider overrides, e.g. \'{"modelslab": {"latency_ms": 3000}}\'',
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--print-env", action="store_true", help="print backend env and exit")
+    args = parser.parse_args()
+
+    if args.print_env:
+        for name, value in provider_env(f"http://{args.host}:{args.port}").items():
+            print(f"{name}={value}")
+        return
+
+    config = FakeProviderConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        processing_polls=args.processing_polls,
+        media_seconds=args.media_seconds,
+        providers=args.provider_config,
+    )
+    if not shutil.which("ffmpeg"):
+        print("ffmpeg not found: /media/*.mp4 answers 503 and ElevenLabs returns WAV")
+
+    import uvicorn
+
+    uvicorn.run(create_app(config, seed=args.seed), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
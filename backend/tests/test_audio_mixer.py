@@ -0,0 +1,173 @@
+"""
+Multi-track audio mixer (app/core/services/audio_mixer.py): scene placement,
+the single ffmpeg filter graph, and concurrent input downloads.
+
+Run:
+    pytest tests/test_audio_mixer.py
+"""
+
+import asyncio
+import math
+import shutil
+import struct
+import subprocess
+import wave
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+
+from app.core.services import audio_mixer
+from app.core.services.audio_mixer import (
+    AudioMixError,
+    AudioMixer,
+    MixSettings,
+    MixTrack,
+    build_mix_command,
+    place_by_scene,
+    tracks_from_audio_files,
+)
+
+
+def write_tone(path, seconds=1.0, frequency=440, rate=16000):
+    with wave.open(str(path), "wb") as audio:
+        audio.setnchannels(1)
+        audio.setsampwidth(2)
+        audio.setframerate(rate)
+        audio.writeframes(
+            b"".join(
+                struct.pack("<h", int(8000 * math.sin(2 * math.pi * frequency * i / rate)))
+                for i in range(int(seconds * rate))
+            )
+        )
+    return str(path)
+
+
+def test_tracks_from_audio_rows_and_scene_placement():
+    rows = [
+        {"audio_url": "http://x/n1.mp3", "audio_type": "narrator", "scene_id": "scene_1",
+         "duration_seconds": 2.0, "sequence_order": 0},
+        {"audio_url": "http://x/c1.mp3", "audio_type": "character", "scene_id": "scene_1",
+         "duration_seconds": 3.0, "sequence_order": 1},
+        {"audio_url": "http://x/door.mp3", "audio_type": "sound_effects",
+         "metadata": {"scene": "scene_1"}, "duration": 1.0},
+        {"audio_url": "http://x/bed.mp3", "audio_type": "background_music", "scene": "scene_1",
+         "duration_seconds": None, "duration": 30.0},
+        {"audio_url": "http://x/n2.mp3", "audio_type": "narrator", "scene_number": "scene_2",
+         "duration_seconds": 4.0},
+        {"audio_url": "http://x/sting.mp3", "audio_type": "sound_effects", "start_time": 0.5},
+        {"audio_url": None, "audio_type": "narrator"},
+    ]
+    tracks = tracks_from_audio_files(rows, {"background_music_volume": 0.3})
+    place_by_scene(tracks)
+
+    placed = {t.source.rsplit("/", 1)[-1]: t for t in tracks}
+    assert len(tracks) == 6
+    assert [placed[n].role for n in ("n1.mp3", "c1.mp3", "door.mp3", "bed.mp3")] == [
+        "narrator", "character", "sfx", "music",
+    ]
+    assert placed["bed.mp3"].volume == 0.3 and placed["n1.mp3"].volume == 1.0
+    assert placed["n1.mp3"].start_seconds == 0.0
+    assert placed["c1.mp3"].start_seconds == 2.0
+    assert placed["door.mp3"].start_seconds == 0.0
+    assert placed["bed.mp3"].start_seconds == 0.0
+    # Scene 2 starts after scene 1's dialogue, not after its 30s music bed
+    assert placed["n2.mp3"].start_seconds == 5.0
+    assert placed["sting.mp3"].start_seconds == 0.5
+
+
+def test_filter_graph_delays_ducks_and_normalizes():
+    tracks = [
+        MixTrack("a.wav", role="narrator", start_seconds=0.0),
+        MixTrack("b.wav", role="character", start_seconds=2.5, volume=1.2),
+        MixTrack("c.wav", role="sfx", start_seconds=1.0),
+        MixTrack("d.wav", role="music", start_seconds=0.0, volume=0.3),
+    ]
+    cmd = build_mix_command(tracks, "out.mp3", MixSettings(loudness_lufs=-16.0))
+    graph = cmd[cmd.index("-filter_complex") + 1]
+
+    assert cmd.count("-i") == 4 and cmd[-1] == "out.mp3"
+    assert "volume=1.200,adelay=2500|2500[a1]" in graph
+    assert "[a0][a1]amix=inputs=2:duration=longest:dropout_transition=0:normalize=0[voice]" in graph
+    assert "[music][voicekeypad]sidechaincompress=" in graph
+    assert "[voicemix][sfx][musicducked]amix=inputs=3" in graph
+    assert "loudnorm=I=-16.0:TP=-1.5:LRA=11.0,aresample=44100[out]" in graph
+
+    solo = build_mix_command(
+        [MixTrack("a.wav", role="music", start_seconds=0.0)],
+        "out.wav",
+        MixSettings(loudness_lufs=None, output_format="wav"),
+    )
+    solo_graph = solo[solo.index("-filter_complex") + 1]
+    assert "sidechaincompress" not in solo_graph and "loudnorm" not in solo_graph
+    assert solo_graph.endswith("[music]anull[mix];[mix]anull[out]")
+
+    with pytest.raises(AudioMixError):
+        build_mix_command(tracks, "out.xyz", MixSettings(output_format="xyz"))
+
+
+@pytest.mark.asyncio
+async def test_inputs_download_concurrently_and_failures_are_dropped(tmp_path, monkeypatch):
+    in_flight = peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        if request.url.path == "/missing.mp3":
+            return httpx.Response(404)
+        return httpx.Response(200, content=b"ID3" + request.url.path.encode())
+
+    @asynccontextmanager
+    async def client_factory():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            yield client
+
+    monkeypatch.setattr(audio_mixer, "shared_http_client", client_factory)
+    local = write_tone(tmp_path / "local.wav")
+    tracks = [
+        MixTrack(f"http://cdn/{i}.mp3", role="narrator", duration_seconds=1.0) for i in range(4)
+    ] + [
+        MixTrack("http://cdn/missing.mp3", role="sfx", duration_seconds=1.0),
+        MixTrack(local, role="music", duration_seconds=1.0),
+    ]
+
+    usable = await AudioMixer(download_concurrency=3).prepare(tracks, str(tmp_path))
+
+    assert peak == 3
+    assert [t.source for t in usable] == [t.source for t in tracks if "missing" not in t.source]
+    assert open(usable[1].local_path, "rb").read() == b"ID3/1.mp3"
+    assert usable[-1].local_path == local
+    assert [t.start_seconds for t in usable[:4]] == [0.0, 1.0, 2.0, 3.0]
+
+    with pytest.raises(AudioMixError):
+        await AudioMixer().prepare([MixTrack("http://cdn/missing.mp3")], str(tmp_path))
+
+
+@pytest.mark.skipif(
+    not (shutil.which("ffmpeg") and shutil.which("ffprobe")), reason="ffmpeg not installed"
+)
+@pytest.mark.asyncio
+async def test_real_mix_renders_one_file(tmp_path):
+    voice = write_tone(tmp_path / "voice.wav", seconds=1.0, frequency=300)
+    line = write_tone(tmp_path / "line.wav", seconds=1.0, frequency=500)
+    music = write_tone(tmp_path / "music.wav", seconds=3.0, frequency=110)
+    output = str(tmp_path / "mix.mp3")
+
+    await AudioMixer().mix(
+        [
+            MixTrack(voice, role="narrator", duration_seconds=1.0),
+            MixTrack(line, role="character", duration_seconds=1.0),
+            MixTrack(music, role="music", volume=0.4, duration_seconds=3.0),
+        ],
+        output,
+    )
+
+    probe = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+         "-of", "default=noprint_wrappers=1:nokey=1", output],
+        capture_output=True, text=True,
+    )
+    assert 2.9 <= float(probe.stdout) <= 3.2
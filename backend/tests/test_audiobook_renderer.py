@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from app.audiobooks.renderer import chunk_fingerprint, render_chunks
+
+
+@pytest.mark.asyncio
+async def test_render_chunks_runs_in_parallel_within_limit_and_keeps_order():
+    in_flight = 0
+    peak = 0
+
+    async def synthesize(text):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"audio_url": f"https://cdn/{text}.mp3", "duration_seconds": 1.5}
+
+    chunks = [f"c{i}" for i in range(8)]
+    rendered = await render_chunks(
+        chunks, synthesize, voice_id="v", model="m", concurrency=3
+    )
+
+    assert peak == 3
+    assert [chunk.audio_url for chunk in rendered] == [f"https://cdn/c{i}.mp3" for i in range(8)]
+    assert all(chunk.duration_seconds == 1.5 for chunk in rendered)
+
+
+@pytest.mark.asyncio
+async def test_retry_only_renders_missing_or_changed_chunks():
+    calls = []
+
+    async def synthesize(text):
+        calls.append(text)
+        if text == "bad":
+            raise RuntimeError("provider down")
+        return {"audio_url": f"https://cdn/{text}.mp3"}
+
+    first = await render_chunks(
+        ["one", "bad", "three"], synthesize, voice_id="v", model="m", concurrency=2
+    )
+    assert first[1].error == "provider down"
+    manifest = [chunk.to_manifest() for chunk in first if chunk.audio_url]
+
+    calls.clear()
+    second = await render_chunks(
+        ["one", "two", "three"],
+        synthesize,
+        voice_id="v",
+        model="m",
+        concurrency=2,
+        previous_manifest=manifest,
+    )
+
+    assert calls == ["two"]
+    assert [chunk.audio_url for chunk in second] == [
+        "https://cdn/one.mp3",
+        "https://cdn/two.mp3",
+        "https://cdn/three.mp3",
+    ]
+
+
+def test_fingerprint_depends_on_voice_and_model():
+    base = chunk_fingerprint("Hello.", "v1", "m1")
+    assert base == chunk_fingerprint("Hello. ", "v1", "m1")
+    assert base != chunk_fingerprint("Hello.", "v2", "m1")
+    assert base != chunk_fingerprint("Hello.", "v1", "m2")
@@ -0,0 +1,78 @@
+import os
+import re
+
+from app.tasks import celery_app as celery_module
+from app.tasks.celery_app import (
+    CELERY_CPU_QUEUE,
+    CELERY_FAST_QUEUE,
+    CELERY_IO_QUEUE,
+    CELERY_QUEUE_NAME,
+    celery_app,
+    QUEUE_TIME_LIMITS,
+    QueueLimitAnnotations,
+    priority_for_tier,
+    queue_for_task,
+)
+
+
+def test_task_families_are_routed_by_workload():
+    assert queue_for_task("app.tasks.video_tasks.generate_all_videos_for_generation") == CELERY_IO_QUEUE
+    assert queue_for_task("app.tasks.image_tasks.generate_scene_image_task") == CELERY_IO_QUEUE
+    assert queue_for_task("app.tasks.merge_tasks.merge_audio_video_for_generation") == CELERY_CPU_QUEUE
+    assert queue_for_task("app.tasks.embedding_tasks.generate_project_embeddings_task") == CELERY_FAST_QUEUE
+    assert queue_for_task("send_email_task") == CELERY_FAST_QUEUE
+
+
+def test_exact_route_wins_over_module_glob():
+    assert queue_for_task("app.tasks.audio_tasks.export_chapter_audio_mix_task") == CELERY_CPU_QUEUE
+    assert queue_for_task("app.tasks.audio_tasks.generate_all_audio_for_video") == CELERY_IO_QUEUE
+
+
+def test_queue_limits_do_not_override_explicit_task_limits():
+    annotations = QueueLimitAnnotations()
+
+    class _Task:
+        name = "app.tasks.merge_tasks.merge_audio_video_for_generation"
+        time_limit = None
+        soft_time_limit = None
+
+    assert annotations.annotate(_Task) == QUEUE_TIME_LIMITS[CELERY_CPU_QUEUE]
+
+    _Task.time_limit = 3600
+    assert annotations.annotate(_Task) is None
+
+
+def test_paid_tiers_outrank_free_for_either_broker(monkeypatch):
+    monkeypatch.setattr(celery_module.settings, "CELERY_BROKER_URL", "amqp://guest@rabbitmq//")
+    assert priority_for_tier("enterprise") > priority_for_tier("premium") > priority_for_tier("free")
+
+    # The Redis transport consumes lower priority numbers first
+    monkeypatch.setattr(celery_module.settings, "CELERY_BROKER_URL", "redis://redis:6379/0")
+    assert priority_for_tier("enterprise") < priority_for_tier("premium") < priority_for_tier("free")
+    assert priority_for_tier("unknown") == priority_for_tier("free")
+
+
+def test_all_queue_workers_reach_the_fast_queue_first():
+    # A strict queue order on Redis would serve .fast only once io and cpu
+    # are empty; queues are polled round-robin, fast first
+    options = celery_app.conf.broker_transport_options
+    assert options.get("queue_order_strategy", "round_robin") == "round_robin"
+    assert [q.name for q in celery_app.conf.task_queues] == [
+        CELERY_FAST_QUEUE,
+        CELERY_QUEUE_NAME,
+        CELERY_IO_QUEUE,
+        CELERY_CPU_QUEUE,
+    ]
+
+    start_sh = os.path.join(
+        os.path.dirname(__file__), "..", "docker", "production", "fastapi",
+        "celery", "worker", "start.sh",
+    )
+    with open(start_sh) as f:
+        all_profile = re.search(r"\n  all\)\n\s*QUEUES=\"([^\"]+)\"", f.read()).group(1)
+    assert all_profile.split(",") == [
+        "${BASE_QUEUE}.fast",
+        "${BASE_QUEUE}",
+        "${BASE_QUEUE}.io",
+        "${BASE_QUEUE}.cpu",
+    ]
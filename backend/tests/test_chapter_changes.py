@@ -0,0 +1,97 @@
+"""
+Per-chapter change tracking (app/chapter_changes): which derived artifacts an
+edit invalidates, how a structure save pairs chapters with existing rows, and
+when a recorded build counts as stale.
+
+Run:
+    pytest tests/test_chapter_changes.py
+"""
+
+import uuid
+from types import SimpleNamespace
+
+from app.chapter_changes.models import ChapterArtifactState
+from app.chapter_changes.service import (
+    CURRENT,
+    MISSING,
+    STALE,
+    ChapterChangeTracker,
+    artifact_fingerprint,
+    invalidated_artifacts,
+    match_chapters,
+)
+
+LONG = "The storm rolled in over the harbour. " * 40
+
+
+def chapter(title="Arrival", content=LONG, summary=None, chapter_number=1, **extra):
+    return SimpleNamespace(
+        id=extra.pop("id", uuid.uuid4()),
+        title=title,
+        content=content,
+        summary=summary,
+        chapter_number=chapter_number,
+        **extra,
+    )
+
+
+def test_edits_invalidate_only_the_artifacts_built_from_the_changed_fields():
+    before = chapter()
+
+    late_edit = chapter(content=LONG + "A gull cried.")
+    # Plot context only sees the first 500 characters when there is no summary
+    assert invalidated_artifacts(before, late_edit) == {"embeddings", "script", "scene_media"}
+
+    renamed = chapter(title="Landfall")
+    assert invalidated_artifacts(before, renamed) == {"plot", "script", "scene_media"}
+
+    summarized = chapter(summary="Ships arrive.")
+    assert invalidated_artifacts(before, summarized) == {"plot"}
+
+    assert invalidated_artifacts(before, chapter()) == set()
+    assert artifact_fingerprint({"content": LONG}, "embeddings") == artifact_fingerprint(
+        before, "embeddings"
+    )
+
+
+def test_structure_save_keeps_existing_chapter_rows():
+    one, two, three = (
+        chapter(title="One", content="first"),
+        chapter(title="Two", content="second"),
+        chapter(title="Three", content="third"),
+    )
+    incoming = [
+        {"title": "Prologue", "content": "new"},
+        {"title": "One", "content": "first"},
+        {"title": "Two", "content": "second, revised"},
+        {"title": "Renamed", "content": "elsewhere", "id": str(three.id)},
+    ]
+
+    pairs, removed = match_chapters([one, two, three], incoming)
+    assert pairs == [None, one, two, three]
+    assert removed == []
+
+    # A dropped chapter is reported; positional matching fills the rest
+    pairs, removed = match_chapters([one, two, three], [{"title": "X", "content": "y"}])
+    assert pairs == [one] and removed == [two, three]
+
+
+def test_recorded_builds_go_stale_on_edit_or_dirty_flag():
+    ch = chapter()
+
+    def state(artifact, source=ch, dirty=False):
+        return ChapterArtifactState(
+            chapter_id=ch.id,
+            book_id=uuid.uuid4(),
+            artifact=artifact,
+            source_hash=artifact_fingerprint(source, artifact),
+            dirty=dirty,
+        )
+
+    status = ChapterChangeTracker._status
+    assert status(None, ch, "embeddings") == MISSING
+    assert status(state("embeddings"), ch, "embeddings") == CURRENT
+    assert status(state("embeddings"), chapter(content="rewritten"), "embeddings") == STALE
+    assert status(state("scene_media", dirty=True), ch, "scene_media") == STALE
+    # Embeddings built from text passed in (not yet saved) compare against that text
+    assert status(state("embeddings", source={"content": "draft"}), {"content": "draft"}, "embeddings") == CURRENT
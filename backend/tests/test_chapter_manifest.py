@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+
+from app.books.manifest import chapter_content_etag, etag_matches
+from app.books.schemas import BookWithChapterManifest
+
+UPDATED = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+def test_etag_is_stable_per_range_and_version():
+    etag = chapter_content_etag("c1", UPDATED, 5000, 0, 2000)
+    assert etag == chapter_content_etag("c1", UPDATED, 5000, 0, 2000)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag != chapter_content_etag("c1", UPDATED, 5000, 2000, 2000)
+    assert etag != chapter_content_etag("c1", UPDATED, 5001, 0, 2000)
+    assert etag != chapter_content_etag(
+        "c1", UPDATED.replace(minute=1), 5000, 0, 2000
+    )
+
+
+def test_if_none_match_handles_lists_weak_tags_and_wildcard():
+    etag = chapter_content_etag("c1", UPDATED, 10, 0, 10)
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_manifest_schema_carries_no_content():
+    book = BookWithChapterManifest(
+        id="b1",
+        title="Book",
+        book_type="fiction",
+        status="PUBLISHED",
+        total_chapters=1,
+        created_at=UPDATED,
+        updated_at=UPDATED,
+        chapters=[
+            {"id": "c1", "book_id": "b1", "chapter_number": 1, "title": "One", "word_count": 1200}
+        ],
+    )
+    dumped = book.model_dump()["chapters"][0]
+    assert dumped["word_count"] == 1200
+    assert "content" not in dumped
@@ -0,0 +1,84 @@
+"""
+Token-budgeted RAG context assembly (app/core/services/context_builder.py).
+
+Tokens are counted with the character estimate (tiktoken files are not
+fetched in tests), so budgets below are ~4 characters per token.
+
+Run:
+    pytest tests/test_context_builder.py
+"""
+
+import uuid
+
+import pytest
+
+from app.core.services.context_builder import ContextBuilder
+from app.core.services.text_utils import TokenCounter, cut_at_sentence_boundary
+
+SHARES = {"current": 0.5, "retrieved": 0.25, "neighbors": 0.25}
+
+
+@pytest.fixture
+def counter():
+    token_counter = TokenCounter()
+    token_counter.encoding = None
+    return token_counter
+
+
+def _chapter(number, sentence, repeat=20):
+    return {
+        "id": uuid.uuid4(),
+        "chapter_number": number,
+        "title": f"Title {number}",
+        "content": " ".join(f"{sentence} number {i}." for i in range(repeat)),
+    }
+
+
+def _chunk(chapter, text, similarity):
+    return {"chapter": {"id": chapter["id"], "chapter_number": chapter["chapter_number"]},
+            "content_chunk": text, "similarity": similarity}
+
+
+def test_truncation_ends_on_a_sentence(counter):
+    text, tokens = counter.truncate_to_tokens("One two three. Four five six. Seven eight", 8)
+
+    assert text == "One two three. Four five six."
+    assert tokens == len(text) // 4
+    assert cut_at_sentence_boundary("a b c d e f g. h") == "a b c d e f g."
+
+
+def test_sources_stay_within_their_budgets(counter):
+    chapter = _chapter(5, "The storm broke over the castle walls")
+    neighbors = [_chapter(n, f"Neighbor {n} walked along the shore") for n in (3, 4, 6, 7)]
+
+    built = ContextBuilder(400, SHARES, counter).build(chapter, neighbors, [])
+
+    assert built["tokens"] <= 400
+    current = built["sources"]["current"]
+    assert current["truncated"] == 1 and current["tokens"] <= 200
+    # Budget left by the chapter and the (empty) retrieved source passes on
+    assert built["sources"]["neighbors"]["budget"] == 400 - current["tokens"]
+    # Neighbors come first, in book order, as in the original layout
+    text = built["text"]
+    assert text.index("Chapter 3:") < text.index("Chapter 4:") < text.index("Chapter 6:")
+    assert text.index("Chapter 7:") < text.index("The storm")
+
+
+def test_chunks_ranked_by_similarity_and_deduplicated(counter):
+    chapter = _chapter(1, "Harry opened the letter at the kitchen table", repeat=3)
+    other = _chapter(2, "unused")
+    duplicate = "The owl flew over the hills and dropped a letter into the garden pond below."
+    chunks = [
+        _chunk(other, "A low ranked chunk about the lake and the boats at dawn today.", 0.2),
+        _chunk(other, duplicate, 0.9),
+        _chunk(other, duplicate + " It was late.", 0.8),
+        _chunk(chapter, "Text from the current chapter itself.", 0.99),
+    ]
+
+    built = ContextBuilder(2000, SHARES, counter).build(chapter, [], chunks)
+
+    related = built["text"].split("Related content:\n")[1].split("\n")
+    assert related[0].endswith(duplicate)
+    assert "lake and the boats" in related[1]
+    assert len(related) == 2
+    assert built["sources"]["retrieved"]["dropped"] == 1
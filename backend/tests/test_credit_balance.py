@@ -0,0 +1,133 @@
+"""
+Materialized credit balance (credit_balances).
+
+These tests pin how CreditService keeps the per-user balance row in step
+with the ledger: reservations are checked against the locked row, and each
+grant, reservation, confirmation and release applies the matching delta.
+The SQL itself is exercised against Postgres, not here.
+
+Run:
+    pytest tests/test_credit_balance.py
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.credits.models import CreditTransaction
+from app.credits.service import CreditService
+from app.promo.models import CreditGrant
+
+
+def _balance(remaining: int, reserved: int) -> dict:
+    return {"credits_remaining": remaining, "credits_reserved": reserved, "valid_until": None}
+
+
+def _reservation(amount: int, expires_in: timedelta) -> CreditTransaction:
+    return CreditTransaction(
+        user_id=uuid.uuid4(),
+        amount=amount,
+        status="reserved",
+        operation_type="image_generation",
+        expires_at=datetime.now(timezone.utc) + expires_in,
+    )
+
+
+@pytest.fixture
+def service(mock_async_session):
+    mock_async_session.add = MagicMock()
+    svc = CreditService(mock_async_session)
+    svc._lock_balance = AsyncMock(return_value=_balance(100, 0))
+    svc._apply_balance_delta = AsyncMock()
+    svc._invalidate_balance = AsyncMock()
+    return svc
+
+
+def _exec_returning(service, transaction):
+    result = MagicMock()
+    result.first.return_value = transaction
+    service.session.exec = AsyncMock(return_value=result)
+
+
+@pytest.mark.asyncio
+async def test_reserve_checks_locked_balance_row(service):
+    service._lock_balance.return_value = _balance(100, 95)
+
+    with pytest.raises(ValueError, match="available=5"):
+        await service.reserve_credits(uuid.uuid4(), 10, "image_generation")
+
+    service._apply_balance_delta.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_reserve_adds_to_reserved_total(service):
+    user_id = uuid.uuid4()
+
+    await service.reserve_credits(user_id, 10, "image_generation")
+
+    service._lock_balance.assert_awaited_once()
+    args, kwargs = service._apply_balance_delta.call_args
+    assert args == (user_id,)
+    assert kwargs["reserved_delta"] == 10
+    assert kwargs["expires_at"] > datetime.now(timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_confirm_moves_reservation_out_of_both_totals(service):
+    transaction = _reservation(10, timedelta(hours=1))
+    _exec_returning(service, transaction)
+
+    with patch("app.credits.service.deduct_credits", AsyncMock(return_value=True)):
+        assert await service.confirm_deduction(transaction.id, 7) is True
+
+    service._apply_balance_delta.assert_awaited_once_with(
+        transaction.user_id, remaining_delta=-7, reserved_delta=-10
+    )
+    assert transaction.status == "confirmed"
+
+
+@pytest.mark.asyncio
+async def test_failed_deduction_invalidates_balance_row(service):
+    transaction = _reservation(10, timedelta(hours=1))
+    _exec_returning(service, transaction)
+
+    with patch("app.credits.service.deduct_credits", AsyncMock(return_value=False)):
+        assert await service.confirm_deduction(transaction.id) is False
+
+    service._invalidate_balance.assert_awaited_once()
+    service._apply_balance_delta.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_release_of_expired_reservation_leaves_reserved_total(service):
+    """An expired reservation was already dropped when the row was rebuilt."""
+    transaction = _reservation(10, timedelta(seconds=-1))
+    _exec_returning(service, transaction)
+
+    assert await service.release_reservation(transaction.id) is True
+
+    service._apply_balance_delta.assert_awaited_once_with(
+        transaction.user_id, reserved_delta=0
+    )
+
+
+@pytest.mark.asyncio
+async def test_add_grant_counts_active_grant(service):
+    grant = CreditGrant(
+        user_id=uuid.uuid4(),
+        credits_remaining=300,
+        credits_used=0,
+        # Naive, like the subscription grant path
+        expires_at=datetime.now() + timedelta(days=365),
+        grant_type="free_tier",
+    )
+
+    await service.add_grant(grant)
+
+    service.session.add.assert_called_once_with(grant)
+    args, kwargs = service._apply_balance_delta.call_args
+    assert args == (grant.user_id,)
+    assert kwargs["remaining_delta"] == 300
+    assert kwargs["expires_at"].tzinfo is not None
@@ -0,0 +1,107 @@
+"""
+Database connection pool modes and metrics (app/core/db_pool.py).
+
+Run:
+    pytest tests/test_db_pool.py
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from app.core import db_pool
+from app.core.db_pool import (
+    MeteredNullPool,
+    MeteredQueuePool,
+    engine_options,
+    instrument_pool,
+    pool_stats,
+)
+
+
+def test_transaction_mode_is_sized_per_process_and_pooler_safe(monkeypatch):
+    monkeypatch.setattr(db_pool.sys, "argv", ["celery", "-A", "app.tasks.celery_app", "worker"])
+    monkeypatch.setattr(db_pool.settings, "DB_POOL_SIZE_API", 6)
+    monkeypatch.setattr(db_pool.settings, "DB_POOL_MAX_OVERFLOW_API", 4)
+    monkeypatch.setattr(db_pool.settings, "DB_POOL_SIZE_WORKER", 2)
+    monkeypatch.setattr(db_pool.settings, "DB_POOL_MAX_OVERFLOW_WORKER", 1)
+
+    api = engine_options("transaction", "api")
+    worker = engine_options("transaction", "worker")
+    assert (api["pool_size"], api["max_overflow"]) == (6, 4)
+    assert (worker["pool_size"], worker["max_overflow"]) == (2, 1)
+    assert api["poolclass"] is MeteredQueuePool and api["pool_pre_ping"]
+
+    connect_args = api["connect_args"]
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    name = connect_args["prepared_statement_name_func"]
+    assert name() != name()
+
+    assert engine_options("null", "api") == {"poolclass": MeteredNullPool}
+    assert engine_options("queue", "worker")["pool_size"] == 5
+    with pytest.raises(ValueError):
+        engine_options("session", "api")
+
+
+def test_mode_and_process_type_defaults(monkeypatch):
+    monkeypatch.setattr(db_pool.settings, "DB_POOL_MODE", None)
+    monkeypatch.setattr(db_pool.settings, "ENVIRONMENT", "production")
+    # Production's DATABASE_URL is the session-mode pooler; transaction is opt-in
+    assert db_pool.pool_mode() == "null"
+    monkeypatch.setattr(db_pool.settings, "ENVIRONMENT", "development")
+    assert db_pool.pool_mode() == "queue"
+    monkeypatch.setattr(db_pool.settings, "DB_POOL_MODE", "null")
+    assert db_pool.pool_mode() == "null"
+
+    monkeypatch.setattr(db_pool.settings, "DB_PROCESS_TYPE", None)
+    monkeypatch.setattr(db_pool.sys, "argv", ["/usr/local/bin/celery", "-A", "app.tasks.celery_app", "worker"])
+    assert db_pool.process_type() == "worker"
+    monkeypatch.setattr(db_pool.sys, "argv", ["/usr/local/bin/gunicorn", "app.main:app"])
+    assert db_pool.process_type() == "api"
+    monkeypatch.setattr(db_pool.settings, "DB_PROCESS_TYPE", "worker")
+    assert db_pool.process_type() == "worker"
+
+
+def test_thread_pool_workers_size_the_pool_for_every_task(monkeypatch):
+    monkeypatch.setattr(db_pool.settings, "DB_POOL_SIZE_WORKER", 2)
+    monkeypatch.setattr(db_pool.settings, "DB_POOL_MAX_OVERFLOW_WORKER", 2)
+    worker = ["celery", "-A", "app.tasks.celery_app", "worker", "-Q", "litink_tasks.io"]
+
+    monkeypatch.setattr(db_pool.sys, "argv", worker + ["--pool=threads", "--concurrency=16"])
+    options = engine_options("transaction", "worker")
+    assert (options["pool_size"], options["max_overflow"]) == (32, 32)
+
+    assert db_pool.tasks_per_process(worker + ["-P", "gevent", "-c", "8"]) == 8
+    assert db_pool.tasks_per_process(worker + ["-Pthreads", "-c4"]) == 4
+    assert db_pool.tasks_per_process(worker + ["--pool", "prefork", "--concurrency", "4"]) == 1
+    assert db_pool.tasks_per_process(worker) == 1
+
+
+class _SyncMeteredPool(db_pool._MeteredPoolMixin, QueuePool):
+    pass
+
+
+def test_checkouts_are_timed_and_new_connections_counted():
+    sync_engine = create_engine("sqlite://", poolclass=_SyncMeteredPool, pool_size=1, max_overflow=0)
+    engine = SimpleNamespace(sync_engine=sync_engine)
+    instrument_pool(engine)
+    before = pool_stats(engine)
+
+    for _ in range(3):
+        with sync_engine.connect() as conn:
+            conn.execute(text("select 1"))
+    with sync_engine.connect() as conn:
+        conn.invalidate()
+    with sync_engine.connect() as conn:
+        conn.execute(text("select 1"))
+
+    after = pool_stats(engine)
+    assert after["acquire"]["count"] - before["acquire"].get("count", 0) == 5
+    assert after["acquire"]["mean_ms"] >= 0
+    opened = after["connections"]["opened"] - before["connections"].get("opened", 0)
+    invalidated = after["connections"]["invalidated"] - before["connections"].get("invalidated", 0)
+    # One connection served four checkouts; the fifth replaced the invalidated one
+    assert (opened, invalidated) == (2, 1)
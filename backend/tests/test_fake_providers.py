@@ -0,0 +1,100 @@
+"""
+Local provider stand-in (scripts/fake_providers.py) answers in the shapes the
+real ModelsLab, PiAPI and ElevenLabs clients parse.
+
+Run:
+    pytest tests/test_fake_providers.py
+"""
+
+import io
+import wave
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.services.modelslab_v7_image import ModelsLabV7ImageService
+from app.core.services.modelslab_v7_video import ModelsLabV7VideoService
+from app.core.services.piapi_client import PiAPIClient
+from scripts.fake_providers import FakeProviderConfig, create_app
+
+
+def fake_client(**config):
+    app = create_app(FakeProviderConfig(latency_ms=0, **config), seed=1)
+    transport = httpx.ASGITransport(app=app)
+    return app, httpx.AsyncClient(transport=transport, base_url="http://fake")
+
+
+@pytest.fixture
+def modelslab_key(monkeypatch):
+    monkeypatch.setattr(settings, "MODELSLAB_API_KEY", "fake-key")
+
+
+@pytest.mark.asyncio
+async def test_modelslab_sync_and_polled_responses_parse(modelslab_key):
+    _, client = fake_client()
+    async with client:
+        response = await client.post("/modelslab/api/v7/images/text-to-image", json={})
+        parsed = ModelsLabV7ImageService()._process_image_response(response.json())
+        assert parsed["status"] == "success"
+        media = await client.get(parsed["output"][0].replace("http://fake", ""))
+        assert media.content.startswith(b"\x89PNG")
+
+    _, client = fake_client(processing_polls=2)
+    async with client:
+        response = await client.post("/modelslab/api/v7/video-fusion/image-to-video", json={})
+        parsed = ModelsLabV7VideoService()._process_video_response(
+            response.json(), "image_to_video"
+        )
+        assert parsed["status"] == "processing"
+        fetch_path = parsed["fetch_result"].replace("http://fake", "")
+        statuses = [(await client.post(fetch_path, json={})).json()["status"] for _ in range(3)]
+        assert statuses == ["processing", "processing", "success"]
+        done = (await client.post(fetch_path, json={})).json()
+        assert done["output"][0].endswith(".mp4")
+
+
+@pytest.mark.asyncio
+async def test_piapi_client_runs_against_fake(monkeypatch):
+    app, _ = fake_client(processing_polls=1)
+    async_client = httpx.AsyncClient
+
+    def client_factory(**kwargs):
+        return async_client(transport=httpx.ASGITransport(app=app), **kwargs)
+
+    monkeypatch.setattr("app.core.services.piapi_client.httpx.AsyncClient", client_factory)
+    client = PiAPIClient(api_key="fake-piapi-key", base_url="http://fake/piapi/v1")
+
+    result = await client.create_and_poll(
+        model="flux-schnell", task_type="txt2img", input={"prompt": "x"}, poll_interval_seconds=0
+    )
+
+    assert result["status"] == "success"
+    assert result["url"].endswith(".png")
+    assert app.state.fake.requests["piapi poll_task"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failures_and_runtime_config():
+    app, client = fake_client(failure_rate=1.0)
+    async with client:
+        modelslab = await client.post("/modelslab/api/v7/voice/sound-generation", json={})
+        assert modelslab.status_code == 200
+        assert modelslab.json()["status"] == "error"
+        tts = await client.post("/elevenlabs/v1/text-to-speech/voice-1", json={"text": "hi"})
+        assert tts.status_code == 500
+
+        await client.post(
+            "/_fake/config", json={"providers": {"elevenlabs": {"failure_rate": 0.0}}}
+        )
+        tts = await client.post("/elevenlabs/v1/text-to-speech/voice-1", json={"text": "hi"})
+        assert tts.status_code == 200
+        if tts.headers["content-type"] == "audio/wav":
+            with wave.open(io.BytesIO(tts.content)) as audio:
+                assert audio.getnframes() == 16000
+
+        stats = (await client.get("/_fake/stats")).json()
+        assert stats["failures"] == {
+            "modelslab v7/voice/sound-generation": 1,
+            "elevenlabs text-to-speech": 1,
+        }
@@ -40,7 +40,7 @@ async def test_extract_last_frame_uses_internal_minio_endpoint_for_download(monk
             return SimpleNamespace(stdout="", returncode=0)
         raise AssertionError(f"unexpected command: {cmd}")
 
-    monkeypatch.setattr(ffmpeg_utils.subprocess, "run", fake_run)
+    monkeypatch.setattr(subprocess, "run", fake_run)
 
     storage = MagicMock()
     storage.upload = AsyncMock(return_value="http://localhost:9000/litink-books/frames/user/last.jpg")
@@ -0,0 +1,92 @@
+"""
+Background health prober and cached snapshot (app/core/health.py).
+
+Run:
+    pytest tests/test_health_prober.py
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.health import HealthCheck, ServiceStatus
+
+
+class CountingCheck:
+    def __init__(self, healthy=True, delay=0.0):
+        self.healthy = healthy
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.healthy
+
+
+@pytest.mark.asyncio
+async def test_health_reads_are_served_from_the_snapshot():
+    checker = HealthCheck()
+    database = CountingCheck()
+    await checker.add_service("database", database)
+
+    first = await checker.check_all_services()
+    for _ in range(5):
+        assert await checker.check_all_services() is first
+
+    assert database.calls == 1
+    assert first["status"] == ServiceStatus.HEALTHY
+    assert first["services"]["database"]["latency_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_slow_probe_times_out_once_without_retry_sleeps():
+    checker = HealthCheck()
+    slow = CountingCheck(delay=5)
+    await checker.add_service("broker", slow, timeout=0.05)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    snapshot = await checker.refresh()
+
+    assert loop.time() - started < 1
+    assert slow.calls == 1
+    assert snapshot["status"] == ServiceStatus.DEGRADED
+    assert snapshot["services"]["broker"]["error"].startswith("Timeout")
+
+
+@pytest.mark.asyncio
+async def test_non_critical_failures_and_dependencies():
+    checker = HealthCheck()
+    await checker.add_service("broker", CountingCheck(healthy=False))
+    await checker.add_service("celery", CountingCheck(), depends_on=["broker"])
+    await checker.add_service("provider:groq", CountingCheck(healthy=False), critical=False)
+
+    snapshot = await checker.refresh()
+
+    assert snapshot["services"]["celery"]["status"] == ServiceStatus.DEGRADED
+    assert snapshot["services"]["provider:groq"]["status"] == ServiceStatus.UNHEALTHY
+
+    healthy = HealthCheck()
+    await healthy.add_service("database", CountingCheck())
+    await healthy.add_service("provider:groq", CountingCheck(healthy=False), critical=False)
+    assert (await healthy.refresh())["status"] == ServiceStatus.HEALTHY
+
+
+@pytest.mark.asyncio
+async def test_prober_refreshes_due_services_and_records_latency():
+    checker = HealthCheck()
+    fast = CountingCheck()
+    slow_interval = CountingCheck()
+    await checker.add_service("prober-redis", fast, interval=0.01)
+    await checker.add_service("prober-provider", slow_interval, interval=60, critical=False)
+
+    checker.start_prober()
+    await asyncio.sleep(0.1)
+    await checker.stop_prober()
+
+    assert fast.calls >= 3
+    assert slow_interval.calls == 1
+    histogram = HealthCheck.latency_histograms()["prober-redis"]
+    assert histogram["count"] >= 3
+    assert histogram["buckets"]["+Inf"] == histogram["count"]
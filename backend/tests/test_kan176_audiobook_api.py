@@ -68,6 +68,7 @@ async def test_generate_audiobook_success():
     dispatches task with reservation_id, returns 202."""
     from app.audiobooks.routes import generate_audiobook
     from app.audiobooks.schemas import AudiobookGenerateRequest
+    from app.tasks.celery_app import priority_for_tier
 
     user_id = uuid.uuid4()
     book_id = uuid.uuid4()
@@ -114,8 +115,11 @@ async def test_generate_audiobook_success():
         mock_credit.reserve_credits.assert_called_once()
 
         # Verify task dispatched WITH reservation_id
-        mock_task.delay.assert_called_once()
-        call_args = mock_task.delay.call_args[0]
+        mock_task.apply_async.assert_called_once()
+        call_args = mock_task.apply_async.call_args.kwargs["args"]
+        assert mock_task.apply_async.call_args.kwargs["priority"] == priority_for_tier(
+            "free"
+        )
         assert call_args[0] == str(audiobook_id), "First arg must be audiobook_id"
         assert (
             len(call_args) >= 2
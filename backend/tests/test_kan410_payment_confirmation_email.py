@@ -32,6 +32,11 @@ async def test_checkout_completed_sends_payment_confirmation_email(monkeypatch):
     session.exec = AsyncMock(side_effect=[_Result(None), _Result(user)])
     session.commit = AsyncMock()
 
+    # Tier credit grant bookkeeping is covered by test_credit_balance.py
+    monkeypatch.setattr(
+        "app.api.services.subscription.CreditService.add_grant", AsyncMock()
+    )
+
     send_email = AsyncMock(return_value=True)
     monkeypatch.setattr(
         "app.api.services.subscription.email_service.send_email", send_email
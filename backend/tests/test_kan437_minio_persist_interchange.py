@@ -32,7 +32,7 @@ class FakeAsyncClient:
     async def __aexit__(self, exc_type, exc, tb):
         return False
 
-    def stream(self, method, url):
+    def stream(self, method, url, **kwargs):
         assert method == "GET"
         return FakeStreamResponse(self.bodies_by_url[url])
 
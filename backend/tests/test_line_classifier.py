@@ -0,0 +1,93 @@
+import re
+
+from app.core.services.file import BookStructureDetector
+from app.core.services.line_classifier import (
+    BLANK,
+    CHAPTER,
+    PAGE_NUMBER,
+    SECTION,
+    SPECIAL,
+    PatternSet,
+)
+
+
+def _first_match(patterns, line, flags=0):
+    for index, pattern in enumerate(patterns):
+        match = re.match(pattern, line, flags)
+        if match:
+            return index, match.groups()
+    return None
+
+
+SAMPLE_LINES = [
+    "CHAPTER XIX.",
+    "Chapter 3: The Storm",
+    "chapter 4 - lowercase",
+    "12.",
+    "TWENTY-ONE",
+    "1. The Beginning",
+    "PART TWO",
+    "Part III - The Long Road Home",
+    "tablet iv The Flood Story Begins",
+    "EPILOGUE",
+    "Acknowledgments",
+    "Table of Contents",
+    "Loomings 3",
+    "Call me Ishmael.",
+    "",
+]
+
+
+def test_pattern_set_picks_the_same_pattern_as_sequential_matching():
+    detector = BookStructureDetector()
+    for patterns in (
+        detector.CHAPTER_PATTERNS,
+        detector.SECTION_PATTERNS,
+        detector.SPECIAL_SECTIONS,
+        detector.TOC_PATTERNS,
+    ):
+        compiled = PatternSet(patterns)
+        for line in SAMPLE_LINES:
+            assert compiled.match(line) == _first_match(patterns, line), line
+
+    compiled = PatternSet(detector.CHAPTER_PATTERNS, re.IGNORECASE)
+    for line in SAMPLE_LINES:
+        assert compiled.match(line) == _first_match(
+            detector.CHAPTER_PATTERNS, line, re.IGNORECASE
+        )
+
+
+def _legacy_following_content(lines, start_line, min_lines=10):
+    content_lines = 0
+    total_content = ""
+    for i in range(start_line + 1, min(len(lines), start_line + 20)):
+        line = lines[i].strip()
+        if line and not re.match(r"^\d+$", line):
+            content_lines += 1
+            total_content += line + " "
+    return content_lines >= min_lines and len(total_content.strip()) > 200
+
+
+def test_line_index_flags_and_prefix_sum_lookups():
+    body = ["Some prose line that keeps the story moving along nicely."] * 12
+    lines = ["PART ONE", "", "CHAPTER 1", "", *body, "42", "EPILOGUE", *body[:3]]
+    detector = BookStructureDetector()
+    index = detector._get_line_index(lines)
+
+    assert index.has(0, SECTION)
+    assert index.has(1, BLANK)
+    assert index.has(2, CHAPTER)
+    assert index.has(16, PAGE_NUMBER)
+    assert index.has(17, SPECIAL)
+    assert detector._get_line_index(lines) is index
+
+    for start in range(len(lines)):
+        for min_lines in (5, 8, 10):
+            assert index.has_substantial_following_content(
+                start, min_lines
+            ) == _legacy_following_content(lines, start, min_lines)
+
+    assert index.has_following_chapter_before_next_section(0)
+    assert not index.has_following_chapter_before_next_section(17)
+    assert index.next_boundary(3) == 16  # a bare "42" also matches a chapter pattern
+    assert index.next_boundary(17) == 17
@@ -0,0 +1,157 @@
+"""
+Concurrent lip-sync stage (app/tasks/lipsync_tasks.py).
+
+Scenes run concurrently under the per-provider semaphore, each outcome is
+recorded as it finishes, and scenes completed by an earlier run are reused.
+The database writes are patched out; the JSONB update is exercised against
+Postgres, not here.
+
+Run:
+    pytest tests/test_lipsync_concurrency.py
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.tasks import lipsync_tasks
+
+
+class FakeLipSyncService:
+    def __init__(self, fail_scenes=()):
+        self.fail_scenes = set(fail_scenes)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+
+    def get_lipsync_model_for_quality(self, tier):
+        return "lipsync-2"
+
+    async def generate_lip_sync(self, video_url, audio_url, model_id="lipsync-2"):
+        self.calls.append(video_url)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        if video_url in self.fail_scenes:
+            raise RuntimeError("provider error")
+        return {"status": "success", "output": [], "video_url": f"{video_url}.synced"}
+
+
+def _scenes(count):
+    scene_videos = [
+        {"scene_id": f"scene_{i}", "video_url": f"https://v/{i}.mp4"} for i in range(count)
+    ]
+    audio_files = {
+        "characters": [
+            {"scene": f"scene_{i}", "character_name": "HARRY", "audio_url": f"https://a/{i}.mp3"}
+            for i in range(count)
+        ]
+    }
+    return scene_videos, audio_files
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    entries = {}
+
+    async def record(video_gen_id, scene_key, entry):
+        entries[scene_key] = entry
+
+    @asynccontextmanager
+    async def fake_session():
+        session = MagicMock()
+        result = MagicMock()
+        result.scalar.return_value = 1
+        session.execute = AsyncMock(return_value=result)
+        session.commit = AsyncMock()
+        yield session
+
+    monkeypatch.setattr(lipsync_tasks, "record_scene_progress", record)
+    monkeypatch.setattr(lipsync_tasks, "async_session", fake_session)
+    monkeypatch.setattr(lipsync_tasks, "_provider_semaphores", {})
+    monkeypatch.setattr(lipsync_tasks.settings, "LIPSYNC_CONCURRENCY_PER_PROVIDER", 2)
+    return entries
+
+
+@pytest.mark.asyncio
+async def test_scenes_run_concurrently_within_provider_limit(recorded):
+    service = FakeLipSyncService()
+    scene_videos, audio_files = _scenes(6)
+
+    results = await lipsync_tasks.apply_lip_sync_to_scenes(
+        service, "gen-1", scene_videos, audio_files, [], "premium"
+    )
+
+    assert service.max_in_flight == 2
+    assert [r["scene_id"] for r in results] == [f"scene_{i}" for i in range(6)]
+    assert results[3]["lipsync_video_url"] == "https://v/3.mp4.synced"
+    assert {entry["status"] for entry in recorded.values()} == {"completed"}
+
+
+@pytest.mark.asyncio
+async def test_failed_scene_is_recorded_and_others_complete(recorded):
+    service = FakeLipSyncService(fail_scenes={"https://v/1.mp4"})
+    scene_videos, audio_files = _scenes(3)
+
+    results = await lipsync_tasks.apply_lip_sync_to_scenes(
+        service, "gen-1", scene_videos, audio_files, [], "premium"
+    )
+
+    assert results[1] is None
+    assert results[0]["has_lipsync"] and results[2]["has_lipsync"]
+    assert recorded["scene_1"]["status"] == "failed"
+    assert recorded["scene_2"]["status"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_rerun_resumes_from_failed_scenes(recorded):
+    scene_videos, audio_files = _scenes(3)
+    first = FakeLipSyncService(fail_scenes={"https://v/1.mp4"})
+    await lipsync_tasks.apply_lip_sync_to_scenes(
+        first, "gen-1", scene_videos, audio_files, [], "premium"
+    )
+    lipsync_data = {"scene_progress": dict(recorded)}
+
+    retry = FakeLipSyncService()
+    results = await lipsync_tasks.apply_lip_sync_to_scenes(
+        retry,
+        "gen-1",
+        scene_videos,
+        audio_files,
+        [],
+        "premium",
+        previous_results=lipsync_tasks.completed_scene_results(lipsync_data),
+    )
+
+    assert retry.calls == ["https://v/1.mp4"]
+    assert all(r["has_lipsync"] for r in results)
+    assert recorded["scene_1"]["status"] == "completed"
+
+
+@pytest.mark.asyncio
+async def test_rerun_redoes_scenes_whose_video_was_regenerated(recorded):
+    scene_videos, audio_files = _scenes(2)
+    await lipsync_tasks.apply_lip_sync_to_scenes(
+        FakeLipSyncService(), "gen-1", scene_videos, audio_files, [], "premium"
+    )
+    lipsync_data = {"scene_progress": dict(recorded)}
+    scene_videos[0] = {**scene_videos[0], "video_url": "https://v/0-regenerated.mp4"}
+
+    retry = FakeLipSyncService()
+    results = await lipsync_tasks.apply_lip_sync_to_scenes(
+        retry,
+        "gen-1",
+        scene_videos,
+        audio_files,
+        [],
+        "premium",
+        previous_results=lipsync_tasks.completed_scene_results(lipsync_data),
+    )
+
+    assert retry.calls == ["https://v/0-regenerated.mp4"]
+    assert results[0]["original_video_url"] == "https://v/0-regenerated.mp4"
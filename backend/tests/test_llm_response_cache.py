@@ -0,0 +1,209 @@
+"""
+Opt-in LLM response cache used by ProviderRouter.chat_completion.
+
+Run:
+    pytest tests/test_llm_response_cache.py
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.services import llm_cache as llm_cache_module
+from app.core.services.llm_cache import INDEX_KEY, LLMResponseCache
+from app.core.services.provider_router import ProviderRouter
+
+MESSAGES = [{"role": "user", "content": "Extract keywords"}]
+
+
+class FakeRawRedis:
+    def __init__(self):
+        self.values = {}
+        self.zsets = {}
+        self.hashes = {}
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def exists(self, key):
+        return int(key in self.values)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    async def zrange(self, key, start, end):
+        ordered = sorted(self.zsets.get(key, {}), key=self.zsets[key].get)
+        return ordered[start : end + 1]
+
+    async def zrem(self, key, *members):
+        for member in members:
+            self.zsets[key].pop(member, None)
+
+    async def hincrby(self, key, field, amount):
+        fields = self.hashes.setdefault(key, {})
+        fields[field] = fields.get(field, 0) + amount
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+
+class FakeRedisService:
+    is_connected = True
+
+    def __init__(self, raw=None):
+        self.redis_client = raw or FakeRawRedis()
+
+    async def get(self, key):
+        value = await self.redis_client.get(key)
+        return json.loads(value) if value else None
+
+
+def _response(content="alpha, beta"):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason="stop")],
+        usage=SimpleNamespace(prompt_tokens=12, completion_tokens=3, total_tokens=15),
+        model="gpt-4o-mini",
+    )
+
+
+class CountingCall:
+    def __init__(self, delay=0.0):
+        self.count = 0
+        self.delay = delay
+
+    async def __call__(self):
+        self.count += 1
+        await asyncio.sleep(self.delay)
+        return _response()
+
+
+async def _no_sleep(_):
+    await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_repeat_request_is_served_from_cache_with_zero_usage():
+    cache = LLMResponseCache(FakeRedisService())
+    call = CountingCall()
+    params = {"temperature": 0.1, "max_tokens": 100}
+
+    first = await cache.get_or_call("keywords", "openai/gpt-4o-mini", MESSAGES, params, call)
+    second = await cache.get_or_call("keywords", "openai/gpt-4o-mini", MESSAGES, dict(params), call)
+
+    assert call.count == 1
+    assert first.usage.total_tokens == 15
+    assert second.cached and second.choices[0].message.content == "alpha, beta"
+    assert second.usage.total_tokens == 0
+    assert second.cached_usage.total_tokens == 15
+
+    stats = await cache.stats()
+    assert stats["sites"]["keywords"]["hits"] == 1
+    assert stats["sites"]["keywords"]["misses"] == 1
+    assert stats["overall"]["hit_rate"] == 50.0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_requests_call_provider_once():
+    cache = LLMResponseCache(FakeRedisService())
+    call = CountingCall(delay=0.01)
+    params = {"temperature": 0.0}
+
+    results = await asyncio.gather(
+        *(cache.get_or_call("keywords", "m/x", MESSAGES, params, call) for _ in range(5))
+    )
+
+    assert call.count == 1
+    assert all(r.choices[0].message.content == "alpha, beta" for r in results)
+    assert (await cache.stats())["sites"]["keywords"]["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_creative_and_streaming_requests_bypass_cache():
+    cache = LLMResponseCache(FakeRedisService())
+    call = CountingCall()
+
+    for params in ({"temperature": 0.7}, {}, {"temperature": 0.1, "stream": True}):
+        await cache.get_or_call("keywords", "m/x", MESSAGES, params, call)
+        await cache.get_or_call("keywords", "m/x", MESSAGES, params, call)
+
+    assert call.count == 6
+
+
+@pytest.mark.asyncio
+async def test_other_process_holding_lock_is_waited_for():
+    raw = FakeRawRedis()
+    cache = LLMResponseCache(FakeRedisService(raw), sleep=_no_sleep)
+    params = {"temperature": 0.2}
+    key = cache.cache_key("m/x", MESSAGES, params)
+    raw.values[f"{key}:lock"] = "1"
+
+    async def other_process_finishes():
+        await asyncio.sleep(0)
+        raw.values[key] = json.dumps(LLMResponseCache.to_payload(_response("from peer")))
+
+    call = CountingCall()
+    response, _ = await asyncio.gather(
+        cache.get_or_call("keywords", "m/x", MESSAGES, params, call),
+        other_process_finishes(),
+    )
+
+    assert call.count == 0
+    assert response.choices[0].message.content == "from peer"
+
+
+@pytest.mark.asyncio
+async def test_oldest_entries_are_evicted_past_max_entries(monkeypatch):
+    monkeypatch.setattr(llm_cache_module.settings, "LLM_RESPONSE_CACHE_MAX_ENTRIES", 2)
+    raw = FakeRawRedis()
+    cache = LLMResponseCache(FakeRedisService(raw))
+
+    keys = []
+    for index in range(3):
+        messages = [{"role": "user", "content": f"request {index}"}]
+        keys.append(cache.cache_key("m/x", messages, {"temperature": 0}))
+        await cache.get_or_call("keywords", "m/x", messages, {"temperature": 0}, CountingCall())
+
+    assert keys[0] not in raw.values
+    assert keys[1] in raw.values and keys[2] in raw.values
+    assert len(raw.zsets[INDEX_KEY]) == 2
+
+
+@pytest.mark.asyncio
+async def test_provider_router_only_caches_when_call_site_opts_in(monkeypatch):
+    cache = LLMResponseCache(FakeRedisService())
+    monkeypatch.setattr("app.core.services.provider_router.llm_response_cache", cache)
+    router = ProviderRouter()
+    calls = []
+
+    async def complete(model, messages, **kwargs):
+        calls.append(kwargs)
+        return _response()
+
+    monkeypatch.setattr(router, "_chat_completion", complete)
+
+    await router.chat_completion("openai/gpt-4o-mini", MESSAGES, temperature=0.1)
+    await router.chat_completion("openai/gpt-4o-mini", MESSAGES, temperature=0.1)
+    await router.chat_completion(
+        "openai/gpt-4o-mini", MESSAGES, temperature=0.1, cache_site="keywords"
+    )
+    await router.chat_completion(
+        "openai/gpt-4o-mini", MESSAGES, temperature=0.1, cache_site="keywords"
+    )
+
+    assert len(calls) == 3
+    assert all("cache_site" not in kwargs for kwargs in calls)
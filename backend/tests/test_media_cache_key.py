@@ -0,0 +1,38 @@
+from app.media_cache.service import build_media_cache_key, media_input_digest, normalize_prompt
+
+
+def _key(**overrides):
+    params = dict(
+        media_type="image",
+        model_id="seedream-t2i",
+        prompt="A lighthouse at dusk",
+        input_urls=["https://cdn.example.com/bucket/users/u1/images/a.png"],
+        aspect_ratio="16:9",
+        scope="user-1",
+    )
+    params.update(overrides)
+    return build_media_cache_key(**params)
+
+
+def test_key_is_deterministic_and_whitespace_insensitive():
+    assert _key() == _key()
+    assert _key(prompt="  A  lighthouse\n at dusk ") == _key()
+    assert normalize_prompt("a\t b") == "a b"
+
+
+def test_key_changes_with_generation_parameters():
+    assert _key(prompt="A lighthouse at dawn") != _key()
+    assert _key(model_id="flux") != _key()
+    assert _key(aspect_ratio="9:16") != _key()
+    assert _key(input_urls=[]) != _key()
+
+
+def test_scope_keeps_users_apart():
+    assert _key(scope="user-2") != _key()
+
+
+def test_input_digest_ignores_host_and_query():
+    internal = "http://minio:9000/bucket/users/u1/images/a.png"
+    signed = "https://cdn.example.com/bucket/users/u1/images/a.png?X-Amz-Signature=abc"
+    assert media_input_digest(internal) == media_input_digest(signed)
+    assert _key(input_urls=[internal]) == _key()
@@ -0,0 +1,150 @@
+"""
+Batched media-row writes and coalesced progress updates
+(app/core/services/media_repository.py).
+
+Run:
+    pytest tests/test_media_repository.py
+"""
+
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.services.media_repository import MediaBatchWriter, ProgressWriter
+from app.videos.models import AudioGeneration, VideoSegment
+
+
+class RecordingSession:
+    def __init__(self, log, fail=False):
+        self.log = log
+        # True fails every statement; a set fails any statement carrying one of these ids
+        self.fail = fail
+
+    async def execute(self, stmt, params=None):
+        if self.fail is True:
+            raise RuntimeError("database unavailable")
+        if self.fail:
+            rows = params if isinstance(params, list) else [params]
+            if any(row["id"] in self.fail for row in rows):
+                raise RuntimeError("violates foreign key constraint")
+        self.log.append(("execute", stmt, params))
+
+    async def commit(self):
+        self.log.append(("commit", None, None))
+
+    async def rollback(self):
+        self.log.append(("rollback", None, None))
+
+
+def session_factory(log, fail=False):
+    @asynccontextmanager
+    async def factory():
+        yield RecordingSession(log, fail)
+
+    return factory
+
+
+def audio(i, **extra):
+    return AudioGeneration(
+        video_generation_id=uuid.uuid4(), audio_type="narrator", sequence_order=i, **extra
+    )
+
+
+@pytest.mark.asyncio
+async def test_rows_are_written_in_batches_with_one_statement_per_table():
+    log = []
+    async with MediaBatchWriter(session_factory=session_factory(log), batch_size=3) as media:
+        ids = [await media.add(audio(i)) for i in range(2)]
+        assert log == []  # nothing written until the batch fills
+        ids.append(await media.add(audio(2)))
+        assert [entry[0] for entry in log] == ["execute", "commit"]
+        assert [row["id"] for row in log[0][2]] == ids
+
+        ids.append(await media.add(audio(3)))
+        segment_id = await media.add(
+            VideoSegment(video_generation_id=uuid.uuid4(), scene_id="scene_1", scene_number=1)
+        )
+
+    executes = [entry for entry in log if entry[0] == "execute"]
+    assert len(executes) == 3 and media.written == 5
+    # A single leftover row is a plain execute, not an executemany
+    assert executes[1][2]["id"] == ids[3]
+    assert executes[2][2]["id"] == segment_id
+
+    sql = str(executes[0][1].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("INSERT INTO audio_generations")
+    assert sql.endswith("ON CONFLICT (id) DO NOTHING")
+    assert executes[0][2][0]["audio_metadata"] == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_write_is_dropped_without_failing_the_stage():
+    log = []
+    media = MediaBatchWriter(session_factory=session_factory(log, fail=True))
+    await media.add(audio(0))
+    assert await media.flush() == 0
+    assert media.written == 0
+    assert await media.flush() == 0  # the batch is not retried forever
+
+
+@pytest.mark.asyncio
+async def test_bad_row_costs_only_itself():
+    log = []
+    bad = audio(1)
+    bad.id = uuid.uuid4()
+    media = MediaBatchWriter(session_factory=session_factory(log, fail={bad.id}), batch_size=3)
+    first = await media.add(audio(0))
+    await media.add(bad)
+    third = await media.add(audio(2))  # fills the batch
+
+    written = [entry[2]["id"] for entry in log if entry[0] == "execute"]
+    assert written == [first, third] and media.written == 2
+
+
+@pytest.mark.asyncio
+async def test_rows_are_written_when_the_stage_raises():
+    log = []
+    with pytest.raises(RuntimeError):
+        async with MediaBatchWriter(session_factory=session_factory(log)) as media:
+            record_id = await media.add(audio(0))
+            raise RuntimeError("provider crashed")
+    assert log[0][2]["id"] == record_id
+
+    with pytest.raises(ValueError):
+        MediaBatchWriter()
+
+
+@pytest.mark.asyncio
+async def test_progress_updates_are_coalesced():
+    log = []
+    writer = ProgressWriter(
+        "merge_operations", uuid.uuid4(), session_factory(log), min_interval=0.2
+    )
+
+    def written():
+        return [entry[1].compile().params for entry in log if entry[0] == "execute"]
+
+    await writer.update(progress=5, merge_status="IN_PROGRESS")
+    await writer.update(progress=5, merge_status="IN_PROGRESS")
+    await writer.update(progress=25, merge_status="IN_PROGRESS")
+    await writer.update(progress=40, merge_status="IN_PROGRESS", processing_stats={"inputs": 2})
+    assert writer.writes == 1
+
+    # Deferred values go out together once the interval has passed
+    await asyncio.sleep(0.3)
+    assert writer.writes == 2
+    assert written()[1]["progress"] == 40 and written()[1]["processing_stats"] == {"inputs": 2}
+    assert "merge_status" not in written()[1]
+
+    await writer.update(progress=70)
+    await writer.update(final=True, progress=100, merge_status="COMPLETED")
+    assert writer.writes == 3 and written()[-1]["progress"] == 100
+
+    await writer.update(progress=100)
+    await writer.update(progress=50)
+    writer.cancel()
+    await asyncio.sleep(0.3)
+    assert writer.writes == 3
@@ -0,0 +1,189 @@
+"""
+Shared circuit breaker and health-ranked ladders (app/core/services/model_fallback.py).
+
+Two ModelFallbackManager instances on one fake Redis stand in for two
+worker processes.
+
+Run:
+    pytest tests/test_model_circuit_breaker.py
+"""
+
+import asyncio
+import json
+from dataclasses import asdict
+
+import pytest
+
+from app.core.services import model_fallback
+from app.core.services.model_fallback import CircuitBreaker, ModelFallbackManager, ModelHealth
+from tests.test_script_ladder_429_cooldown import FakeRedis
+
+
+class FakeRawRedis:
+    def __init__(self, values):
+        self.values = values
+
+    async def eval(self, script, numkeys, key, *argv):
+        # Redis runs scripts one at a time, so no awaits in here either
+        assert script == model_fallback.RECORD_OUTCOME_SCRIPT
+        now, success, latency, threshold, timeout = argv[:5]
+        raw = self.values.get(key)
+        health = ModelHealth.from_dict(json.loads(raw)) if raw else ModelHealth()
+        transition = model_fallback.apply_outcome(
+            health, now, success == 1, None if latency == "" else latency, threshold, timeout
+        )
+        encoded = json.dumps(asdict(health))
+        self.values[key] = encoded
+        return [encoded.encode(), transition.encode()]
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+
+class SharedRedis(FakeRedis):
+    def __init__(self):
+        super().__init__()
+        self.redis_client = FakeRawRedis(self.values)
+
+    async def get(self, key):
+        # The reply is in flight for a moment; other workers can write meanwhile
+        value = await super().get(key)
+        await asyncio.sleep(0)
+        return value
+
+
+async def no_sleep(_seconds):
+    return None
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {"t": 1_000_000.0}
+    monkeypatch.setattr(model_fallback.time, "time", lambda: now["t"])
+    return now
+
+
+@pytest.mark.asyncio
+async def test_breaker_opened_in_one_process_is_seen_by_another(clock):
+    redis = SharedRedis()
+    worker_a = ModelFallbackManager(redis_service=redis, sleep=no_sleep)
+    worker_b = ModelFallbackManager(redis_service=redis, sleep=no_sleep)
+    calls = []
+
+    async def generate(model):
+        calls.append(model)
+        if model == "zai/primary":
+            raise RuntimeError("upstream 500")
+        return {"status": "success"}
+
+    for _ in range(5):
+        await worker_a.try_model_list_with_fallback(
+            ["zai/primary", "groq/backup"], generate, {}, model_param_name="model"
+        )
+    calls.clear()
+
+    result = await worker_b.try_model_list_with_fallback(
+        ["zai/primary", "groq/backup"], generate, {}, model_param_name="model"
+    )
+
+    assert calls == ["groq/backup"]
+    assert result["model_used"] == "groq/backup"
+    snapshot = await worker_b.circuit_breaker.snapshot(["zai/primary"])
+    assert snapshot[0]["status"] == "open"
+
+
+@pytest.mark.asyncio
+async def test_half_open_allows_one_probe_and_success_closes(clock):
+    redis = SharedRedis()
+    breaker_a = CircuitBreaker(failure_threshold=2, timeout_seconds=60, redis_service=redis)
+    breaker_b = CircuitBreaker(failure_threshold=2, timeout_seconds=60, redis_service=redis)
+
+    await breaker_a.record_failure("zai/m")
+    await breaker_a.record_failure("zai/m")
+    assert not await breaker_b.allow_request("zai/m")
+
+    clock["t"] += 61
+    breaker_b.fetched_at.clear()
+    assert await breaker_a.allow_request("zai/m")
+    assert not await breaker_b.allow_request("zai/m")
+
+    await breaker_a.record_success("zai/m", latency=1.0)
+    breaker_b.fetched_at.clear()
+    assert await breaker_b.allow_request("zai/m")
+    assert (await breaker_b.snapshot(["zai/m"]))[0]["status"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_reopens_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=2, timeout_seconds=60, redis_service=SharedRedis())
+    await breaker.record_failure("zai/m")
+    await breaker.record_failure("zai/m")
+    clock["t"] += 61
+
+    assert await breaker.allow_request("zai/m")
+    await breaker.record_failure("zai/m")
+
+    assert not await breaker.allow_request("zai/m")
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_moved_behind_healthy_fallback(clock):
+    breaker = CircuitBreaker(redis_service=SharedRedis())
+    ladder = ["zai/primary", "groq/fast", "openai/last"]
+    assert await breaker.rank(ladder) == ladder
+
+    for _ in range(5):
+        await breaker.record_success("zai/primary", latency=30.0)
+        await breaker.record_success("groq/fast", latency=2.0)
+
+    assert await breaker.rank(ladder) == ["groq/fast", "openai/last", "zai/primary"]
+
+
+@pytest.mark.asyncio
+async def test_reordered_ladder_keeps_static_model_type(clock):
+    redis = SharedRedis()
+    manager = ModelFallbackManager(redis_service=redis, sleep=no_sleep)
+    for _ in range(5):
+        await manager.circuit_breaker.record_success("zai/primary", latency=1.0)
+        await manager.circuit_breaker.record_failure("groq/flaky", latency=1.0)
+
+    async def generate(model):
+        return {"status": "success"}
+
+    result = await manager.try_model_list_with_fallback(
+        ["groq/flaky", "zai/primary"], generate, {}, model_param_name="model"
+    )
+
+    assert result["model_used"] == "zai/primary"
+    assert result["model_tier_used"] == "fallback1"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_failures_from_many_workers_all_count(clock):
+    redis = SharedRedis()
+    workers = [
+        CircuitBreaker(failure_threshold=5, timeout_seconds=60, redis_service=redis)
+        for _ in range(5)
+    ]
+
+    await asyncio.gather(*(worker.record_failure("zai/m") for worker in workers))
+
+    observer = CircuitBreaker(failure_threshold=5, timeout_seconds=60, redis_service=redis)
+    assert not await observer.allow_request("zai/m")
+    snapshot = (await observer.snapshot(["zai/m"]))[0]
+    assert (snapshot["failure_count"], snapshot["samples"]) == (5, 5)
+
+
+def test_health_written_by_the_script_reads_back_with_empty_lists():
+    # cjson encodes an empty Lua table as an object
+    health = ModelHealth.from_dict(
+        {"failures": {}, "recent_latencies": {}, "opened_until": 0, "ewma_latency": None}
+    )
+    assert health.failures == [] and health.recent_latencies == []
+    assert health.state(1.0) == "closed"
@@ -0,0 +1,136 @@
+"""
+Hedged text generation in ModelFallbackManager (hedge=True).
+
+Run:
+    pytest tests/test_model_hedging.py
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.services import model_fallback
+from app.core.services.model_fallback import ModelFallbackManager
+from tests.test_model_circuit_breaker import SharedRedis, no_sleep
+
+LADDER = ["zai/primary", "groq/backup", "openai/last"]
+
+
+@pytest.fixture(autouse=True)
+def short_budget(monkeypatch):
+    monkeypatch.setattr(model_fallback.settings, "HEDGE_DEFAULT_BUDGET_SECONDS", 0.02)
+    monkeypatch.setattr(model_fallback.settings, "HEDGE_MIN_BUDGET_SECONDS", 0.0)
+
+
+def _generator(delays, failures=(), cancelled=None):
+    async def generate(model):
+        try:
+            await asyncio.sleep(delays[model])
+        except asyncio.CancelledError:
+            if cancelled is not None:
+                cancelled.append(model)
+            raise
+        if model in failures:
+            raise RuntimeError(f"{model} upstream 500")
+        return {"status": "success", "content": model}
+
+    return generate
+
+
+async def _run(manager, generate, on_hedge_cancelled=None, hedge=True):
+    return await manager._try_models(
+        models=LADDER,
+        generation_function=generate,
+        request_params={},
+        model_param_name="model",
+        service_type="script",
+        hedge=hedge,
+        on_hedge_cancelled=on_hedge_cancelled,
+    )
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged():
+    manager = ModelFallbackManager(redis_service=SharedRedis(), sleep=no_sleep)
+    calls = []
+
+    async def generate(model):
+        calls.append(model)
+        return {"status": "success"}
+
+    result = await _run(manager, generate)
+
+    assert calls == ["zai/primary"]
+    assert "hedge" not in result and result["attempts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_loses_to_hedge_and_is_cancelled_and_accounted():
+    manager = ModelFallbackManager(redis_service=SharedRedis(), sleep=no_sleep)
+    cancelled, accounted = [], []
+
+    async def account(model, elapsed):
+        accounted.append(model)
+
+    result = await _run(
+        manager,
+        _generator({"zai/primary": 5, "groq/backup": 0}, cancelled=cancelled),
+        on_hedge_cancelled=account,
+    )
+    await asyncio.sleep(0)
+
+    assert result["content"] == "groq/backup"
+    assert result["model_used"] == "groq/backup"
+    assert result["model_tier_used"] == "fallback1"
+    assert result["hedge"]["winner"] == "groq/backup"
+    assert result["attempts"] == 2
+    assert cancelled == accounted == ["zai/primary"]
+    statuses = {entry["model"]: entry["status"] for entry in result["attempted_models"]}
+    assert statuses == {"zai/primary": "cancelled", "groq/backup": "success"}
+
+
+@pytest.mark.asyncio
+async def test_failed_hedge_leaves_primary_to_finish():
+    manager = ModelFallbackManager(redis_service=SharedRedis(), sleep=no_sleep)
+
+    result = await _run(
+        manager,
+        _generator({"zai/primary": 0.1, "groq/backup": 0}, failures={"groq/backup"}),
+    )
+
+    assert result["model_used"] == "zai/primary"
+    assert [entry["status"] for entry in result["attempted_models"]] == ["failed", "success"]
+
+
+@pytest.mark.asyncio
+async def test_both_hedged_calls_failing_moves_past_the_hedge_model():
+    manager = ModelFallbackManager(redis_service=SharedRedis(), sleep=no_sleep)
+    calls = []
+    inner = _generator(
+        {"zai/primary": 0.05, "groq/backup": 0, "openai/last": 0},
+        failures={"zai/primary", "groq/backup"},
+    )
+
+    async def generate(model):
+        calls.append(model)
+        return await inner(model)
+
+    result = await _run(manager, generate)
+
+    assert calls == ["zai/primary", "groq/backup", "openai/last"]
+    assert result["model_used"] == "openai/last"
+    assert result["attempts"] == 3
+
+
+@pytest.mark.asyncio
+async def test_budget_is_the_models_p90_latency(monkeypatch):
+    monkeypatch.setattr(model_fallback.settings, "HEDGE_MIN_SAMPLES", 10)
+    breaker = ModelFallbackManager(redis_service=SharedRedis()).circuit_breaker
+
+    assert await breaker.hedge_budget("zai/primary") == 0.02
+    for latency in range(1, 21):
+        await breaker.record_success("zai/primary", latency=float(latency))
+
+    assert await breaker.hedge_budget("zai/primary") == 19.0
+    snapshot = (await breaker.snapshot(["zai/primary"]))[0]
+    assert snapshot["p90_latency_seconds"] == 19.0
@@ -0,0 +1,204 @@
+"""
+Per-generation pipeline tracing (app/tracing): span nesting, Celery header
+propagation, the JSONL exporter and the admin waterfall.
+
+Run:
+    pytest tests/test_pipeline_tracing.py
+"""
+
+import asyncio
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.core.async_runtime import run_async
+from app.core.config import settings
+from app.core.services.provider_limiter import provider_limiter
+from app.tracing import propagation
+from app.tracing.exporters import read_jsonl_spans
+from app.tracing.service import _summarize_records, build_waterfall, purge_old_spans
+from app.tracing.tracer import (
+    current_span,
+    instrument_engine,
+    pipeline_span_id,
+    span,
+    span_each,
+    start_trace,
+    trace_id_for,
+    traced,
+    traced_run,
+)
+
+STAGE_TASK = "app.tasks.image_tasks.generate_all_images_for_video"
+
+
+@pytest.fixture
+def spans_file(tmp_path, monkeypatch):
+    path = tmp_path / "spans.jsonl"
+    monkeypatch.setattr(settings, "TRACING_ENABLED", True)
+    monkeypatch.setattr(settings, "TRACING_EXPORTER", "jsonl")
+    monkeypatch.setattr(settings, "TRACING_JSONL_PATH", str(path))
+    return path
+
+
+def by_name(spans):
+    return {s["name"]: s for s in spans}
+
+
+@traced("storage.upload", "storage", capture=("path",))
+async def fake_upload(content, path):
+    await asyncio.sleep(0)
+    return path
+
+
+def test_spans_nest_and_export_when_the_root_closes(spans_file):
+    generation_id = str(uuid.uuid4())
+
+    assert current_span() is None
+    with span("outside", "scene") as outside:
+        assert outside is None
+
+    with start_trace("video", "stage", generation_id) as root:
+        for scene in span_each(["a", "b"], "scene"):
+            traced_run([sys.executable, "-c", "pass"], check=True)
+            asyncio.run(fake_upload(b"x", path=f"videos/{scene}.mp4"))
+        assert not spans_file.exists()
+
+    spans = read_jsonl_spans(str(spans_file), trace_id_for(generation_id))
+    assert len(spans) == 1 + 2 + 2 + 2
+    assert root.trace_id == uuid.UUID(generation_id).hex
+    scenes = [s for s in spans if s["kind"] == "scene"]
+    assert [s["attributes"]["index"] for s in scenes] == [0, 1]
+    assert all(s["parent_id"] == root.span_id for s in scenes)
+    uploads = [s for s in spans if s["kind"] == "storage"]
+    assert {u["parent_id"] for u in uploads} == {s["span_id"] for s in scenes}
+    assert uploads[0]["attributes"]["path"] == "videos/a.mp4"
+    runs = [s for s in spans if s["kind"] == "subprocess"]
+    assert runs[0]["attributes"]["returncode"] == 0
+    assert current_span() is None
+
+
+def test_celery_headers_link_tasks_and_stages(spans_file):
+    generation_id = str(uuid.uuid4())
+    headers = {}
+    with start_trace("audio", "stage", generation_id) as audio:
+        propagation.inject_headers(headers)
+    assert headers["traceparent"] == f"00-{audio.trace_id}-{audio.span_id}-01"
+
+    request = SimpleNamespace(retries=0, **headers)
+    stage_task = SimpleNamespace(name=STAGE_TASK, request=request)
+    propagation.begin_task("t-1", stage_task, (generation_id,), {})
+    with span("generate", "provider"):
+        child_headers = {}
+        propagation.inject_headers(child_headers)
+    propagation.finish_task("t-1", "SUCCESS")
+
+    helper = SimpleNamespace(
+        name="app.tasks.image_tasks.generate_scene_image_task",
+        request=SimpleNamespace(retries=1, **child_headers),
+    )
+    propagation.begin_task("t-2", helper, ("scene-1",), {})
+    propagation.finish_task("t-2", "FAILURE")
+
+    untraced = SimpleNamespace(name="app.tasks.credit_tasks.x", request=SimpleNamespace())
+    propagation.begin_task("t-3", untraced, (), {})
+    assert current_span() is None
+
+    spans = by_name(read_jsonl_spans(str(spans_file), audio.trace_id))
+    image = spans["image"]
+    assert image["parent_id"] == pipeline_span_id(audio.trace_id)
+    assert image["attributes"]["triggered_by"] == audio.span_id
+    helper_span = spans["generate_scene_image_task"]
+    assert helper_span["parent_id"] == spans["generate"]["span_id"]
+    assert helper_span["kind"] == "task"
+    assert helper_span["status"] == "error"
+
+
+def test_context_crosses_run_async_and_provider_and_db_spans(spans_file, monkeypatch):
+    monkeypatch.setattr(settings, "TRACING_DB_QUERIES", True)
+    generation_id = str(uuid.uuid4())
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+
+    async def call_provider():
+        async with provider_limiter.acquire("untracked-provider"):
+            return current_span().name
+
+    with start_trace("merge", "stage", generation_id) as root:
+        assert run_async(call_provider()) == "untracked-provider"
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 2"))
+
+    spans = by_name(read_jsonl_spans(str(spans_file), root.trace_id))
+    assert spans["untracked-provider"]["kind"] == "provider"
+    assert spans["untracked-provider"]["parent_id"] == root.span_id
+    assert spans["SELECT"]["kind"] == "db"
+    assert spans["SELECT"]["attributes"]["statement"] == "SELECT 1"
+    assert len(spans) == 3
+
+
+def test_waterfall_and_summary_from_exported_spans(spans_file):
+    generation_id = str(uuid.uuid4())
+    with start_trace("audio", "stage", generation_id):
+        with span("elevenlabs", "provider"):
+            pass
+    with start_trace("merge", "stage", generation_id):
+        traced_run([sys.executable, "-c", "pass"])
+
+    spans = read_jsonl_spans(str(spans_file), trace_id_for(generation_id))
+    # A span whose parent never got exported hangs off the pipeline root
+    orphan = dict(spans[0], span_id="f" * 16, parent_id="e" * 16, name="orphan")
+    waterfall = build_waterfall(spans + [orphan], generation_id)
+
+    rows = waterfall["spans"]
+    names = [r["name"] for r in rows]
+    depths = {r["name"]: r["depth"] for r in rows}
+    assert names[:3] == ["pipeline", "audio", "elevenlabs"]
+    assert names.index("merge") > names.index("elevenlabs")
+    assert depths["pipeline"] == 0 and depths["merge"] == 1 and depths["orphan"] == 1
+    assert depths["elevenlabs"] == 2
+    assert rows[names.index("merge") + 1]["kind"] == "subprocess"
+    assert rows[0]["duration_ms"] >= max(r["offset_ms"] for r in rows)
+    assert set(waterfall["stages"]) == {"audio", "merge"}
+    assert build_waterfall([], generation_id) is None
+
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    summary = _summarize_records(
+        [
+            {"trace_id": "t", "kind": "stage", "name": "audio", "started_at": start, "duration_ms": 60000},
+            {"trace_id": "t", "kind": "stage", "name": "merge", "started_at": start + timedelta(minutes=2), "duration_ms": 30000},
+            {"trace_id": "t", "kind": "provider", "name": "elevenlabs", "started_at": start, "duration_ms": 1500},
+        ]
+    )
+    assert summary["pipeline_total"] == {"average": 150.0, "min": 150.0, "max": 150.0, "count": 1}
+    assert summary["stages"]["audio"]["average"] == 60.0
+    assert summary["spans"]["provider"]["elevenlabs"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_spans_past_the_retention_window_are_purged_hourly():
+    from app.tasks.celery_app import CELERY_FAST_QUEUE, celery_app, queue_for_task
+
+    class FakeSession:
+        async def execute(self, stmt):
+            self.cutoff = stmt.compile().params["started_at_1"]
+            return SimpleNamespace(rowcount=3)
+
+        async def commit(self):
+            pass
+
+    session = FakeSession()
+    assert await purge_old_spans(session, retention_days=7) == 3
+    expected = datetime.now(timezone.utc) - timedelta(days=7)
+    assert abs(session.cutoff - expected) < timedelta(minutes=1)
+
+    task = "app.tasks.tracing_tasks.purge_old_pipeline_spans"
+    assert task in {entry["task"] for entry in celery_app.conf.beat_schedule.values()}
+    assert queue_for_task(task) == CELERY_FAST_QUEUE
+    assert type(settings).model_fields["TRACING_DB_QUERIES"].default is False
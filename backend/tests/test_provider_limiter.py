@@ -0,0 +1,249 @@
+"""
+Fleet-wide provider limits (app/core/services/provider_limiter.py).
+
+Two ProviderLimiter instances on one fake Redis stand in for two worker
+processes. The fake runs the Lua scripts' logic in Python (reserve_token is
+the bucket's Python twin).
+
+Run:
+    pytest tests/test_provider_limiter.py
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.provider_limits import ProviderLimit, get_provider_limit
+from app.core.services.model_fallback import ModelFallbackManager
+from app.core.services.provider_limiter import (
+    ACQUIRE_SLOT_SCRIPT,
+    TAKE_TOKEN_SCRIPT,
+    ProviderCapacityError,
+    ProviderLimiter,
+    reserve_token,
+)
+from tests.test_model_circuit_breaker import SharedRedis, no_sleep
+
+
+class FakeLimitRedis:
+    def __init__(self):
+        self.hashes = {}
+        self.zsets = {}
+
+    async def eval(self, script, numkeys, key, *argv):
+        now = float(argv[0])
+        if script == TAKE_TOKEN_SCRIPT:
+            rate, capacity, max_wait = (float(v) for v in argv[1:4])
+            bucket = self.hashes.get(key, {})
+            tokens, wait = reserve_token(
+                bucket.get("tokens"), bucket.get("ts"), now, rate, capacity, max_wait
+            )
+            if tokens is None:
+                return "-1"
+            self.hashes[key] = {"tokens": tokens, "ts": now}
+            return str(wait)
+        if script == ACQUIRE_SLOT_SCRIPT:
+            limit, expires, holder = int(argv[1]), float(argv[2]), argv[3]
+            leases = {h: e for h, e in self.zsets.get(key, {}).items() if e > now}
+            self.zsets[key] = leases
+            if len(leases) < limit:
+                leases[holder] = expires
+                return 1
+            return 0
+        raise AssertionError("unknown script")
+
+    async def hset(self, key, mapping):
+        self.hashes[key] = {field: float(value) for field, value in mapping.items()}
+
+    async def expire(self, key, seconds):
+        return True
+
+    async def zadd(self, key, mapping, xx=False):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zrem(self, key, holder):
+        self.zsets.get(key, {}).pop(holder, None)
+
+
+class FakeRedisService:
+    def __init__(self, raw=None, connected=True):
+        self.redis_client = raw or FakeLimitRedis()
+        self.is_connected = connected
+
+    async def connect(self):
+        return None
+
+
+class RecordingSleep:
+    def __init__(self):
+        self.waits = []
+
+    async def __call__(self, seconds):
+        self.waits.append(seconds)
+        await asyncio.sleep(0)
+
+
+LIMITS = {
+    "slots": ProviderLimit(max_concurrent=2),
+    "rate": ProviderLimit(requests_per_minute=60, burst=2),
+}
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_shared_across_processes():
+    raw = FakeLimitRedis()
+    worker_a = ProviderLimiter(FakeRedisService(raw), LIMITS, sleep=RecordingSleep())
+    worker_b = ProviderLimiter(FakeRedisService(raw), LIMITS, sleep=RecordingSleep())
+
+    async with worker_a.acquire("slots", "key-1"), worker_b.acquire("slots", "key-1"):
+        with pytest.raises(ProviderCapacityError):
+            async with worker_b.acquire("slots", "key-1", timeout=0.2):
+                pass
+        # A different API key has its own slots
+        async with worker_a.acquire("slots", "key-2"):
+            pass
+
+    async with worker_b.acquire("slots", "key-1"):
+        assert len(raw.zsets[worker_b.redis_key("slots", "key-1", "slots")]) == 1
+    assert not raw.zsets[worker_b.redis_key("slots", "key-1", "slots")]
+
+
+@pytest.mark.asyncio
+async def test_waiter_gets_slot_when_another_process_releases():
+    raw = FakeLimitRedis()
+    worker_a = ProviderLimiter(FakeRedisService(raw), LIMITS)
+    worker_b = ProviderLimiter(FakeRedisService(raw), LIMITS)
+    order = []
+
+    async def hold(limiter, name, seconds):
+        async with limiter.acquire("slots"):
+            order.append(name)
+            await asyncio.sleep(seconds)
+
+    await asyncio.gather(hold(worker_a, "a1", 0.1), hold(worker_a, "a2", 0.1), hold(worker_b, "b", 0))
+
+    assert order[-1] == "b"
+
+
+@pytest.mark.asyncio
+async def test_bucket_paces_requests_across_processes():
+    raw = FakeLimitRedis()
+    sleep_a, sleep_b = RecordingSleep(), RecordingSleep()
+    worker_a = ProviderLimiter(FakeRedisService(raw), LIMITS, sleep=sleep_a)
+    worker_b = ProviderLimiter(FakeRedisService(raw), LIMITS, sleep=sleep_b)
+
+    for limiter in (worker_a, worker_b, worker_a, worker_b):
+        async with limiter.acquire("rate"):
+            pass
+
+    # Burst of two, then one token per second reserved in order
+    assert sleep_a.waits[0] == pytest.approx(1.0, abs=0.05)
+    assert sleep_b.waits[0] == pytest.approx(2.0, abs=0.05)
+
+    with pytest.raises(ProviderCapacityError):
+        async with worker_a.acquire("rate", timeout=1.0):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_backoff_after_429_slows_every_process():
+    raw = FakeLimitRedis()
+    worker_a = ProviderLimiter(FakeRedisService(raw), LIMITS)
+    sleep_b = RecordingSleep()
+    worker_b = ProviderLimiter(FakeRedisService(raw), LIMITS, sleep=sleep_b)
+
+    await worker_a.backoff("rate", seconds=20)
+    async with worker_b.acquire("rate"):
+        pass
+
+    assert sleep_b.waits == [pytest.approx(20.0, abs=0.1)]
+
+
+@pytest.mark.asyncio
+async def test_without_redis_limits_apply_per_process():
+    limiter = ProviderLimiter(FakeRedisService(connected=False), LIMITS, sleep=RecordingSleep())
+
+    async with limiter.acquire("slots"), limiter.acquire("slots"):
+        with pytest.raises(ProviderCapacityError):
+            async with limiter.acquire("slots", timeout=0.05):
+                pass
+    async with limiter.acquire("slots"):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_fallback_skips_model_at_capacity_without_cooldown():
+    redis = SharedRedis()
+    manager = ModelFallbackManager(redis_service=redis, sleep=no_sleep)
+
+    async def generate(model):
+        if model == "zai/primary":
+            raise ProviderCapacityError("zai at capacity (20 calls in flight)")
+        return {"status": "success"}
+
+    result = await manager.try_model_list_with_fallback(
+        ["zai/primary", "groq/backup"], generate, {}, model_param_name="model"
+    )
+
+    assert result["model_used"] == "groq/backup"
+    assert result["attempted_models"][0]["reason"] == "provider_capacity"
+    assert result["attempts"] == 1
+    assert manager.cooldown_key("zai") not in redis.values
+    health = await manager.circuit_breaker.health("zai/primary", fresh=True)
+    assert health.samples == 0
+
+
+@pytest.mark.asyncio
+async def test_capacity_error_does_not_fall_back_on_the_same_limiter():
+    redis = SharedRedis()
+    manager = ModelFallbackManager(redis_service=redis, sleep=no_sleep)
+    calls = []
+
+    async def generate(model):
+        calls.append(model)
+        raise ProviderCapacityError("modelslab at capacity (8 calls in flight)", "modelslab")
+
+    result = await manager.try_model_list_with_fallback(
+        ["seedream-4", "imagen-4", "zai/glm"], generate, {}, model_param_name="model"
+    )
+
+    # The second media model shares the first one's limit; zai has its own
+    assert calls == ["seedream-4", "zai/glm"]
+    assert result["status"] == "error"
+    assert [m["reason"] for m in result["attempted_models"]] == ["provider_capacity"] * 3
+
+
+@pytest.mark.asyncio
+async def test_provider_acquire_timeout_overrides_the_default(monkeypatch):
+    limits = {"slow": ProviderLimit(max_concurrent=1, acquire_timeout_seconds=0.1)}
+    limiter = ProviderLimiter(FakeRedisService(), limits)
+    monkeypatch.setattr(settings, "PROVIDER_LIMIT_ACQUIRE_TIMEOUT_SECONDS", 60.0)
+
+    async with limiter.acquire("slow"):
+        with pytest.raises(ProviderCapacityError) as raised:
+            async with limiter.acquire("slow"):
+                pass
+    assert raised.value.provider == "slow"
+
+
+def test_modelslab_jobs_queue_long_but_leases_stay_short():
+    limit = get_provider_limit("modelslab")
+    # Background jobs wait about one generation for a slot, but a killed
+    # worker's slot frees quickly; live holders renew while they poll
+    assert limit.acquire_timeout_seconds >= 20 * 60
+    assert limit.lease_seconds <= 120
+
+
+@pytest.mark.asyncio
+async def test_request_timeout_fails_fast_behind_a_long_queue():
+    limits = {"media": ProviderLimit(max_concurrent=1, acquire_timeout_seconds=20 * 60)}
+    limiter = ProviderLimiter(FakeRedisService(), limits)
+    loop = asyncio.get_running_loop()
+
+    async with limiter.acquire("media"):
+        started = loop.time()
+        with pytest.raises(ProviderCapacityError):
+            async with limiter.acquire("media", timeout=0.1):
+                pass
+    assert loop.time() - started < 1.0
@@ -272,6 +272,59 @@ def test_response_format():
     print("✅ Response returns HTTP 202 (Accepted)")
 
 
+class _FakeCreditService:
+    calls = []
+
+    def __init__(self, session):
+        pass
+
+    async def confirm_deduction(self, reservation_id, amount):
+        self.calls.append(("confirm", str(reservation_id), amount))
+        return True
+
+    async def release_reservation(self, reservation_id):
+        self.calls.append(("release", str(reservation_id)))
+        return True
+
+
+class _FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_and_failures_release_the_scene_image_reservation(monkeypatch):
+    """Only a provider generation confirms the route's reservation."""
+    from app.tasks import image_tasks
+
+    monkeypatch.setattr(image_tasks, "async_session", _FakeSession)
+    monkeypatch.setattr("app.credits.service.CreditService", _FakeCreditService)
+    _FakeCreditService.calls = []
+    reservation = str(uuid4())
+
+    await image_tasks.settle_scene_image_credits(reservation, str(uuid4()), 0)
+    await image_tasks.settle_scene_image_credits(reservation, str(uuid4()), image_tasks.SCENE_IMAGE_GEN)
+    await image_tasks.settle_scene_image_credits(None, str(uuid4()), image_tasks.SCENE_IMAGE_GEN)
+
+    assert _FakeCreditService.calls == [
+        ("release", reservation),
+        ("confirm", reservation, image_tasks.SCENE_IMAGE_GEN),
+    ]
+
+
+def test_scene_image_request_defaults_to_the_cache():
+    from app.images.schemas import SceneImageRequest
+
+    assert SceneImageRequest().regenerate is False
+    assert SceneImageRequest(regenerate=True).regenerate is True
+
+
 if __name__ == "__main__":
     print("=" * 80)
     print("🚀 Running Scene Image Generation Endpoint Tests")
@@ -294,4 +347,4 @@ if __name__ == "__main__":
     print("✅ Task is called with all required parameters")
     print("✅ Metadata includes scene_number, script_id, and chapter_id")
     print("✅ Error handling for DB and task queue failures")
-    print("✅ Authorization checks enforced")
\ No newline at end of file
+    print("✅ Authorization checks enforced")
@@ -0,0 +1,126 @@
+"""
+Compiled script AST shared by the ScriptParser stages.
+
+Run:
+    pytest tests/test_script_ast.py
+"""
+
+import json
+from types import SimpleNamespace
+
+from app.core.services import script_ast as script_ast_module
+from app.core.services.script_ast import (
+    ACT_SCENE,
+    LOCATION,
+    ScriptAST,
+    attach_script_ast,
+    compile_script,
+    script_hash,
+)
+from app.core.services.script_parser import ScriptParser
+
+SCRIPT = """**ACT I - SCENE 1**
+
+INT. CUPBOARD UNDER THE STAIRS - MORNING
+
+HARRY
+(sighs)
+"I wish I could go to the zoo."
+
+EXT. PRIVET DRIVE - DAY. Wide shot of the street.
+VERNON: Get in the car, boy!
+SFX: car door slams
+
+**ACT I - SCENE 2**
+MUSIC: playful strings
+HAGRID - Yer a wizard, Harry.
+"""
+
+
+def test_lines_carry_scene_shot_and_heading_numbering():
+    ast = compile_script(SCRIPT)
+    by_text = {line.text: line for line in ast.lines}
+
+    assert by_text["**ACT I - SCENE 1**"].kind == ACT_SCENE
+    assert by_text["INT. CUPBOARD UNDER THE STAIRS - MORNING"].kind == LOCATION
+    # First INT. inside an ACT/SCENE is shot 1; the second is shot 2
+    assert by_text["HARRY"].node_id == "s1.1.l5"
+    assert by_text["VERNON: Get in the car, boy!"].shot == 2
+    assert by_text["HAGRID - Yer a wizard, Harry."].node_id == "s2.0.l15"
+    # Video-prompt numbering counts SCENE/INT./EXT. headings only
+    assert by_text["HAGRID - Yer a wizard, Harry."].heading == 2
+    assert ast.scene_count == 2
+
+
+def test_speaker_uses_first_matching_dialogue_pattern():
+    line = next(l for l in compile_script(SCRIPT).lines if l.text.startswith("VERNON"))
+
+    assert line.speaker({"HARRY"}) is None
+    assert ScriptParser()._detect_character_dialogue(line.text, ["Harry"]) is None
+    hagrid = next(l for l in compile_script(SCRIPT).lines if l.text.startswith("HAGRID"))
+    assert hagrid.speaker({"HAGRID"}) == ("HAGRID", "Yer a wizard, Harry.")
+
+
+def test_compact_form_round_trips_through_json():
+    ast = compile_script(SCRIPT)
+    compact = json.loads(json.dumps(ast.to_compact()))
+
+    restored = ScriptAST.from_compact(compact)
+
+    assert restored.lines == ast.lines
+    assert restored.scene_count == ast.scene_count
+    assert restored.scenes() == ast.scenes()
+
+
+def test_stored_ast_is_used_only_for_the_same_text(monkeypatch):
+    compact = compile_script(SCRIPT).to_compact()
+    monkeypatch.setattr(script_ast_module, "_cache", type(script_ast_module._cache)())
+    built = []
+    original_build = ScriptAST.build.__func__
+    monkeypatch.setattr(
+        ScriptAST,
+        "build",
+        classmethod(lambda cls, *args: built.append(1) or original_build(cls, *args)),
+    )
+
+    compile_script(SCRIPT, compact)
+    assert built == []
+
+    compile_script(SCRIPT + "\nFADE OUT.", compact)
+    assert built == [1]
+
+
+def test_compile_script_is_memoized_by_hash():
+    assert compile_script(SCRIPT) is compile_script(str(SCRIPT))
+
+
+def test_attach_script_ast_refreshes_only_when_text_changes():
+    record = SimpleNamespace(script=SCRIPT, script_hash=None, script_ast=None)
+
+    attach_script_ast(record)
+    first = record.script_ast
+    assert record.script_hash == script_hash(SCRIPT)
+
+    attach_script_ast(record)
+    assert record.script_ast is first
+
+    record.script = SCRIPT + "\nSCENE 3"
+    attach_script_ast(record)
+    assert record.script_hash == script_hash(record.script)
+    assert record.script_ast["scene_count"] == 3
+
+
+def test_audio_and_video_stages_share_node_ids():
+    parser = ScriptParser()
+    characters = ["HARRY", "Vernon", "HAGRID"]
+
+    audio = parser.parse_script_for_audio(SCRIPT, characters, [], "cinematic_movie")
+    video = parser.parse_script_for_video_prompt(SCRIPT, characters)
+
+    audio_ids = {d["node_id"] for d in audio["character_dialogues"]}
+    video_ids = {d["node_id"] for d in video["character_dialogues"]}
+    assert audio_ids == video_ids == {"s1.1.l7", "s1.2.l10", "s2.0.l15"}
+    assert any(
+        sfx["node_id"] == "s1.2.l11" and sfx["description"] == "car door slams"
+        for sfx in audio["sound_effects"]
+    )
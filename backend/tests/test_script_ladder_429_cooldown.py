@@ -2,6 +2,11 @@ import pytest
 
 from app.core.services import model_fallback
 from app.core.services.model_fallback import ModelFallbackManager
+from app.core.services.provider_limiter import (
+    BACKOFF_DEFAULT_SECONDS,
+    BACKOFF_MAX_SECONDS,
+    retry_after_seconds,
+)
 
 
 class FakeRedis:
@@ -61,7 +66,8 @@ async def test_429_sets_provider_cooldown_and_skips_remaining_slots(monkeypatch)
     assert second["status"] == "success"
     assert calls == ["zai/fallback"]
 
-    now += model_fallback.PROVIDER_COOLDOWN_SECONDS + 1
+    # The provider is benched for its backoff, not for an hour
+    now += BACKOFF_DEFAULT_SECONDS + 1
     calls.clear()
     third = await manager.try_model_list_with_fallback(
         ["ollama/first", "zai/fallback"],
@@ -124,3 +130,17 @@ async def test_timeout_stops_before_a_second_provider_attempt():
 
     assert result["status"] == "error"
     assert calls == ["ollama/first"]
+
+
+def test_cooldown_follows_retry_after_within_the_cap():
+    class _RateLimited(Exception):
+        status_code = 429
+
+        def __init__(self, retry_after):
+            super().__init__("429 Too Many Requests")
+            self.response = type("R", (), {"headers": {"retry-after": retry_after}})()
+
+    assert retry_after_seconds(_RateLimited("12")) == 12.0
+    assert retry_after_seconds(_RateLimited("86400")) == BACKOFF_MAX_SECONDS
+    assert retry_after_seconds(_RateLimited("soon")) == BACKOFF_DEFAULT_SECONDS
+    assert retry_after_seconds(RuntimeError("429")) == BACKOFF_DEFAULT_SECONDS
@@ -0,0 +1,40 @@
+from app.core.services.title_locator import TitleLocator
+
+TEXT = (
+    "CONTENTS\nThe Storm 3\nThe Storm Breaks 9\n\n"
+    "THE STORM\nRain fell. the storm grew.\n\n"
+    "The Storm Breaks\nAt dawn the storm breaks over the harbor."
+)
+
+
+def _find_all(text, needle):
+    positions, start = [], 0
+    while (pos := text.lower().find(needle.lower(), start)) != -1:
+        positions.append(pos)
+        start = pos + 1
+    return positions
+
+
+def test_finds_every_case_insensitive_occurrence_including_overlaps():
+    titles = ["The Storm", "The Storm Breaks", "harbor", "missing title"]
+    locator = TitleLocator(TEXT, titles)
+    for title in titles:
+        assert locator.positions(title) == _find_all(TEXT, title)
+    assert locator.positions("missing title") == []
+
+
+def test_spans_are_in_original_text_and_support_exact_case_filtering():
+    locator = TitleLocator(TEXT, ["The Storm", "THE STORM", "the storm"])
+    start, end = locator.first("the storm", start=20)
+    assert TEXT[start:end].lower() == "the storm"
+    assert locator.exact_positions(["THE STORM"]) == [TEXT.index("THE STORM")]
+    assert locator.exact_positions(["the storm"]) == [
+        p for p in _find_all(TEXT, "the storm") if TEXT[p : p + 9] == "the storm"
+    ]
+
+
+def test_length_changing_lowercase_maps_back_to_original_offsets():
+    # "İ".lower() is two code points, so folded offsets drift from the original
+    text = "İstanbul Nights\n... İSTANBUL NIGHTS"
+    locator = TitleLocator(text, ["nights"])
+    assert [text[s:e] for s, e in locator.spans("nights")] == ["Nights", "NIGHTS"]
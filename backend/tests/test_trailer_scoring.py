@@ -0,0 +1,126 @@
+"""
+Concurrent, cached chapter scoring for trailer analysis (app/trailers/service.py).
+
+Run:
+    pytest tests/test_trailer_scoring.py
+"""
+
+import asyncio
+import json
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.services import provider_router as provider_router_module
+from app.trailers import service as trailer_service
+from app.trailers.service import TONE_WEIGHTS, TrailerSceneService
+
+
+class FakeRedis:
+    is_connected = True
+
+    def __init__(self):
+        self.store = {}
+
+    async def get_cached_ai_content(self, content_hash):
+        return self.store.get(content_hash)
+
+    async def cache_ai_content(self, content_hash, ai_content):
+        self.store[content_hash] = json.loads(json.dumps(ai_content))
+
+
+def _chapter(number, action):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        chapter_number=number,
+        title=f"Chapter {number}",
+        content=f"ACTION={action} " + "The storm broke over the castle. " * 10,
+    )
+
+
+@pytest.fixture
+def model_calls(monkeypatch):
+    calls = []
+    state = {"in_flight": 0, "max_in_flight": 0}
+
+    async def chat_completion(model, messages, **kwargs):
+        calls.append(messages[1]["content"])
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        action = float(messages[1]["content"].split("ACTION=")[1].split()[0])
+        scene = {
+            "scene_title": "Moment",
+            "scene_description": "A moment",
+            "action_score": action,
+            "emotional_score": 1.0 - action,
+            "visual_score": 0.5,
+            "narrative_score": 0.5,
+        }
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps([scene])))]
+        )
+
+    monkeypatch.setattr(
+        provider_router_module.provider_router, "chat_completion", chat_completion
+    )
+    monkeypatch.setattr(trailer_service.settings, "TRAILER_SCORING_CONCURRENCY", 3)
+    return SimpleNamespace(calls=calls, state=state)
+
+
+@pytest.fixture
+def scene_service():
+    return TrailerSceneService(MagicMock(), redis_service=FakeRedis())
+
+
+@pytest.mark.asyncio
+async def test_chapters_are_scored_concurrently_and_streamed(model_calls, scene_service):
+    chapters = [_chapter(i, i / 10) for i in range(8)]
+    all_scenes = []
+
+    snapshots = [
+        (done, [s.action_score for s in top])
+        async for done, top in scene_service.iter_top_scenes(
+            chapters, uuid.uuid4(), TONE_WEIGHTS["action"], 3, all_scenes
+        )
+    ]
+
+    assert model_calls.state["max_in_flight"] == 3
+    assert [done for done, _ in snapshots] == list(range(1, 9))
+    assert snapshots[-1][1] == [0.7, 0.6, 0.5]
+    # all_scenes is in chapter order, as the sequential pass produced it
+    assert [s.chapter_id for s in all_scenes] == [c.id for c in chapters]
+
+
+@pytest.mark.asyncio
+async def test_reanalysis_with_other_weights_reuses_cached_scores(model_calls, scene_service):
+    chapters = [_chapter(i, i / 10) for i in range(4)]
+
+    async def top_scene(weights):
+        ranked = [
+            top
+            async for _, top in scene_service.iter_top_scenes(
+                chapters, uuid.uuid4(), weights, 1
+            )
+        ]
+        return ranked[-1][0]
+
+    assert (await top_scene(TONE_WEIGHTS["action"])).action_score == 0.3
+    assert len(model_calls.calls) == 4
+
+    assert (await top_scene(TONE_WEIGHTS["romantic"])).action_score == 0.0
+    assert len(model_calls.calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_changed_chapter_text_is_rescored(model_calls, scene_service):
+    chapter = _chapter(1, 0.5)
+    await scene_service._score_chapter_content(chapter)
+
+    chapter.content += " A new paragraph."
+    await scene_service._score_chapter_content(chapter)
+
+    assert len(model_calls.calls) == 2
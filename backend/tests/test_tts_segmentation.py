@@ -0,0 +1,149 @@
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.services.tts import synthesis_cache
+from app.core.services.tts.segmentation import split_for_tts, split_sentences
+from app.core.services.tts.synthesis_cache import build_tts_cache_key, synthesized_model
+
+
+def test_split_sentences_keeps_abbreviations_initials_and_decimals():
+    text = 'Dr. Watson paid 3.5 pounds. J. R. Smith left! "Why?" she asked.'
+    assert split_sentences(text) == [
+        "Dr. Watson paid 3.5 pounds.",
+        "J. R. Smith left!",
+        '"Why?"',
+        "she asked.",
+    ]
+
+
+def test_chunks_respect_limit_and_never_cut_words():
+    sentence = "The quick brown fox jumps over the lazy dog. "
+    text = sentence * 40
+    chunks = split_for_tts(text, 200)
+
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    assert all(chunk.endswith(".") for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_paragraphs_are_kept_together_when_they_fit():
+    text = "First paragraph here.\n\nSecond paragraph here.\n\n\nThird one."
+    assert split_for_tts(text, 1000) == [
+        "First paragraph here.\n\nSecond paragraph here.\n\nThird one."
+    ]
+    assert split_for_tts(text, 30) == [
+        "First paragraph here.",
+        "Second paragraph here.",
+        "Third one.",
+    ]
+
+
+def test_overlong_sentence_breaks_at_clauses_then_words():
+    text = "alpha beta, gamma delta; " + "word " * 30 + "end."
+    chunks = split_for_tts(text, 40)
+
+    assert all(len(chunk) <= 40 for chunk in chunks)
+    assert chunks[0].startswith("alpha beta,")
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_tts_cache_key_covers_voice_settings_and_normalized_text():
+    key = build_tts_cache_key(
+        model="elevenlabs/eleven_multilingual_v2", voice_id="v1", text="Hello  there.",
+        voice_settings={"speed": 1.0}, scope="u1",
+    )
+    same = build_tts_cache_key(
+        model="elevenlabs/eleven_multilingual_v2", voice_id="v1", text=" Hello there. ",
+        voice_settings={"speed": 1.0}, scope="u1",
+    )
+    assert key == same
+    assert key != build_tts_cache_key(
+        model="elevenlabs/eleven_multilingual_v2", voice_id="v2", text="Hello there.",
+        voice_settings={"speed": 1.0}, scope="u1",
+    )
+    assert key != build_tts_cache_key(
+        model="openai/tts-1", voice_id="v1", text="Hello there.",
+        voice_settings={"speed": 1.0}, scope="u1",
+    )
+    assert key != build_tts_cache_key(
+        model="elevenlabs/eleven_multilingual_v2", voice_id="v1", text="Hello there.",
+        voice_settings={"speed": 1.2}, scope="u1",
+    )
+
+
+def test_synthesized_model_reports_the_model_that_produced_the_audio():
+    # Audio task adapter shape, after the chain fell back to another model
+    assert synthesized_model(
+        {"model_used": "eleven_turbo_v2", "service": "elevenlabs"}
+    ) == "elevenlabs/eleven_turbo_v2"
+    # TTSResult.to_dict() shape
+    assert synthesized_model({"model": "tts-1", "provider": "openai"}) == "openai/tts-1"
+    # Cache hits already carry the router form
+    assert synthesized_model({"model_used": "openai/tts-1"}) == "openai/tts-1"
+    assert synthesized_model({"model_used": "unknown", "service": "tts_router"}) is None
+    assert synthesized_model({"model_used": "eleven_turbo_v2", "service": "tts_router"}) is None
+
+
+class FakeMediaCache:
+    entries = {}
+
+    def __init__(self, session):
+        pass
+
+    @staticmethod
+    def enabled():
+        return True
+
+    async def lookup(self, cache_key):
+        return self.entries.get(cache_key)
+
+    async def store(self, cache_key, *, media_url, duration_seconds=None, **kwargs):
+        self.entries[cache_key] = SimpleNamespace(
+            media_url=media_url, duration_seconds=duration_seconds
+        )
+
+
+@pytest.fixture
+def fake_synthesis_cache(monkeypatch):
+    @asynccontextmanager
+    async def fake_session():
+        yield None
+
+    probed = []
+
+    async def fake_probe(url):
+        probed.append(url)
+        return 4.5
+
+    FakeMediaCache.entries = {}
+    monkeypatch.setattr(synthesis_cache, "async_session", fake_session)
+    monkeypatch.setattr(synthesis_cache, "MediaCacheService", FakeMediaCache)
+    monkeypatch.setattr(synthesis_cache, "probe_audio_duration_from_url", fake_probe)
+    return probed
+
+
+@pytest.mark.asyncio
+async def test_stored_synthesis_without_a_duration_is_probed(fake_synthesis_cache):
+    # TTS providers do not report durations; cache hits must still know
+    # theirs so they are left out of the billed seconds
+    await synthesis_cache.store_synthesis(
+        "k1", audio_url="https://cdn/a.mp3", model="openai/tts-1"
+    )
+
+    entry = await synthesis_cache.lookup_synthesis("k1")
+    assert entry.duration_seconds == 4.5
+    assert fake_synthesis_cache == ["https://cdn/a.mp3"]
+
+
+@pytest.mark.asyncio
+async def test_cached_entry_without_a_duration_is_probed_on_lookup(fake_synthesis_cache):
+    FakeMediaCache.entries["k2"] = SimpleNamespace(
+        media_url="https://cdn/b.mp3", duration_seconds=None
+    )
+
+    entry = await synthesis_cache.lookup_synthesis("k2")
+
+    assert entry.duration_seconds == 4.5
+    assert fake_synthesis_cache == ["https://cdn/b.mp3"]
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from app.core.async_runtime import WorkerAsyncRuntime, shared_http_client
+
+
+@pytest.fixture
+def worker_runtime(monkeypatch):
+    rt = WorkerAsyncRuntime()
+    monkeypatch.setattr("app.core.async_runtime.runtime", rt)
+    yield rt
+    with rt._lock:
+        if rt.is_running:
+            rt._loop.call_soon_threadsafe(rt._loop.stop)
+            rt._thread.join(5)
+
+
+def test_tasks_share_one_event_loop(worker_runtime):
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    first = worker_runtime.run(current_loop())
+    second = worker_runtime.run(current_loop())
+
+    assert first is second
+    assert first is worker_runtime.loop
+
+
+def test_exceptions_propagate_to_the_calling_task(worker_runtime):
+    async def boom():
+        raise ValueError("provider failed")
+
+    with pytest.raises(ValueError, match="provider failed"):
+        worker_runtime.run(boom())
+
+    # The loop survives a failing task
+    async def ok():
+        return 42
+
+    assert worker_runtime.run(ok()) == 42
+
+
+def test_http_client_is_pooled_on_the_runtime_loop(worker_runtime):
+    async def grab():
+        async with shared_http_client() as client:
+            return client
+
+    assert worker_runtime.run(grab()) is worker_runtime.run(grab())
+
+
+def test_http_client_outside_worker_is_one_off():
+    async def grab():
+        async with shared_http_client() as client:
+            return client
+
+    client = asyncio.run(grab())
+    assert client.is_closed
+
+
+def test_run_from_runtime_loop_is_rejected(worker_runtime):
+    async def nested():
+        async def inner():
+            return 1
+
+        return worker_runtime.run(inner())
+
+    with pytest.raises(RuntimeError, match="cannot be called from the runtime loop"):
+        worker_runtime.run(nested())
+
+
+def test_task_time_limit_is_enforced_without_the_pool(worker_runtime, monkeypatch):
+    """The threads pool ignores time limits; run_async applies the soft one."""
+    from celery.exceptions import SoftTimeLimitExceeded
+
+    from app.core import async_runtime
+
+    monkeypatch.setattr(async_runtime, "task_time_limit", lambda: 0.05)
+    cancelled = []
+
+    async def stuck_poll():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(SoftTimeLimitExceeded):
+        async_runtime.run_async(stuck_poll())
+    assert cancelled == [True]
+
+    async def provider_timeout():
+        raise TimeoutError("provider read timed out")
+
+    # The task's own timeouts are not mistaken for the time limit
+    with pytest.raises(TimeoutError, match="provider read timed out"):
+        async_runtime.run_async(provider_timeout())
+
+
+def test_no_time_limit_outside_a_task():
+    from app.core.async_runtime import task_time_limit
+
+    assert task_time_limit() is None
@@ -32,4 +32,5 @@ export interface ImageGenerationOptions {
   includeBackground: boolean;
   lightingMood: string;
   customPrompt?: string; // Added to fix lint error
+  regenerate?: boolean; // Ask for a new image instead of a cached one
 }
@@ -46,6 +46,7 @@ export const RetryControls: React.FC<RetryControlsProps> = ({
   const [selectedStep, setSelectedStep] = useState<string>('');
   const [showConfirmDialog, setShowConfirmDialog] = useState(false);
   const [showStepSelector, setShowStepSelector] = useState(false);
+  const [regenerate, setRegenerate] = useState(false);
 
   // Check if generation can be retried
   const canRetry = pipelineStatus.can_resume && 
@@ -81,10 +82,11 @@ export const RetryControls: React.FC<RetryControlsProps> = ({
 
   const handleRetryConfirm = async () => {
     if (selectedStep) {
-      await onRetry(selectedStep);
+      await onRetry(selectedStep, regenerate);
       setShowConfirmDialog(false);
       setShowStepSelector(false);
       setSelectedStep('');
+      setRegenerate(false);
     }
   };
 
@@ -92,6 +94,7 @@ export const RetryControls: React.FC<RetryControlsProps> = ({
     setShowConfirmDialog(false);
     setShowStepSelector(false);
     setSelectedStep('');
+    setRegenerate(false);
   };
 
   if (!canRetry) {
@@ -256,6 +259,18 @@ export const RetryControls: React.FC<RetryControlsProps> = ({
                 This will restart the generation process from this step onwards. 
                 Any existing content from this step will be replaced.
               </p>
+              <label className="flex items-start space-x-2 mt-3 text-sm text-gray-700">
+                <input
+                  type="checkbox"
+                  checked={regenerate}
+                  onChange={(e) => setRegenerate(e.target.checked)}
+                  className="mt-0.5"
+                />
+                <span>
+                  Regenerate all media from scratch instead of reusing scenes
+                  that already succeeded
+                </span>
+              </label>
             </div>
 
             <div className="flex items-center justify-end space-x-3">
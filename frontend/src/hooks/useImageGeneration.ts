@@ -37,6 +37,7 @@ interface ImageGenerationOptions {
   includeBackground: boolean;
   lightingMood: string;
   customPrompt?: string;
+  regenerate?: boolean; // Ask for a new image instead of a cached one
 }
 
 export const useImageGeneration = (
@@ -295,7 +296,8 @@ export const useImageGeneration = (
         character_ids: characterIds,
         character_image_urls: characterImageUrls,
         is_suggested_shot: isSuggestedShot,  // Pass suggested shot flag to backend
-        shot_index: shotIndex  // Pass shot_index to backend (0 = Key Scene, 1+ = Suggested)
+        shot_index: shotIndex,  // Pass shot_index to backend (0 = Key Scene, 1+ = Suggested)
+        regenerate: options.regenerate ?? false  // Skip the backend media cache
       };
 
       const result = await userService.generateSceneImage(chapterId!, sceneNumber, request);
@@ -443,7 +445,7 @@ export const useImageGeneration = (
       const existingImage = Array.isArray(images) && images.length > 0 ? images[0] : null;
       
       if (existingImage) {
-        await generateSceneImage(identifier, existingImage.prompt, options);
+        await generateSceneImage(identifier, existingImage.prompt, { ...options, regenerate: true });
       }
     } else if (type === 'character' && typeof identifier === 'string') {
       const existingImage = characterImages[identifier];
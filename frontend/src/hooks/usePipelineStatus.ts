@@ -107,14 +107,16 @@ export const usePipelineStatus = (
   }, []);
 
   // Retry generation
-  const retryGeneration = useCallback(async (step?: string) => {
+  const retryGeneration = useCallback(async (step?: string, regenerate = false) => {
     if (!videoGenerationId || !mountedRef.current) return;
 
     setIsRetrying(true);
     setRetryError(null);
 
     try {
-      const result = await aiService.retryVideoGeneration(videoGenerationId, step);
+      // A plain retry reuses cached scenes; only an explicit regenerate
+      // asks the providers for new media
+      const result = await aiService.retryVideoGeneration(videoGenerationId, step, regenerate);
       
       if (!mountedRef.current) return;
       
@@ -50,10 +50,15 @@ export const aiService = {
 
   retryVideoGeneration: async (
     videoGenId: string, 
-    retryFromStep?: string
+    retryFromStep?: string,
+    regenerate = false
   ): Promise<RetryResponse> => {
     try {
-      const body = retryFromStep ? { retry_from_step: retryFromStep } : {};
+      // regenerate asks the backend for new media instead of cached results
+      const body = {
+        ...(retryFromStep ? { retry_from_step: retryFromStep } : {}),
+        ...(regenerate ? { regenerate: true } : {}),
+      };
       const response = await apiClient.post<RetryResponse>(
         `/ai/retry-generation/${videoGenId}`, 
         body
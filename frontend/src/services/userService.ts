@@ -143,6 +143,7 @@ interface SceneImageRequest {
   style?: string;
   aspect_ratio?: string;
   custom_prompt?: string;
+  regenerate?: boolean;
 }
 
 interface CharacterImageRequest {
@@ -2,7 +2,7 @@ import { PipelineStatus } from "../services/aiService";
 
 export interface RetryControlsProps {
   pipelineStatus: PipelineStatus;
-  onRetry: (step?: string) => Promise<void>;
+  onRetry: (step?: string, regenerate?: boolean) => Promise<void>;
   isRetrying: boolean;
   retryError: string | null;
   className?: string;
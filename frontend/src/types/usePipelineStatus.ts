@@ -12,7 +12,7 @@ export interface UsePipelineStatusReturn {
   isLoading: boolean;
   error: string | null;
   refreshStatus: () => Promise<void>;
-  retryGeneration: (step?: string) => Promise<void>;
+  retryGeneration: (step?: string, regenerate?: boolean) => Promise<void>;
   isRetrying: boolean;
   retryError: string | null;
   startPolling: () => void;